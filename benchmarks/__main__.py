@@ -0,0 +1,101 @@
+"""Benchmark runner.
+
+    PYTHONPATH=src python -m benchmarks run --output benchmarks/baselines/main.json
+    PYTHONPATH=src python -m benchmarks run --sizes 1000 10000000 --only walk_forward_batch -o after.json
+    PYTHONPATH=src python -m benchmarks compare benchmarks/baselines/main.json after.json
+
+``compare`` exits with status 1 when any benchmark regressed, so it can gate CI.
+Baselines are only comparable on the same machine and interpreter; each report
+records its environment, and ``compare`` exits with status 2 without judging
+the results when the Python or numpy version, architecture or CPU count differ
+(``--ignore-environment`` compares anyway).
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from .suite import BENCHMARKS, DEFAULT_SIZES, Result, compare, environment_mismatch, load, run_suite, save
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+logger = logging.getLogger("benchmarks")
+logging.getLogger("httpx").setLevel(logging.WARNING)  # the API benchmark's test client logs every request
+
+
+def _bars(value: str) -> int:
+    """Sizes as plain integers or with a k/M suffix (``10M``)."""
+    scale = {"k": 1_000, "m": 1_000_000}.get(value[-1:].lower(), 1)
+    return int(float(value[:-1] if scale > 1 else value) * scale)
+
+
+def _report(result: Result) -> None:
+    logger.info(
+        "%-24s %10d bars %12.0f %s/s %10.1f ms %9.1f MiB peak",
+        result.benchmark,
+        result.bars,
+        result.throughput,
+        result.unit,
+        result.seconds * 1_000,
+        result.peak_bytes / (1 << 20),
+    )
+
+
+def _run(args: argparse.Namespace) -> int:
+    report = run_suite(args.sizes, args.only, args.repeat, args.seed, not args.no_memory, _report)
+    save(report, args.output)
+    logger.info("wrote %d results to %s", len(report["results"]), args.output)
+    return 0
+
+
+def _compare(args: argparse.Namespace) -> int:
+    baseline, current = load(args.baseline), load(args.current)
+    mismatch = environment_mismatch(baseline, current)
+    for key, (before, after) in mismatch.items():
+        print(f"environment {key}: baseline {before}, current {after}")
+    if mismatch and not args.ignore_environment:
+        print("reports come from different environments; regenerate the baseline here or pass --ignore-environment")
+        return 2
+    changes = compare(baseline, current, args.threshold, args.memory_threshold)
+    for change in changes:
+        flag = "REGRESSED" if change.regressed else "ok"
+        print(
+            f"{change.benchmark:<24} {change.bars:>10} bars  "
+            f"throughput x{change.throughput_ratio:5.2f}  memory x{change.memory_ratio:5.2f}  {flag}"
+        )
+    regressed = [change for change in changes if change.regressed]
+    print(f"{len(regressed)} of {len(changes)} benchmarks regressed")
+    return 1 if regressed else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Throughput and memory benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the suite and write a JSON report")
+    run.add_argument("--sizes", nargs="+", type=_bars, default=list(DEFAULT_SIZES), help="series lengths in bars")
+    run.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="benchmarks to run (default: all)")
+    run.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark; the best is kept")
+    run.add_argument("--seed", type=int, default=7)
+    run.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    run.add_argument("-o", "--output", type=Path, default=Path("benchmark.json"))
+    run.set_defaults(handler=_run)
+
+    diff = commands.add_parser("compare", help="flag regressions of CURRENT against BASELINE")
+    diff.add_argument("baseline", type=Path)
+    diff.add_argument("current", type=Path)
+    diff.add_argument("--threshold", type=float, default=0.10, help="tolerated throughput drop (fraction)")
+    diff.add_argument("--memory-threshold", type=float, default=0.25, help="tolerated peak memory growth (fraction)")
+    diff.add_argument(
+        "--ignore-environment", action="store_true", help="compare even when the reports' environments differ"
+    )
+    diff.set_defaults(handler=_compare)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+import numpy as np
+
+from xrp_platform.data.candles import CandleSeries, datetime_to_ns
+
+MINUTE_NS = 60_000_000_000
+START = datetime(2024, 1, 1)
+
+
+def synthetic_series(bars: int, seed: int = 7, symbol: str = "XRPUSDT", timeframe: int = 1) -> CandleSeries:
+    """Seeded random-walk candles; the same ``bars`` and ``seed`` always give the same series.
+
+    Built column-wise, so 10M bars take seconds and about 560 MB. Log returns are
+    drawn with fat tails and slowly varying volatility, so regimes, stops and
+    aggregation all see realistic variety rather than a sine wave.
+    """
+    rng = np.random.default_rng(seed)
+    volatility = 0.0015 * np.exp(np.cumsum(rng.normal(0.0, 0.01, bars)).clip(-1.5, 1.5))
+    returns = rng.standard_t(4, bars) * volatility / np.sqrt(2.0)
+    close = 0.5 * np.exp(np.cumsum(returns))
+    open = np.empty(bars)
+    open[0] = 0.5
+    open[1:] = close[:-1]
+    wick = np.abs(rng.normal(0.0, 1.0, (2, bars))) * volatility * close
+    high = np.maximum(open, close) + wick[0]
+    low = np.minimum(open, close) - wick[1]
+    volume = rng.lognormal(np.log(1e6), 0.5, bars)
+    timestamp = datetime_to_ns(START) + np.arange(bars, dtype=np.int64) * timeframe * MINUTE_NS
+    return CandleSeries.from_arrays(
+        symbol,
+        timeframe,
+        timestamp=timestamp,
+        open=open,
+        high=high,
+        low=low,
+        close=close,
+        volume=volume,
+        vwap=(high + low + close) / 3.0,
+    )
+
+
+__all__ = ["synthetic_series"]
@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+import gc
+import itertools
+import json
+import os
+import platform
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from services.backtesting.engine import walk_forward, walk_forward_batch
+from xrp_platform.data.candles import CandleSeries
+from xrp_platform.features.timeframe import TimeframeAggregator
+from xrp_platform.signals.composite import CompositeEngine
+from xrp_platform.utils.features import compute_features, compute_features_batch
+
+from .data import synthetic_series
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+FORMAT_VERSION = 1
+# allocations below this are noise from interpreter caches, not a memory regression
+MEMORY_FLOOR_BYTES = 1 << 20
+
+Run = Callable[[], int]
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """One workload: ``setup`` prepares it for a series and returns a run that reports units processed.
+
+    Setup work (building inputs, warming caches) is never timed. A benchmark
+    that is not ``sized`` does the same work whatever the series length and runs
+    once, at the smallest size. ``max_bars`` skips sizes the workload was never
+    meant for, such as the per-bar reference backtest on millions of bars.
+    """
+
+    name: str
+    setup: Callable[[CandleSeries], Run]
+    unit: str = "bars"
+    sized: bool = True
+    max_bars: Optional[int] = None
+
+    def applies(self, bars: int, smallest: int) -> bool:
+        if not self.sized:
+            return bars == smallest
+        return self.max_bars is None or bars <= self.max_bars
+
+
+@dataclass(frozen=True)
+class Result:
+    benchmark: str
+    bars: int
+    units: int
+    unit: str
+    seconds: float  # best of the timed repeats
+    throughput: float  # units per second
+    peak_bytes: int  # tracemalloc peak above the allocations live when the run started
+
+
+def _features(series: CandleSeries) -> Run:
+    def run() -> int:
+        compute_features(series.symbol, 1, series)
+        return len(series)
+
+    return run
+
+
+def _features_batch(series: CandleSeries) -> Run:
+    columns = series.columns()
+
+    def run() -> int:
+        compute_features_batch(columns, 60)
+        return len(series)
+
+    return run
+
+
+def _composite(series: CandleSeries) -> Run:
+    engine = CompositeEngine()
+    features = compute_features(series.symbol, 1, series[-120:])
+    calls = 2_000
+
+    def run() -> int:
+        for _ in range(calls):
+            engine.compute(features)
+        return calls
+
+    return run
+
+
+def _composite_batch(series: CandleSeries) -> Run:
+    engine = CompositeEngine()
+    batch = compute_features_batch(series.columns(), 60)
+
+    def run() -> int:
+        engine.compute_batch(batch)
+        return len(batch)
+
+    return run
+
+
+def _aggregate(series: CandleSeries) -> Run:
+    aggregator = TimeframeAggregator()
+
+    def run() -> int:
+        aggregator.aggregate(series, 60)
+        return len(series)
+
+    return run
+
+
+def _resample_many(series: CandleSeries) -> Run:
+    aggregator = TimeframeAggregator()
+
+    def run() -> int:
+        aggregator.resample_many(series, (5, 15, 60, 240, 1_440))
+        return len(series)
+
+    return run
+
+
+def _walk_forward(series: CandleSeries) -> Run:
+    def run() -> int:
+        walk_forward(series.symbol, series)
+        return len(series)
+
+    return run
+
+
+def _walk_forward_batch(series: CandleSeries) -> Run:
+    def run() -> int:
+        walk_forward_batch(series.symbol, series)
+        return len(series)
+
+    return run
+
+
+def _api_signal(series: CandleSeries) -> Run:
+    from fastapi.testclient import TestClient
+
+    from services.api.main import app
+
+    # no lifespan: the endpoint computes on a cache miss without Redis or a database
+    client = TestClient(app)
+    symbols = (f"BENCH{i}" for i in itertools.count())
+    requests = 100
+    client.get(f"/signals/{next(symbols)}")
+
+    def run() -> int:
+        for _ in range(requests):
+            # a fresh symbol every time, so each request misses the cache and computes
+            response = client.get(f"/signals/{next(symbols)}")
+            response.raise_for_status()
+        return requests
+
+    return run
+
+
+BENCHMARKS: Dict[str, Benchmark] = {
+    benchmark.name: benchmark
+    for benchmark in (
+        Benchmark("compute_features", _features),
+        # whole-series feature matrices grow past 2 GB at 10M bars; walk_forward_batch chunks instead
+        Benchmark("compute_features_batch", _features_batch, max_bars=1_000_000),
+        Benchmark("composite_compute", _composite, unit="signals", sized=False),
+        Benchmark("composite_compute_batch", _composite_batch, max_bars=1_000_000),
+        Benchmark("aggregate", _aggregate),
+        Benchmark("resample_many", _resample_many),
+        Benchmark("walk_forward", _walk_forward, max_bars=10_000),
+        Benchmark("walk_forward_batch", _walk_forward_batch),
+        Benchmark("api_signal", _api_signal, unit="requests", sized=False),
+    )
+}
+
+
+def measure(benchmark: Benchmark, series: CandleSeries, repeat: int = 3, memory: bool = True) -> Result:
+    """Best wall time over ``repeat`` runs, then one more run under tracemalloc for the peak.
+
+    Timing and memory are separate passes because tracing every allocation
+    slows Python-heavy code several times over.
+    """
+    run = benchmark.setup(series)
+    best = float("inf")
+    units = 0
+    for _ in range(max(repeat, 1)):
+        gc.collect()
+        started = time.perf_counter()
+        units = run()
+        best = min(best, time.perf_counter() - started)
+    peak = 0
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            run()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return Result(benchmark.name, len(series), units, benchmark.unit, best, units / best if best > 0 else 0.0, peak)
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+# environment fields that change timings; a baseline is only comparable when they match
+COMPARABLE_ENVIRONMENT = ("python", "numpy", "machine", "cpus")
+
+
+def environment_mismatch(baseline: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Tuple[Any, Any]]:
+    """``COMPARABLE_ENVIRONMENT`` fields that differ between two reports, as (baseline, current)."""
+    before, after = baseline.get("environment", {}), current.get("environment", {})
+    return {
+        key: (before.get(key), after.get(key))
+        for key in COMPARABLE_ENVIRONMENT
+        if before.get(key) != after.get(key)
+    }
+
+
+def run_suite(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    names: Optional[Iterable[str]] = None,
+    repeat: int = 3,
+    seed: int = 7,
+    memory: bool = True,
+    log: Optional[Callable[[Result], None]] = None,
+) -> Dict[str, Any]:
+    """Run the selected benchmarks over seeded series of each size; the report is JSON-ready."""
+    selected = [BENCHMARKS[name] for name in names] if names is not None else list(BENCHMARKS.values())
+    sizes = sorted(set(sizes))
+    results: List[Result] = []
+    for bars in sizes:
+        series = synthetic_series(bars, seed)
+        for benchmark in selected:
+            if not benchmark.applies(bars, sizes[0]):
+                continue
+            result = measure(benchmark, series, repeat, memory)
+            results.append(result)
+            if log is not None:
+                log(result)
+        del series
+    return {
+        "version": FORMAT_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "seed": seed,
+        "repeat": repeat,
+        "environment": environment(),
+        "results": [asdict(result) for result in results],
+    }
+
+
+def save(report: Dict[str, Any], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2) + "\n")
+
+
+def load(path: Path) -> Dict[str, Any]:
+    report = json.loads(path.read_text())
+    if report.get("version") != FORMAT_VERSION:
+        raise ValueError(f"{path} is benchmark format {report.get('version')}, expected {FORMAT_VERSION}")
+    return report
+
+
+@dataclass(frozen=True)
+class Change:
+    benchmark: str
+    bars: int
+    throughput_ratio: float  # current / baseline; below 1 is slower
+    memory_ratio: float  # current / baseline peak; above 1 uses more
+    slower: bool
+    bigger: bool
+
+    @property
+    def regressed(self) -> bool:
+        return self.slower or self.bigger
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = 0.10,
+    memory_threshold: float = 0.25,
+) -> List[Change]:
+    """Pair results by benchmark and size and flag throughput or peak-memory regressions.
+
+    A run is slower when its throughput falls more than ``threshold`` below the
+    baseline, and bigger when its peak grows more than ``memory_threshold`` and
+    by at least ``MEMORY_FLOOR_BYTES``. Results present in only one report are
+    ignored.
+    """
+    before = {(row["benchmark"], row["bars"]): row for row in baseline["results"]}
+    changes: List[Change] = []
+    for row in current["results"]:
+        old = before.get((row["benchmark"], row["bars"]))
+        if old is None:
+            continue
+        speed = row["throughput"] / old["throughput"] if old["throughput"] else 1.0
+        growth = row["peak_bytes"] - old["peak_bytes"]
+        memory = row["peak_bytes"] / old["peak_bytes"] if old["peak_bytes"] else 1.0
+        changes.append(
+            Change(
+                row["benchmark"],
+                row["bars"],
+                speed,
+                memory,
+                slower=speed < 1.0 - threshold,
+                bigger=growth >= MEMORY_FLOOR_BYTES and memory > 1.0 + memory_threshold,
+            )
+        )
+    return changes
+
+
+__all__ = [
+    "BENCHMARKS",
+    "Benchmark",
+    "COMPARABLE_ENVIRONMENT",
+    "Change",
+    "DEFAULT_SIZES",
+    "Result",
+    "compare",
+    "environment_mismatch",
+    "load",
+    "measure",
+    "run_suite",
+    "save",
+]
@@ -2,21 +2,34 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from datetime import datetime
+from typing import Optional
 
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
 
-from xrp_platform.data.storage import Base, engine
+from xrp_platform.data.storage import (
+    Base,
+    ensure_execution_log_columns,
+    ensure_signal_partitions,
+    get_engine,
+    migrate_legacy_signals,
+)
 
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 logger = logging.getLogger("bootstrap_db")
 
 
-async def init_db() -> None:
+async def init_db(engine: Optional[AsyncEngine] = None) -> None:
+    engine = engine or get_engine()
     logger.info("Initializing database schemas")
     try:
         async with engine.begin() as conn:
+            await migrate_legacy_signals(conn, datetime.utcnow().date())
             await conn.run_sync(Base.metadata.create_all)
+            await ensure_execution_log_columns(conn)
+            await ensure_signal_partitions(conn, datetime.utcnow().date())
         logger.info("Database schemas created successfully")
     except SQLAlchemyError as exc:
         logger.exception("Failed to initialize database", exc_info=exc)
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from xrp_platform.messaging.streams import SignalStreamReader
+
+logger = logging.getLogger("api.cache")
+
+Key = Tuple[str, int]
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    stream_updates: int = 0
+    evictions: int = 0
+
+
+class SignalCache:
+    """Latest serialized signal per (symbol, timeframe), kept for one bar.
+
+    Values are the JSON bytes published by the worker, so a hit is returned as
+    is with no model validation or re-serialization. Misses are single-flight:
+    concurrent requests for the same key await one shared computation. Keys
+    come from requests, so the map is an LRU of at most ``max_entries``.
+    """
+
+    def __init__(
+        self, grace_s: float = 5.0, max_entries: int = 10_000, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.grace_s = grace_s
+        self.max_entries = max_entries
+        self.clock = clock
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[Key, Tuple[bytes, float]]" = OrderedDict()
+        self._inflight: Dict[Key, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def ttl(self, timeframe: int) -> float:
+        return timeframe * 60 + self.grace_s
+
+    def put(self, symbol: str, timeframe: int, data: bytes) -> None:
+        entries = self._entries
+        entries[(symbol, timeframe)] = (data, self.clock() + self.ttl(timeframe))
+        entries.move_to_end((symbol, timeframe))
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def get(self, symbol: str, timeframe: int) -> Optional[bytes]:
+        entry = self._entries.get((symbol, timeframe))
+        if entry is None:
+            return None
+        data, expires_at = entry
+        if expires_at <= self.clock():
+            del self._entries[(symbol, timeframe)]
+            return None
+        self._entries.move_to_end((symbol, timeframe))
+        return data
+
+    async def get_or_compute(self, symbol: str, timeframe: int, compute: Callable[[], Awaitable[bytes]]) -> bytes:
+        data = self.get(symbol, timeframe)
+        if data is not None:
+            self.stats.hits += 1
+            return data
+        key = (symbol, timeframe)
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.stats.coalesced += 1
+            return await asyncio.shield(pending)
+
+        self.stats.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            data = await compute()
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        else:
+            self.put(symbol, timeframe, data)
+            future.set_result(data)
+            return data
+        finally:
+            del self._inflight[key]
+
+    async def consume(self, reader: SignalStreamReader, retry_delay_s: float = 1.0) -> None:
+        """Fill the cache from the worker's signal stream until cancelled.
+
+        Failures, including Redis being down when the API starts, are logged and
+        retried. The group is (re)created before the first read and whenever a
+        read finds it gone (NOGROUP, e.g. after Redis restarted without its data).
+        """
+        grouped = False
+        while True:
+            try:
+                if not grouped:
+                    await reader.ensure_group()
+                    grouped = True
+                entries = await reader.read()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                if "NOGROUP" in str(exc):
+                    grouped = False
+                logger.exception("signal stream read failed")
+                await asyncio.sleep(retry_delay_s)
+                continue
+            for entry in entries:
+                self.put(entry.symbol, entry.timeframe_min, entry.data)
+            self.stats.stream_updates += len(entries)
+            await reader.ack([entry.entry_id for entry in entries])
+
+
+__all__ = ["SignalCache", "CacheStats"]
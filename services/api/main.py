@@ -1,39 +1,128 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
-from typing import List
+import asyncio
+import logging
+import os
+import socket
+from contextlib import asynccontextmanager
+from datetime import datetime
+from enum import IntEnum
+from time import perf_counter_ns
+from typing import AsyncIterator, Awaitable, Callable, Optional
 
-from fastapi import FastAPI
-from fastapi.responses import ORJSONResponse
+import numpy as np
+import orjson
+from fastapi import FastAPI, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import ValidationError
 
-from xrp_platform.data.schemas import CompositeSignal, TimeframeCandle
+from xrp_platform.config import get_settings
+from xrp_platform.connectors.binance import INTERVALS
+from xrp_platform.data.candles import CandleSeries, datetime_to_ns
+from xrp_platform.data.history import history_cursor, stream_signal_history
+from xrp_platform.data.schemas import CompositeSignal, MultiTimeframeSignal
+from xrp_platform.data.storage import create_engine, get_engine
+from xrp_platform.messaging.streams import SignalStreamReader, create_redis, encode_signal
 from xrp_platform.signals.composite import CompositeEngine
+from xrp_platform.signals.multi_timeframe import MultiTimeframePipeline
 from xrp_platform.utils.features import compute_features
+from xrp_platform.utils.metrics import CONTENT_TYPE, REGISTRY
+
+from .cache import SignalCache
+
+logger = logging.getLogger("api")
 
-app = FastAPI(default_response_class=ORJSONResponse)
 engine = CompositeEngine()
+pipeline = MultiTimeframePipeline(engine=engine)
+cache = SignalCache()
+# multi-timeframe signals, keyed at the 1m base timeframe since confluence moves with every base bar
+timeframes_cache = SignalCache()
+
+# bar sizes the worker can publish; anything else answers 422 rather than filling
+# the cache with keys nothing refreshes
+Timeframe = IntEnum("Timeframe", {f"m{minutes}": minutes for minutes in INTERVALS})
+
+for _field in ("hits", "misses", "coalesced", "stream_updates", "evictions"):
+    REGISTRY.counter(
+        "xrp_api_cache_events",
+        "Signal cache lookups and stream updates",
+        fn=lambda field=_field: getattr(cache.stats, field),
+        event=_field,
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    try:
+        settings = get_settings()
+    except ValidationError:
+        logger.warning("settings incomplete; serving signals without the worker stream")
+        yield
+        return
+    redis = create_redis(settings.redis_url)
+    app.state.db_engine = create_engine(settings.database_url)
+    # a group per process: in a shared group each worker or replica would see only part of the stream
+    name = f"api-{socket.gethostname()}-{os.getpid()}"
+    reader = SignalStreamReader(redis, group=name, consumer=name)
+    consumer = asyncio.create_task(cache.consume(reader))
+    try:
+        yield
+    finally:
+        consumer.cancel()
+        await asyncio.gather(consumer, return_exceptions=True)
+        try:
+            await reader.drop_group()
+        except Exception:
+            logger.warning("could not remove consumer group %s", name, exc_info=True)
+        await redis.aclose()
+        await app.state.db_engine.dispose()
 
 
-def _synthetic_candles(symbol: str, points: int = 60) -> List[TimeframeCandle]:
-    now = datetime.utcnow()
-    candles: List[TimeframeCandle] = []
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
+
+
+@app.middleware("http")
+async def record_latency(request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
+    started = perf_counter_ns()
+    response = await call_next(request)
+    # label by route template, not path, so every symbol shares one series
+    route = request.scope.get("route")
+    path = getattr(route, "path", "unmatched")
+    REGISTRY.histogram("xrp_api_request_seconds", "API handler latency", route=path).observe_ns(
+        perf_counter_ns() - started
+    )
+    REGISTRY.counter("xrp_api_requests", "API responses", route=path, status=str(response.status_code)).inc()
+    return response
+
+
+def _synthetic_candles(symbol: str, points: int = 60, timeframe: int = 1) -> CandleSeries:
+    now = datetime_to_ns(datetime.utcnow())
+    i = np.arange(points)
     price = 0.5
-    for i in range(points):
-        close = price + 0.001 * (i / points)
-        candles.append(
-            TimeframeCandle(
-                symbol=symbol,
-                timeframe_min=1,
-                open=close - 0.0005,
-                high=close + 0.0005,
-                low=close - 0.001,
-                close=close,
-                volume=1_000_000,
-                vwap=close,
-                timestamp=now - timedelta(minutes=points - i),
-            )
-        )
-    return candles
+    close = price + 0.001 * (i / points)
+    return CandleSeries.from_arrays(
+        symbol,
+        timeframe,
+        timestamp=now - (points - i) * timeframe * 60_000_000_000,
+        open=close - 0.0005,
+        high=close + 0.0005,
+        low=close - 0.001,
+        close=close,
+        volume=np.full(points, 1_000_000.0),
+        vwap=close,
+    )
+
+
+def _compute_signal(symbol: str, timeframe: int) -> bytes:
+    candles = _synthetic_candles(symbol, timeframe=timeframe)
+    features = compute_features(symbol, timeframe, candles)
+    return encode_signal(engine.compute(features))
+
+
+def _compute_multi_timeframe(symbol: str) -> bytes:
+    # two weeks of 1-minute bars so every timeframe up to weekly has at least one bar
+    return orjson.dumps(pipeline.compute(_synthetic_candles(symbol, points=14 * 1_440)).model_dump())
 
 
 @app.get("/health")
@@ -41,11 +130,55 @@ async def health() -> dict[str, str]:
     return {"status": "ok", "timestamp": datetime.utcnow().isoformat()}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
 @app.get("/signals/{symbol}", response_model=CompositeSignal)
-async def signal(symbol: str) -> CompositeSignal:
-    candles = _synthetic_candles(symbol)
-    features = compute_features(symbol, 1, candles)
-    return engine.compute(features)
+async def signal(symbol: str, timeframe: Timeframe = Timeframe.m1) -> Response:
+    minutes = timeframe.value
+    data = await cache.get_or_compute(symbol, minutes, lambda: run_in_threadpool(_compute_signal, symbol, minutes))
+    return Response(content=data, media_type="application/json")
+
+
+@app.get("/signals/{symbol}/timeframes", response_model=MultiTimeframeSignal)
+async def multi_timeframe_signal(symbol: str) -> Response:
+    """Composite signal for every timeframe plus their cross-timeframe confluence."""
+    data = await timeframes_cache.get_or_compute(
+        symbol, 1, lambda: run_in_threadpool(_compute_multi_timeframe, symbol)
+    )
+    return Response(content=data, media_type="application/json")
+
+
+@app.get("/signals/{symbol}/history")
+async def signal_history(
+    request: Request,
+    symbol: str,
+    timeframe: Timeframe = Timeframe.m1,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    cursor: Optional[int] = None,
+    limit: int = Query(1_000, ge=1, le=10_000),
+) -> StreamingResponse:
+    """Stored signals as NDJSON, oldest first.
+
+    When the page is full a final ``{"next_cursor": ...}`` line carries the
+    cursor for the next request.
+    """
+    db_engine = getattr(request.app.state, "db_engine", None) or get_engine()
+
+    async def lines() -> AsyncIterator[bytes]:
+        count = 0
+        last = None
+        async for row in stream_signal_history(db_engine, symbol, timeframe.value, start, end, cursor, limit):
+            count += 1
+            last = row["computed_at"]
+            yield orjson.dumps(row) + b"\n"
+        if count == limit and last is not None:
+            yield orjson.dumps({"next_cursor": history_cursor(last)}) + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 
 __all__ = ["app"]
@@ -1,47 +1,36 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterable, List
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
 from xrp_platform.signals.composite import CompositeEngine
-from xrp_platform.utils.features import compute_features
+from xrp_platform.utils.features import (
+    RollingFeatures,
+    average_true_range,
+    compute_features,
+    compute_features_batch,
+)
+from xrp_platform.data.candles import CandleSeries, as_series, ns_to_datetime
 from xrp_platform.data.schemas import BacktestResult, TimeframeCandle
 
+from .simulator import SimulationConfig
 
-def walk_forward(symbol: str, candles: Iterable[TimeframeCandle], window: int = 60) -> BacktestResult:
-    engine = CompositeEngine()
-    equity = 1_000_000.0
-    equity_curve: List[float] = [equity]
-    trades = 0
-    wins = 0
 
-    candle_list = list(candles)
-    for i in range(window, len(candle_list)):
-        window_candles = candle_list[i - window : i]
-        features = compute_features(symbol, 1, window_candles)
-        signal = engine.compute(features)
-        last_close = window_candles[-1].close
-        if signal.composite > signal.thresholds["bullish"]:
-            pnl = last_close * 0.001
-            equity *= 1 + pnl
-            wins += 1
-            trades += 1
-        elif signal.composite < signal.thresholds["bearish"]:
-            pnl = -last_close * 0.001
-            equity *= 1 + pnl
-            trades += 1
-        equity_curve.append(equity)
+_DEFAULT_SIMULATION = SimulationConfig()
+_START_EQUITY = _DEFAULT_SIMULATION.start_equity
+
 
+def _summarize(equity_curve: np.ndarray, wins: int, trades: int) -> BacktestResult:
     returns = np.diff(equity_curve) / equity_curve[:-1]
     sharpe = float(np.mean(returns) / (np.std(returns) + 1e-6) * np.sqrt(252)) if len(returns) else 0.0
-    max_drawdown = float(np.max(np.maximum.accumulate(equity_curve) - equity_curve)) if equity_curve else 0.0
+    max_drawdown = float(np.max(np.maximum.accumulate(equity_curve) - equity_curve))
     expectancy = float(np.mean(returns)) if len(returns) else 0.0
     win_rate = wins / trades if trades else 0.0
 
     return BacktestResult(
-        equity_curve=equity_curve,
+        equity_curve=equity_curve.tolist(),
         sharpe=sharpe,
         max_drawdown=max_drawdown,
         expectancy=expectancy,
@@ -51,4 +40,171 @@ def walk_forward(symbol: str, candles: Iterable[TimeframeCandle], window: int =
     )
 
 
-__all__ = ["walk_forward"]
+def _book_trades(
+    series: CandleSeries,
+    composites: Sequence[float],
+    window: int,
+    thresholds: Dict[str, float],
+    simulation: Optional[SimulationConfig] = None,
+    atr: Optional[np.ndarray] = None,
+) -> BacktestResult:
+    """Route one composite per bar from ``window - 1`` through the fill simulator."""
+    simulation = simulation or _DEFAULT_SIMULATION
+    simulator = simulation.simulator(series)
+    if atr is None:
+        atr = average_true_range(series, simulation.atr_window)
+    simulator.run_signals(composites, window - 1, thresholds, atr, simulation.expiry_bars)
+    curve = simulator.equity(window, len(series))
+    wins, trades = simulator.closed(window, len(series))
+    return _summarize(np.r_[simulation.start_equity, curve], wins, trades)
+
+
+def downsample_curve(values: Sequence[float], max_points: int) -> Tuple[List[int], List[float]]:
+    """At most ``max_points`` (index, value) pairs that keep the curve's shape.
+
+    Each bucket contributes its minimum and maximum in time order, so drawdowns
+    and peaks survive; the first and last points are always kept.
+    """
+    values = np.asarray(values, dtype=float)
+    if len(values) <= max_points:
+        return list(range(len(values))), values.tolist()
+    buckets = max((max_points - 2) // 2, 1)
+    edges = np.linspace(1, len(values) - 1, buckets + 1).astype(int)
+    picked = [0]
+    for lower, upper in zip(edges[:-1], edges[1:]):
+        if upper <= lower:
+            continue
+        segment = values[lower:upper]
+        picked.extend(sorted({lower + int(np.argmin(segment)), lower + int(np.argmax(segment))}))
+    picked.append(len(values) - 1)
+    return picked, values[picked].tolist()
+
+
+def walk_forward(
+    symbol: str,
+    candles: Iterable[TimeframeCandle],
+    window: int = 60,
+    simulation: Optional[SimulationConfig] = None,
+) -> BacktestResult:
+    """Reference backtest: a fresh feature pass and full signal per bar, routed through the fill simulator."""
+    engine = CompositeEngine()
+    composites: List[float] = []
+
+    candle_list = list(candles)
+    for i in range(window, len(candle_list)):
+        window_candles = candle_list[i - window : i]
+        features = compute_features(symbol, 1, window_candles)
+        signal = engine.compute(features)
+        composites.append(signal.composite)
+
+    series = as_series(candle_list, symbol, 1)
+    return _book_trades(series, composites, window, engine.thresholds(), simulation)
+
+
+def walk_forward_incremental(
+    symbol: str,
+    candles: Union[CandleSeries, Iterable[TimeframeCandle]],
+    window: int = 60,
+    simulation: Optional[SimulationConfig] = None,
+) -> BacktestResult:
+    """Same bars, signals and result as ``walk_forward`` with O(1) feature updates per bar.
+
+    Window statistics live in a ``RollingFeatures`` state instead of being recomputed
+    from a fresh slice, and composites are scored without per-module explanations.
+    """
+    engine = CompositeEngine()
+    state = RollingFeatures(window)
+    composites: List[float] = []
+
+    series = as_series(candles, symbol, 1)
+    bars = zip(series.timestamp.tolist(), series.close.tolist(), series.volume.tolist(), series.vwap.tolist())
+    for timestamp, close, volume, vwap in list(bars)[:-1]:
+        state.push(close, volume, vwap, ns_to_datetime(timestamp, series.tz_aware))
+        if state.count < window:
+            continue
+        composite, _ = engine.composite_score(state.features(symbol, 1))
+        composites.append(composite)
+
+    return _book_trades(series, composites, window, engine.thresholds(), simulation)
+
+
+@dataclass(frozen=True)
+class WalkForwardChunk:
+    """Progress of a chunked walk-forward: equity for the bars booked in this chunk."""
+
+    bars_done: int
+    bars_total: int
+    equity: np.ndarray
+    wins: int
+    trades: int
+
+
+def walk_forward_chunks(
+    symbol: str,
+    candles: Union[CandleSeries, Iterable[TimeframeCandle]],
+    window: int = 60,
+    engine: Optional[CompositeEngine] = None,
+    chunk_size: int = 65_536,
+    simulation: Optional[SimulationConfig] = None,
+) -> Iterator[WalkForwardChunk]:
+    """``walk_forward_batch`` split into ``chunk_size``-bar steps.
+
+    Each chunk runs the batch feature and composite passes over its own slice
+    (plus the ``window - 1`` bars of history it needs), so memory stays bounded
+    and a caller can report progress or stop between chunks. One fill simulator
+    spans the chunks, so positions carry across chunk boundaries.
+    """
+    engine = engine or CompositeEngine()
+    simulation = simulation or _DEFAULT_SIMULATION
+    thresholds = engine.thresholds()
+    series = as_series(candles, symbol, 1)
+    columns = series.columns()
+    simulator = simulation.simulator(series)
+    atr = average_true_range(series, simulation.atr_window)
+    total = max(len(series) - window, 0)
+    for first in range(0, total, chunk_size):
+        last = min(first + chunk_size, total)
+        stop = last + window - 1
+        batch = compute_features_batch({name: column[first:stop] for name, column in columns.items()}, window)
+        composites = engine.compute_batch(batch).composite
+        simulator.run_signals(composites, first + window - 1, thresholds, atr, simulation.expiry_bars)
+        # signals at the closes of bars first+window-1 .. stop-1 are marked at the bar after each
+        curve = simulator.equity(first + window, stop + 1)
+        wins, trades = simulator.closed(first + window, stop + 1)
+        yield WalkForwardChunk(bars_done=last, bars_total=total, equity=curve, wins=wins, trades=trades)
+
+
+def walk_forward_batch(
+    symbol: str,
+    candles: Union[CandleSeries, Iterable[TimeframeCandle]],
+    window: int = 60,
+    engine: Optional[CompositeEngine] = None,
+    on_chunk: Optional[Callable[[WalkForwardChunk], None]] = None,
+    chunk_size: int = 65_536,
+    simulation: Optional[SimulationConfig] = None,
+) -> BacktestResult:
+    """``walk_forward`` over whole arrays: batch feature and composite passes per chunk.
+
+    ``engine`` carries the weights and thresholds under test; the default engine
+    reproduces ``walk_forward``. ``on_chunk`` sees every chunk as it is booked
+    and may raise to abandon the run.
+    """
+    curves: List[np.ndarray] = [np.array([(simulation or _DEFAULT_SIMULATION).start_equity])]
+    wins = trades = 0
+    for chunk in walk_forward_chunks(symbol, candles, window, engine, chunk_size, simulation):
+        if on_chunk is not None:
+            on_chunk(chunk)
+        curves.append(chunk.equity)
+        wins += chunk.wins
+        trades += chunk.trades
+    return _summarize(np.concatenate(curves), wins, trades)
+
+
+__all__ = [
+    "WalkForwardChunk",
+    "downsample_curve",
+    "walk_forward",
+    "walk_forward_batch",
+    "walk_forward_chunks",
+    "walk_forward_incremental",
+]
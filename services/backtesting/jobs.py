@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from xrp_platform.data.candles import CandleSeries
+
+from .engine import WalkForwardChunk, downsample_curve, walk_forward_batch
+
+logger = logging.getLogger("backtesting.jobs")
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+CANCELLED = "cancelled"
+FAILED = "failed"
+FINISHED = (DONE, CANCELLED, FAILED)
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobsFull(Exception):
+    """Every slot holds a job that has not finished; submit again once one does."""
+
+
+class BacktestJob:
+    """One submitted backtest and the ordered log of events it has produced.
+
+    The run happens on an executor thread; events are handed back to the event
+    loop and appended to ``events``, so any number of subscribers can replay the
+    log from the start and then follow it live.
+    """
+
+    def __init__(self, symbol: str, series: CandleSeries, window: int, max_points: int, chunk_size: int) -> None:
+        self.id = uuid.uuid4().hex
+        self.symbol = symbol
+        self.series: Optional[CandleSeries] = series
+        self.window = window
+        self.max_points = max_points
+        self.chunk_size = chunk_size
+        self.status = PENDING
+        self.bars_done = 0
+        self.bars_total = max(len(series) - window, 0)
+        self.events: List[Dict[str, Any]] = []
+        self._cancel = threading.Event()
+        self._changed = asyncio.Event()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "symbol": self.symbol,
+            "status": self.status,
+            "bars_done": self.bars_done,
+            "bars_total": self.bars_total,
+        }
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def _emit(self, event: Dict[str, Any]) -> None:
+        self.events.append(event)
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def _on_chunk(self, loop: asyncio.AbstractEventLoop, chunk: WalkForwardChunk) -> None:
+        if self._cancel.is_set():
+            raise JobCancelled
+        # the chunk's curve covers bars (bars_done - len(equity), bars_done]
+        offset = chunk.bars_done - len(chunk.equity) + 1
+        points = max(self.max_points * len(chunk.equity) // max(self.bars_total, 1), 2)
+        indices, values = downsample_curve(chunk.equity, points)
+        event = {
+            "event": "progress",
+            "bars_done": chunk.bars_done,
+            "bars_total": chunk.bars_total,
+            "equity": [[offset + index, value] for index, value in zip(indices, values)],
+        }
+        loop.call_soon_threadsafe(self._progress, event)
+
+    def _progress(self, event: Dict[str, Any]) -> None:
+        self.bars_done = event["bars_done"]
+        self._emit(event)
+
+    def _finish(self, status: str, event: Dict[str, Any]) -> None:
+        self.status = status
+        self.series = None
+        self._emit({"event": status, **event})
+
+    def run(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Executor-thread body: run the backtest, posting events back to ``loop``."""
+        if self._cancel.is_set():
+            loop.call_soon_threadsafe(self._finish, CANCELLED, {})
+            return
+        loop.call_soon_threadsafe(setattr, self, "status", RUNNING)
+        try:
+            result = walk_forward_batch(
+                self.symbol,
+                self.series,
+                self.window,
+                on_chunk=lambda chunk: self._on_chunk(loop, chunk),
+                chunk_size=self.chunk_size,
+            )
+        except JobCancelled:
+            loop.call_soon_threadsafe(self._finish, CANCELLED, {})
+            return
+        except Exception as exc:
+            logger.exception("backtest job %s failed", self.id)
+            loop.call_soon_threadsafe(self._finish, FAILED, {"error": str(exc)})
+            return
+        _, curve = downsample_curve(result.equity_curve, self.max_points)
+        result = result.model_copy(update={"equity_curve": curve})
+        loop.call_soon_threadsafe(self._finish, DONE, {"result": result.model_dump()})
+
+    async def follow(self) -> AsyncIterator[Dict[str, Any]]:
+        """Every event from the first one, then new ones until the job finishes."""
+        index = 0
+        while True:
+            changed = self._changed
+            while index < len(self.events):
+                yield self.events[index]
+                index += 1
+            if self.status in FINISHED:
+                return
+            await changed.wait()
+
+
+class JobManager:
+    """Submits backtests to a small thread pool and keeps the most recent jobs.
+
+    At most ``max_jobs`` are kept: finished jobs are evicted oldest first, and
+    once every slot holds a pending or running job ``submit`` raises
+    ``JobsFull`` rather than letting the map grow. The walk-forward passes are
+    numpy-bound and release the GIL for most of their work, so threads keep
+    the event loop free without copying candle archives into worker processes.
+    """
+
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        max_jobs: int = 100,
+        max_points: int = 500,
+        chunk_size: int = 65_536,
+    ) -> None:
+        self.executor = executor or ThreadPoolExecutor(max_workers=2, thread_name_prefix="backtest")
+        self.max_jobs = max_jobs
+        self.max_points = max_points
+        self.chunk_size = chunk_size
+        self._jobs: "OrderedDict[str, BacktestJob]" = OrderedDict()
+
+    def submit(self, symbol: str, series: CandleSeries, window: int = 60) -> BacktestJob:
+        self._evict()
+        if len(self._jobs) >= self.max_jobs:
+            raise JobsFull(f"{len(self._jobs)} backtest jobs are still pending or running")
+        job = BacktestJob(symbol, series, window, self.max_points, self.chunk_size)
+        self._jobs[job.id] = job
+        loop = asyncio.get_running_loop()
+        loop.run_in_executor(self.executor, job.run, loop)
+        return job
+
+    def get(self, job_id: str) -> Optional[BacktestJob]:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[BacktestJob]:
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job.cancel()
+        return job
+
+    def _evict(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in FINISHED]
+        while len(self._jobs) >= self.max_jobs and finished:
+            del self._jobs[finished.pop(0)]
+
+
+__all__ = ["BacktestJob", "JobManager", "JobsFull", "PENDING", "RUNNING", "DONE", "CANCELLED", "FAILED"]
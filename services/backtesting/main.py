@@ -1,39 +1,62 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
-from typing import List
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Optional
 
-from fastapi import FastAPI
-from fastapi.responses import ORJSONResponse
+import numpy as np
+import orjson
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import ValidationError
 
-from xrp_platform.data.schemas import BacktestResult, TimeframeCandle
-from xrp_platform.utils.features import compute_features
-from .engine import walk_forward
+from xrp_platform.config import get_settings
+from xrp_platform.data.archive import CandleArchive
+from xrp_platform.data.candles import CandleSeries, datetime_to_ns
+from xrp_platform.data.schemas import BacktestResult, SweepRequest, SweepRun
+from .engine import downsample_curve, walk_forward_batch
+from .jobs import BacktestJob, JobManager, JobsFull
+from .sweep import run_sweep, sweep_params
 
 app = FastAPI(default_response_class=ORJSONResponse)
+jobs = JobManager()
 
 
-def _synthetic_series(symbol: str, points: int = 720) -> List[TimeframeCandle]:
-    now = datetime.utcnow()
-    candles: List[TimeframeCandle] = []
+def _synthetic_series(symbol: str, points: int = 720) -> CandleSeries:
+    now = datetime_to_ns(datetime.utcnow())
+    i = np.arange(points)
     price = 0.5
-    for i in range(points):
-        drift = 0.001 * ((i // 60) % 5)
-        close = price + drift + 0.0005 * (i % 10)
-        candles.append(
-            TimeframeCandle(
-                symbol=symbol,
-                timeframe_min=1,
-                open=close - 0.0005,
-                high=close + 0.0008,
-                low=close - 0.0009,
-                close=close,
-                volume=900_000 + (i % 30) * 1000,
-                vwap=close,
-                timestamp=now - timedelta(minutes=points - i),
-            )
-        )
-    return candles
+    drift = 0.001 * ((i // 60) % 5)
+    close = price + drift + 0.0005 * (i % 10)
+    return CandleSeries.from_arrays(
+        symbol,
+        1,
+        timestamp=now - (points - i) * 60_000_000_000,
+        open=close - 0.0005,
+        high=close + 0.0008,
+        low=close - 0.0009,
+        close=close,
+        volume=900_000 + (i % 30) * 1000,
+        vwap=close,
+    )
+
+
+@lru_cache(maxsize=1)
+def _archive() -> Optional[CandleArchive]:
+    try:
+        directory = get_settings().candle_archive_dir
+    except ValidationError:
+        return None
+    return CandleArchive(directory) if directory else None
+
+
+def _series(symbol: str, start: Optional[datetime] = None, end: Optional[datetime] = None) -> CandleSeries:
+    """Archived 1-minute bars for ``symbol`` when available, else the synthetic series."""
+    archive = _archive()
+    if archive is not None and archive.exists(symbol, 1):
+        return archive.open(symbol, 1, start, end)
+    return _synthetic_series(symbol)
 
 
 @app.get("/health")
@@ -42,11 +65,74 @@ async def health() -> dict[str, str]:
 
 
 @app.get("/backtest/{symbol}", response_model=BacktestResult)
-async def run_backtest(symbol: str) -> BacktestResult:
-    series = _synthetic_series(symbol)
-    features = compute_features(symbol, 1, series)
-    _ = features  # features consumed implicitly inside walk_forward per window
-    return walk_forward(symbol, series)
+async def run_backtest(
+    symbol: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    max_points: Optional[int] = Query(None, ge=2),
+) -> BacktestResult:
+    series = _series(symbol, start, end)
+    result = await run_in_threadpool(walk_forward_batch, symbol, series)
+    if max_points is not None:
+        _, curve = downsample_curve(result.equity_curve, max_points)
+        result = result.model_copy(update={"equity_curve": curve})
+    return result
+
+
+def _job(job_id: str) -> BacktestJob:
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="unknown backtest job")
+    return job
+
+
+@app.post("/backtest/{symbol}/jobs", status_code=202)
+async def submit_backtest(
+    symbol: str, start: Optional[datetime] = None, end: Optional[datetime] = None, window: int = Query(60, ge=1)
+) -> Dict[str, Any]:
+    """Queue a backtest; follow it at ``/backtest/jobs/{job_id}/events``."""
+    try:
+        return jobs.submit(symbol, _series(symbol, start, end), window).snapshot()
+    except JobsFull as exc:
+        raise HTTPException(status_code=429, detail=str(exc)) from exc
+
+
+@app.get("/backtest/jobs/{job_id}")
+async def backtest_job(job_id: str) -> Dict[str, Any]:
+    return _job(job_id).snapshot()
+
+
+@app.get("/backtest/jobs/{job_id}/events")
+async def backtest_job_events(job_id: str) -> StreamingResponse:
+    """NDJSON progress events with downsampled partial equity, ending with the outcome."""
+    job = _job(job_id)
+
+    async def lines() -> AsyncIterator[bytes]:
+        async for event in job.follow():
+            yield orjson.dumps(event) + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@app.delete("/backtest/jobs/{job_id}", status_code=202)
+async def cancel_backtest(job_id: str) -> Dict[str, Any]:
+    job = jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="unknown backtest job")
+    return job.snapshot()
+
+
+@app.post("/backtest/{symbol}/sweep", response_model=List[SweepRun])
+async def run_backtest_sweep(
+    symbol: str, request: SweepRequest, start: Optional[datetime] = None, end: Optional[datetime] = None
+) -> List[SweepRun]:
+    series = _series(symbol, start, end)
+    try:
+        return await run_in_threadpool(
+            run_sweep, series, sweep_params(request), rank_by=request.rank_by, top=request.top
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
 
 
 __all__ = ["app"]
@@ -0,0 +1,331 @@
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from xrp_platform.data.candles import CandleSeries, datetime_to_ns
+from xrp_platform.data.schemas import ExecutionCommand
+from xrp_platform.execution.engine import ExecutionEngine, RiskEngine, RiskLimits, direction
+from xrp_platform.execution.portfolio import PortfolioRisk
+from xrp_platform.utils.features import average_true_range
+
+# exit reasons recorded per trade
+STOP, TAKE_PROFIT, END = 1, 2, 3
+
+_TRADE_DTYPE = np.dtype(
+    [
+        ("signal_bar", np.int64),
+        ("fill_bar", np.int64),
+        ("exit_bar", np.int64),
+        ("side", np.int8),
+        ("reason", np.int8),
+        ("size", np.float64),
+        ("entry", np.float64),
+        ("exit", np.float64),
+        ("fees", np.float64),  # entry fee is charged at the fill, the rest at the exit
+        ("entry_fee", np.float64),
+    ]
+)
+
+
+@dataclass(frozen=True)
+class FillModel:
+    """Costs of trading: a fee on every fill's notional and slippage on market fills.
+
+    Entries and take-profits are limit orders and fill at their price (or the
+    open, when the bar gaps through it); stops are market orders and fill at the
+    stop (or the gapped open) moved against the position by ``slippage_bps``.
+    """
+
+    fee_bps: float = 10.0
+    slippage_bps: float = 2.0
+
+
+@dataclass(frozen=True)
+class SimulationConfig:
+    """Everything a backtest needs to turn signals into fills besides the bars."""
+
+    limits: RiskLimits = RiskLimits()
+    fill_model: FillModel = FillModel()
+    max_positions: int = 1
+    expiry_bars: int = 1  # ``route`` expires a command one timeframe after its signal
+    atr_window: int = 14
+    start_equity: float = 1_000_000.0
+
+    def simulator(self, series: CandleSeries) -> "FillSimulator":
+        return FillSimulator(
+            series,
+            RiskEngine(limits=self.limits),
+            self.fill_model,
+            self.max_positions,
+            self.start_equity,
+            PortfolioRisk(self.start_equity, self.limits),
+        )
+
+
+def _first(mask: np.ndarray) -> int:
+    hits = np.flatnonzero(mask)
+    return int(hits[0]) if hits.size else -1
+
+
+class FillSimulator:
+    """Replays execution commands against a bar stream, bar by bar in event order.
+
+    A command is submitted at the close of its signal bar. Its entry is a limit
+    order that can fill in any later bar opening at or before its expiry; once
+    filled, the position exits at the first bar that reaches its stop or
+    take-profit (the stop is assumed first when one bar reaches both, and only
+    the stop can trigger in the fill bar itself), or at the last close.
+    Because the whole bar history is known, a command's fill and exit are found
+    with array scans when it is submitted, and the trade is recorded in a
+    growable structured array. Slots of ``max_positions`` concurrent orders and
+    positions hold the bar each frees up at; a command arriving when every slot
+    is busy is dropped. ``equity`` then marks all trades to market over any bar
+    range with cumulative sums instead of stepping through positions.
+
+    With a ``portfolio``, fills and exits are also fed to it in bar order as
+    decisions advance past them, and each signal is marked and scaled by it
+    before it is submitted, exactly as live routing consults it.
+    """
+
+    def __init__(
+        self,
+        series: CandleSeries,
+        risk: Optional[RiskEngine] = None,
+        fill_model: Optional[FillModel] = None,
+        max_positions: int = 1,
+        start_equity: float = 1_000_000.0,
+        portfolio: Optional[PortfolioRisk] = None,
+    ) -> None:
+        self.series = series
+        self.portfolio = portfolio
+        self.risk = risk or RiskEngine(limits=RiskLimits())
+        self.fill_model = fill_model or FillModel()
+        self.start_equity = start_equity
+        self._open, self._high = series.open, series.high
+        self._low, self._close = series.low, series.close
+        self._fee = self.fill_model.fee_bps / 10_000
+        self._slippage = self.fill_model.slippage_bps / 10_000
+        self._busy_until = np.full(max_positions, -1, dtype=np.int64)
+        self._trades = np.empty(64, dtype=_TRADE_DTYPE)
+        self._count = 0
+        self._pending: List[Tuple[int, float]] = []  # (exit bar, net pnl) heap of unrealized trades
+        self._realized = start_equity
+        self._events: List[Tuple[int, int, int]] = []  # (bar, 0 fill / 1 exit, row) not yet seen by the portfolio
+        self.submitted = 0
+        self.expired = 0
+        self.rejected = 0
+
+    @property
+    def trades(self) -> np.ndarray:
+        return self._trades[: self._count]
+
+    def realized_equity(self, bar: int) -> float:
+        """Starting equity plus the net result of every trade closed by ``bar``."""
+        pending = self._pending
+        while pending and pending[0][0] <= bar:
+            self._realized += heapq.heappop(pending)[1]
+        return self._realized
+
+    def advance(self, bar: int) -> None:
+        """Feed the portfolio every fill and exit up to ``bar`` and mark it at that close."""
+        portfolio = self.portfolio
+        if portfolio is None:
+            return
+        events, symbol = self._events, self.series.symbol
+        while events and events[0][0] <= bar:
+            _, kind, row = heapq.heappop(events)
+            trade = self._trades[row]
+            side, size = int(trade["side"]), float(trade["size"])
+            if kind == 0:
+                portfolio.on_fill(symbol, side, size, float(trade["entry"]), float(trade["entry_fee"]))
+            else:
+                exit_fee = float(trade["fees"] - trade["entry_fee"])
+                portfolio.on_fill(symbol, -side, size, float(trade["exit"]), exit_fee)
+        portfolio.mark(symbol, float(self._close[bar]))
+
+    def _slot(self, bar: int) -> int:
+        free = np.flatnonzero(self._busy_until <= bar)
+        return int(free[0]) if free.size else -1
+
+    def _scan_exit(self, side: int, fill_bar: int, stop: float, take_profit: float) -> Tuple[int, int]:
+        last = len(self._close) - 1
+        low, high = self._low, self._high
+        stop_hit = low[fill_bar] <= stop if side > 0 else high[fill_bar] >= stop
+        if stop_hit:
+            return fill_bar, STOP
+        start, step = fill_bar + 1, 64
+        while start <= last:
+            end = min(start + step, last + 1)
+            if side > 0:
+                stops, targets = low[start:end] <= stop, high[start:end] >= take_profit
+            else:
+                stops, targets = high[start:end] >= stop, low[start:end] <= take_profit
+            hit = _first(stops | targets)
+            if hit >= 0:
+                return start + hit, STOP if stops[hit] else TAKE_PROFIT
+            start, step = end, step * 4
+        return last, END
+
+    def _exit_price(
+        self, side: int, bar: int, reason: int, fill_bar: int, fill: float, stop: float, take_profit: float
+    ) -> float:
+        if reason == END:
+            return float(self._close[bar])
+        opened = float(self._open[bar])
+        if reason == STOP:
+            # a bar that opens through the stop fills at the open; in the fill bar the
+            # open is already the fill, which a gap can have put beyond the stop
+            reference = fill if bar == fill_bar else opened
+            price = min(reference, stop) if side > 0 else max(reference, stop)
+            return price * (1 - side * self._slippage)
+        return max(opened, take_profit) if side > 0 else min(opened, take_profit)
+
+    def submit_order(
+        self, bar: int, side: int, size: float, entry: float, stop: float, take_profit: float, last_bar: int
+    ) -> Optional[int]:
+        """Submit at the close of ``bar``; returns the trade's row, or None if dropped or unfilled."""
+        self.submitted += 1
+        slot = self._slot(bar)
+        if slot < 0 or size <= 0:
+            self.rejected += 1
+            return None
+        last_bar = min(last_bar, len(self._close) - 1)
+        first = bar + 1
+        if first > last_bar:
+            self.expired += 1
+            return None
+        if side > 0:
+            touched = _first(self._low[first : last_bar + 1] <= entry)
+        else:
+            touched = _first(self._high[first : last_bar + 1] >= entry)
+        if touched < 0:
+            self.expired += 1
+            self._busy_until[slot] = last_bar
+            return None
+        fill_bar = first + touched
+        opened = float(self._open[fill_bar])
+        fill = min(opened, entry) if side > 0 else max(opened, entry)
+        exit_bar, reason = self._scan_exit(side, fill_bar, stop, take_profit)
+        exit_price = self._exit_price(side, exit_bar, reason, fill_bar, fill, stop, take_profit)
+        entry_fee = fill * size * self._fee
+        fees = entry_fee + exit_price * size * self._fee
+        pnl = side * size * (exit_price - fill) - fees
+
+        if self._count == len(self._trades):
+            self._trades = np.resize(self._trades, 2 * len(self._trades))
+        row = self._count
+        self._trades[row] = (bar, fill_bar, exit_bar, side, reason, size, fill, exit_price, fees, entry_fee)
+        self._count += 1
+        self._busy_until[slot] = exit_bar
+        heapq.heappush(self._pending, (exit_bar, pnl))
+        if self.portfolio is not None:
+            heapq.heappush(self._events, (fill_bar, 0, row))
+            heapq.heappush(self._events, (exit_bar, 1, row))
+        return row
+
+    def submit(self, command: ExecutionCommand, bar: int) -> Optional[int]:
+        """Replay one routed command issued at the close of ``bar``."""
+        expires_ns = datetime_to_ns(command.expires_at)
+        last_bar = int(np.searchsorted(self.series.timestamp, expires_ns, side="right")) - 1
+        return self.submit_order(
+            bar, direction(command.side), command.size, command.entry, command.stop, command.take_profit, last_bar
+        )
+
+    def run_signals(
+        self,
+        composites: np.ndarray,
+        first_bar: int,
+        thresholds: Mapping[str, float],
+        atr: Optional[np.ndarray] = None,
+        expiry_bars: int = 1,
+    ) -> None:
+        """Route ``composites`` (one per bar from ``first_bar``) the way ``ExecutionEngine.route`` does.
+
+        Sides and ATR stops are computed for every signal at once; each order is
+        then sized from the equity realized by its bar, scaled by the portfolio
+        (if any) and replayed in order.
+        """
+        composites = np.asarray(composites, dtype=float)
+        sides = ExecutionEngine.sides(composites, thresholds)
+        bars = np.flatnonzero(sides) + first_bar
+        if not len(bars):
+            return
+        if atr is None:
+            atr = average_true_range(self.series)
+        entries = self._close[bars]
+        order_sides = sides[bars - first_bar].astype(np.int64)
+        levels = self.risk.stops(entries, atr[bars], order_sides)
+        for bar, side, entry, stop, take_profit in zip(
+            bars.tolist(), order_sides.tolist(), entries.tolist(), levels["stop"].tolist(), levels["take_profit"].tolist()
+        ):
+            if self._slot(bar) < 0:
+                self.submitted += 1
+                self.rejected += 1
+                continue
+            size = self.risk.size_position(self.realized_equity(bar), entry)
+            if self.portfolio is not None:
+                self.advance(bar)
+                size *= self.portfolio.scale(self.series.symbol, side, size * entry)
+            self.submit_order(bar, side, size, entry, stop, take_profit, bar + expiry_bars)
+
+    def equity(self, start: int, stop: int) -> np.ndarray:
+        """Mark-to-market equity at the close of each bar in ``[start, stop)``."""
+        length = max(stop - start, 0)
+        trades = self.trades
+        fill, exit_ = trades["fill_bar"], trades["exit_bar"]
+        signed = trades["side"] * trades["size"]
+        realized = signed * (trades["exit"] - trades["entry"]) - (trades["fees"] - trades["entry_fee"])
+
+        base = self.start_equity - trades["entry_fee"][fill < start].sum() + realized[exit_ < start].sum()
+        cash = np.zeros(length + 1)
+        quantity = np.zeros(length + 1)
+        cost = np.zeros(length + 1)
+
+        opened = (fill < stop) & (exit_ >= start)
+        first = np.maximum(fill[opened] - start, 0)
+        np.add.at(quantity, first, signed[opened])
+        np.add.at(cost, first, (signed * trades["entry"])[opened])
+        entering = (fill >= start) & (fill < stop)
+        np.add.at(cash, fill[entering] - start, -trades["entry_fee"][entering])
+        closing = (exit_ >= start) & (exit_ < stop)
+        np.add.at(cash, exit_[closing] - start, realized[closing])
+        np.add.at(quantity, exit_[closing] - start, -signed[closing])
+        np.add.at(cost, exit_[closing] - start, -(signed * trades["entry"])[closing])
+
+        closes = self._close[start:stop]
+        held = np.cumsum(quantity[:length])
+        return base + np.cumsum(cash[:length]) + held * closes - np.cumsum(cost[:length])
+
+    def closed(self, start: int, stop: int) -> Tuple[int, int]:
+        """Wins and trades among the trades that exit in ``[start, stop)``."""
+        trades = self.trades
+        closing = (trades["exit_bar"] >= start) & (trades["exit_bar"] < stop)
+        pnl = trades["side"] * trades["size"] * (trades["exit"] - trades["entry"]) - trades["fees"]
+        return int((pnl[closing] > 0).sum()), int(closing.sum())
+
+    def stats(self) -> Dict[str, float]:
+        trades = self.trades
+        return {
+            "submitted": self.submitted,
+            "filled": len(trades),
+            "expired": self.expired,
+            "rejected": self.rejected,
+            "fees": float(trades["fees"].sum()),
+            "stops": int((trades["reason"] == STOP).sum()),
+            "take_profits": int((trades["reason"] == TAKE_PROFIT).sum()),
+            "halted": float(self.portfolio is not None and self.portfolio.halted),
+        }
+
+
+__all__ = [
+    "END",
+    "FillModel",
+    "FillSimulator",
+    "STOP",
+    "SimulationConfig",
+    "TAKE_PROFIT",
+]
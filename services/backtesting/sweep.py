@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from xrp_platform.data.candles import PRICE_COLUMNS, CandleSeries
+from xrp_platform.data.schemas import BacktestResult, SweepParams, SweepRequest, SweepRun
+from xrp_platform.signals.composite import CompositeEngine
+from xrp_platform.utils.features import average_true_range, compute_features_batch
+
+from .engine import _DEFAULT_SIMULATION, _book_trades
+
+_COLUMNS = ("timestamp",) + PRICE_COLUMNS
+# metric -> whether a larger value ranks higher
+RANK_METRICS: Dict[str, bool] = {"sharpe": True, "expectancy": True, "win_rate": True, "max_drawdown": False}
+
+
+@dataclass(frozen=True)
+class SharedSeries:
+    """Picklable handle to a ``CandleSeries`` copied once into shared memory.
+
+    Workers attach by name and wrap the block in zero-copy column views, so a
+    sweep ships the candle history to each process once instead of pickling it
+    with every task.
+    """
+
+    name: str
+    symbol: str
+    timeframe_min: int
+    length: int
+    tz_aware: bool = False
+
+    @classmethod
+    def create(cls, series: CandleSeries) -> Tuple[SharedMemory, "SharedSeries"]:
+        shm = SharedMemory(create=True, size=max(len(series), 1) * 8 * len(_COLUMNS))
+        handle = cls(shm.name, series.symbol, series.timeframe_min, len(series), series.tz_aware)
+        columns = series.columns()
+        for name, view in zip(_COLUMNS, handle._views(shm)):
+            view[:] = columns[name]
+        return shm, handle
+
+    def _views(self, shm: SharedMemory) -> List[np.ndarray]:
+        block = np.ndarray((len(_COLUMNS), self.length), dtype=np.float64, buffer=shm.buf)
+        return [block[0].view(np.int64), *block[1:]]
+
+    def attach(self) -> Tuple[SharedMemory, CandleSeries]:
+        shm = SharedMemory(name=self.name)
+        timestamp, *prices = self._views(shm)
+        series = CandleSeries.from_arrays(
+            self.symbol, self.timeframe_min, timestamp, *prices, tz_aware=self.tz_aware
+        )
+        return shm, series
+
+
+class SweepEvaluator:
+    """Runs ``walk_forward_batch`` for many parameter sets over one series.
+
+    Features, module scores and regimes depend only on the window, so they are
+    computed once per window (the last ``max_windows`` are kept) and each
+    parameter set only re-blends the scores and replays the orders through the
+    fill simulator (the ATR its stops use is computed once per series).
+    """
+
+    def __init__(self, series: CandleSeries, max_windows: int = 4) -> None:
+        self.series = series
+        self.max_windows = max_windows
+        self.atr = average_true_range(series, _DEFAULT_SIMULATION.atr_window)
+        self._scored: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def scored(self, window: int) -> Tuple[np.ndarray, np.ndarray]:
+        cached = self._scored.get(window)
+        if cached is None:
+            engine = CompositeEngine()
+            batch = compute_features_batch(self.series.columns(), window)
+            cached = (engine.score_batch(batch)[:-1], engine.classify_regime_batch(batch)[:-1])
+            if len(self._scored) >= self.max_windows:
+                self._scored.pop(next(iter(self._scored)))
+            self._scored[window] = cached
+        return cached
+
+    def evaluate(self, params: SweepParams) -> BacktestResult:
+        scores, regimes = self.scored(params.window)
+        engine = CompositeEngine(params.base_weights, params.regime_multipliers, params.thresholds)
+        composites = engine.blend(scores, regimes)
+        return _book_trades(self.series, composites, params.window, engine.thresholds(), atr=self.atr)
+
+
+_shared: Optional[SharedMemory] = None
+_evaluator: Optional[SweepEvaluator] = None
+
+
+def _attach(handle: SharedSeries) -> None:
+    global _shared, _evaluator
+    _shared, series = handle.attach()
+    _evaluator = SweepEvaluator(series)
+
+
+def _evaluate_shared(params: SweepParams) -> BacktestResult:
+    assert _evaluator is not None, "worker was not initialised with a shared series"
+    return _evaluator.evaluate(params)
+
+
+def sweep_params(request: SweepRequest) -> List[SweepParams]:
+    """The full grid of ``request``, or ``samples`` distinct points drawn from it.
+
+    Sampling draws grid indices and decodes them, so a huge grid is never
+    materialized just to pick a few points from it.
+    """
+    axes = (request.windows, request.thresholds, request.base_weights, request.regime_multipliers)
+    total = math.prod(len(axis) for axis in axes)
+    if request.samples is not None and request.samples < total:
+        indices = sorted(random.Random(request.seed).sample(range(total), request.samples))
+    else:
+        indices = list(range(total))
+
+    params: List[SweepParams] = []
+    for index in indices:
+        picked = []
+        for axis in reversed(axes):
+            index, position = divmod(index, len(axis))
+            picked.append(axis[position])
+        window, thresholds, base_weights, regime_multipliers = reversed(picked)
+        params.append(
+            SweepParams(
+                window=window, thresholds=thresholds, base_weights=base_weights, regime_multipliers=regime_multipliers
+            )
+        )
+    return params
+
+
+def rank_runs(
+    params: Sequence[SweepParams], results: Sequence[BacktestResult], rank_by: str = "sharpe"
+) -> List[SweepRun]:
+    if rank_by not in RANK_METRICS:
+        raise ValueError(f"rank_by must be one of {sorted(RANK_METRICS)}")
+    sign = -1.0 if RANK_METRICS[rank_by] else 1.0
+    order = sorted(range(len(results)), key=lambda i: sign * getattr(results[i], rank_by))
+    return [SweepRun(rank=rank, params=params[i], result=results[i]) for rank, i in enumerate(order, start=1)]
+
+
+def run_sweep(
+    series: CandleSeries,
+    params: Sequence[SweepParams],
+    max_workers: Optional[int] = None,
+    rank_by: str = "sharpe",
+    top: Optional[int] = None,
+) -> List[SweepRun]:
+    """Backtest every parameter set on ``series`` across a process pool and rank the results.
+
+    Runs are ordered by window before being chunked out so each worker mostly
+    reuses the scores it already computed for that window.
+    """
+    if rank_by not in RANK_METRICS:
+        raise ValueError(f"rank_by must be one of {sorted(RANK_METRICS)}")
+    if any(p.window < 1 or p.window >= len(series) for p in params):
+        raise ValueError("every window must be positive and shorter than the series")
+    ordered = sorted(params, key=lambda p: p.window)
+    workers = min(max_workers or os.cpu_count() or 1, len(ordered))
+
+    if workers <= 1:
+        evaluator = SweepEvaluator(series)
+        results = [evaluator.evaluate(p) for p in ordered]
+    else:
+        shm, handle = SharedSeries.create(series)
+        try:
+            with ProcessPoolExecutor(workers, initializer=_attach, initargs=(handle,)) as pool:
+                chunksize = max(1, len(ordered) // (workers * 4))
+                results = list(pool.map(_evaluate_shared, ordered, chunksize=chunksize))
+        finally:
+            shm.close()
+            shm.unlink()
+
+    ranked = rank_runs(ordered, results, rank_by)
+    return ranked[:top] if top is not None else ranked
+
+
+__all__ = ["RANK_METRICS", "SharedSeries", "SweepEvaluator", "rank_runs", "run_sweep", "sweep_params"]
@@ -1,65 +1,431 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime, timedelta
-from typing import List
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from time import perf_counter_ns, time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, TypeVar
 
 import numpy as np
+from sqlalchemy.ext.asyncio import AsyncEngine
 
-from xrp_platform.config import get_settings
-from xrp_platform.data.schemas import CompositeSignal, TimeframeCandle
+from xrp_platform.config import Settings, get_settings
+from xrp_platform.connectors.binance import BinanceConnector, BinanceMarketStream
+from xrp_platform.connectors.http import HttpPool, RateLimiter, RestClient, split_endpoint
+from xrp_platform.connectors.news import NewsApiConnector, NewsFeed
+from xrp_platform.connectors.replay import ReplayConnector
+from xrp_platform.connectors.websocket import Connect, websocket_connect
+from xrp_platform.connectors.xrpl import XrplConnector, XrplLedgerFeed
+from xrp_platform.data.candles import CandleSeries, datetime_to_ns
+from xrp_platform.data.schemas import CompositeSignal
+from xrp_platform.data.sink import ExecutionSink, SignalSink
+from xrp_platform.data.storage import get_engine, maintain_signal_partitions
+from xrp_platform.execution.engine import ExecutionEngine, RiskLimits
+from xrp_platform.execution.pipeline import ExecutionPipeline, PaperBroker
+from xrp_platform.execution.portfolio import PortfolioRisk
+from xrp_platform.features.cross_asset import CrossAssetFeatures
+from xrp_platform.features.news import NewsSentiment
+from xrp_platform.features.onchain import OnChainIndexer
+from xrp_platform.features.order_book import OrderBook
+from xrp_platform.features.timeframe import MINUTE_NS
+from xrp_platform.features.trade_tape import SECOND_NS, TradeTape
+from xrp_platform.messaging.streams import SignalPublisher, create_redis
 from xrp_platform.signals.composite import CompositeEngine
-from xrp_platform.utils.features import compute_features
+from xrp_platform.signals.multi_timeframe import MultiTimeframePipeline
+from xrp_platform.utils.features import average_true_range, compute_features
+from xrp_platform.utils.metrics import REGISTRY, Registry, serve_metrics
+
+from .scheduler import SignalScheduler
+
+logger = logging.getLogger("signal_worker")
+
+T = TypeVar("T")
+
+_engine: Optional[CompositeEngine] = None
+
+# bars each signal is computed over
+HISTORY_BARS = 120
+# 1m bars fetched once per symbol and minute (one Binance request); every timeframe
+# they cover with HISTORY_BARS bars is resampled from them instead of fetched
+BASE_BARS = 1_000
+# cross-asset windows sized to the HISTORY_BARS each job syncs (one return fewer
+# than bars), so the long window and the decoupling it feeds are full from the
+# first signal rather than after hundreds of bars the worker never fetched
+CROSS_ASSET_WINDOWS = (20, 60, HISTORY_BARS - 1)
+
+# where a job's time goes between the bar close and the signal leaving the worker
+STAGES = ("fetch", "cross_asset", "executor_wait", "features", "composite", "publish", "route", "total")
+_stages = {
+    stage: REGISTRY.histogram("xrp_worker_stage_seconds", "Signal job time per stage", stage=stage)
+    for stage in STAGES
+}
+_computed = REGISTRY.counter("xrp_signals_computed", "Signals computed by the worker")
+# ``@timed`` fills these in whichever process runs the computation; with a process
+# pool that is a child whose registry is never scraped, so the worker merges the
+# timings the children send back into its own copies
+_features_seconds = REGISTRY.histogram("xrp_compute_features_seconds")
+_composite_seconds = REGISTRY.histogram("xrp_composite_compute_seconds")
+
+
+def compute_signal_timed(
+    symbol: str,
+    timeframe: int,
+    candles: CandleSeries,
+    order_book: Optional[Mapping[str, float]] = None,
+    volume: Optional[Mapping[str, float]] = None,
+    onchain: Optional[Mapping[str, float]] = None,
+    news: Optional[Mapping[str, float]] = None,
+    meta: Optional[Mapping[str, float]] = None,
+) -> Tuple[CompositeSignal, int, int]:
+    """``compute_signal`` plus the nanoseconds spent on features and on the composite.
+
+    The timings travel back with the result because histograms recorded in a
+    pool process would never reach the worker's registry.
+    """
+    global _engine
+    if _engine is None:
+        _engine = CompositeEngine()
+    started = perf_counter_ns()
+    features = compute_features(
+        symbol, timeframe, candles, order_book=order_book, volume=volume, onchain=onchain, news=news, meta=meta
+    )
+    featured = perf_counter_ns()
+    signal = _engine.compute(features)
+    return signal, featured - started, perf_counter_ns() - featured
+
+
+def compute_signal(
+    symbol: str,
+    timeframe: int,
+    candles: CandleSeries,
+    order_book: Optional[Mapping[str, float]] = None,
+    volume: Optional[Mapping[str, float]] = None,
+    onchain: Optional[Mapping[str, float]] = None,
+    news: Optional[Mapping[str, float]] = None,
+    meta: Optional[Mapping[str, float]] = None,
+) -> CompositeSignal:
+    """CPU-bound half of a job; module level so a process pool can pickle it."""
+    return compute_signal_timed(symbol, timeframe, candles, order_book, volume, onchain, news, meta)[0]
+
+
+async def _once_per_bar(
+    entries: Dict[Any, Tuple[int, "asyncio.Future[T]"]],
+    key: Any,
+    timeframe: int,
+    fetch: Callable[[], Awaitable[T]],
+) -> T:
+    """``fetch()`` at most once per ``timeframe`` bar for ``key``; concurrent and later callers share it."""
+    now = datetime_to_ns(datetime.utcnow())
+    bar_ns = now - now % (timeframe * MINUTE_NS)
+    entry = entries.get(key)
+    if entry is None or entry[0] != bar_ns:
+        entry = (bar_ns, asyncio.ensure_future(fetch()))
+        entries[key] = entry
+    try:
+        return await asyncio.shield(entry[1])
+    except Exception:
+        if entries.get(key) is entry:
+            del entries[key]  # let the next job retry
+        raise
 
 
 class SignalWorker:
-    def __init__(self) -> None:
-        self.settings = get_settings()
+    def __init__(
+        self,
+        settings: Optional[Settings] = None,
+        executor: Optional[Executor] = None,
+        publisher: Optional[SignalPublisher] = None,
+        sink: Optional[SignalSink] = None,
+        candles: Optional[BinanceConnector] = None,
+        execution: Optional[ExecutionPipeline] = None,
+    ) -> None:
+        self.settings = settings or get_settings()
         self.engine = CompositeEngine()
+        self.pipeline = MultiTimeframePipeline(self.settings.timeframes, engine=self.engine)
+        self.executor = executor
+        self.publisher = publisher
+        self.sink = sink
+        # routes each signal to a broker; None only computes and publishes
+        self.execution = execution
+        # kline source (a connector); None falls back to a synthetic series
+        self.candles = candles
+        # live books and trade tapes per symbol, kept current by the market data feed
+        self.order_books: Dict[str, OrderBook] = {}
+        self.trade_tapes: Dict[str, TradeTape] = {}
+        # XRPL flows are chain-wide, so one indexer serves every symbol
+        self.onchain = OnChainIndexer(self.settings.xrpl_exchange_addresses)
+        self.news = NewsSentiment(self.settings.symbols)
+        self.cross_assets: Dict[Tuple[str, int], CrossAssetFeatures] = {}
+        self._benchmarks: Dict[int, Tuple[int, "asyncio.Future[Dict[str, CandleSeries]]"]] = {}
+        self._timeframes: Dict[str, Tuple[int, "asyncio.Future[Dict[int, CandleSeries]]"]] = {}
 
-    async def fetch_candles(self, symbol: str, timeframe: int) -> List[TimeframeCandle]:
-        now = datetime.utcnow()
-        candles: List[TimeframeCandle] = []
+    async def fetch_candles(self, symbol: str, timeframe: int, limit: int = HISTORY_BARS) -> CandleSeries:
+        if self.candles is not None:
+            return await self.candles.fetch_klines(symbol, timeframe, limit=limit)
+        now = datetime_to_ns(datetime.utcnow())
+        now -= now % (timeframe * MINUTE_NS)
+        i = np.arange(limit)
         price = 0.5
-        for i in range(120):
-            close = price + np.sin(i / 10) * 0.01
-            volume = 1_000_000 + np.cos(i / 5) * 50_000
-            candles.append(
-                TimeframeCandle(
-                    symbol=symbol,
-                    timeframe_min=1,
-                    open=close - 0.002,
-                    high=close + 0.002,
-                    low=close - 0.003,
-                    close=close,
-                    volume=float(volume),
-                    vwap=close,
-                    timestamp=now - timedelta(minutes=120 - i),
-                )
-            )
-        return candles
+        close = price + np.sin(i / 10) * 0.01
+        return CandleSeries.from_arrays(
+            symbol,
+            timeframe,
+            timestamp=now - (limit - i) * timeframe * MINUTE_NS,
+            open=close - 0.002,
+            high=close + 0.002,
+            low=close - 0.003,
+            close=close,
+            volume=1_000_000 + np.cos(i / 5) * 50_000,
+            vwap=close,
+        )
+
+    async def _fetch_benchmarks(self, timeframe: int) -> Dict[str, CandleSeries]:
+        btc, eth = await asyncio.gather(
+            self.fetch_candles(self.settings.btc_symbol, timeframe),
+            self.fetch_candles(self.settings.eth_symbol, timeframe),
+        )
+        return {"btc": btc, "eth": eth}
+
+    async def fetch_benchmarks(self, timeframe: int) -> Dict[str, CandleSeries]:
+        """BTC and ETH bars for ``timeframe``, fetched once per bar however many symbols ask."""
+        return await _once_per_bar(self._benchmarks, timeframe, timeframe, lambda: self._fetch_benchmarks(timeframe))
+
+    async def _fetch_timeframes(self, symbol: str) -> Dict[int, CandleSeries]:
+        return self.pipeline.aggregate(await self.fetch_candles(symbol, 1, limit=BASE_BARS))
+
+    async def timeframe_candles(self, symbol: str, timeframe: int) -> CandleSeries:
+        """The latest ``HISTORY_BARS`` bars of ``timeframe``.
+
+        Every job closing in the same minute shares one 1m fetch per symbol,
+        aggregated into all timeframes by the multi-timeframe pipeline; only
+        timeframes that history is too short for are fetched on their own.
+        """
+        by_timeframe = await _once_per_bar(self._timeframes, symbol, 1, lambda: self._fetch_timeframes(symbol))
+        series = by_timeframe.get(timeframe)
+        if series is not None and len(series) >= HISTORY_BARS:
+            return series[-HISTORY_BARS:]
+        return await self.fetch_candles(symbol, timeframe)
 
-    async def compute(self, symbol: str) -> CompositeSignal:
-        candles = await self.fetch_candles(symbol, 1)
-        features = compute_features(symbol, 1, candles)
-        return self.engine.compute(features)
+    async def cross_asset(self, symbol: str, timeframe: int, candles: CandleSeries) -> Optional[Dict[str, float]]:
+        cross = self.cross_assets.get((symbol, timeframe))
+        if cross is None:
+            cross = self.cross_assets[(symbol, timeframe)] = CrossAssetFeatures(CROSS_ASSET_WINDOWS)
+        try:
+            cross.sync(candles, await self.fetch_benchmarks(timeframe))
+        except Exception as exc:
+            logger.warning("benchmark bars for %sm unavailable: %s", timeframe, exc)
+        return cross.features() if cross.bars else None
+
+    async def compute(
+        self, symbol: str, timeframe: int = 1, candles: Optional[CandleSeries] = None
+    ) -> CompositeSignal:
+        if candles is None:
+            with _stages["fetch"].time():
+                candles = await self.timeframe_candles(symbol, timeframe)
+        with _stages["cross_asset"].time():
+            meta = await self.cross_asset(symbol, timeframe, candles)
+        book = self.order_books.get(symbol)
+        tape = self.trade_tapes.get(symbol)
+        order_book = book.features() if book is not None else None
+        volume = tape.features() if tape is not None and len(tape) else None
+        onchain = self.onchain.features() if self.onchain.ledgers else None
+        news = self.news.features(symbol, datetime_to_ns(datetime.utcnow()) / SECOND_NS)
+        loop = asyncio.get_running_loop()
+        started = perf_counter_ns()
+        signal, features_ns, composite_ns = await loop.run_in_executor(
+            self.executor, compute_signal_timed, symbol, timeframe, candles, order_book, volume, onchain, news, meta
+        )
+        _stages["executor_wait"].observe_ns(perf_counter_ns() - started - features_ns - composite_ns)
+        _stages["features"].observe_ns(features_ns)
+        _stages["composite"].observe_ns(composite_ns)
+        if isinstance(self.executor, ProcessPoolExecutor):
+            _features_seconds.observe_ns(features_ns)
+            _composite_seconds.observe_ns(composite_ns)
+        _computed.inc()
+        return signal
 
     async def publish(self, signal: CompositeSignal) -> None:
-        print(signal.model_dump_json())
+        if self.publisher is None:
+            logger.debug(
+                "no publisher; %s %dm composite %.3f (%s)",
+                signal.symbol,
+                signal.timeframe_min,
+                signal.composite,
+                signal.regime,
+            )
+        else:
+            self.publisher.publish_nowait(signal)
+        # storage is best effort on the signal path: a slow database must not hold up the next job
+        if self.sink is not None and not self.sink.submit_nowait(signal):
+            logger.warning("signal sink full; not storing %s %dm", signal.symbol, signal.timeframe_min)
+
+    async def run_once(self, symbol: str, timeframe: int = 1) -> None:
+        with _stages["total"].time():
+            with _stages["fetch"].time():
+                candles = await self.timeframe_candles(symbol, timeframe)
+            signal = await self.compute(symbol, timeframe, candles)
+            with _stages["publish"].time():
+                await self.publish(signal)
+            if self.execution is not None and len(candles):
+                with _stages["route"].time():
+                    atr = float(average_true_range(candles)[-1])
+                    self.execution.submit(signal, float(candles.close[-1]), atr)
+        # how long after its bar closed the signal was out; compare with the timeframe
+        closed_s = datetime_to_ns(signal.computed_at) / 1e9 + timeframe * 60
+        REGISTRY.histogram(
+            "xrp_signal_bar_close_lag_seconds", "Time from bar close to published signal", timeframe=str(timeframe)
+        ).observe(max(time() - closed_s, 0.0))
+
+    def instrument(self, registry: Registry = REGISTRY) -> None:
+        """Expose queue depths and the pipeline counters the worker's components already keep."""
+        if self.publisher is not None:
+            publisher = self.publisher
+            registry.gauge("xrp_publisher_queue_depth", "Signals waiting for Redis", fn=lambda: publisher.queue_depth)
+            registry.counter(
+                "xrp_signals_published", "Signals written to the stream", fn=lambda: publisher.stats.published
+            )
+            registry.counter("xrp_signals_dropped", "Signals dropped unpublished", fn=lambda: publisher.stats.dropped)
+        if self.sink is not None:
+            sink = self.sink
+            registry.gauge("xrp_sink_queue_depth", "Signals waiting to be stored", fn=lambda: sink.queue_depth)
+            registry.counter("xrp_sink_rows", "Signal rows stored", fn=lambda: sink.stats.rows)
+            registry.counter(
+                "xrp_sink_rows_lost",
+                "Signal rows not stored",
+                fn=lambda: sink.stats.dropped + sink.stats.abandoned,
+            )
+        if self.execution is not None:
+            execution = self.execution
+            registry.gauge(
+                "xrp_execution_queue_depth", "Commands waiting for the broker", fn=lambda: execution.queue_depth
+            )
+            registry.counter(
+                "xrp_commands_dispatched", "Commands answered by the broker", fn=lambda: execution.stats.dispatched
+            )
+            registry.counter("xrp_commands_stale", "Commands past their latency budget", fn=lambda: execution.stats.stale)
+            registry.gauge(
+                "xrp_command_latency_max_seconds",
+                "Slowest submit-to-dispatch so far",
+                fn=lambda: execution.stats.max_latency_ms / 1_000,
+            )
+
+    def scheduler(self, symbols: Optional[Iterable[str]] = None) -> SignalScheduler:
+        return SignalScheduler(
+            run_job=self.run_once,
+            symbols=list(symbols or self.settings.symbols),
+            timeframes=self.settings.timeframes,
+            max_in_flight=self.settings.worker_max_in_flight,
+        )
 
-    async def run_once(self, symbol: str) -> None:
-        signal = await self.compute(symbol)
-        await self.publish(signal)
+    async def run(self, symbols: Optional[Iterable[str]] = None) -> None:
+        consumers = [sink for sink in (self.publisher, self.sink, self.execution) if sink is not None]
+        for sink in consumers:
+            sink.start()
+        scheduler = self.scheduler(symbols)
+        self.instrument()
+        REGISTRY.gauge("xrp_jobs_in_flight", "Signal jobs computing now", fn=lambda: scheduler.in_flight)
+        REGISTRY.counter(
+            "xrp_bar_closes_skipped",
+            "Bar closes skipped because the previous run overran",
+            fn=lambda: sum(stats.skipped_closes for stats in scheduler.stats.values()),
+        )
+        try:
+            await scheduler.run()
+        finally:
+            for sink in reversed(consumers):
+                await sink.stop()
 
-    async def run(self, symbol: str) -> None:
-        while True:
-            await self.run_once(symbol)
-            await asyncio.sleep(5)
+
+# Binance spot allows 6000 request weight per minute per IP
+_BINANCE_WEIGHT_PER_S = 100.0
+_BINANCE_BURST = 1_000.0
+# public rippled servers throttle heavy clients; expanded ledgers are expensive
+_XRPL_RPS = 10.0
+
+
+def _market_data(
+    settings: Settings, pool: HttpPool
+) -> Tuple[Optional[BinanceConnector], Optional[Connect]]:
+    """Kline source and websocket transport for ``MARKET_DATA_SOURCE``."""
+    source = settings.market_data_source
+    if source == "binance":
+        limiter = RateLimiter(_BINANCE_WEIGHT_PER_S, _BINANCE_BURST)
+        return BinanceConnector(RestClient(pool.client(settings.binance_rest_url), limiter)), websocket_connect
+    if source == "replay":
+        if settings.candle_archive_dir is None:
+            raise ValueError("MARKET_DATA_SOURCE=replay needs CANDLE_ARCHIVE_DIR")
+        replay = ReplayConnector(settings.candle_archive_dir, settings.market_replay_path)
+        return replay, replay.connect if settings.market_replay_path else None
+    return None, None
+
+
+def _execution(settings: Settings, engine: AsyncEngine) -> Optional[ExecutionPipeline]:
+    """Execution pipeline for ``EXECUTION_BROKER``; None when signals are not traded."""
+    if settings.execution_broker == "none":
+        return None
+    portfolio = PortfolioRisk(settings.paper_balance, RiskLimits.from_settings(settings))
+    return ExecutionPipeline(
+        ExecutionEngine(settings, portfolio=portfolio),
+        PaperBroker(portfolio),
+        ExecutionSink(engine),
+        max_latency_s=settings.execution_max_latency_s,
+    )
+
+
+async def _serve(settings: Settings, executor: Executor) -> None:
+    redis = create_redis(settings.redis_url)
+    engine = get_engine()
+    pool = HttpPool()
+    tasks: List[asyncio.Task] = []
+    metrics = await serve_metrics(port=settings.metrics_port) if settings.metrics_port else None
+    try:
+        tasks.append(asyncio.create_task(maintain_signal_partitions(engine)))
+        candles, connect = _market_data(settings, pool)
+        worker = SignalWorker(
+            settings,
+            executor=executor,
+            publisher=SignalPublisher(redis),
+            sink=SignalSink(engine),
+            candles=candles,
+            execution=_execution(settings, engine),
+        )
+        if connect is not None:
+            stream = BinanceMarketStream(
+                str(settings.binance_ws_url),
+                settings.symbols,
+                candles,
+                books=worker.order_books,
+                tapes=worker.trade_tapes,
+                connect=connect,
+            )
+            tasks.append(asyncio.create_task(stream.run()))
+        if settings.market_data_source == "binance":
+            xrpl = XrplConnector(RestClient(pool.client(settings.xrpl_rpc_url), RateLimiter(_XRPL_RPS, _XRPL_RPS)))
+            tasks.append(asyncio.create_task(XrplLedgerFeed(xrpl, worker.onchain).run()))
+            news_origin, news_path = split_endpoint(settings.newsapi_endpoint)
+            news = NewsApiConnector(
+                RestClient(pool.client(news_origin)), settings.newsapi_key, settings.news_query, news_path
+            )
+            tasks.append(asyncio.create_task(NewsFeed(news, worker.news).run()))
+        await worker.run()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if metrics is not None:
+            metrics.close()
+            await metrics.wait_closed()
+        await pool.aclose()
+        await redis.aclose()
+        await engine.dispose()
 
 
 def main() -> None:
-    worker = SignalWorker()
-    asyncio.run(worker.run("XRPUSDT"))
+    settings = get_settings()
+    pool = ProcessPoolExecutor if settings.worker_executor == "process" else ThreadPoolExecutor
+    with pool() as executor:
+        asyncio.run(_serve(settings, executor))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+from xrp_platform.features.timeframe import MINUTE_NS, bucket_start
+
+logger = logging.getLogger("signal_worker.scheduler")
+
+
+@dataclass(frozen=True)
+class Job:
+    symbol: str
+    timeframe: int
+
+
+@dataclass
+class JobStats:
+    runs: int = 0
+    failures: int = 0
+    skipped_closes: int = 0
+    last_latency_s: float = 0.0
+    max_latency_s: float = 0.0
+
+
+@dataclass
+class SignalScheduler:
+    """Runs one loop per symbol x timeframe job, each woken at its bar close.
+
+    A job never overlaps itself: if a run overruns the next close, the missed
+    closes are counted and skipped rather than queued. A shared semaphore caps
+    how many jobs compute at once so a burst of simultaneous closes (every
+    timeframe closes together at midnight) queues instead of oversubscribing the
+    compute pool, while a slow job only delays its own next run.
+    """
+
+    run_job: Callable[[str, int], Awaitable[None]]
+    symbols: Iterable[str]
+    timeframes: Iterable[int]
+    max_in_flight: int = 8
+    settle_s: float = 1.0
+    clock: Callable[[], float] = time.time
+    sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+    stats: Dict[Job, JobStats] = field(default_factory=dict, init=False)
+
+    def __post_init__(self) -> None:
+        self.jobs: List[Job] = [Job(symbol, timeframe) for symbol in self.symbols for timeframe in self.timeframes]
+        self.stats = {job: JobStats() for job in self.jobs}
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self.in_flight = 0
+
+    def next_close(self, timeframe: int, now: float) -> float:
+        now_ns = int(now * 1e9)
+        return (bucket_start(now_ns, timeframe) + timeframe * MINUTE_NS) / 1e9 + self.settle_s
+
+    async def _run_job(self, job: Job, until: Optional[float]) -> None:
+        stats = self.stats[job]
+        due = self.next_close(job.timeframe, self.clock() - self.settle_s)
+        while until is None or due <= until:
+            delay = due - self.clock()
+            if delay > 0:
+                await self.sleep(delay)
+            async with self._slots:
+                self.in_flight += 1
+                started = self.clock()
+                try:
+                    await self.run_job(job.symbol, job.timeframe)
+                    stats.runs += 1
+                except Exception:  # keep the loop alive; one bad run must not stop the job
+                    stats.failures += 1
+                    logger.exception("signal job %s/%sm failed", job.symbol, job.timeframe)
+                finally:
+                    self.in_flight -= 1
+                stats.last_latency_s = self.clock() - started
+                stats.max_latency_s = max(stats.max_latency_s, stats.last_latency_s)
+            following = self.next_close(job.timeframe, self.clock() - self.settle_s)
+            step = job.timeframe * 60
+            stats.skipped_closes += max(0, round((following - due) / step) - 1)
+            due = following
+
+    async def run(self, until: Optional[float] = None) -> None:
+        """Run every job until the clock passes ``until`` (forever when ``None``)."""
+        await asyncio.gather(*(self._run_job(job, until) for job in self.jobs))
+
+
+__all__ = ["Job", "JobStats", "SignalScheduler"]
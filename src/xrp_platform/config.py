@@ -1,39 +1,81 @@
 from __future__ import annotations
 
+import os
 from functools import lru_cache
-from typing import List
+from typing import List, Literal, Optional
 
-from pydantic import AnyHttpUrl, BaseModel, Field
+from pydantic import AnyHttpUrl, AnyUrl, BaseModel, Field, field_validator
 
 
 class Settings(BaseModel):
     binance_api_key: str = Field(..., alias="BINANCE_API_KEY")
     binance_api_secret: str = Field(..., alias="BINANCE_API_SECRET")
-    binance_ws_url: AnyHttpUrl = Field(..., alias="BINANCE_WS_URL")
+    binance_ws_url: AnyUrl = Field(..., alias="BINANCE_WS_URL")
     binance_rest_url: AnyHttpUrl = Field(..., alias="BINANCE_REST_URL")
 
     xrpl_rpc_url: AnyHttpUrl = Field(..., alias="XRPL_RPC_URL")
-    xrpl_ws_url: AnyHttpUrl = Field(..., alias="XRPL_WS_URL")
+    xrpl_ws_url: AnyUrl = Field(..., alias="XRPL_WS_URL")
     xrpl_data_api: AnyHttpUrl = Field(..., alias="XRPL_DATA_API")
+    # known exchange wallets as "label:address" (or bare addresses)
+    xrpl_exchange_addresses: List[str] = Field(default_factory=list, alias="XRPL_EXCHANGE_ADDRESSES")
 
     newsapi_key: str = Field(..., alias="NEWSAPI_KEY")
     newsapi_endpoint: AnyHttpUrl = Field(..., alias="NEWSAPI_ENDPOINT")
+    news_query: str = Field("XRP OR Ripple", alias="NEWS_QUERY")
 
-    btc_market_feed_url: AnyHttpUrl = Field(..., alias="BTC_MARKET_FEED_URL")
-    eth_market_feed_url: AnyHttpUrl = Field(..., alias="ETH_MARKET_FEED_URL")
+    btc_market_feed_url: AnyUrl = Field(..., alias="BTC_MARKET_FEED_URL")
+    eth_market_feed_url: AnyUrl = Field(..., alias="ETH_MARKET_FEED_URL")
+    # benchmark pairs for the cross-asset features, fetched from the kline source
+    btc_symbol: str = Field("BTCUSDT", alias="BTC_SYMBOL")
+    eth_symbol: str = Field("ETHUSDT", alias="ETH_SYMBOL")
 
     database_url: str = Field(..., alias="DATABASE_URL")
+    db_pool_size: int = Field(10, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(20, alias="DB_MAX_OVERFLOW")
     redis_url: str = Field(..., alias="REDIS_URL")
 
-    max_position_pct: float = Field(..., alias="MAX_POSITION_PCT")
-    max_drawdown_pct: float = Field(..., alias="MAX_DRAWDOWN_PCT")
+    # risk limits are percentages of equity: 2 means 2%, not 0.02
+    max_position_pct: float = Field(..., gt=0, le=100, alias="MAX_POSITION_PCT")
+    max_drawdown_pct: float = Field(..., gt=0, le=100, alias="MAX_DRAWDOWN_PCT")
+    max_exposure_pct: float = Field(100.0, gt=0, alias="MAX_EXPOSURE_PCT")
     stop_multiplier: float = Field(..., alias="STOP_MULTIPLIER")
     take_profit_multiplier: float = Field(..., alias="TAKE_PROFIT_MULTIPLIER")
+    # paper: route signals to the local paper broker; none (default): compute and publish only
+    execution_broker: Literal["paper", "none"] = Field("none", alias="EXECUTION_BROKER")
+    execution_max_latency_s: float = Field(2.0, alias="EXECUTION_MAX_LATENCY_S")
+    paper_balance: float = Field(100_000.0, alias="PAPER_BALANCE")
 
     env: str = Field("dev", alias="ENV")
     log_level: str = Field("INFO", alias="LOG_LEVEL")
     public_api_base_url: AnyHttpUrl = Field(..., alias="PUBLIC_API_BASE_URL")
 
+    symbols: List[str] = Field(default_factory=lambda: ["XRPUSDT"], alias="SYMBOLS")
+    worker_max_in_flight: int = Field(8, alias="WORKER_MAX_IN_FLIGHT")
+    worker_executor: str = Field("process", alias="WORKER_EXECUTOR")
+    # port for the worker's Prometheus endpoint; unset serves no metrics
+    metrics_port: Optional[int] = Field(None, alias="METRICS_PORT")
+
+    candle_archive_dir: Optional[str] = Field(None, alias="CANDLE_ARCHIVE_DIR")
+
+    # binance: live REST + websocket; replay: CANDLE_ARCHIVE_DIR plus an NDJSON
+    # stream recording; synthetic: generated candles, no stream
+    market_data_source: Literal["binance", "replay", "synthetic"] = Field("synthetic", alias="MARKET_DATA_SOURCE")
+    market_replay_path: Optional[str] = Field(None, alias="MARKET_REPLAY_PATH")
+
+    @field_validator("xrpl_exchange_addresses", mode="before")
+    @classmethod
+    def _split_addresses(cls, value: object) -> object:
+        if isinstance(value, str):
+            return [entry.strip() for entry in value.split(",") if entry.strip()]
+        return value
+
+    @field_validator("symbols", mode="before")
+    @classmethod
+    def _split_symbols(cls, value: object) -> object:
+        if isinstance(value, str):
+            return [symbol.strip().upper() for symbol in value.split(",") if symbol.strip()]
+        return value
+
     @property
     def timeframes(self) -> List[int]:
         return [1, 5, 60, 240, 1440, 10080]
@@ -41,7 +83,7 @@ class Settings(BaseModel):
 
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    return Settings()  # type: ignore[arg-type]
+    return Settings.model_validate(os.environ)
 
 
 __all__ = ["get_settings", "Settings"]
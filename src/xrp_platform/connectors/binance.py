@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from xrp_platform.data.candles import CandleSeries
+from xrp_platform.data.schemas import OrderBookSnapshot
+from xrp_platform.features.order_book import OrderBook
+from xrp_platform.features.timeframe import MINUTE_NS
+from xrp_platform.features.trade_tape import TradeTape
+
+from .http import RestClient
+from .websocket import Connect, StreamSubscriber, websocket_connect
+
+logger = logging.getLogger("connectors.binance")
+
+INTERVALS: Dict[int, str] = {1: "1m", 5: "5m", 15: "15m", 60: "1h", 240: "4h", 1440: "1d", 10080: "1w"}
+KLINE_LIMIT = 1_000
+_MS_NS = 1_000_000
+
+
+def parse_klines(symbol: str, timeframe: int, rows: Sequence[Sequence[Any]]) -> CandleSeries:
+    """Binance kline rows as a series; vwap is quote volume over base volume."""
+    if not rows:
+        return CandleSeries(symbol, timeframe, capacity=0)
+    table = np.array([row[:8] for row in rows], dtype=np.float64)
+    volume = table[:, 5]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vwap = np.where(volume != 0, table[:, 7] / volume, table[:, 4])
+    return CandleSeries.from_arrays(
+        symbol,
+        timeframe,
+        timestamp=np.array([row[0] for row in rows], dtype=np.int64) * _MS_NS,
+        open=table[:, 1],
+        high=table[:, 2],
+        low=table[:, 3],
+        close=table[:, 4],
+        volume=volume,
+        vwap=vwap,
+    )
+
+
+def _concat(symbol: str, timeframe: int, pages: List[CandleSeries]) -> CandleSeries:
+    pages = [page for page in pages if len(page)]
+    if len(pages) == 1:
+        return pages[0]
+    if not pages:
+        return CandleSeries(symbol, timeframe, capacity=0)
+    columns = [page.columns() for page in pages]
+    return CandleSeries.from_arrays(
+        symbol, timeframe, **{name: np.concatenate([c[name] for c in columns]) for name in columns[0]}
+    )
+
+
+class BinanceConnector:
+    """Binance spot REST endpoints used by the platform, over a shared ``RestClient``.
+
+    Request weights follow the exchange's published costs so the shared rate
+    limiter tracks the real budget. Kline ranges longer than one page are
+    fetched as consecutive ``KLINE_LIMIT``-bar pages. Binance also returns the
+    still-forming current kline; it is dropped, so live series end at the last
+    closed bar like archived and replayed ones. ``clock`` is wall time in seconds.
+    """
+
+    def __init__(self, rest: RestClient, clock: Callable[[], float] = time.time) -> None:
+        self.rest = rest
+        self.clock = clock
+
+    async def _closed_klines(self, symbol: str, timeframe: int, params: Dict[str, Any]) -> CandleSeries:
+        rows = await self.rest.get_json("/api/v3/klines", params, weight=2)
+        # row[6] is the kline's close time; an open kline closes in the future
+        now_ms = int(self.clock() * 1_000)
+        while rows and int(rows[-1][6]) >= now_ms:
+            rows = rows[:-1]
+        return parse_klines(symbol, timeframe, rows)
+
+    async def fetch_klines(
+        self,
+        symbol: str,
+        timeframe: int,
+        start_ns: Optional[int] = None,
+        end_ns: Optional[int] = None,
+        limit: int = 120,
+    ) -> CandleSeries:
+        """Closed bars in ``[start_ns, end_ns)``; the latest ``limit`` when no start."""
+        interval = INTERVALS[timeframe]
+        if start_ns is None:
+            # one row more than asked for, in case the newest is the open kline
+            params: Dict[str, Any] = {"symbol": symbol, "interval": interval, "limit": min(limit + 1, KLINE_LIMIT)}
+            if end_ns is not None:
+                params["endTime"] = end_ns // _MS_NS - 1
+            series = await self._closed_klines(symbol, timeframe, params)
+            return series[-limit:] if len(series) > limit else series
+
+        pages: List[CandleSeries] = []
+        cursor = start_ns
+        while end_ns is None or cursor < end_ns:
+            params = {"symbol": symbol, "interval": interval, "startTime": cursor // _MS_NS, "limit": KLINE_LIMIT}
+            if end_ns is not None:
+                params["endTime"] = end_ns // _MS_NS - 1
+            page = await self._closed_klines(symbol, timeframe, params)
+            pages.append(page)
+            if len(page) < KLINE_LIMIT:
+                break
+            cursor = int(page.timestamp[-1]) + timeframe * MINUTE_NS
+        return _concat(symbol, timeframe, pages)
+
+    async def fetch_klines_many(
+        self, requests: Iterable[Tuple[str, int]], limit: int = 120
+    ) -> Dict[Tuple[str, int], CandleSeries]:
+        """Latest bars for many (symbol, timeframe) pairs, issued concurrently under the limiter."""
+        keys = list(requests)
+        pages = await asyncio.gather(*(self.fetch_klines(symbol, tf, limit=limit) for symbol, tf in keys))
+        return dict(zip(keys, pages))
+
+    async def depth(self, symbol: str, limit: int = 1_000) -> Tuple[Optional[int], OrderBookSnapshot]:
+        data = await self.rest.get_json("/api/v3/depth", {"symbol": symbol, "limit": limit}, weight=50)
+        snapshot = OrderBookSnapshot(
+            symbol=symbol,
+            bids=[[float(price), float(size)] for price, size in data["bids"]],
+            asks=[[float(price), float(size)] for price, size in data["asks"]],
+            timestamp=datetime.utcnow(),
+        )
+        return int(data["lastUpdateId"]), snapshot
+
+    async def agg_trades(self, symbol: str, from_id: int, limit: int = 1_000) -> List[Mapping[str, Any]]:
+        return await self.rest.get_json(
+            "/api/v3/aggTrades", {"symbol": symbol, "fromId": from_id, "limit": limit}, weight=2
+        )
+
+
+class BinanceMarketStream:
+    """Depth diffs and aggregate trades for many symbols over one combined stream.
+
+    Depth diffs keep each ``OrderBook`` current and aggregate trades feed each
+    ``TradeTape``. After every (re)connect the books are re-seeded from a REST
+    snapshot and trades missed while disconnected are backfilled by id, and the
+    same happens for a book whenever a diff arrives out of sequence.
+    """
+
+    def __init__(
+        self,
+        ws_url: str,
+        symbols: Sequence[str],
+        rest: BinanceConnector,
+        books: Optional[Dict[str, OrderBook]] = None,
+        tapes: Optional[Dict[str, TradeTape]] = None,
+        connect: Connect = websocket_connect,
+    ) -> None:
+        self.symbols = [symbol.upper() for symbol in symbols]
+        self.rest = rest
+        self.books = books if books is not None else {}
+        self.tapes = tapes if tapes is not None else {}
+        for symbol in self.symbols:
+            self.books.setdefault(symbol, OrderBook(symbol))
+            self.tapes.setdefault(symbol, TradeTape(symbol))
+        self._last_update: Dict[str, int] = {}
+        self._last_trade: Dict[str, int] = {}
+        self.subscriber = StreamSubscriber(
+            self.stream_url(ws_url), self.on_message, on_connect=self.on_connect, connect=connect
+        )
+
+    def stream_url(self, ws_url: str) -> str:
+        base = str(ws_url).rstrip("/")
+        if base.endswith("/ws"):
+            base = base[: -len("/ws")]
+        streams = "/".join(f"{symbol.lower()}@depth@100ms/{symbol.lower()}@aggTrade" for symbol in self.symbols)
+        return f"{base}/stream?streams={streams}"
+
+    async def run(self) -> None:
+        await self.subscriber.run()
+
+    def stop(self) -> None:
+        self.subscriber.stop()
+
+    async def resync_book(self, symbol: str) -> None:
+        last_update, snapshot = await self.rest.depth(symbol)
+        self.books[symbol].apply_snapshot(snapshot.bids, snapshot.asks)
+        if last_update is None:
+            # unsequenced source (a replay without snapshots): take diffs as they come
+            self._last_update.pop(symbol, None)
+        else:
+            self._last_update[symbol] = last_update
+
+    async def backfill_trades(self, symbol: str) -> None:
+        last = self._last_trade.get(symbol)
+        if last is None:
+            return
+        while True:
+            trades = await self.rest.agg_trades(symbol, last + 1)
+            for trade in trades:
+                self._ingest_trade(symbol, trade)
+            if len(trades) < 1_000:
+                return
+            last = self._last_trade[symbol]
+
+    async def on_connect(self) -> None:
+        for symbol in self.symbols:
+            await self.resync_book(symbol)
+            await self.backfill_trades(symbol)
+
+    def _ingest_trade(self, symbol: str, trade: Mapping[str, Any]) -> None:
+        trade_id = int(trade["a"])
+        if trade_id <= self._last_trade.get(symbol, -1):
+            return
+        self._last_trade[symbol] = trade_id
+        # "m": the buyer was the maker, i.e. the taker sold
+        self.tapes[symbol].ingest_values(
+            int(trade["T"]) * _MS_NS, float(trade["p"]), float(trade["q"]), not trade["m"]
+        )
+
+    async def on_message(self, message: Mapping[str, Any]) -> None:
+        data = message.get("data", message)
+        event = data.get("e")
+        symbol = data.get("s")
+        if symbol not in self.books:
+            return
+        if event == "aggTrade":
+            self._ingest_trade(symbol, data)
+        elif event == "depthUpdate":
+            await self._apply_depth(symbol, data)
+
+    async def _apply_depth(self, symbol: str, data: Mapping[str, Any], resync: bool = True) -> None:
+        last = self._last_update.get(symbol)
+        if last is not None and data["u"] <= last:
+            return  # already contained in the snapshot
+        if last is not None and data["U"] > last + 1:
+            if resync:
+                logger.warning("depth gap for %s (%d -> %d); resyncing", symbol, last, data["U"])
+                await self.resync_book(symbol)
+                await self._apply_depth(symbol, data, resync=False)
+            return
+        book = self.books[symbol]
+        timestamp = int(data["E"]) * _MS_NS
+        for price, size in data["b"]:
+            book.update(True, float(price), float(size), timestamp)
+        for price, size in data["a"]:
+            book.update(False, float(price), float(size), timestamp)
+        self._last_update[symbol] = data["u"]
+
+
+__all__ = ["BinanceConnector", "BinanceMarketStream", "INTERVALS", "KLINE_LIMIT", "parse_klines"]
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+import orjson
+
+logger = logging.getLogger("connectors.http")
+
+_RETRY_STATUS = (418, 429, 500, 502, 503, 504)
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+class UpstreamError(Exception):
+    """An upstream kept failing after retries, or answered with a non-retryable error."""
+
+    def __init__(self, url: str, status: Optional[int], detail: str) -> None:
+        super().__init__(f"{url}: {status} {detail}")
+        self.url = url
+        self.status = status
+
+
+def split_endpoint(url: Any) -> Tuple[str, str]:
+    """``(origin, path)`` of a full endpoint URL, so the pooled client is keyed by host."""
+    parts = urlsplit(str(url))
+    return f"{parts.scheme}://{parts.netloc}", parts.path or "/"
+
+
+class RateLimiter:
+    """Token bucket in request-weight units, shared by every caller of one upstream.
+
+    ``acquire`` waits until ``weight`` tokens are available instead of letting the
+    upstream reject the request; ``penalize`` empties the bucket for a while when
+    the upstream says we went too fast anyway.
+    """
+
+    def __init__(
+        self,
+        rate_per_s: float,
+        burst: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self.rate_per_s = rate_per_s
+        self.burst = burst
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = burst
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate_per_s)
+        self._updated = now
+
+    async def acquire(self, weight: float = 1.0) -> None:
+        async with self._lock:  # first come, first served; a heavy request is not starved
+            self._refill()
+            while self._tokens < weight:
+                await self.sleep((weight - self._tokens) / self.rate_per_s)
+                self._refill()
+            self._tokens -= weight
+
+    def penalize(self, seconds: float) -> None:
+        self._refill()
+        self._tokens = min(self._tokens, 0.0) - seconds * self.rate_per_s
+
+
+class HttpPool:
+    """One pooled ``httpx.AsyncClient`` per upstream base URL, shared process-wide.
+
+    Every connector for an upstream borrows the same client, so keep-alive
+    connections are reused and the total socket count stays bounded by
+    ``max_connections`` per upstream however many tasks issue requests.
+    """
+
+    def __init__(
+        self, max_connections: int = 20, max_keepalive: int = 10, timeout_s: float = 10.0, **client_options: Any
+    ) -> None:
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive)
+        self.timeout = httpx.Timeout(timeout_s)
+        self.client_options = client_options
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def client(self, base_url: Any) -> httpx.AsyncClient:
+        key = str(base_url).rstrip("/")
+        client = self._clients.get(key)
+        if client is None:
+            client = httpx.AsyncClient(
+                base_url=key, limits=self.limits, timeout=self.timeout, **self.client_options
+            )
+            self._clients[key] = client
+        return client
+
+    async def aclose(self) -> None:
+        clients, self._clients = list(self._clients.values()), {}
+        await asyncio.gather(*(client.aclose() for client in clients))
+
+
+class RestClient:
+    """JSON requests against one upstream through its pooled client and rate limiter.
+
+    Throttling (429/418) and transient 5xx answers are retried after the
+    upstream's ``Retry-After`` (or an exponential backoff), and throttling also
+    drains the shared limiter so concurrent callers back off together.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        limiter: Optional[RateLimiter] = None,
+        max_retries: int = 4,
+        backoff_s: float = 0.5,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self.client = client
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.backoff_s = backoff_s
+        self.sleep = sleep
+
+    async def get_json(self, path: str, params: Optional[Mapping[str, Any]] = None, weight: float = 1.0) -> Any:
+        return await self._request("GET", path, weight, params=params)
+
+    async def post_json(self, path: str, body: Any, weight: float = 1.0) -> Any:
+        """JSON-RPC style POST; retried like a GET, so only use it for idempotent calls."""
+        return await self._request("POST", path, weight, content=orjson.dumps(body), headers=_JSON_HEADERS)
+
+    async def _request(self, method: str, path: str, weight: float, **kwargs: Any) -> Any:
+        for attempt in range(self.max_retries + 1):
+            if self.limiter is not None:
+                await self.limiter.acquire(weight)
+            try:
+                response = await self.client.request(method, path, **kwargs)
+            except httpx.TransportError as exc:
+                status, detail, delay = None, str(exc), self.backoff_s * 2**attempt
+            else:
+                if response.status_code < 400:
+                    return orjson.loads(response.content)
+                if response.status_code not in _RETRY_STATUS:
+                    raise UpstreamError(path, response.status_code, response.text[:200])
+                status, detail = response.status_code, response.text[:200]
+                retry_after = response.headers.get("Retry-After")
+                delay = float(retry_after) if retry_after else self.backoff_s * 2**attempt
+                if status in (418, 429) and self.limiter is not None:
+                    self.limiter.penalize(delay)
+            if attempt == self.max_retries:
+                raise UpstreamError(path, status, detail)
+            logger.warning("%s %s failed (%s); retrying in %.1fs", method, path, status or detail, delay)
+            await self.sleep(delay)
+        raise AssertionError("unreachable")
+
+
+__all__ = ["HttpPool", "RateLimiter", "RestClient", "UpstreamError", "split_endpoint"]
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, List, Mapping, Optional
+
+from xrp_platform.data.schemas import NewsArticle
+from xrp_platform.features.news import NewsSentiment
+
+from .http import RestClient
+
+logger = logging.getLogger("connectors.news")
+
+_REMOVED = "[Removed]"  # NewsAPI's placeholder for retracted articles
+
+
+def parse_articles(payload: Mapping[str, Any]) -> List[NewsArticle]:
+    """NewsAPI ``everything`` results; untitled, undated and removed entries are dropped."""
+    articles = []
+    for entry in payload.get("articles", ()):
+        if entry.get("title") in (None, "", _REMOVED) or not entry.get("publishedAt"):
+            continue
+        articles.append(
+            NewsArticle(
+                title=entry["title"],
+                description=entry.get("description"),
+                source=(entry.get("source") or {}).get("name"),
+                url=entry.get("url"),
+                published_at=entry["publishedAt"],
+            )
+        )
+    return articles
+
+
+class NewsApiConnector:
+    """NewsAPI ``everything`` search against ``NEWSAPI_ENDPOINT``."""
+
+    def __init__(
+        self, rest: RestClient, api_key: str, query: str = "XRP OR Ripple", path: str = "/v2/everything"
+    ) -> None:
+        self.rest = rest
+        self.api_key = api_key
+        self.query = query
+        self.path = path
+
+    async def fetch(self, since: Optional[datetime] = None, page_size: int = 100) -> List[NewsArticle]:
+        params = {"q": self.query, "sortBy": "publishedAt", "pageSize": page_size, "apiKey": self.api_key}
+        if since is not None:
+            params["from"] = since.strftime("%Y-%m-%dT%H:%M:%S")
+        return parse_articles(await self.rest.get_json(self.path, params))
+
+
+class NewsFeed:
+    """Polls the news search and feeds new articles into ``NewsSentiment``.
+
+    Each poll asks for articles since the newest one already ingested (less
+    ``overlap`` for late indexing); whatever comes back twice is absorbed by
+    the sentiment pipeline's dedup cache.
+    """
+
+    def __init__(
+        self,
+        connector: NewsApiConnector,
+        sentiment: NewsSentiment,
+        poll_s: float = 900.0,
+        overlap: timedelta = timedelta(minutes=30),
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self.connector = connector
+        self.sentiment = sentiment
+        self.poll_s = poll_s
+        self.overlap = overlap
+        self.sleep = sleep
+        self.newest: Optional[datetime] = None
+        self._stopped = False
+
+    def stop(self) -> None:
+        self._stopped = True
+
+    async def poll(self) -> int:
+        since = self.newest - self.overlap if self.newest is not None else None
+        articles = await self.connector.fetch(since)
+        if articles:
+            newest = max(article.published_at for article in articles)
+            self.newest = newest if self.newest is None else max(self.newest, newest)
+        return self.sentiment.ingest(articles)
+
+    async def run(self, max_polls: Optional[int] = None) -> None:
+        polls = 0
+        while not self._stopped and (max_polls is None or polls < max_polls):
+            polls += 1
+            try:
+                await self.poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("news poll failed: %s", exc)
+            if max_polls is None or polls < max_polls:
+                await self.sleep(self.poll_s)
+
+
+__all__ = ["NewsApiConnector", "NewsFeed", "parse_articles"]
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, List, Mapping, Optional, Tuple, Union
+
+from xrp_platform.data.archive import CandleArchive
+from xrp_platform.data.candles import CandleSeries
+from xrp_platform.data.schemas import OrderBookSnapshot
+
+
+class RecordedStream:
+    """Async-context stand-in for a websocket connection that replays an NDJSON recording."""
+
+    def __init__(self, path: Union[str, os.PathLike], delay_s: float = 0.0) -> None:
+        self.path = Path(path)
+        self.delay_s = delay_s
+
+    async def __aenter__(self) -> "RecordedStream":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        with open(self.path, "rb") as handle:
+            for line in handle:
+                line = line.strip()
+                if not line:
+                    continue
+                if self.delay_s:
+                    await asyncio.sleep(self.delay_s)
+                yield line
+
+
+class ReplayConnector:
+    """Offline stand-in for ``BinanceConnector`` backed by local files.
+
+    Klines come from a ``CandleArchive`` (``now_ns`` pins the replay clock, so
+    "latest" means latest before it) and websocket traffic from NDJSON
+    recordings of the raw stream messages. Depth snapshots are empty and
+    unsequenced and there is nothing to backfill, so a recorded stream replays
+    exactly as captured.
+    """
+
+    def __init__(
+        self,
+        archive: Union[CandleArchive, str, os.PathLike],
+        recording: Optional[Union[str, os.PathLike]] = None,
+        now_ns: Optional[int] = None,
+        delay_s: float = 0.0,
+    ) -> None:
+        self.archive = archive if isinstance(archive, CandleArchive) else CandleArchive(archive)
+        self.recording = recording
+        self.now_ns = now_ns
+        self.delay_s = delay_s
+
+    async def fetch_klines(
+        self,
+        symbol: str,
+        timeframe: int,
+        start_ns: Optional[int] = None,
+        end_ns: Optional[int] = None,
+        limit: int = 120,
+    ) -> CandleSeries:
+        if end_ns is None:
+            end_ns = self.now_ns
+        series = self.archive.open(symbol, timeframe, start_ns, end_ns)
+        return series if start_ns is not None else series[-limit:]
+
+    async def depth(self, symbol: str, limit: int = 1_000) -> Tuple[Optional[int], OrderBookSnapshot]:
+        return None, OrderBookSnapshot(symbol=symbol, bids=[], asks=[], timestamp=datetime.utcnow())
+
+    async def agg_trades(self, symbol: str, from_id: int, limit: int = 1_000) -> List[Mapping[str, Any]]:
+        return []
+
+    def connect(self, url: str) -> RecordedStream:
+        if self.recording is None:
+            raise FileNotFoundError("replay connector has no stream recording")
+        return RecordedStream(self.recording, self.delay_s)
+
+
+__all__ = ["RecordedStream", "ReplayConnector"]
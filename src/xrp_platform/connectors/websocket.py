@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from dataclasses import dataclass
+from typing import Any, AsyncContextManager, AsyncIterable, Awaitable, Callable, Optional
+
+import orjson
+
+logger = logging.getLogger("connectors.websocket")
+
+Connect = Callable[[str], AsyncContextManager[AsyncIterable[Any]]]
+
+
+def websocket_connect(url: str) -> AsyncContextManager[AsyncIterable[Any]]:
+    """Default transport: a ``websockets`` client connection with keepalive pings."""
+    import websockets
+
+    return websockets.connect(url, ping_interval=20, ping_timeout=20, max_queue=4_096)
+
+
+@dataclass
+class SubscriberStats:
+    connects: int = 0
+    disconnects: int = 0
+    messages: int = 0
+    handler_errors: int = 0
+
+
+class StreamSubscriber:
+    """Keeps one websocket subscription alive and hands every decoded message to ``on_message``.
+
+    After every (re)connect ``on_connect`` runs before any message is delivered,
+    which is where callers backfill whatever they missed while disconnected.
+    Reconnects back off exponentially with jitter, reset once a connection has
+    delivered messages. A failing handler is logged and does not drop the
+    connection.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        on_message: Callable[[Any], Awaitable[None]],
+        on_connect: Optional[Callable[[], Awaitable[None]]] = None,
+        connect: Connect = websocket_connect,
+        min_backoff_s: float = 0.5,
+        max_backoff_s: float = 30.0,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self.url = url
+        self.on_message = on_message
+        self.on_connect = on_connect
+        self.connect = connect
+        self.min_backoff_s = min_backoff_s
+        self.max_backoff_s = max_backoff_s
+        self.sleep = sleep
+        self.stats = SubscriberStats()
+        self._stopped = False
+
+    def stop(self) -> None:
+        self._stopped = True
+
+    async def _session(self) -> bool:
+        """One connection's lifetime; True when it delivered at least one message."""
+        delivered = False
+        async with self.connect(self.url) as connection:
+            self.stats.connects += 1
+            if self.on_connect is not None:
+                await self.on_connect()
+            async for raw in connection:
+                if self._stopped:
+                    break
+                self.stats.messages += 1
+                delivered = True
+                try:
+                    await self.on_message(orjson.loads(raw))
+                except Exception:
+                    self.stats.handler_errors += 1
+                    logger.exception("handler failed for message from %s", self.url)
+        return delivered
+
+    async def run(self, max_connects: Optional[int] = None) -> None:
+        """Connect, consume and reconnect until ``stop`` (or ``max_connects`` sessions)."""
+        backoff = self.min_backoff_s
+        sessions = 0
+        while not self._stopped and (max_connects is None or sessions < max_connects):
+            sessions += 1
+            try:
+                if await self._session():
+                    backoff = self.min_backoff_s
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("stream %s dropped: %s", self.url, exc)
+            self.stats.disconnects += 1
+            if self._stopped or (max_connects is not None and sessions >= max_connects):
+                break
+            await self.sleep(backoff * random.uniform(0.5, 1.0))
+            backoff = min(backoff * 2, self.max_backoff_s)
+
+
+__all__ = ["StreamSubscriber", "SubscriberStats", "websocket_connect"]
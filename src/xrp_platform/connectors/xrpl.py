@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from xrp_platform.features.onchain import OnChainIndexer
+
+from .http import RestClient, UpstreamError
+
+logger = logging.getLogger("connectors.xrpl")
+
+
+class XrplConnector:
+    """rippled JSON-RPC methods used by the on-chain indexer."""
+
+    def __init__(self, rest: RestClient) -> None:
+        self.rest = rest
+
+    async def rpc(self, method: str, **params: Any) -> Dict[str, Any]:
+        response = await self.rest.post_json("/", {"method": method, "params": [params]})
+        result = response.get("result", {})
+        if result.get("status") == "error":
+            raise UpstreamError(method, None, str(result.get("error_message") or result.get("error")))
+        return result
+
+    async def validated_index(self) -> int:
+        result = await self.rpc("ledger", ledger_index="validated")
+        return int(result["ledger_index"])
+
+    async def ledger(self, index: int) -> Dict[str, Any]:
+        """One validated ledger with its transactions and metadata expanded."""
+        result = await self.rpc("ledger", ledger_index=index, transactions=True, expand=True)
+        return result["ledger"]
+
+    async def ledgers(self, start: int, end: int) -> List[Dict[str, Any]]:
+        """Ledgers ``start..end`` inclusive, fetched concurrently under the shared limiter."""
+        return list(await asyncio.gather(*(self.ledger(index) for index in range(start, end + 1))))
+
+
+class XrplLedgerFeed:
+    """Polls for newly validated ledgers and folds them into an ``OnChainIndexer`` in order.
+
+    The first poll starts from the current validated ledger; later polls
+    continue after the last one indexed, so a slow poll or an outage is caught
+    up in ``batch_size`` batches rather than skipped. Catch-up is bounded by
+    ``max_backlog`` ledgers, beyond which the indexer's windows would have
+    expired the data anyway.
+    """
+
+    def __init__(
+        self,
+        connector: XrplConnector,
+        indexer: OnChainIndexer,
+        poll_s: float = 4.0,
+        batch_size: int = 16,
+        max_backlog: int = 25_000,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self.connector = connector
+        self.indexer = indexer
+        self.poll_s = poll_s
+        self.batch_size = batch_size
+        self.max_backlog = max_backlog
+        self.sleep = sleep
+        self._stopped = False
+
+    def stop(self) -> None:
+        self._stopped = True
+
+    async def poll(self) -> int:
+        """Index every ledger validated since the last poll; returns how many."""
+        latest = await self.connector.validated_index()
+        last = self.indexer.last_ledger_index
+        start = latest if last is None else max(last + 1, latest - self.max_backlog + 1)
+        indexed = 0
+        while start <= latest:
+            end = min(start + self.batch_size - 1, latest)
+            self.indexer.process(await self.connector.ledgers(start, end))
+            indexed += end - start + 1
+            start = end + 1
+        return indexed
+
+    async def run(self, max_polls: Optional[int] = None) -> None:
+        polls = 0
+        while not self._stopped and (max_polls is None or polls < max_polls):
+            polls += 1
+            try:
+                await self.poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("ledger poll failed: %s", exc)
+            if max_polls is None or polls < max_polls:
+                await self.sleep(self.poll_s)
+
+
+__all__ = ["XrplConnector", "XrplLedgerFeed"]
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from xrp_platform.data.candles import PRICE_COLUMNS, CandleSeries, datetime_to_ns
+
+ARCHIVE_VERSION = 1
+HEADER_FILE = "header.json"
+_COLUMNS = (("timestamp", "<i8"),) + tuple((name, "<f8") for name in PRICE_COLUMNS)
+
+Bound = Union[datetime, int, None]
+
+
+def _bound_ns(value: Bound) -> Optional[int]:
+    if value is None or isinstance(value, int):
+        return value
+    return datetime_to_ns(value)
+
+
+class CandleArchive:
+    """On-disk columnar candle store, one directory per symbol and timeframe.
+
+    Each ``<root>/<SYMBOL>/<tf>m/`` holds a small ``header.json`` and one raw
+    little-endian file per column (``timestamp.i8``, ``close.f8``, ...). Reads
+    memory-map the columns, so opening an archive costs the same whatever its
+    size and a date range is found by binary search on the timestamp file. Bars
+    are appended to the end of each column file without rewriting it; the bar
+    count is the shortest column, so a torn append is simply not visible.
+    """
+
+    def __init__(self, root: Union[str, os.PathLike]) -> None:
+        self.root = Path(root)
+
+    def path(self, symbol: str, timeframe: int) -> Path:
+        return self.root / symbol.upper() / f"{timeframe}m"
+
+    def _column_path(self, directory: Path, name: str, dtype: str) -> Path:
+        return directory / f"{name}.{dtype[1:]}"
+
+    def exists(self, symbol: str, timeframe: int) -> bool:
+        return (self.path(symbol, timeframe) / HEADER_FILE).is_file()
+
+    def datasets(self) -> Iterator[Tuple[str, int]]:
+        for header in sorted(self.root.glob(f"*/*m/{HEADER_FILE}")):
+            meta = json.loads(header.read_text())
+            yield meta["symbol"], meta["timeframe_min"]
+
+    def count(self, symbol: str, timeframe: int) -> int:
+        directory = self.path(symbol, timeframe)
+        sizes = []
+        for name, dtype in _COLUMNS:
+            column = self._column_path(directory, name, dtype)
+            sizes.append(column.stat().st_size // 8 if column.exists() else 0)
+        return min(sizes)
+
+    def _ensure(self, symbol: str, timeframe: int) -> Path:
+        directory = self.path(symbol, timeframe)
+        header = directory / HEADER_FILE
+        if not header.exists():
+            directory.mkdir(parents=True, exist_ok=True)
+            meta = {
+                "version": ARCHIVE_VERSION,
+                "symbol": symbol.upper(),
+                "timeframe_min": timeframe,
+                "columns": {name: dtype for name, dtype in _COLUMNS},
+            }
+            header.write_text(json.dumps(meta, indent=2))
+        return directory
+
+    def _memmap(self, directory: Path, name: str, dtype: str, count: int) -> np.ndarray:
+        if count == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(self._column_path(directory, name, dtype), dtype=dtype, mode="r", shape=(count,))
+
+    def last_timestamp(self, symbol: str, timeframe: int) -> Optional[int]:
+        count = self.count(symbol, timeframe)
+        if count == 0:
+            return None
+        timestamps = self._memmap(self.path(symbol, timeframe), "timestamp", "<i8", count)
+        return int(timestamps[-1])
+
+    def append(self, series: CandleSeries) -> int:
+        """Append bars newer than the archived ones; returns how many were written.
+
+        Bars at or before the last archived timestamp are skipped, so replaying an
+        overlapping download is harmless. The timestamp column stays sorted, which
+        ``open`` relies on for its binary search.
+        """
+        directory = self._ensure(series.symbol, series.timeframe_min)
+        count = self.count(series.symbol, series.timeframe_min)
+        timestamps = series.timestamp
+        if len(timestamps) > 1 and np.any(timestamps[1:] <= timestamps[:-1]):
+            raise ValueError("series timestamps must be strictly increasing")
+        last = self.last_timestamp(series.symbol, series.timeframe_min)
+        first = 0 if last is None else int(np.searchsorted(timestamps, last, side="right"))
+        columns = series.columns()
+        for name, dtype in _COLUMNS:
+            path = self._column_path(directory, name, dtype)
+            with open(path, "ab") as handle:
+                # drop any torn tail from an interrupted append before extending
+                handle.truncate(count * 8)
+                handle.write(np.ascontiguousarray(columns[name][first:], dtype=dtype).tobytes())
+        return len(timestamps) - first
+
+    def open(
+        self, symbol: str, timeframe: int, start: Bound = None, end: Bound = None, tz_aware: bool = False
+    ) -> CandleSeries:
+        """Zero-copy series over ``[start, end)``; bounds are datetimes or epoch ns."""
+        directory = self.path(symbol, timeframe)
+        if not (directory / HEADER_FILE).is_file():
+            raise FileNotFoundError(f"no archive for {symbol.upper()} {timeframe}m under {self.root}")
+        count = self.count(symbol, timeframe)
+        columns: List[np.ndarray] = [self._memmap(directory, name, dtype, count) for name, dtype in _COLUMNS]
+        timestamps = columns[0]
+        lower = 0 if start is None else int(np.searchsorted(timestamps, _bound_ns(start), side="left"))
+        upper = count if end is None else int(np.searchsorted(timestamps, _bound_ns(end), side="left"))
+        upper = max(lower, upper)
+        return CandleSeries.from_arrays(
+            symbol.upper(), timeframe, *(column[lower:upper] for column in columns), tz_aware=tz_aware
+        )
+
+
+__all__ = ["ARCHIVE_VERSION", "CandleArchive"]
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+
+from xrp_platform.data.schemas import TimeframeCandle
+
+PRICE_COLUMNS = ("open", "high", "low", "close", "volume", "vwap")
+_EPOCH = datetime(1970, 1, 1)
+
+
+def datetime_to_ns(value: datetime) -> int:
+    """Epoch nanoseconds for ``value``; naive datetimes are taken to be UTC."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    delta = value - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1_000
+
+
+def ns_to_datetime(ns: int, tz_aware: bool = False) -> datetime:
+    value = _EPOCH + timedelta(microseconds=int(ns) // 1_000)
+    return value.replace(tzinfo=timezone.utc) if tz_aware else value
+
+
+class CandleSeries:
+    """Columnar candles for one symbol and timeframe.
+
+    Each column is a contiguous array (``timestamp`` as int64 epoch nanoseconds,
+    prices and volume as float64) with spare capacity, so ``append`` is amortized
+    O(1). Slicing returns a series that shares the parent's buffers; a slice has
+    no spare capacity, so appending to it reallocates instead of writing into the
+    parent. ``TimeframeCandle`` objects are only built on indexing or iteration.
+    """
+
+    __slots__ = ("symbol", "timeframe_min", "tz_aware", "_timestamp", "_prices", "_length")
+
+    def __init__(self, symbol: str, timeframe_min: int, capacity: int = 1024, tz_aware: bool = False) -> None:
+        self.symbol = symbol
+        self.timeframe_min = timeframe_min
+        self.tz_aware = tz_aware
+        self._timestamp = np.empty(capacity, dtype=np.int64)
+        self._prices = [np.empty(capacity, dtype=np.float64) for _ in PRICE_COLUMNS]
+        self._length = 0
+
+    @classmethod
+    def from_arrays(
+        cls,
+        symbol: str,
+        timeframe_min: int,
+        timestamp: np.ndarray,
+        open: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray,
+        vwap: np.ndarray,
+        tz_aware: bool = False,
+    ) -> "CandleSeries":
+        """Wrap existing column arrays; no copy is made when dtypes already match."""
+        series = cls.__new__(cls)
+        series.symbol = symbol
+        series.timeframe_min = timeframe_min
+        series.tz_aware = tz_aware
+        timestamp = np.asarray(timestamp)
+        if np.issubdtype(timestamp.dtype, np.datetime64):
+            timestamp = timestamp.astype("datetime64[ns]").view(np.int64)
+        series._timestamp = timestamp.astype(np.int64, copy=False)
+        series._prices = [np.asarray(column, dtype=np.float64) for column in (open, high, low, close, volume, vwap)]
+        series._length = len(series._timestamp)
+        if any(len(column) != series._length for column in series._prices):
+            raise ValueError("all candle columns must have the same length")
+        return series
+
+    @classmethod
+    def from_candles(
+        cls, candles: Iterable[TimeframeCandle], symbol: Optional[str] = None, timeframe_min: Optional[int] = None
+    ) -> "CandleSeries":
+        candle_list = list(candles)
+        first = candle_list[0] if candle_list else None
+        return cls.from_arrays(
+            symbol if symbol is not None else (first.symbol if first else ""),
+            timeframe_min if timeframe_min is not None else (first.timeframe_min if first else 1),
+            np.array([datetime_to_ns(c.timestamp) for c in candle_list], dtype=np.int64),
+            *(np.array([getattr(c, name) for c in candle_list], dtype=np.float64) for name in PRICE_COLUMNS),
+            tz_aware=bool(first and first.timestamp.tzinfo is not None),
+        )
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def timestamp(self) -> np.ndarray:
+        return self._timestamp[: self._length]
+
+    @property
+    def open(self) -> np.ndarray:
+        return self._prices[0][: self._length]
+
+    @property
+    def high(self) -> np.ndarray:
+        return self._prices[1][: self._length]
+
+    @property
+    def low(self) -> np.ndarray:
+        return self._prices[2][: self._length]
+
+    @property
+    def close(self) -> np.ndarray:
+        return self._prices[3][: self._length]
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self._prices[4][: self._length]
+
+    @property
+    def vwap(self) -> np.ndarray:
+        return self._prices[5][: self._length]
+
+    @property
+    def nbytes(self) -> int:
+        return self._length * (8 + 8 * len(PRICE_COLUMNS))
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Column views keyed by name, the input format of ``compute_features_batch``."""
+        columns = {"timestamp": self.timestamp}
+        columns.update({name: column[: self._length] for name, column in zip(PRICE_COLUMNS, self._prices)})
+        return columns
+
+    def _grow(self, minimum: int) -> None:
+        capacity = max(minimum, 2 * len(self._timestamp), 16)
+        timestamp = np.empty(capacity, dtype=np.int64)
+        timestamp[: self._length] = self._timestamp[: self._length]
+        self._timestamp = timestamp
+        prices = []
+        for column in self._prices:
+            grown = np.empty(capacity, dtype=np.float64)
+            grown[: self._length] = column[: self._length]
+            prices.append(grown)
+        self._prices = prices
+
+    def append(
+        self,
+        timestamp: Union[int, datetime],
+        open: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+        vwap: float,
+    ) -> None:
+        index = self._length
+        if index >= len(self._timestamp):
+            self._grow(index + 1)
+        self._timestamp[index] = datetime_to_ns(timestamp) if isinstance(timestamp, datetime) else timestamp
+        for column, value in zip(self._prices, (open, high, low, close, volume, vwap)):
+            column[index] = value
+        self._length = index + 1
+
+    def append_candle(self, candle: TimeframeCandle) -> None:
+        self.append(candle.timestamp, candle.open, candle.high, candle.low, candle.close, candle.volume, candle.vwap)
+
+    def candle(self, index: int) -> TimeframeCandle:
+        values = [float(column[index]) for column in self._prices]
+        return TimeframeCandle(
+            symbol=self.symbol,
+            timeframe_min=self.timeframe_min,
+            timestamp=ns_to_datetime(self._timestamp[index], self.tz_aware),
+            **dict(zip(PRICE_COLUMNS, values)),
+        )
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[TimeframeCandle, "CandleSeries"]:
+        if isinstance(index, slice):
+            return CandleSeries.from_arrays(
+                self.symbol,
+                self.timeframe_min,
+                self.timestamp[index],
+                *(column[: self._length][index] for column in self._prices),
+                tz_aware=self.tz_aware,
+            )
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("candle index out of range")
+        return self.candle(index)
+
+    def __iter__(self) -> Iterator[TimeframeCandle]:
+        for index in range(self._length):
+            yield self.candle(index)
+
+    def to_candles(self) -> List[TimeframeCandle]:
+        return list(self)
+
+    def __repr__(self) -> str:
+        return f"CandleSeries(symbol={self.symbol!r}, timeframe_min={self.timeframe_min}, length={self._length})"
+
+
+def as_series(
+    candles: Iterable[TimeframeCandle], symbol: Optional[str] = None, timeframe_min: Optional[int] = None
+) -> CandleSeries:
+    """Return ``candles`` unchanged if already columnar, else convert at the edge."""
+    if isinstance(candles, CandleSeries):
+        return candles
+    return CandleSeries.from_candles(candles, symbol=symbol, timeframe_min=timeframe_min)
+
+
+__all__ = ["CandleSeries", "PRICE_COLUMNS", "as_series", "datetime_to_ns", "ns_to_datetime"]
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Mapping, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from xrp_platform.data.candles import datetime_to_ns, ns_to_datetime
+from xrp_platform.data.storage import SCORE_COLUMNS, SignalRecord
+
+
+def history_row(row: Mapping[str, Any]) -> Dict[str, Any]:
+    """Stored signal row as a JSON-ready dict, scores folded back into one mapping."""
+    return {
+        "symbol": row["symbol"],
+        "timeframe_min": row["timeframe_min"],
+        "computed_at": row["computed_at"],
+        "composite": row["composite"],
+        "regime": row["regime"],
+        "scores": {module: row[column] for module, column in SCORE_COLUMNS.items() if row[column] is not None},
+        "thresholds": row["thresholds"],
+    }
+
+
+def history_cursor(computed_at: datetime) -> int:
+    return datetime_to_ns(computed_at)
+
+
+async def stream_signal_history(
+    engine: AsyncEngine,
+    symbol: str,
+    timeframe: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    cursor: Optional[int] = None,
+    limit: int = 1_000,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Signals for one symbol and timeframe in ``[start, end)``, oldest first.
+
+    Pages by keyset: ``cursor`` is the epoch-ns ``computed_at`` of the last row
+    already seen, so each page is one range scan of the primary key (pruned to
+    the matching monthly partitions on PostgreSQL) however deep the client is.
+    Rows are streamed from the cursor rather than fetched as a whole page.
+    """
+    table = SignalRecord.__table__
+    computed_at = table.c.computed_at
+    query = select(table).where(table.c.symbol == symbol, table.c.timeframe_min == timeframe)
+    if start is not None:
+        query = query.where(computed_at >= start)
+    if end is not None:
+        query = query.where(computed_at < end)
+    if cursor is not None:
+        query = query.where(computed_at > ns_to_datetime(cursor, tz_aware=True))
+    query = query.order_by(computed_at).limit(limit)
+
+    async with engine.connect() as conn:
+        result = await conn.stream(query)
+        async for row in result.mappings():
+            yield history_row(row)
+
+
+__all__ = ["history_cursor", "history_row", "stream_signal_history"]
@@ -21,6 +21,14 @@ class Trade(BaseModel):
     timestamp: datetime
 
 
+class NewsArticle(BaseModel):
+    title: str
+    description: Optional[str] = None
+    source: Optional[str] = None
+    url: Optional[str] = None
+    published_at: datetime
+
+
 class TimeframeCandle(BaseModel):
     symbol: str
     timeframe_min: int
@@ -66,6 +74,14 @@ class CompositeSignal(BaseModel):
     thresholds: Dict[str, float]
 
 
+class MultiTimeframeSignal(BaseModel):
+    symbol: str
+    computed_at: datetime
+    signals: List[CompositeSignal]
+    confluence: float
+    alignment: float
+
+
 class ExecutionCommand(BaseModel):
     symbol: str
     side: str
@@ -75,6 +91,8 @@ class ExecutionCommand(BaseModel):
     take_profit: float
     expires_at: datetime
     risk_tags: Dict[str, float]
+    # one command per symbol, timeframe and bar; brokers take it as the client order id
+    idempotency_key: Optional[str] = None
 
 
 class BacktestResult(BaseModel):
@@ -87,14 +105,43 @@ class BacktestResult(BaseModel):
     duration_days: float
 
 
+class SweepParams(BaseModel):
+    window: int = 60
+    thresholds: Dict[str, float] = Field(default_factory=dict)
+    base_weights: Dict[str, float] = Field(default_factory=dict)
+    regime_multipliers: Dict[str, Dict[str, float]] = Field(default_factory=dict)
+
+
+class SweepRequest(BaseModel):
+    windows: List[int] = Field(default_factory=lambda: [60])
+    thresholds: List[Dict[str, float]] = Field(default_factory=lambda: [{}])
+    base_weights: List[Dict[str, float]] = Field(default_factory=lambda: [{}])
+    regime_multipliers: List[Dict[str, Dict[str, float]]] = Field(default_factory=lambda: [{}])
+    samples: Optional[int] = None
+    seed: int = 0
+    rank_by: str = "sharpe"
+    top: Optional[int] = None
+
+
+class SweepRun(BaseModel):
+    rank: int
+    params: SweepParams
+    result: BacktestResult
+
+
 __all__ = [
     "OrderBookSnapshot",
     "Trade",
+    "NewsArticle",
     "TimeframeCandle",
     "FeatureVector",
     "SignalExplanation",
     "SignalScore",
     "CompositeSignal",
+    "MultiTimeframeSignal",
     "ExecutionCommand",
     "BacktestResult",
+    "SweepParams",
+    "SweepRequest",
+    "SweepRun",
 ]
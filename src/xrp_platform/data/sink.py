@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import orjson
+from sqlalchemy import JSON, insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from xrp_platform.data.schemas import CompositeSignal, ExecutionCommand
+from xrp_platform.data.storage import SCORE_COLUMNS, ExecutionLog, SignalRecord
+
+logger = logging.getLogger("data.sink")
+
+
+def signal_row(signal: CompositeSignal) -> Dict[str, Any]:
+    row: Dict[str, Any] = {
+        "symbol": signal.symbol,
+        "timeframe_min": signal.timeframe_min,
+        "computed_at": signal.computed_at,
+        "composite": signal.composite,
+        "regime": signal.regime,
+        "thresholds": signal.thresholds,
+    }
+    row.update({column: None for column in SCORE_COLUMNS.values()})
+    for score in signal.scores:
+        column = SCORE_COLUMNS.get(score.module)
+        if column is not None:
+            row[column] = score.score
+    return row
+
+
+def execution_row(
+    command: ExecutionCommand,
+    status: str,
+    created_at: datetime,
+    fill_price: Optional[float] = None,
+    latency_ms: Optional[float] = None,
+) -> Dict[str, Any]:
+    return {
+        "idempotency_key": command.idempotency_key,
+        "symbol": command.symbol,
+        "side": command.side,
+        "size": command.size,
+        "entry": command.entry,
+        "stop": command.stop,
+        "take_profit": command.take_profit,
+        "risk_tags": command.risk_tags,
+        "status": status,
+        "fill_price": fill_price,
+        "latency_ms": latency_ms,
+        "created_at": created_at,
+    }
+
+
+@dataclass
+class SinkStats:
+    rows: int = 0
+    flushes: int = 0
+    errors: int = 0  # failed write attempts, retried or not
+    abandoned: int = 0  # rows given up after every retry failed
+    dropped: int = 0  # rows refused by ``submit_nowait`` because the queue was full
+    last_flush_ms: float = 0.0
+    max_flush_ms: float = 0.0
+
+
+class SignalSink:
+    """Write-behind buffer that persists signals to ``SignalRecord`` in bulk.
+
+    ``submit`` only enqueues; a background task flushes when ``max_batch`` rows
+    are buffered or ``flush_interval_s`` has passed since the first buffered
+    row. PostgreSQL through psycopg is written with ``COPY``, other backends
+    with one multi-row ``executemany`` insert per flush; rows already stored
+    are skipped, and a ``COPY`` that fails is retried as an insert. A failed
+    write is retried ``max_retries`` times with exponential backoff from
+    ``retry_delay_s``; only then is the batch given up and counted in
+    ``stats.abandoned``. When the queue is full ``submit`` waits, pushing back
+    on producers instead of dropping rows; ``submit_nowait`` is for producers
+    that must not wait, and counts what it refuses in ``stats.dropped``.
+    """
+
+    table = SignalRecord.__table__
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        max_batch: int = 500,
+        flush_interval_s: float = 1.0,
+        max_queue: int = 50_000,
+        max_retries: int = 4,
+        retry_delay_s: float = 0.5,
+    ) -> None:
+        self.engine = engine
+        self.max_batch = max_batch
+        self.flush_interval_s = flush_interval_s
+        self.max_retries = max_retries
+        self.retry_delay_s = retry_delay_s
+        self.stats = SinkStats()
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._task: Optional[asyncio.Task] = None
+        self._use_copy = engine.dialect.name == "postgresql" and engine.dialect.driver == "psycopg"
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def row(self, item: Any) -> Dict[str, Any]:
+        return signal_row(item)
+
+    async def submit(self, item: Any) -> None:
+        await self._queue.put(item)
+
+    def submit_nowait(self, item: Any) -> bool:
+        """Enqueue without waiting; False (and counted as dropped) when the queue is full."""
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.stats.dropped += 1
+            return False
+        return True
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush everything submitted so far and stop the background task."""
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = loop.time() + self.flush_interval_s
+            stopping = False
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                try:
+                    if timeout <= 0:
+                        item = self._queue.get_nowait()
+                    else:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self.flush([self.row(item) for item in batch])
+            if stopping:
+                return
+
+    async def flush(self, rows: Sequence[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        started = time.perf_counter()
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self._write(rows)
+                break
+            except Exception:
+                self.stats.errors += 1
+                if attempt == self.max_retries:
+                    self.stats.abandoned += len(rows)
+                    logger.exception(
+                        "giving up on %d rows for %s after %d attempts", len(rows), self.table.name, attempt + 1
+                    )
+                    return
+                delay = self.retry_delay_s * 2**attempt
+                logger.warning(
+                    "failed to persist %d rows into %s; retrying in %.1fs",
+                    len(rows),
+                    self.table.name,
+                    delay,
+                    exc_info=True,
+                )
+                await asyncio.sleep(delay)
+        elapsed_ms = (time.perf_counter() - started) * 1_000
+        self.stats.rows += len(rows)
+        self.stats.flushes += 1
+        self.stats.last_flush_ms = elapsed_ms
+        self.stats.max_flush_ms = max(self.stats.max_flush_ms, elapsed_ms)
+
+    async def _write(self, rows: Sequence[Dict[str, Any]]) -> None:
+        if not (self._use_copy and await self._try_copy(rows)):
+            async with self.engine.begin() as conn:
+                await conn.execute(self._insert(), list(rows))
+
+    def _insert(self) -> Any:
+        dialect = self.engine.dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            return insert(self.table)
+        return dialect_insert(self.table).on_conflict_do_nothing()
+
+    async def _try_copy(self, rows: Sequence[Dict[str, Any]]) -> bool:
+        try:
+            await self._copy(rows)
+        except Exception:
+            logger.warning("COPY into %s failed; retrying %d rows with INSERT", self.table.name, len(rows))
+            return False
+        return True
+
+    async def _copy(self, rows: Sequence[Dict[str, Any]]) -> None:
+        columns: List[str] = list(rows[0])
+        json_columns = {column.name for column in self.table.columns if isinstance(column.type, JSON)}
+        statement = f"COPY {self.table.name} ({', '.join(columns)}) FROM STDIN"
+        async with self.engine.connect() as conn:
+            raw = await conn.get_raw_connection()
+            async with raw.driver_connection.cursor() as cursor:
+                async with cursor.copy(statement) as copy:
+                    for row in rows:
+                        await copy.write_row(
+                            [orjson.dumps(row[c]).decode() if c in json_columns else row[c] for c in columns]
+                        )
+            await conn.commit()
+
+
+class ExecutionSink(SignalSink):
+    """The same write-behind buffer for ``ExecutionLog``; ``submit`` takes ``execution_row`` dicts."""
+
+    table = ExecutionLog.__table__
+
+    def row(self, item: Any) -> Dict[str, Any]:
+        return item
+
+
+__all__ = ["ExecutionSink", "SignalSink", "SinkStats", "execution_row", "signal_row"]
@@ -1,33 +1,71 @@
 from __future__ import annotations
 
-from sqlalchemy import Column, DateTime, Float, Integer, JSON, String
-from sqlalchemy.ext.asyncio import AsyncAttrs, async_sessionmaker, create_async_engine
+import asyncio
+import logging
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from sqlalchemy import Column, DateTime, Float, Integer, JSON, MetaData, String, Table, inspect, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncAttrs, AsyncConnection, AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 from xrp_platform.config import get_settings
 
+logger = logging.getLogger("data.storage")
+
 
 class Base(AsyncAttrs, DeclarativeBase):
     pass
 
 
 class SignalRecord(Base):
+    """One composite signal per symbol, timeframe and bar.
+
+    The primary key doubles as the (symbol, timeframe_min, computed_at) index
+    that history range scans use, and includes the partition column so that
+    PostgreSQL can range-partition the table by month on ``computed_at``.
+    """
+
     __tablename__ = "signals"
+    __table_args__ = {"postgresql_partition_by": "RANGE (computed_at)"}
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    symbol: Mapped[str] = mapped_column(String(16), index=True)
-    timeframe_min: Mapped[int] = mapped_column(Integer, index=True)
+    symbol: Mapped[str] = mapped_column(String(16), primary_key=True)
+    timeframe_min: Mapped[int] = mapped_column(Integer, primary_key=True)
+    computed_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), primary_key=True)
     composite: Mapped[float] = mapped_column(Float)
     regime: Mapped[str] = mapped_column(String(32))
-    scores: Mapped[dict] = mapped_column(JSON)
+    score_technical_trend: Mapped[Optional[float]] = mapped_column(Float)
+    score_momentum_reversal: Mapped[Optional[float]] = mapped_column(Float)
+    score_volume_flow: Mapped[Optional[float]] = mapped_column(Float)
+    score_order_book_microstructure: Mapped[Optional[float]] = mapped_column(Float)
+    score_news_sentiment: Mapped[Optional[float]] = mapped_column(Float)
+    score_onchain_confirmation: Mapped[Optional[float]] = mapped_column(Float)
+    score_regime_classifier: Mapped[Optional[float]] = mapped_column(Float)
+    score_pattern_cluster: Mapped[Optional[float]] = mapped_column(Float)
+    score_heuristic_swarm: Mapped[Optional[float]] = mapped_column(Float)
     thresholds: Mapped[dict] = mapped_column(JSON)
-    computed_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), index=True)
+
+
+SCORE_PREFIX = "score_"
+SCORE_COLUMNS: Dict[str, str] = {
+    column.name[len(SCORE_PREFIX) :]: column.name
+    for column in SignalRecord.__table__.columns
+    if column.name.startswith(SCORE_PREFIX)
+}
 
 
 class ExecutionLog(Base):
+    """One routed command and what became of it.
+
+    ``idempotency_key`` is unique, so a command logged twice (a retried flush,
+    a restarted worker re-routing the same bar) is stored once.
+    """
+
     __tablename__ = "execution_logs"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    idempotency_key: Mapped[Optional[str]] = mapped_column(String(64), unique=True)
     symbol: Mapped[str] = mapped_column(String(16), index=True)
     side: Mapped[str] = mapped_column(String(8))
     size: Mapped[float] = mapped_column(Float)
@@ -35,12 +73,219 @@ class ExecutionLog(Base):
     stop: Mapped[float] = mapped_column(Float)
     take_profit: Mapped[float] = mapped_column(Float)
     risk_tags: Mapped[dict] = mapped_column(JSON)
+    status: Mapped[Optional[str]] = mapped_column(String(16))
+    fill_price: Mapped[Optional[float]] = mapped_column(Float)
+    latency_ms: Mapped[Optional[float]] = mapped_column(Float)
     created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), index=True)
 
 
-_settings = get_settings()
-engine = create_async_engine(_settings.database_url, future=True, echo=False)
-SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+def _column_names(sync_conn: Any, table: str) -> Set[str]:
+    inspector = inspect(sync_conn)
+    return {column["name"] for column in inspector.get_columns(table)} if inspector.has_table(table) else set()
+
+
+# columns added to ``execution_logs`` after it first shipped; ``create_all`` never
+# alters an existing table, so ``ensure_execution_log_columns`` adds them
+EXECUTION_LOG_UPGRADE_COLUMNS = ("idempotency_key", "status", "fill_price", "latency_ms")
+
+
+async def ensure_execution_log_columns(conn: AsyncConnection) -> None:
+    """Add the ``EXECUTION_LOG_UPGRADE_COLUMNS`` an older ``execution_logs`` table lacks.
+
+    New columns are nullable, so rows logged before the upgrade stay valid. An
+    added ``idempotency_key`` gets the unique index ``create_all`` would have
+    built; on a fresh table everything is already there and nothing runs.
+    """
+    existing = await conn.run_sync(_column_names, "execution_logs")
+    table = ExecutionLog.__table__
+    for name in EXECUTION_LOG_UPGRADE_COLUMNS:
+        if name in existing:
+            continue
+        column_type = table.c[name].type.compile(dialect=conn.dialect)
+        await conn.execute(text(f"ALTER TABLE execution_logs ADD COLUMN {name} {column_type}"))
+        logger.info("added execution_logs.%s", name)
+        if name == "idempotency_key":
+            await conn.execute(
+                text(
+                    "CREATE UNIQUE INDEX IF NOT EXISTS ix_execution_logs_idempotency_key "
+                    "ON execution_logs (idempotency_key)"
+                )
+            )
+
+
+def _month_start(day: date, offset: int = 0) -> date:
+    month = day.month - 1 + offset
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+async def ensure_signal_partitions(conn: AsyncConnection, around: date, months_ahead: int = 3) -> None:
+    """Create monthly ``signals`` partitions from last month to ``months_ahead``, plus a default one.
+
+    Only PostgreSQL partitions; on other backends ``signals`` is a plain table
+    and this is a no-op. The default partition catches rows outside the
+    prepared range so inserts never fail while maintenance lags behind. A month
+    that is missing is built as a plain table, filled with any of its rows that
+    already landed in the default partition, and then attached: PostgreSQL
+    refuses to attach a range the default partition still holds rows for.
+    Run it regularly (``maintain_signal_partitions``) to stay ahead of the clock.
+    """
+    if conn.dialect.name != "postgresql":
+        return
+    if not await conn.scalar(
+        text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'signals'::regclass)")
+    ):
+        raise RuntimeError(
+            "signals is not partitioned (it predates per-module score columns); "
+            "run scripts/bootstrap_db.py to migrate it"
+        )
+    await conn.execute(text("CREATE TABLE IF NOT EXISTS signals_default PARTITION OF signals DEFAULT"))
+    for offset in range(-1, months_ahead + 1):
+        lower = _month_start(around, offset)
+        upper = _month_start(around, offset + 1)
+        name = f"signals_{lower:%Y_%m}"
+        if await conn.scalar(text(f"SELECT to_regclass('{name}') IS NOT NULL")):
+            continue
+        bounds = f"computed_at >= '{lower.isoformat()}' AND computed_at < '{upper.isoformat()}'"
+        await conn.execute(text(f"CREATE TABLE {name} (LIKE signals INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+        await conn.execute(text(f"INSERT INTO {name} SELECT * FROM signals_default WHERE {bounds}"))
+        await conn.execute(text(f"DELETE FROM signals_default WHERE {bounds}"))
+        await conn.execute(
+            text(
+                f"ALTER TABLE signals ATTACH PARTITION {name} "
+                f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+            )
+        )
+
+
+async def maintain_signal_partitions(
+    engine: AsyncEngine,
+    interval_s: float = 86_400.0,
+    today: Callable[[], date] = lambda: datetime.now(timezone.utc).date(),
+    sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+) -> None:
+    """Run ``ensure_signal_partitions`` now and every ``interval_s`` until cancelled."""
+    while True:
+        try:
+            async with engine.begin() as conn:
+                await ensure_signal_partitions(conn, today())
+        except Exception:
+            logger.exception("signal partition maintenance failed")
+        await sleep(interval_s)
+
+
+# ``signals`` as first shipped: a serial id and every module score in one JSON column
+LEGACY_SIGNALS = Table(
+    "signals_legacy",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("symbol", String(16)),
+    Column("timeframe_min", Integer),
+    Column("composite", Float),
+    Column("regime", String(32)),
+    Column("scores", JSON),
+    Column("thresholds", JSON),
+    Column("computed_at", DateTime(timezone=True)),
+)
+
+
+def _legacy_scores(scores: Any) -> Dict[str, Optional[float]]:
+    """``score_*`` columns from a legacy ``scores`` value: ``{module: score}`` or dumped ``SignalScore`` list."""
+    if isinstance(scores, list):
+        scores = {item.get("module"): item.get("score") for item in scores if isinstance(item, dict)}
+    row: Dict[str, Optional[float]] = {column: None for column in SCORE_COLUMNS.values()}
+    for module, score in (scores or {}).items():
+        if module in SCORE_COLUMNS and score is not None:
+            row[SCORE_COLUMNS[module]] = float(score)
+    return row
+
+
+async def migrate_legacy_signals(conn: AsyncConnection, today: date, batch: int = 10_000) -> int:
+    """Rebuild a ``signals`` table in its first-shipped layout; returns the rows carried over.
+
+    ``create_all`` never alters an existing table, so a database bootstrapped
+    before scores got their own columns keeps a plain ``signals`` that the sink
+    cannot write and PostgreSQL cannot partition. The old table is renamed to
+    ``signals_legacy`` (kept for inspection; drop it once satisfied), the current
+    one is created and partitioned, and the rows are copied with their scores
+    spread over the ``score_*`` columns. A bar stored more than once keeps its
+    latest row. Does nothing when ``signals`` is missing or already current.
+    """
+    if "id" not in await conn.run_sync(_column_names, "signals"):
+        return 0
+    logger.warning("signals has the legacy layout; migrating it and keeping the old rows in signals_legacy")
+    await conn.execute(text("ALTER TABLE signals RENAME TO signals_legacy"))
+    if conn.dialect.name == "postgresql":
+        # the primary key index keeps its name and would clash with the new table's
+        await conn.execute(text("ALTER TABLE signals_legacy RENAME CONSTRAINT signals_pkey TO signals_legacy_pkey"))
+    await conn.run_sync(lambda sync: SignalRecord.__table__.create(sync))
+    await ensure_signal_partitions(conn, today)
+
+    latest: Dict[Tuple[str, int, Any], Dict[str, Any]] = {}
+    for row in (await conn.execute(select(LEGACY_SIGNALS).order_by(LEGACY_SIGNALS.c.id))).mappings():
+        latest[(row["symbol"], row["timeframe_min"], row["computed_at"])] = {
+            "symbol": row["symbol"],
+            "timeframe_min": row["timeframe_min"],
+            "computed_at": row["computed_at"],
+            "composite": row["composite"],
+            "regime": row["regime"],
+            "thresholds": row["thresholds"],
+            **_legacy_scores(row["scores"]),
+        }
+    rows = list(latest.values())
+    for start in range(0, len(rows), batch):
+        await conn.execute(insert(SignalRecord.__table__), rows[start : start + batch])
+    logger.info("copied %d legacy signals", len(rows))
+    return len(rows)
+
+
+def create_engine(url: Optional[str] = None) -> AsyncEngine:
+    """Async engine with a pool sized for the write-behind sinks plus API reads."""
+    settings = get_settings() if url is None else None
+    url = url or settings.database_url
+    options: dict[str, Any] = {}
+    if not url.startswith("sqlite"):
+        options.update(
+            pool_size=settings.db_pool_size if settings else 10,
+            max_overflow=settings.db_max_overflow if settings else 20,
+            pool_pre_ping=True,
+            pool_recycle=1_800,
+        )
+    return create_async_engine(url, future=True, echo=False, **options)
+
+
+@lru_cache(maxsize=1)
+def get_engine() -> AsyncEngine:
+    return create_engine()
+
+
+@lru_cache(maxsize=1)
+def get_sessionmaker() -> async_sessionmaker:
+    return async_sessionmaker(get_engine(), expire_on_commit=False)
+
+
+def __getattr__(name: str) -> Any:
+    # ``engine`` and ``SessionLocal`` are created on first use so importing the
+    # models does not require a configured environment.
+    if name == "engine":
+        return get_engine()
+    if name == "SessionLocal":
+        return get_sessionmaker()
+    raise AttributeError(name)
 
 
-__all__ = ["Base", "SignalRecord", "ExecutionLog", "engine", "SessionLocal"]
+__all__ = [
+    "Base",
+    "SignalRecord",
+    "ExecutionLog",
+    "SCORE_COLUMNS",
+    "EXECUTION_LOG_UPGRADE_COLUMNS",
+    "ensure_execution_log_columns",
+    "ensure_signal_partitions",
+    "maintain_signal_partitions",
+    "migrate_legacy_signals",
+    "create_engine",
+    "get_engine",
+    "get_sessionmaker",
+    "engine",
+    "SessionLocal",
+]
@@ -1,29 +1,107 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
-from typing import Dict
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import TYPE_CHECKING, Dict, Mapping, Optional, Union
 
-from xrp_platform.config import get_settings
+import numpy as np
+
+from xrp_platform.config import Settings, get_settings
+from xrp_platform.data.candles import datetime_to_ns
 from xrp_platform.data.schemas import CompositeSignal, ExecutionCommand
 
+if TYPE_CHECKING:
+    from .portfolio import PortfolioRisk
+
+Side = Union[str, int, np.ndarray]
+
+
+@dataclass(frozen=True)
+class RiskLimits:
+    """Sizing, stop and portfolio parameters; the ``_pct`` limits are percentages of equity."""
+
+    max_position_pct: float = 2.0
+    stop_multiplier: float = 2.0
+    take_profit_multiplier: float = 3.0
+    max_drawdown_pct: float = 10.0
+    max_exposure_pct: float = 100.0  # gross exposure across symbols
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "RiskLimits":
+        return cls(
+            settings.max_position_pct,
+            settings.stop_multiplier,
+            settings.take_profit_multiplier,
+            settings.max_drawdown_pct,
+            settings.max_exposure_pct,
+        )
+
+
+def direction(side: Side) -> Union[int, np.ndarray]:
+    """+1 for buys and -1 for sells; arrays of +1/-1 pass through."""
+    if isinstance(side, str):
+        return 1 if side.upper() == "BUY" else -1
+    return side
+
+
+def idempotency_key(signal: CompositeSignal) -> str:
+    """Identity of the order a signal may trigger: its symbol, timeframe and bar."""
+    return f"{signal.symbol}:{signal.timeframe_min}:{datetime_to_ns(signal.computed_at)}"
+
 
 class RiskEngine:
-    def __init__(self) -> None:
-        self.settings = get_settings()
+    """Position sizing and ATR stops.
+
+    Limits come from ``limits`` when given, otherwise from ``settings`` (the
+    process settings by default), so backtests can run without a live config.
+    """
+
+    def __init__(self, settings: Optional[Settings] = None, limits: Optional[RiskLimits] = None) -> None:
+        if limits is None:
+            settings = settings or get_settings()
+            limits = RiskLimits.from_settings(settings)
+        self.settings = settings
+        self.limits = limits
 
     def size_position(self, balance: float, price: float) -> float:
-        max_notional = balance * self.settings.max_position_pct / 100.0
+        max_notional = balance * self.limits.max_position_pct / 100.0
         return max_notional / price
 
-    def stops(self, price: float, atr: float) -> Dict[str, float]:
-        stop = price - atr * self.settings.stop_multiplier
-        take_profit = price + atr * self.settings.take_profit_multiplier
+    def stops(self, price: float, atr: float, side: Side = "BUY") -> Dict[str, float]:
+        """Stop below and target above the entry for buys, mirrored for sells.
+
+        Prices, ATRs and sides (as +1/-1) may also be arrays of commands.
+        """
+        sign = direction(side)
+        stop = price - sign * atr * self.limits.stop_multiplier
+        take_profit = price + sign * atr * self.limits.take_profit_multiplier
         return {"stop": stop, "take_profit": take_profit}
 
 
 class ExecutionEngine:
-    def __init__(self) -> None:
-        self.risk = RiskEngine()
+    """Turns composite signals into bracket orders.
+
+    With a ``PortfolioRisk`` attached, every order is scaled by what the
+    portfolio allows (exposure headroom, drawdown throttle, kill switch) and
+    dropped when nothing is allowed.
+    """
+
+    def __init__(
+        self,
+        settings: Optional[Settings] = None,
+        risk: Optional[RiskEngine] = None,
+        portfolio: Optional[PortfolioRisk] = None,
+    ) -> None:
+        self.risk = risk or RiskEngine(settings)
+        self.portfolio = portfolio
+
+    @staticmethod
+    def sides(composites: np.ndarray, thresholds: Mapping[str, float]) -> np.ndarray:
+        """``route``'s side for each composite: +1 buy, -1 sell, 0 no order."""
+        composites = np.asarray(composites, dtype=float)
+        return np.where(
+            composites < thresholds["bearish"], -1, np.where(composites > thresholds["bullish"], 1, 0)
+        ).astype(np.int8)
 
     def route(self, signal: CompositeSignal, balance: float, price: float, atr: float) -> ExecutionCommand | None:
         if signal.composite < signal.thresholds["bearish"]:
@@ -34,7 +112,11 @@ class ExecutionEngine:
             return None
 
         size = self.risk.size_position(balance, price)
-        stops = self.risk.stops(price, atr)
+        if self.portfolio is not None:
+            size *= self.portfolio.scale(signal.symbol, direction(side), size * price)
+            if size <= 0:
+                return None
+        stops = self.risk.stops(price, atr, side)
         expires_at = signal.computed_at + timedelta(minutes=signal.timeframe_min)
         return ExecutionCommand(
             symbol=signal.symbol,
@@ -44,8 +126,9 @@ class ExecutionEngine:
             stop=stops["stop"],
             take_profit=stops["take_profit"],
             expires_at=expires_at,
-            risk_tags={"atr": atr, "position_pct": self.risk.settings.max_position_pct},
+            risk_tags={"atr": atr, "position_pct": self.risk.limits.max_position_pct},
+            idempotency_key=idempotency_key(signal),
         )
 
 
-__all__ = ["ExecutionEngine"]
+__all__ = ["ExecutionEngine", "RiskEngine", "RiskLimits", "direction", "idempotency_key"]
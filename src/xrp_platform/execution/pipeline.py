@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional, Protocol
+
+from xrp_platform.data.schemas import CompositeSignal, ExecutionCommand
+from xrp_platform.data.sink import ExecutionSink, execution_row
+from xrp_platform.utils.dedup import DedupCache
+
+from .engine import ExecutionEngine, direction, idempotency_key
+from .portfolio import PortfolioRisk
+
+logger = logging.getLogger("execution.pipeline")
+
+FILLED, ACCEPTED, REJECTED, STALE, TIMEOUT, ERROR = "filled", "accepted", "rejected", "stale", "timeout", "error"
+
+
+@dataclass(frozen=True)
+class Dispatch:
+    """A broker's answer to one command."""
+
+    status: str
+    fill_price: Optional[float] = None
+
+
+class Broker(Protocol):
+    async def submit(self, command: ExecutionCommand) -> Dispatch:
+        """Place ``command``; a repeated ``idempotency_key`` must not place it twice."""
+
+    def mark(self, symbol: str, price: float) -> None:
+        """Latest price for ``symbol``; brokers that manage their own brackets can ignore it."""
+
+
+class _Bracket(NamedTuple):
+    side: int
+    size: float
+    stop: float
+    take_profit: float
+
+
+class PaperBroker:
+    """Local stand-in for an exchange: market fills at the entry plus slippage.
+
+    Each fill opens a bracket whose stop and take-profit are checked on every
+    ``mark``; fills and exits are booked into ``portfolio``, so routing sees
+    paper positions exactly as it would live ones. Orders are remembered by
+    idempotency key (the last ``capacity``), and a repeat returns the first answer.
+    """
+
+    def __init__(
+        self,
+        portfolio: Optional[PortfolioRisk] = None,
+        fee_bps: float = 10.0,
+        slippage_bps: float = 2.0,
+        capacity: int = 10_000,
+    ) -> None:
+        self.portfolio = portfolio
+        self.capacity = capacity
+        self._fee = fee_bps / 10_000
+        self._slippage = slippage_bps / 10_000
+        self._orders: "OrderedDict[str, Dispatch]" = OrderedDict()
+        self._brackets: Dict[str, List[_Bracket]] = {}
+
+    def _fill(self, symbol: str, side: int, size: float, price: float) -> None:
+        if self.portfolio is not None:
+            self.portfolio.on_fill(symbol, side, size, price, price * size * self._fee)
+
+    async def submit(self, command: ExecutionCommand) -> Dispatch:
+        key = command.idempotency_key
+        if key is not None and key in self._orders:
+            return self._orders[key]
+        side = direction(command.side)
+        price = command.entry * (1 + side * self._slippage)
+        self._fill(command.symbol, side, command.size, price)
+        self._brackets.setdefault(command.symbol, []).append(
+            _Bracket(side, command.size, command.stop, command.take_profit)
+        )
+        dispatch = Dispatch(FILLED, price)
+        if key is not None:
+            self._orders[key] = dispatch
+            if len(self._orders) > self.capacity:
+                self._orders.popitem(last=False)
+        return dispatch
+
+    def mark(self, symbol: str, price: float) -> None:
+        brackets = self._brackets.get(symbol)
+        if brackets:
+            still_open = []
+            for bracket in brackets:
+                side = bracket.side
+                if (price - bracket.stop) * side <= 0:
+                    self._fill(symbol, -side, bracket.size, price * (1 - side * self._slippage))
+                elif (price - bracket.take_profit) * side >= 0:
+                    self._fill(symbol, -side, bracket.size, price)
+                else:
+                    still_open.append(bracket)
+            self._brackets[symbol] = still_open
+        if self.portfolio is not None:
+            self.portfolio.mark(symbol, price)
+
+    def open_brackets(self, symbol: str) -> int:
+        return len(self._brackets.get(symbol, ()))
+
+
+@dataclass
+class PipelineStats:
+    routed: int = 0
+    duplicates: int = 0
+    dispatched: int = 0
+    dropped: int = 0
+    stale: int = 0
+    errors: int = 0
+    last_latency_ms: float = 0.0
+    max_latency_ms: float = 0.0
+    total_latency_ms: float = 0.0
+
+    @property
+    def mean_latency_ms(self) -> float:
+        return self.total_latency_ms / self.dispatched if self.dispatched else 0.0
+
+
+class _Queued(NamedTuple):
+    command: ExecutionCommand
+    queued_at: float
+
+
+class ExecutionPipeline:
+    """Routes signals into commands and dispatches them to a broker in the background.
+
+    ``submit`` runs on the signal path and stays cheap: it drops a signal whose
+    idempotency key (symbol, timeframe, bar) was already routed, routes the
+    rest and enqueues the command without awaiting anything. A background task
+    dispatches in order. Every command gets ``max_latency_s`` from ``submit``
+    to the broker's answer: one still queued past that is logged as stale
+    instead of being placed late, and a broker call is cut off at whatever is
+    left of the budget. The queue is bounded and drops its oldest command when
+    full. Outcomes and latencies go to ``stats`` and, through the write-behind
+    ``sink``, to ``ExecutionLog``.
+    """
+
+    def __init__(
+        self,
+        router: ExecutionEngine,
+        broker: Broker,
+        sink: Optional[ExecutionSink] = None,
+        balance: float = 1_000_000.0,
+        max_latency_s: float = 2.0,
+        max_queue: int = 1_000,
+        dedup_capacity: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.router = router
+        self.broker = broker
+        self.sink = sink
+        self.balance = balance
+        self.max_latency_s = max_latency_s
+        self.clock = clock
+        self.stats = PipelineStats()
+        self._keys = DedupCache(dedup_capacity)
+        self._queue: Deque[_Queued] = deque(maxlen=max_queue)
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def submit(self, signal: CompositeSignal, price: float, atr: float) -> Optional[ExecutionCommand]:
+        """Route ``signal`` at ``price`` and queue the command; None if deduplicated or not traded."""
+        self.broker.mark(signal.symbol, price)
+        if self._keys.seen(idempotency_key(signal).encode()):
+            self.stats.duplicates += 1
+            return None
+        portfolio = self.router.portfolio
+        balance = portfolio.equity if portfolio is not None else self.balance
+        command = self.router.route(signal, balance, price, atr)
+        if command is None:
+            return None
+        self.stats.routed += 1
+        if len(self._queue) == self._queue.maxlen:
+            self.stats.dropped += 1
+            logger.warning("execution queue full; dropping %s", self._queue[0].command.idempotency_key)
+        self._queue.append(_Queued(command, self.clock()))
+        self._wakeup.set()
+        return command
+
+    def start(self) -> None:
+        if self._task is None:
+            self._closing = False
+            if self.sink is not None:
+                self.sink.start()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Dispatch (or expire) whatever is queued, flush the log rows and stop."""
+        self._closing = True
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+            if self.sink is not None:
+                await self.sink.stop()
+
+    async def _run(self) -> None:
+        while True:
+            if not self._queue:
+                if self._closing:
+                    return
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            await self._dispatch(self._queue.popleft())
+
+    async def _dispatch(self, queued: _Queued) -> None:
+        command = queued.command
+        remaining = self.max_latency_s - (self.clock() - queued.queued_at)
+        if remaining <= 0:
+            self.stats.stale += 1
+            logger.warning("dropping stale command %s", command.idempotency_key)
+            dispatch = Dispatch(STALE)
+        else:
+            try:
+                dispatch = await asyncio.wait_for(self.broker.submit(command), remaining)
+            except asyncio.TimeoutError:
+                self.stats.errors += 1
+                logger.warning("broker timed out on %s", command.idempotency_key)
+                dispatch = Dispatch(TIMEOUT)
+            except Exception:
+                self.stats.errors += 1
+                logger.exception("broker failed on %s", command.idempotency_key)
+                dispatch = Dispatch(ERROR)
+        latency_ms = (self.clock() - queued.queued_at) * 1_000
+        if dispatch.status in (FILLED, ACCEPTED):
+            stats = self.stats
+            stats.dispatched += 1
+            stats.last_latency_ms = latency_ms
+            stats.max_latency_ms = max(stats.max_latency_ms, latency_ms)
+            stats.total_latency_ms += latency_ms
+        if self.sink is not None:
+            now = datetime.now(timezone.utc)
+            await self.sink.submit(execution_row(command, dispatch.status, now, dispatch.fill_price, latency_ms))
+
+
+__all__ = [
+    "ACCEPTED",
+    "Broker",
+    "Dispatch",
+    "ERROR",
+    "ExecutionPipeline",
+    "FILLED",
+    "PaperBroker",
+    "PipelineStats",
+    "REJECTED",
+    "STALE",
+    "TIMEOUT",
+]
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from .engine import RiskLimits
+
+
+@dataclass
+class _Position:
+    quantity: float = 0.0  # signed: positive long, negative short
+    mark: float = 0.0
+
+
+class PortfolioRisk:
+    """Equity, exposure and drawdown across symbols, kept current one event at a time.
+
+    Every fill and mark touches only its own symbol: the portfolio's net value
+    and gross exposure are running sums adjusted by that symbol's change, and
+    the high-water mark and drawdown are updated from the new equity. ``scale``
+    therefore answers in constant time however many positions are open. Once
+    drawdown from the high-water mark reaches ``max_drawdown_pct`` the kill
+    switch latches: orders that add risk are refused until ``rearm``, while
+    orders that reduce a position still go through. Between half the limit and
+    the limit, new risk is scaled down linearly.
+    """
+
+    def __init__(self, start_equity: float, limits: Optional[RiskLimits] = None) -> None:
+        self.limits = limits or RiskLimits()
+        self.cash = start_equity
+        self.high_water = start_equity
+        self.drawdown = 0.0
+        self.halted = False
+        self._positions: Dict[str, _Position] = {}
+        self._value = 0.0  # sum of quantity * mark
+        self._gross = 0.0  # sum of |quantity * mark|
+
+    @property
+    def equity(self) -> float:
+        return self.cash + self._value
+
+    @property
+    def gross_exposure(self) -> float:
+        return self._gross
+
+    @property
+    def net_exposure(self) -> float:
+        return self._value
+
+    def position(self, symbol: str) -> float:
+        position = self._positions.get(symbol)
+        return position.quantity if position is not None else 0.0
+
+    def _revalue(self, symbol: str, quantity: float, price: float) -> None:
+        position = self._positions.get(symbol)
+        if position is None:
+            position = self._positions[symbol] = _Position()
+        old = position.quantity * position.mark
+        new = quantity * price
+        self._value += new - old
+        self._gross += abs(new) - abs(old)
+        position.quantity, position.mark = quantity, price
+        if quantity == 0.0:
+            del self._positions[symbol]
+        self._update_drawdown()
+
+    def _update_drawdown(self) -> None:
+        equity = self.equity
+        if equity > self.high_water:
+            self.high_water = equity
+        self.drawdown = 1.0 - equity / self.high_water if self.high_water > 0 else 1.0
+        if equity <= self.high_water * (1.0 - self.limits.max_drawdown_pct / 100.0):
+            self.halted = True
+
+    def on_fill(self, symbol: str, side: int, quantity: float, price: float, fee: float = 0.0) -> None:
+        """Book a fill of ``quantity`` (unsigned) bought (+1) or sold (-1) at ``price``."""
+        self.cash -= side * quantity * price + fee
+        self._revalue(symbol, self.position(symbol) + side * quantity, price)
+
+    def mark(self, symbol: str, price: float) -> None:
+        """Mark ``symbol``'s open position to ``price``."""
+        position = self._positions.get(symbol)
+        if position is None:
+            return
+        self._revalue(symbol, position.quantity, price)
+
+    def scale(self, symbol: str, side: int, notional: float) -> float:
+        """Fraction in ``[0, 1]`` of an order of ``notional`` that the portfolio allows."""
+        if notional <= 0:
+            return 0.0
+        held = self.position(symbol)
+        if held * side < 0:
+            # reducing (or flipping) a position: allowed up to flat
+            position = self._positions[symbol]
+            return min(1.0, abs(held) * position.mark / notional)
+        if self.halted:
+            return 0.0
+        equity = self.equity
+        headroom = equity * self.limits.max_exposure_pct / 100.0 - self._gross
+        allowed = min(1.0, max(headroom, 0.0) / notional)
+        limit = self.limits.max_drawdown_pct / 100.0
+        throttle = min(1.0, max(2.0 * (1.0 - self.drawdown / limit), 0.0)) if limit > 0 else 0.0
+        return allowed * throttle
+
+    def rearm(self) -> None:
+        """Clear the kill switch and restart drawdown from the current equity."""
+        self.halted = False
+        self.high_water = self.equity
+        self.drawdown = 0.0
+
+
+__all__ = ["PortfolioRisk"]
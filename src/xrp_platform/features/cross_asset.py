@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Deque, Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from xrp_platform.data.candles import CandleSeries
+
+BENCHMARKS: Tuple[str, ...] = ("btc", "eth")
+
+
+class RollingCovariance:
+    """Mean, variance and covariance of the last ``window`` (x, y) pairs, updated in O(1).
+
+    Welford's update adds the newest pair and the inverse update removes the
+    oldest, so nothing is recomputed over the window; the sums are rebuilt
+    exactly once every ``window`` pushes so rounding cannot accumulate.
+    """
+
+    def __init__(self, window: int) -> None:
+        if window < 2:
+            raise ValueError("window must be at least 2")
+        self.window = window
+        self._pairs: Deque[Tuple[float, float]] = deque()
+        self._since_resync = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        self._mean_x = self._mean_y = 0.0
+        self._m2_x = self._m2_y = self._c_xy = 0.0
+
+    @property
+    def count(self) -> int:
+        return len(self._pairs)
+
+    def _add(self, x: float, y: float) -> None:
+        n = len(self._pairs)
+        dx = x - self._mean_x
+        self._mean_x += dx / n
+        dy = y - self._mean_y
+        self._mean_y += dy / n
+        self._m2_x += dx * (x - self._mean_x)
+        self._m2_y += dy * (y - self._mean_y)
+        self._c_xy += dx * (y - self._mean_y)
+
+    def _remove(self, x: float, y: float) -> None:
+        n = len(self._pairs)
+        if n == 0:
+            self._reset()
+            return
+        dx = x - self._mean_x
+        self._mean_x -= dx / n
+        dy = y - self._mean_y
+        self._mean_y -= dy / n
+        self._m2_x -= dx * (x - self._mean_x)
+        self._m2_y -= dy * (y - self._mean_y)
+        self._c_xy -= dx * (y - self._mean_y)
+
+    def _resync(self) -> None:
+        xs = np.fromiter((x for x, _ in self._pairs), dtype=float, count=len(self._pairs))
+        ys = np.fromiter((y for _, y in self._pairs), dtype=float, count=len(self._pairs))
+        self._mean_x, self._mean_y = float(xs.mean()), float(ys.mean())
+        dx, dy = xs - self._mean_x, ys - self._mean_y
+        self._m2_x, self._m2_y, self._c_xy = float(dx @ dx), float(dy @ dy), float(dx @ dy)
+        self._since_resync = 0
+
+    def push(self, x: float, y: float) -> None:
+        pairs = self._pairs
+        if len(pairs) == self.window:
+            old_x, old_y = pairs.popleft()
+            self._remove(old_x, old_y)
+        pairs.append((x, y))
+        self._add(x, y)
+        self._since_resync += 1
+        if self._since_resync >= self.window:
+            self._resync()
+
+    def covariance(self) -> float:
+        n = len(self._pairs)
+        return self._c_xy / (n - 1) if n >= 2 else 0.0
+
+    def correlation(self) -> float:
+        denominator = math.sqrt(max(self._m2_x, 0.0) * max(self._m2_y, 0.0))
+        return max(-1.0, min(1.0, self._c_xy / denominator)) if denominator > 1e-18 else 0.0
+
+    def beta(self) -> float:
+        """Slope of x on y: how much x moves per unit move of y."""
+        return self._c_xy / self._m2_y if self._m2_y > 1e-18 else 0.0
+
+
+class _Benchmark:
+    __slots__ = ("windows", "lags", "history")
+
+    def __init__(self, windows: Sequence[int], lead_window: int, max_lag: int) -> None:
+        self.windows = [RollingCovariance(window) for window in windows]
+        self.lags = [RollingCovariance(lead_window) for _ in range(max_lag)]
+        self.history: Deque[float] = deque(maxlen=max_lag)  # newest benchmark return last
+
+
+class CrossAssetFeatures:
+    """Rolling correlation, beta and lead-lag of one asset's returns against BTC and ETH.
+
+    Every aligned bar pushes one log return per series into a
+    ``RollingCovariance`` per benchmark and window, and into one per lag
+    ``1..max_lag`` pairing the asset's return with the benchmark's return that
+    many bars earlier. ``sync`` feeds only the bars newer than the last one seen,
+    so calling it with the same rolling window of candles every bar costs one
+    update rather than a pass over the window.
+    """
+
+    def __init__(
+        self,
+        windows: Sequence[int] = (30, 120, 480),
+        lead_window: Optional[int] = None,
+        max_lag: int = 5,
+        benchmarks: Sequence[str] = BENCHMARKS,
+    ) -> None:
+        self.windows = tuple(sorted(windows))
+        lead_window = lead_window or self.windows[len(self.windows) // 2]
+        self.max_lag = max_lag
+        self._benchmarks: Dict[str, _Benchmark] = {
+            name: _Benchmark(self.windows, lead_window, max_lag) for name in benchmarks
+        }
+        self._last_close: Dict[str, float] = {}
+        self.last_timestamp_ns: Optional[int] = None
+        self.bars = 0
+
+    def push_closes(self, close: float, benchmark_closes: Mapping[str, float]) -> None:
+        """One aligned bar: the asset's close and each benchmark's close."""
+        previous = self._last_close
+        closes = {"": close, **benchmark_closes}
+        if all(name in previous for name in closes) and all(value > 0 for value in closes.values()):
+            x = math.log(close / previous[""])
+            for name, benchmark in self._benchmarks.items():
+                y = math.log(closes[name] / previous[name])
+                for stats in benchmark.windows:
+                    stats.push(x, y)
+                # lag k pairs this bar's asset return with the benchmark return k bars back
+                for lag, lagged in enumerate(reversed(benchmark.history)):
+                    benchmark.lags[lag].push(x, lagged)
+                benchmark.history.append(y)
+            self.bars += 1
+        self._last_close = closes
+
+    def sync(self, series: CandleSeries, benchmarks: Mapping[str, CandleSeries]) -> int:
+        """Push the bars present in every series and newer than the last synced; returns how many."""
+        timestamps = series.timestamp
+        for name in self._benchmarks:
+            timestamps = np.intersect1d(timestamps, benchmarks[name].timestamp, assume_unique=True)
+        if self.last_timestamp_ns is not None:
+            timestamps = timestamps[timestamps > self.last_timestamp_ns]
+        if not len(timestamps):
+            return 0
+        closes = series.close[np.searchsorted(series.timestamp, timestamps)]
+        benchmark_closes = {
+            name: benchmarks[name].close[np.searchsorted(benchmarks[name].timestamp, timestamps)]
+            for name in self._benchmarks
+        }
+        for i, close in enumerate(closes.tolist()):
+            self.push_closes(close, {name: float(values[i]) for name, values in benchmark_closes.items()})
+        self.last_timestamp_ns = int(timestamps[-1])
+        return len(timestamps)
+
+    def stats(self, benchmark: str, window: int) -> RollingCovariance:
+        return self._benchmarks[benchmark].windows[self.windows.index(window)]
+
+    def lead_lag(self, benchmark: str) -> Tuple[int, float]:
+        """Lag in bars (0 if none) at which the benchmark best predicts the asset, and that correlation."""
+        best_lag, best = 0, 0.0
+        for lag, stats in enumerate(self._benchmarks[benchmark].lags, start=1):
+            correlation = stats.correlation() if stats.count > 2 else 0.0
+            if abs(correlation) > abs(best):
+                best_lag, best = lag, correlation
+        return best_lag, best
+
+    def features(self) -> Dict[str, float]:
+        """Cross-asset keys of the ``meta`` group of a ``FeatureVector``.
+
+        Correlation and beta are over the shortest window. ``decoupling`` is how
+        far the short-window correlation has fallen below the long-window one,
+        averaged over the benchmarks: XRP moving on its own news while the
+        market link usually holds. ``btc_lead`` is the strongest lagged
+        correlation with BTC, i.e. how much of BTC's last few bars still has to
+        show up in XRP.
+        """
+        short, long = self.windows[0], self.windows[-1]
+        features: Dict[str, float] = {}
+        decoupling = []
+        for name in self._benchmarks:
+            short_stats, long_stats = self.stats(name, short), self.stats(name, long)
+            features[f"{name}_correlation"] = short_stats.correlation()
+            features[f"{name}_beta"] = short_stats.beta()
+            decoupling.append(max(long_stats.correlation() - short_stats.correlation(), 0.0))
+        features["decoupling"] = sum(decoupling) / len(decoupling) if decoupling else 0.0
+        if "btc" in self._benchmarks:
+            features["btc_lead"] = self.lead_lag("btc")[1]
+        return features
+
+
+__all__ = ["BENCHMARKS", "CrossAssetFeatures", "RollingCovariance"]
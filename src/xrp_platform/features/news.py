@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import math
+import re
+from collections import deque
+from hashlib import blake2b
+from typing import Any, Deque, Dict, Iterable, List, Mapping, Optional, Protocol, Sequence
+
+import numpy as np
+
+from xrp_platform.data.candles import datetime_to_ns
+from xrp_platform.data.schemas import NewsArticle
+from xrp_platform.utils.dedup import DedupCache
+
+from .trade_tape import SECOND_NS
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+# syndicated copies append the outlet ("... - Reuters", "... | CoinDesk")
+_OUTLET_SUFFIX = re.compile(r"\s+[-|–—]\s+[^-|–—]{1,40}$")
+
+LEXICON: Dict[str, float] = {
+    # bullish
+    "surge": 2.5, "surges": 2.5, "soar": 2.5, "soars": 2.5, "rally": 2.0, "rallies": 2.0,
+    "jump": 1.5, "jumps": 1.5, "gain": 1.5, "gains": 1.5, "rise": 1.0, "rises": 1.0,
+    "bullish": 2.5, "breakout": 1.5, "record": 1.0, "high": 0.5, "win": 2.0, "wins": 2.0,
+    "victory": 2.5, "approve": 2.0, "approves": 2.0, "approved": 2.0, "approval": 2.0,
+    "partnership": 1.5, "partners": 1.0, "adoption": 1.5, "launch": 1.0, "launches": 1.0,
+    "listing": 1.5, "lists": 1.0, "etf": 1.0, "settlement": 0.5, "dismissed": 1.5,
+    "upgrade": 1.0, "inflows": 1.0, "recovery": 1.5, "rebound": 1.5, "optimism": 1.5,
+    # bearish
+    "crash": -3.0, "crashes": -3.0, "plunge": -2.5, "plunges": -2.5, "slump": -2.0,
+    "drop": -1.5, "drops": -1.5, "fall": -1.5, "falls": -1.5, "decline": -1.5, "declines": -1.5,
+    "bearish": -2.5, "lawsuit": -2.0, "sues": -2.0, "sued": -2.0, "charges": -1.5,
+    "fraud": -3.0, "hack": -3.0, "hacked": -3.0, "exploit": -2.5, "scam": -3.0,
+    "delist": -2.5, "delists": -2.5, "delisting": -2.5, "ban": -2.5, "bans": -2.5,
+    "reject": -2.0, "rejects": -2.0, "rejected": -2.0, "appeal": -1.0, "probe": -1.5,
+    "investigation": -1.5, "outflows": -1.0, "selloff": -2.0, "liquidations": -1.5,
+    "fear": -1.5, "warning": -1.0, "loss": -1.5, "losses": -1.5, "low": -0.5,
+}
+NEGATIONS = frozenset({"not", "no", "never", "without", "isn't", "wasn't", "won't", "don't", "didn't", "fails"})
+_NEGATION_SPAN = 3
+_NORMALIZER = 15.0  # lexicon totals map to (-1, 1) via s / sqrt(s^2 + 15)
+
+
+def normalize_headline(text: str) -> str:
+    text = _OUTLET_SUFFIX.sub("", text.strip())
+    return " ".join(_TOKEN.findall(text.lower()))
+
+
+def content_key(article: NewsArticle) -> bytes:
+    """Digest of the normalized headline, shared by syndicated copies of one story."""
+    return blake2b(normalize_headline(article.title).encode(), digest_size=16).digest()
+
+
+class Scorer(Protocol):
+    def score_batch(self, texts: Sequence[str]) -> np.ndarray:
+        """Sentiment in [-1, 1] per text."""
+
+
+class LexiconScorer:
+    """Word-weight sentiment with a short negation scope, normalized into (-1, 1)."""
+
+    def __init__(self, lexicon: Optional[Mapping[str, float]] = None) -> None:
+        self.lexicon = dict(LEXICON if lexicon is None else lexicon)
+
+    def score(self, text: str) -> float:
+        lexicon = self.lexicon
+        total = 0.0
+        negated_until = -1
+        for position, token in enumerate(_TOKEN.findall(text.lower())):
+            if token in NEGATIONS:
+                negated_until = position + _NEGATION_SPAN
+                continue
+            weight = lexicon.get(token)
+            if weight is not None:
+                total += -weight if position <= negated_until else weight
+        return total / math.sqrt(total * total + _NORMALIZER)
+
+    def score_batch(self, texts: Sequence[str]) -> np.ndarray:
+        return np.fromiter((self.score(text) for text in texts), dtype=float, count=len(texts))
+
+
+class ModelScorer:
+    """Adapter for a fitted scikit-learn style text classifier (e.g. a TF-IDF pipeline).
+
+    The expected score is the class probabilities weighted by the class labels,
+    so models trained on labels in [-1, 1] (negative/neutral/positive) map
+    directly onto the lexicon's range.
+    """
+
+    def __init__(self, model: Any) -> None:
+        self.model = model
+        self._labels = np.asarray(model.classes_, dtype=float)
+
+    def score_batch(self, texts: Sequence[str]) -> np.ndarray:
+        if not texts:
+            return np.empty(0)
+        return np.clip(self.model.predict_proba(list(texts)) @ self._labels, -1.0, 1.0)
+
+
+class SentimentState:
+    """Exponentially decayed sentiment of one symbol's news flow, updated per article.
+
+    ``level`` is the decay-weighted mean article score over a slow half-life and
+    ``velocity`` the fast-minus-slow level, i.e. how far the latest coverage has
+    moved from the prevailing tone. Scores are also summed into ``bucket_s``
+    buckets, and ``shock`` is the z-score of the current bucket against the
+    last ``shock_buckets`` closed ones, reported once it clears ``shock_z``.
+    All state is O(1) per article and fixed in size.
+    """
+
+    def __init__(
+        self,
+        fast_half_life_s: float = 3_600.0,
+        slow_half_life_s: float = 21_600.0,
+        bucket_s: int = 900,
+        shock_buckets: int = 96,
+        shock_z: float = 3.0,
+    ) -> None:
+        self._rates = (math.log(2) / fast_half_life_s, math.log(2) / slow_half_life_s)
+        self.bucket_s = bucket_s
+        self.shock_z = shock_z
+        self._sums = [0.0, 0.0]  # decayed score sums (fast, slow) as of _time_s
+        self._weights = [0.0, 0.0]
+        self._time_s: Optional[float] = None
+        self._bucket: Optional[int] = None
+        self._current = 0.0
+        self._history: Deque[float] = deque(maxlen=shock_buckets)
+        self._history_sum = 0.0
+        self._history_sq = 0.0
+        self.articles = 0
+
+    def _close_bucket(self, value: float) -> None:
+        history = self._history
+        if len(history) == history.maxlen:
+            old = history[0]
+            self._history_sum -= old
+            self._history_sq -= old * old
+        history.append(value)
+        self._history_sum += value
+        self._history_sq += value * value
+
+    def advance(self, now_s: float) -> None:
+        """Move the clock forward, decaying the levels and closing elapsed buckets."""
+        if self._time_s is None:
+            self._time_s = now_s
+            self._bucket = int(now_s // self.bucket_s)
+            return
+        if now_s <= self._time_s:
+            return
+        elapsed = now_s - self._time_s
+        for i, rate in enumerate(self._rates):
+            decay = math.exp(-rate * elapsed)
+            self._sums[i] *= decay
+            self._weights[i] *= decay
+        self._time_s = now_s
+        bucket = int(now_s // self.bucket_s)
+        if bucket > self._bucket:
+            self._close_bucket(self._current)
+            for _ in range(min(bucket - self._bucket - 1, self._history.maxlen)):
+                self._close_bucket(0.0)
+            self._current = 0.0
+            self._bucket = bucket
+
+    def add(self, score: float, published_s: float) -> None:
+        self.advance(published_s)
+        # late articles count with the weight they would have decayed to by now
+        age = max(self._time_s - published_s, 0.0)
+        for i, rate in enumerate(self._rates):
+            weight = math.exp(-rate * age)
+            self._sums[i] += score * weight
+            self._weights[i] += weight
+        self._current += score
+        self.articles += 1
+
+    def _level(self, i: int) -> float:
+        return self._sums[i] / self._weights[i] if self._weights[i] > 1e-9 else 0.0
+
+    def shock(self) -> float:
+        count = len(self._history)
+        if count < 2:
+            return 0.0
+        mean = self._history_sum / count
+        variance = max(self._history_sq / count - mean * mean, 0.0)
+        # a quiet history would make any single article a shock; floor the spread
+        z = (self._current - mean) / max(math.sqrt(variance), 0.5)
+        return math.tanh(z / self.shock_z) if abs(z) >= self.shock_z else 0.0
+
+    def features(self, now_s: Optional[float] = None) -> Dict[str, float]:
+        """The ``news`` group of a ``FeatureVector``."""
+        if now_s is not None:
+            self.advance(now_s)
+        fast, slow = self._level(0), self._level(1)
+        return {"sentiment_level": slow, "sentiment_velocity": fast - slow, "shock": self.shock()}
+
+
+class NewsSentiment:
+    """Dedups, batch-scores and routes news articles into per-symbol sentiment state.
+
+    Each ``ingest`` call drops articles whose normalized headline is already in
+    the LRU (syndicated copies, re-polled pages), scores the remainder in one
+    ``score_batch`` call and folds them into every symbol whose keywords the
+    article mentions, oldest first. Without keywords every article applies to
+    every symbol, which suits a feed that is already filtered to one asset.
+    """
+
+    def __init__(
+        self,
+        symbols: Iterable[str],
+        scorer: Optional[Scorer] = None,
+        keywords: Optional[Mapping[str, Sequence[str]]] = None,
+        dedup_capacity: int = 100_000,
+        **state_options: Any,
+    ) -> None:
+        self.scorer = scorer if scorer is not None else LexiconScorer()
+        self.states: Dict[str, SentimentState] = {symbol: SentimentState(**state_options) for symbol in symbols}
+        self.keywords = {
+            symbol: frozenset(term.lower() for term in terms) for symbol, terms in (keywords or {}).items()
+        }
+        self.dedup = DedupCache(dedup_capacity)
+        self.duplicates = 0
+
+    def _symbols(self, text: str) -> List[str]:
+        if not self.keywords:
+            return list(self.states)
+        tokens = set(_TOKEN.findall(text.lower()))
+        return [symbol for symbol, terms in self.keywords.items() if symbol in self.states and terms & tokens]
+
+    def ingest(self, articles: Iterable[NewsArticle]) -> int:
+        """Score and apply the articles not seen before; returns how many were new."""
+        fresh = []
+        for article in articles:
+            if self.dedup.seen(content_key(article)):
+                self.duplicates += 1
+            else:
+                fresh.append(article)
+        if not fresh:
+            return 0
+        fresh.sort(key=lambda article: article.published_at)
+        texts = [f"{article.title}. {article.description or ''}" for article in fresh]
+        scores = self.scorer.score_batch(texts)
+        for article, text, score in zip(fresh, texts, scores.tolist()):
+            published_s = datetime_to_ns(article.published_at) / SECOND_NS
+            for symbol in self._symbols(text):
+                self.states[symbol].add(score, published_s)
+        return len(fresh)
+
+    def features(self, symbol: str, now_s: Optional[float] = None) -> Optional[Dict[str, float]]:
+        state = self.states.get(symbol)
+        if state is None or not state.articles:
+            return None
+        return state.features(now_s)
+
+
+__all__ = [
+    "LEXICON",
+    "LexiconScorer",
+    "ModelScorer",
+    "NewsSentiment",
+    "SentimentState",
+    "content_key",
+    "normalize_headline",
+]
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import math
+from collections import deque
+from hashlib import blake2b
+from typing import Any, Deque, Dict, Iterable, List, Mapping, Optional, Union
+
+import numpy as np
+
+RIPPLE_EPOCH_S = 946_684_800  # ledger close times count seconds from 2000-01-01 UTC
+DROPS_PER_XRP = 1_000_000
+
+_HASH_BITS = 64
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+def _estimate(registers: np.ndarray) -> float:
+    """HyperLogLog cardinality estimate with linear counting for small sets."""
+    m = registers.shape[-1]
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / float(np.sum(np.ldexp(1.0, -registers.astype(np.int32))))
+    zeros = int(np.count_nonzero(registers == 0))
+    if estimate <= 2.5 * m and zeros:
+        return m * math.log(m / zeros)
+    return estimate
+
+
+class HyperLogLog:
+    """Distinct-count sketch in ``2 ** precision`` one-byte registers.
+
+    The standard error is about ``1.04 / sqrt(2 ** precision)`` (1.6% at the
+    default 12), independent of how many values are added. Sketches with the
+    same precision merge by taking the register-wise maximum.
+    """
+
+    def __init__(self, precision: int = 12) -> None:
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        self._rest_bits = _HASH_BITS - precision
+        self._rest_mask = (1 << self._rest_bits) - 1
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: str) -> None:
+        hashed = _hash(value)
+        index = hashed >> self._rest_bits
+        rank = self._rest_bits - (hashed & self._rest_mask).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, values: Iterable[str]) -> None:
+        for value in values:
+            self.add(value)
+
+    def clear(self) -> None:
+        self.registers[:] = bytes(len(self.registers))
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.precision != self.precision:
+            raise ValueError("cannot merge sketches of different precision")
+        merged = np.maximum(np.frombuffer(self.registers, dtype=np.uint8), np.frombuffer(other.registers, dtype=np.uint8))
+        self.registers[:] = merged.tobytes()
+
+    def count(self) -> float:
+        return _estimate(np.frombuffer(self.registers, dtype=np.uint8))
+
+
+def _xrp(amount: Any) -> Optional[float]:
+    """XRP amounts are drop strings; issued currencies are objects and are not counted.
+
+    Old ledgers report ``delivered_amount`` as ``"unavailable"``; non-numeric
+    strings like that are not counted either.
+    """
+    if isinstance(amount, int):
+        return amount / DROPS_PER_XRP
+    if isinstance(amount, str) and amount.isdigit():
+        return int(amount) / DROPS_PER_XRP
+    return None
+
+
+def exchange_index(entries: Union[Mapping[str, str], Iterable[str]]) -> Dict[str, str]:
+    """Address to exchange label from a mapping or ``"label:address"`` / bare address entries."""
+    if isinstance(entries, Mapping):
+        return dict(entries)
+    index: Dict[str, str] = {}
+    for entry in entries:
+        label, _, address = entry.rpartition(":")
+        index[address.strip()] = label.strip() or address.strip()
+    return index
+
+
+class OnChainIndexer:
+    """Incremental XRPL ledger indexer producing the ``onchain`` feature group.
+
+    Ledgers are folded in as they validate: every successful transaction marks
+    its sender (and a payment's destination) active, and delivered XRP moving
+    between a known exchange address and the outside world counts as exchange
+    inflow or outflow. Transfers between wallets of the same exchange are
+    internal shuffling and ignored.
+
+    State lives in a ring of ``bucket_s`` buckets spanning ``long_s``: each
+    bucket holds its inflow, outflow and a HyperLogLog sketch of its active
+    addresses, so window totals and distinct counts are sums and register
+    maxima over the ring and memory stays constant however many ledgers are
+    indexed. When a bucket closes, the distinct count of the short window ending
+    there is sampled, giving the baseline the current short window's activity
+    is compared against.
+    """
+
+    def __init__(
+        self,
+        exchanges: Union[Mapping[str, str], Iterable[str]] = (),
+        short_s: int = 3_600,
+        long_s: int = 86_400,
+        bucket_s: int = 300,
+        precision: int = 12,
+    ) -> None:
+        if short_s % bucket_s or long_s % short_s:
+            raise ValueError("windows must be whole multiples of the bucket (and long of short)")
+        self.exchanges = exchange_index(exchanges)
+        self.bucket_s = bucket_s
+        self.short_buckets = short_s // bucket_s
+        self.long_buckets = long_s // bucket_s
+        self._inflow = np.zeros(self.long_buckets)
+        self._outflow = np.zeros(self.long_buckets)
+        self._sketches: List[HyperLogLog] = [HyperLogLog(precision) for _ in range(self.long_buckets)]
+        self._samples: Deque[float] = deque(maxlen=self.long_buckets - self.short_buckets + 1)
+        self._bucket: Optional[int] = None  # absolute index of the newest bucket
+        self.last_ledger_index: Optional[int] = None
+        self.close_time_s: Optional[int] = None  # unix seconds of the newest ledger
+        self.ledgers = 0
+        self.transactions = 0
+        self.skipped_ledgers = 0
+        self.malformed_transactions = 0
+
+    def _advance(self, bucket: int) -> None:
+        if self._bucket is None:
+            self._bucket = bucket
+            return
+        steps = min(bucket - self._bucket, self.long_buckets)
+        for _ in range(max(steps, 0)):
+            self._samples.append(self._window_count(self.short_buckets))
+            self._bucket += 1
+            slot = self._bucket % self.long_buckets
+            self._inflow[slot] = self._outflow[slot] = 0.0
+            self._sketches[slot].clear()
+        # a gap longer than the ring leaves only empty buckets behind
+        self._bucket = max(self._bucket, bucket)
+
+    def _slots(self, buckets: int) -> List[int]:
+        newest = self._bucket or 0
+        return [(newest - i) % self.long_buckets for i in range(min(buckets, self.long_buckets))]
+
+    def _window_count(self, buckets: int) -> float:
+        registers = [np.frombuffer(self._sketches[slot].registers, dtype=np.uint8) for slot in self._slots(buckets)]
+        return _estimate(np.maximum.reduce(registers))
+
+    def process_ledger(self, ledger: Mapping[str, Any]) -> int:
+        """Fold one expanded ledger (``ledger`` RPC result) in; returns the transactions applied.
+
+        Ledgers at or below the last one indexed are skipped, so overlapping
+        batches and replays after a reconnect are harmless. The whole ledger is
+        parsed before any state changes: a ledger that fails to parse is left
+        unindexed for the next poll rather than half applied and then skipped.
+        A transaction missing its accounts is skipped and counted in
+        ``malformed_transactions``.
+        """
+        ledger = ledger.get("ledger", ledger)
+        index = int(ledger["ledger_index"])
+        if self.last_ledger_index is not None and index <= self.last_ledger_index:
+            self.skipped_ledgers += 1
+            return 0
+        close_time_s = int(ledger["close_time"]) + RIPPLE_EPOCH_S
+        exchanges = self.exchanges
+
+        addresses: List[str] = []
+        inflow = outflow = 0.0
+        applied = malformed = 0
+        for entry in ledger.get("transactions", ()):
+            tx = entry.get("tx_json", entry)
+            meta = entry.get("meta") or entry.get("metaData") or {}
+            if meta.get("TransactionResult", "tesSUCCESS") != "tesSUCCESS":
+                continue
+            source = tx.get("Account")
+            payment = tx.get("TransactionType") == "Payment"
+            destination = tx.get("Destination") if payment else None
+            if source is None or (payment and destination is None):
+                malformed += 1
+                continue
+            applied += 1
+            addresses.append(source)
+            if not payment:
+                continue
+            addresses.append(destination)
+            # partial payments deliver less than Amount; the metadata has what arrived
+            amount = _xrp(meta.get("delivered_amount", meta.get("DeliveredAmount", tx.get("Amount"))))
+            if amount is None:
+                continue
+            source_exchange, destination_exchange = exchanges.get(source), exchanges.get(destination)
+            if source_exchange == destination_exchange:
+                continue
+            if destination_exchange is not None:
+                inflow += amount
+            if source_exchange is not None:
+                outflow += amount
+
+        self.last_ledger_index = index
+        self.close_time_s = max(close_time_s, self.close_time_s or close_time_s)
+        self._advance(self.close_time_s // self.bucket_s)
+        slot = self._bucket % self.long_buckets
+        sketch = self._sketches[slot]
+        for address in addresses:
+            sketch.add(address)
+        self._inflow[slot] += inflow
+        self._outflow[slot] += outflow
+        self.ledgers += 1
+        self.transactions += applied
+        self.malformed_transactions += malformed
+        return applied
+
+    def process(self, ledgers: Iterable[Mapping[str, Any]]) -> int:
+        return sum(self.process_ledger(ledger) for ledger in ledgers)
+
+    def net_inflow(self, buckets: Optional[int] = None) -> float:
+        """XRP into exchanges minus out of them over the newest ``buckets`` (default: all)."""
+        slots = self._slots(buckets or self.long_buckets)
+        return float(self._inflow[slots].sum() - self._outflow[slots].sum())
+
+    def active_addresses(self, buckets: Optional[int] = None) -> float:
+        return self._window_count(buckets or self.short_buckets)
+
+    def features(self) -> Dict[str, float]:
+        """The ``onchain`` group of a ``FeatureVector``.
+
+        ``flow_direction`` is the short-window net exchange outflow and
+        ``exchange_balance_delta`` the long-window net inflow, each as a share of
+        the gross exchange flow in that window, in [-1, 1]. ``active_address_divergence``
+        is the log ratio of the current short window's active addresses to the
+        average of the short windows before it, squashed into (-1, 1).
+        """
+        short, long = self._slots(self.short_buckets), self._slots(self.long_buckets)
+        short_in, short_out = float(self._inflow[short].sum()), float(self._outflow[short].sum())
+        long_in, long_out = float(self._inflow[long].sum()), float(self._outflow[long].sum())
+        divergence = 0.0
+        if self._samples:
+            baseline = sum(self._samples) / len(self._samples)
+            current = self._window_count(self.short_buckets)
+            if baseline > 0 and current > 0:
+                divergence = math.tanh(math.log(current / baseline))
+        return {
+            "flow_direction": (short_out - short_in) / (short_out + short_in) if short_out + short_in else 0.0,
+            "active_address_divergence": divergence,
+            "exchange_balance_delta": (long_in - long_out) / (long_in + long_out) if long_in + long_out else 0.0,
+        }
+
+
+__all__ = ["HyperLogLog", "OnChainIndexer", "RIPPLE_EPOCH_S", "exchange_index"]
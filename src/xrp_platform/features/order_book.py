@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from xrp_platform.data.schemas import OrderBookSnapshot
+
+Level = Sequence[float]
+
+
+class BookSide:
+    """Price levels of one side kept in a sorted list with a size per price.
+
+    Keys are stored so that the best level is always first: bids as negated
+    prices, asks as prices. Inserting or removing a level is a bisect plus a
+    list memmove, and the depth of the top levels is read off the list head.
+    """
+
+    def __init__(self, descending: bool) -> None:
+        self._sign = -1.0 if descending else 1.0
+        self._keys: List[float] = []
+        self._sizes: Dict[float, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._sizes.clear()
+
+    def size(self, price: float) -> float:
+        return self._sizes.get(self._sign * price, 0.0)
+
+    def set(self, price: float, size: float) -> Tuple[float, int]:
+        """Set the size at ``price`` (0 removes it); returns the previous size and the level's rank."""
+        key = self._sign * price
+        previous = self._sizes.get(key, 0.0)
+        rank = bisect_left(self._keys, key)
+        if size > 0:
+            if not previous:
+                self._keys.insert(rank, key)
+            self._sizes[key] = size
+        elif previous:
+            del self._keys[rank]
+            del self._sizes[key]
+        return previous, rank
+
+    def best(self) -> Optional[Tuple[float, float]]:
+        if not self._keys:
+            return None
+        key = self._keys[0]
+        return self._sign * key, self._sizes[key]
+
+    def depth(self, levels: int) -> float:
+        sizes = self._sizes
+        return sum(sizes[key] for key in self._keys[:levels])
+
+    def levels(self, count: Optional[int] = None) -> List[Tuple[float, float]]:
+        keys = self._keys if count is None else self._keys[:count]
+        return [(self._sign * key, self._sizes[key]) for key in keys]
+
+
+class OrderBook:
+    """Price-level order book maintained from diff updates, with microstructure features.
+
+    Updates are absolute sizes per price level as exchanges send them (size 0
+    deletes the level). Besides the book itself, every update feeds exponentially
+    decayed counters of size added and cancelled within the top ``depth_levels``:
+    size pulled from a level behind the touch is counted as a cancel, since fills
+    only happen at the best level. ``spoof_likelihood`` is the decayed cancelled
+    share of that added size, so walls that keep appearing and vanishing without
+    trading push it towards 1.
+    """
+
+    def __init__(self, symbol: str, depth_levels: int = 10, half_life_updates: float = 500.0) -> None:
+        self.symbol = symbol
+        self.depth_levels = depth_levels
+        self.bids = BookSide(descending=True)
+        self.asks = BookSide(descending=False)
+        self.updates = 0
+        self.timestamp_ns: Optional[int] = None
+        self._decay = 0.5 ** (1.0 / half_life_updates)
+        self._added = 0.0
+        self._cancelled = 0.0
+
+    @classmethod
+    def from_snapshot(cls, snapshot: OrderBookSnapshot, **kwargs: float) -> "OrderBook":
+        book = cls(snapshot.symbol, **kwargs)
+        book.apply_snapshot(snapshot.bids, snapshot.asks)
+        return book
+
+    def apply_snapshot(self, bids: Iterable[Level], asks: Iterable[Level]) -> None:
+        """Replace the whole book; spoof counters keep their history."""
+        self.bids.clear()
+        self.asks.clear()
+        for price, size in bids:
+            self.bids.set(price, size)
+        for price, size in asks:
+            self.asks.set(price, size)
+
+    def update(self, is_bid: bool, price: float, size: float, timestamp_ns: Optional[int] = None) -> None:
+        side = self.bids if is_bid else self.asks
+        previous, rank = side.set(price, size)
+        self.updates += 1
+        if timestamp_ns is not None:
+            self.timestamp_ns = timestamp_ns
+        self._added *= self._decay
+        self._cancelled *= self._decay
+        if rank >= self.depth_levels:
+            return
+        delta = size - previous
+        if delta > 0:
+            self._added += delta
+        elif rank > 0:
+            self._cancelled -= delta
+
+    def apply_diff(self, bids: Iterable[Level], asks: Iterable[Level], timestamp_ns: Optional[int] = None) -> None:
+        """Apply one exchange depth-diff message of ``[price, size]`` pairs per side."""
+        for price, size in bids:
+            self.update(True, price, size, timestamp_ns)
+        for price, size in asks:
+            self.update(False, price, size, timestamp_ns)
+
+    def mid(self) -> Optional[float]:
+        bid, ask = self.bids.best(), self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return (bid[0] + ask[0]) / 2
+
+    def microprice(self) -> Optional[float]:
+        """Touch prices weighted by the opposite side's size: leans towards the thinner side."""
+        bid, ask = self.bids.best(), self.asks.best()
+        if bid is None or ask is None:
+            return None
+        (bid_price, bid_size), (ask_price, ask_size) = bid, ask
+        return (bid_price * ask_size + ask_price * bid_size) / (bid_size + ask_size)
+
+    def depth_skew(self) -> float:
+        """Bid minus ask depth over the top levels, as a share of both, in [-1, 1]."""
+        bid_depth = self.bids.depth(self.depth_levels)
+        ask_depth = self.asks.depth(self.depth_levels)
+        total = bid_depth + ask_depth
+        return (bid_depth - ask_depth) / total if total else 0.0
+
+    def microprice_drift(self) -> float:
+        """Microprice offset from the mid in half-spreads, in [-1, 1]."""
+        bid, ask = self.bids.best(), self.asks.best()
+        if bid is None or ask is None or ask[0] <= bid[0]:
+            return 0.0
+        half_spread = (ask[0] - bid[0]) / 2
+        return (self.microprice() - (bid[0] + ask[0]) / 2) / half_spread
+
+    def spoof_likelihood(self) -> float:
+        if self._added <= 0:
+            return 0.0
+        return min(self._cancelled / self._added, 1.0)
+
+    def features(self) -> Dict[str, float]:
+        """The ``order_book`` group of a ``FeatureVector``."""
+        return {
+            "depth_skew": self.depth_skew(),
+            "spoof_likelihood": self.spoof_likelihood(),
+            "microprice_drift": self.microprice_drift(),
+        }
+
+
+__all__ = ["BookSide", "OrderBook"]
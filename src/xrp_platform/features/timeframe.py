@@ -1,50 +1,234 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
+from xrp_platform.data.candles import CandleSeries, as_series, datetime_to_ns, ns_to_datetime
 from xrp_platform.data.schemas import TimeframeCandle
 
+MINUTE_NS = 60_000_000_000
+# Weekly bars open on Monday 00:00 UTC like exchange klines; the epoch itself was a Thursday.
+_WEEK_ORIGIN_NS = 4 * 1_440 * MINUTE_NS
+
+
+def bucket_origin(timeframe: int) -> int:
+    return _WEEK_ORIGIN_NS if timeframe % 10_080 == 0 else 0
+
+
+def bucket_start(timestamp_ns: Union[int, np.ndarray], timeframe: int) -> Union[int, np.ndarray]:
+    """Open time of the ``timeframe``-minute bar containing ``timestamp_ns``.
+
+    Buckets are aligned to the epoch (weeks to Monday), so any timeframe works,
+    including ones such as 240 or 1440 minutes that do not divide an hour.
+    """
+    step = timeframe * MINUTE_NS
+    origin = bucket_origin(timeframe)
+    return (timestamp_ns - origin) // step * step + origin
+
+
+def _reduce(
+    timestamps: np.ndarray, columns: Dict[str, np.ndarray], target_timeframe: int
+) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Bucket starts and OHLC, volume and volume-weighted price sums per ``target_timeframe`` bar.
+
+    ``columns`` carries ``vwap_num`` (vwap x volume) rather than vwap so the sums
+    can be reduced again into coarser bars without round-tripping through vwap.
+    """
+    buckets = bucket_start(timestamps, target_timeframe)
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(buckets)] - 1
+    return buckets[starts], {
+        "open": columns["open"][starts],
+        "high": np.maximum.reduceat(columns["high"], starts),
+        "low": np.minimum.reduceat(columns["low"], starts),
+        "close": columns["close"][ends],
+        "volume": np.add.reduceat(columns["volume"], starts),
+        "vwap_num": np.add.reduceat(columns["vwap_num"], starts),
+    }
+
+
+def _to_series(
+    symbol: str, timeframe: int, timestamps: np.ndarray, columns: Dict[str, np.ndarray], tz_aware: bool
+) -> CandleSeries:
+    volume = columns["volume"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vwap = np.where(volume != 0, columns["vwap_num"] / volume, columns["close"])
+    return CandleSeries.from_arrays(
+        symbol,
+        timeframe,
+        timestamp=timestamps,
+        open=columns["open"],
+        high=columns["high"],
+        low=columns["low"],
+        close=columns["close"],
+        volume=volume,
+        vwap=vwap,
+        tz_aware=tz_aware,
+    )
+
+
+def _sorted_columns(series: CandleSeries) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    timestamps = series.timestamp
+    columns = {
+        "open": series.open,
+        "high": series.high,
+        "low": series.low,
+        "close": series.close,
+        "volume": series.volume,
+        "vwap_num": series.vwap * series.volume,
+    }
+    if np.any(timestamps[1:] < timestamps[:-1]):
+        order = np.argsort(timestamps, kind="stable")
+        timestamps = timestamps[order]
+        columns = {name: values[order] for name, values in columns.items()}
+    return timestamps, columns
+
+
+def resample(series: CandleSeries, target_timeframe: int) -> CandleSeries:
+    """Aggregate a whole series into ``target_timeframe`` bars with segment reductions."""
+    if len(series) == 0:
+        return CandleSeries(series.symbol, target_timeframe, capacity=0, tz_aware=series.tz_aware)
+    timestamps, columns = _reduce(*_sorted_columns(series), target_timeframe)
+    return _to_series(series.symbol, target_timeframe, timestamps, columns, series.tz_aware)
+
+
+def _nests(finer: int, coarser: int) -> bool:
+    """Whether every ``finer`` bar lies inside a single ``coarser`` bar."""
+    step = finer * MINUTE_NS
+    return coarser % finer == 0 and (bucket_origin(coarser) - bucket_origin(finer)) % step == 0
+
+
+def resample_many(series: CandleSeries, timeframes: Iterable[int]) -> Dict[int, CandleSeries]:
+    """Aggregate ``series`` into every timeframe in one cascade.
+
+    Each timeframe is reduced from the coarsest already-built timeframe whose bars
+    nest inside its own (1m -> 5m -> 60m -> 240m -> 1440m -> 10080m), carrying the
+    volume and volume-weighted price sums along, so each level only touches the
+    bars of the level below instead of the whole base history.
+    """
+    base = series.timeframe_min
+    result: Dict[int, CandleSeries] = {}
+    if len(series) == 0:
+        return {tf: resample(series, tf) for tf in timeframes}
+    built: Dict[int, Tuple[np.ndarray, Dict[str, np.ndarray]]] = {base: _sorted_columns(series)}
+    for timeframe in sorted(set(timeframes)):
+        if timeframe == base:
+            result[timeframe] = series
+            continue
+        sources = [tf for tf in built if _nests(tf, timeframe)]
+        source = max(sources) if sources else base
+        built[timeframe] = _reduce(*built[source], timeframe)
+        result[timeframe] = _to_series(series.symbol, timeframe, *built[timeframe], series.tz_aware)
+    return result
+
 
 class TimeframeAggregator:
     def __init__(self, base_timeframe: int = 1):
         self.base_timeframe = base_timeframe
 
-    def aggregate(self, candles: Iterable[TimeframeCandle], target_timeframe: int) -> List[TimeframeCandle]:
-        grouped: Dict[datetime, List[TimeframeCandle]] = {}
-        for candle in candles:
-            bucket = candle.timestamp - timedelta(
-                minutes=candle.timestamp.minute % target_timeframe,
-                seconds=candle.timestamp.second,
-                microseconds=candle.timestamp.microsecond,
-            )
-            grouped.setdefault(bucket, []).append(candle)
-
-        aggregated: List[TimeframeCandle] = []
-        for bucket, group in grouped.items():
-            opens = [c.open for c in group]
-            highs = [c.high for c in group]
-            lows = [c.low for c in group]
-            closes = [c.close for c in group]
-            volumes = [c.volume for c in group]
-            vwap_num = sum(c.vwap * c.volume for c in group)
-            vwap_den = sum(c.volume for c in group)
-            aggregated.append(
-                TimeframeCandle(
-                    symbol=group[0].symbol,
-                    timeframe_min=target_timeframe,
-                    open=opens[0],
-                    high=max(highs),
-                    low=min(lows),
-                    close=closes[-1],
-                    volume=float(np.sum(volumes)),
-                    vwap=float(vwap_num / vwap_den) if vwap_den else closes[-1],
-                    timestamp=bucket,
-                )
-            )
-        return sorted(aggregated, key=lambda c: c.timestamp)
-
-
-__all__ = ["TimeframeAggregator"]
+    def resample(self, candles: Union[CandleSeries, Iterable[TimeframeCandle]], target_timeframe: int) -> CandleSeries:
+        return resample(as_series(candles, None, self.base_timeframe), target_timeframe)
+
+    def aggregate(
+        self, candles: Union[CandleSeries, Iterable[TimeframeCandle]], target_timeframe: int
+    ) -> List[TimeframeCandle]:
+        return self.resample(candles, target_timeframe).to_candles()
+
+    def resample_many(
+        self, candles: Union[CandleSeries, Iterable[TimeframeCandle]], timeframes: Iterable[int]
+    ) -> Dict[int, CandleSeries]:
+        return resample_many(as_series(candles, None, self.base_timeframe), timeframes)
+
+
+class StreamingAggregator:
+    """Incremental multi-timeframe bar builder fed one base bar at a time.
+
+    A partial bar is kept per timeframe; ``update`` folds the new base bar into
+    each of them (O(number of timeframes)) and returns the bars it completed. A
+    bar completes when the base bar covering its last slot arrives, or when a bar
+    from a later bucket shows up after a gap.
+    """
+
+    def __init__(self, symbol: str, timeframes: Sequence[int], base_timeframe: int = 1, tz_aware: bool = False) -> None:
+        self.symbol = symbol
+        self.timeframes = list(timeframes)
+        self.base_timeframe = base_timeframe
+        self.tz_aware = tz_aware
+        count = len(self.timeframes)
+        self._bucket: List[Optional[int]] = [None] * count
+        self._open = [0.0] * count
+        self._high = [0.0] * count
+        self._low = [0.0] * count
+        self._close = [0.0] * count
+        self._volume = [0.0] * count
+        self._vwap_num = [0.0] * count
+
+    def _emit(self, index: int) -> TimeframeCandle:
+        bucket = self._bucket[index]
+        volume = self._volume[index]
+        close = self._close[index]
+        self._bucket[index] = None
+        return TimeframeCandle(
+            symbol=self.symbol,
+            timeframe_min=self.timeframes[index],
+            open=self._open[index],
+            high=self._high[index],
+            low=self._low[index],
+            close=close,
+            volume=volume,
+            vwap=self._vwap_num[index] / volume if volume else close,
+            timestamp=ns_to_datetime(bucket, self.tz_aware),
+        )
+
+    def update_values(
+        self, timestamp_ns: int, open: float, high: float, low: float, close: float, volume: float, vwap: float
+    ) -> List[TimeframeCandle]:
+        closed: List[TimeframeCandle] = []
+        base_end = timestamp_ns + self.base_timeframe * MINUTE_NS
+        for index, timeframe in enumerate(self.timeframes):
+            start = bucket_start(timestamp_ns, timeframe)
+            current = self._bucket[index]
+            if current is not None and current != start:
+                closed.append(self._emit(index))
+                current = None
+            if current is None:
+                self._bucket[index] = start
+                self._open[index] = open
+                self._high[index] = high
+                self._low[index] = low
+                self._volume[index] = volume
+                self._vwap_num[index] = vwap * volume
+            else:
+                if high > self._high[index]:
+                    self._high[index] = high
+                if low < self._low[index]:
+                    self._low[index] = low
+                self._volume[index] += volume
+                self._vwap_num[index] += vwap * volume
+            self._close[index] = close
+            if base_end >= start + timeframe * MINUTE_NS:
+                closed.append(self._emit(index))
+        return closed
+
+    def update(self, candle: TimeframeCandle) -> List[TimeframeCandle]:
+        return self.update_values(
+            datetime_to_ns(candle.timestamp), candle.open, candle.high, candle.low, candle.close, candle.volume, candle.vwap
+        )
+
+    def partial(self, timeframe: int) -> Optional[TimeframeCandle]:
+        """The still-open bar for ``timeframe`` without closing it, if any."""
+        index = self.timeframes.index(timeframe)
+        bucket = self._bucket[index]
+        if bucket is None:
+            return None
+        candle = self._emit(index)
+        self._bucket[index] = bucket
+        return candle
+
+    def flush(self) -> List[TimeframeCandle]:
+        """Force-close every partial bar, e.g. at the end of a replay."""
+        return [self._emit(index) for index, bucket in enumerate(self._bucket) if bucket is not None]
+
+
+__all__ = ["TimeframeAggregator", "StreamingAggregator", "resample", "resample_many", "bucket_start", "MINUTE_NS"]
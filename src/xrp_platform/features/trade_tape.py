@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from xrp_platform.data.candles import datetime_to_ns, ns_to_datetime
+from xrp_platform.data.schemas import TimeframeCandle, Trade
+
+SECOND_NS = 1_000_000_000
+MINUTE_NS = 60 * SECOND_NS
+
+
+class FlowStats(NamedTuple):
+    buy_volume: float
+    sell_volume: float
+    vwap: float
+    trades: int
+
+    @property
+    def volume(self) -> float:
+        return self.buy_volume + self.sell_volume
+
+    @property
+    def imbalance(self) -> float:
+        """Signed order-flow imbalance in [-1, 1]: taker buys minus sells over both."""
+        volume = self.volume
+        return (self.buy_volume - self.sell_volume) / volume if volume else 0.0
+
+
+class _Window:
+    __slots__ = ("span_ns", "tail", "buy", "sell", "notional", "count")
+
+    def __init__(self, span_ns: int) -> None:
+        self.span_ns = span_ns
+        self.tail = 0
+        self.buy = 0.0
+        self.sell = 0.0
+        self.notional = 0.0
+        self.count = 0
+
+
+class TradeTape:
+    """Rolling trade-flow aggregates over several horizons, plus 1-minute candles.
+
+    Trades go into a ring of plain lists. Every horizon keeps running buy
+    volume, sell volume, notional and count, and a tail pointer into the ring: a
+    new trade is added to each horizon and the trades that fell out of it are
+    subtracted, so each trade is added and removed once per horizon (amortized
+    O(1)). The ring starts at ``initial_capacity`` slots and doubles whenever the
+    longest horizon fills it, so an idle or quiet symbol costs kilobytes; past
+    ``capacity`` slots the oldest trades are expired early rather than growing it.
+
+    Timestamps must not go backwards; late trades are folded into the current
+    time so the windows stay consistent.
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        horizons_s: Sequence[int] = (60, 300, 3_600),
+        capacity: int = 1 << 20,
+        initial_capacity: int = 1 << 10,
+    ) -> None:
+        self.symbol = symbol
+        self.horizons_s = tuple(sorted(horizons_s))
+        self.capacity = capacity
+        self._slots = min(initial_capacity, capacity)
+        self._timestamp: List[int] = [0] * self._slots
+        self._price: List[float] = [0.0] * self._slots
+        self._size: List[float] = [0.0] * self._slots
+        self._buy: List[bool] = [False] * self._slots
+        self._head = 0  # sequence number of the next trade
+        self._windows = [_Window(horizon * SECOND_NS) for horizon in self.horizons_s]
+        self.first_timestamp_ns: Optional[int] = None
+        self.last_timestamp_ns: Optional[int] = None
+        self._bar_start: Optional[int] = None
+        self._bar = [0.0, 0.0, 0.0, 0.0, 0.0, 0.0]  # open, high, low, close, volume, notional
+
+    def __len__(self) -> int:
+        return min(self._head, self.capacity)
+
+    @property
+    def allocated_slots(self) -> int:
+        return self._slots
+
+    def _grow(self) -> None:
+        """Double the ring, moving every live trade to its slot in the larger one."""
+        old, new = self._slots, min(self._slots * 2, self.capacity)
+        live = range(min(window.tail for window in self._windows), self._head)
+        for name in ("_timestamp", "_price", "_size", "_buy"):
+            column = getattr(self, name)
+            grown = [column[0]] * new
+            for seq in live:
+                grown[seq % new] = column[seq % old]
+            setattr(self, name, grown)
+        self._slots = new
+
+    def _expire(self, window: _Window, cutoff_ns: int) -> None:
+        timestamps, prices, sizes, buys = self._timestamp, self._price, self._size, self._buy
+        slots = self._slots
+        while window.tail < self._head:
+            slot = window.tail % slots
+            if timestamps[slot] > cutoff_ns:
+                break
+            size = sizes[slot]
+            if buys[slot]:
+                window.buy -= size
+            else:
+                window.sell -= size
+            window.notional -= prices[slot] * size
+            window.count -= 1
+            window.tail += 1
+        if window.count == 0:
+            # resync exactly whenever a window drains so rounding cannot accumulate
+            window.buy = window.sell = window.notional = 0.0
+
+    def ingest_values(self, timestamp_ns: int, price: float, size: float, is_buy: bool) -> List[TimeframeCandle]:
+        """Add one trade; returns the 1-minute candles it closed (usually none)."""
+        if self.last_timestamp_ns is None:
+            self.first_timestamp_ns = timestamp_ns
+        elif timestamp_ns < self.last_timestamp_ns:
+            timestamp_ns = self.last_timestamp_ns
+        self.last_timestamp_ns = timestamp_ns
+
+        longest = self._windows[-1]
+        if self._head - longest.tail >= self._slots:
+            if self._slots < self.capacity:
+                self._grow()
+            else:
+                # the slot about to be reused still belongs to some window
+                for window in self._windows:
+                    self._expire(window, self._timestamp[self._head % self._slots])
+
+        slot = self._head % self._slots
+        self._timestamp[slot] = timestamp_ns
+        self._price[slot] = price
+        self._size[slot] = size
+        self._buy[slot] = is_buy
+        self._head += 1
+        notional = price * size
+        for window in self._windows:
+            if is_buy:
+                window.buy += size
+            else:
+                window.sell += size
+            window.notional += notional
+            window.count += 1
+            self._expire(window, timestamp_ns - window.span_ns)
+
+        return self._fold_bar(timestamp_ns, price, size, notional)
+
+    def ingest(self, trade: Trade) -> List[TimeframeCandle]:
+        return self.ingest_values(
+            datetime_to_ns(trade.timestamp), trade.price, trade.size, trade.side.lower() == "buy"
+        )
+
+    def _fold_bar(self, timestamp_ns: int, price: float, size: float, notional: float) -> List[TimeframeCandle]:
+        start = timestamp_ns - timestamp_ns % MINUTE_NS
+        closed: List[TimeframeCandle] = []
+        bar = self._bar
+        if self._bar_start is not None and start != self._bar_start:
+            closed.append(self._emit())
+        if self._bar_start is None:
+            self._bar_start = start
+            bar[:] = [price, price, price, price, size, notional]
+        else:
+            if price > bar[1]:
+                bar[1] = price
+            if price < bar[2]:
+                bar[2] = price
+            bar[3] = price
+            bar[4] += size
+            bar[5] += notional
+        return closed
+
+    def _emit(self) -> TimeframeCandle:
+        open_, high, low, close, volume, notional = self._bar
+        candle = TimeframeCandle(
+            symbol=self.symbol,
+            timeframe_min=1,
+            open=open_,
+            high=high,
+            low=low,
+            close=close,
+            volume=volume,
+            vwap=notional / volume if volume else close,
+            timestamp=ns_to_datetime(self._bar_start),
+        )
+        self._bar_start = None
+        return candle
+
+    def flush(self) -> List[TimeframeCandle]:
+        """Close the partial minute, e.g. when the feed stops."""
+        return [self._emit()] if self._bar_start is not None else []
+
+    def advance(self, now_ns: int) -> List[TimeframeCandle]:
+        """Expire windows and close the current minute at ``now_ns`` when no trade has arrived."""
+        for window in self._windows:
+            self._expire(window, now_ns - window.span_ns)
+        if self._bar_start is not None and now_ns >= self._bar_start + MINUTE_NS:
+            return [self._emit()]
+        return []
+
+    def stats(self, horizon_s: int) -> FlowStats:
+        window = self._windows[self.horizons_s.index(horizon_s)]
+        volume = window.buy + window.sell
+        vwap = window.notional / volume if volume else 0.0
+        return FlowStats(max(window.buy, 0.0), max(window.sell, 0.0), vwap, window.count)
+
+    def features(self) -> Dict[str, float]:
+        """The ``volume`` group of a ``FeatureVector`` from the shortest and longest horizons.
+
+        ``rvol`` compares the short horizon's volume rate with the long one's
+        (over the time actually covered while the tape is younger than a horizon),
+        ``accumulation`` is the long-horizon flow imbalance and ``imbalance`` the
+        short-horizon one.
+        """
+        short_s, long_s = self.horizons_s[0], self.horizons_s[-1]
+        short, long = self.stats(short_s), self.stats(long_s)
+        elapsed_s = 0.0
+        if self.last_timestamp_ns is not None:
+            elapsed_s = (self.last_timestamp_ns - self.first_timestamp_ns) / SECOND_NS
+        short_rate = short.volume / max(min(short_s, elapsed_s), 1e-9)
+        long_rate = long.volume / max(min(long_s, elapsed_s), 1e-9)
+        return {
+            "rvol": short_rate / long_rate if long_rate else 1.0,
+            "accumulation": long.imbalance,
+            "imbalance": short.imbalance,
+        }
+
+
+__all__ = ["FlowStats", "TradeTape"]
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Sequence
+
+import orjson
+
+from xrp_platform.data.schemas import CompositeSignal
+
+logger = logging.getLogger("messaging.streams")
+
+SIGNAL_STREAM = "signals"
+_SHUTDOWN_ATTEMPTS = 3
+
+
+def create_redis(url: str, max_connections: int = 32) -> Any:
+    """One pooled asyncio Redis client; share it instead of opening per-call connections."""
+    from redis.asyncio import ConnectionPool, Redis
+
+    return Redis(connection_pool=ConnectionPool.from_url(url, max_connections=max_connections))
+
+
+def encode_signal(signal: CompositeSignal) -> bytes:
+    return orjson.dumps(signal.model_dump())
+
+
+def decode_signal(data: bytes) -> CompositeSignal:
+    return CompositeSignal.model_validate(orjson.loads(data))
+
+
+class StreamEntry(NamedTuple):
+    entry_id: str
+    symbol: str
+    timeframe_min: int
+    data: bytes
+
+
+@dataclass
+class PublisherStats:
+    published: int = 0
+    dropped: int = 0
+    batches: int = 0
+    errors: int = 0
+
+
+class SignalPublisher:
+    """Batches signals into pipelined XADDs on a Redis stream.
+
+    ``publish_nowait`` serializes and enqueues without awaiting Redis, so the
+    compute loop never blocks on the network. The local queue is bounded; when
+    Redis falls behind the oldest signals are dropped first, since a newer
+    signal for the same symbol supersedes them. The stream itself is trimmed
+    to roughly ``maxlen`` entries.
+    """
+
+    def __init__(
+        self,
+        redis: Any,
+        stream: str = SIGNAL_STREAM,
+        maxlen: int = 100_000,
+        batch_size: int = 256,
+        max_queue: int = 10_000,
+        retry_delay_s: float = 0.5,
+    ) -> None:
+        self.redis = redis
+        self.stream = stream
+        self.maxlen = maxlen
+        self.batch_size = batch_size
+        self.retry_delay_s = retry_delay_s
+        self.stats = PublisherStats()
+        self._queue: Deque[Dict[str, Any]] = deque(maxlen=max_queue)
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def publish_nowait(self, signal: CompositeSignal) -> None:
+        if len(self._queue) == self._queue.maxlen:
+            self.stats.dropped += 1
+        self._queue.append(
+            {"symbol": signal.symbol, "timeframe": str(signal.timeframe_min), "data": encode_signal(signal)}
+        )
+        self._wakeup.set()
+
+    async def publish(self, signal: CompositeSignal) -> None:
+        self.publish_nowait(signal)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._closing = False
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush whatever is queued, then stop the background task."""
+        self._closing = True
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    async def _send_batch(self) -> bool:
+        batch: List[Dict[str, Any]] = []
+        while self._queue and len(batch) < self.batch_size:
+            batch.append(self._queue.popleft())
+        if not batch:
+            return True
+        pipe = self.redis.pipeline(transaction=False)
+        for fields in batch:
+            pipe.xadd(self.stream, fields, maxlen=self.maxlen, approximate=True)
+        try:
+            await pipe.execute()
+        except Exception:
+            self.stats.errors += 1
+            logger.exception("failed to publish %d signals to %s", len(batch), self.stream)
+            for fields in reversed(batch):
+                if len(self._queue) < (self._queue.maxlen or 0):
+                    self._queue.appendleft(fields)
+                else:
+                    self.stats.dropped += 1
+            return False
+        self.stats.published += len(batch)
+        self.stats.batches += 1
+        return True
+
+    async def _run(self) -> None:
+        failures = 0
+        while True:
+            if not self._queue:
+                if self._closing:
+                    return
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            if await self._send_batch():
+                failures = 0
+                continue
+            failures += 1
+            if self._closing and failures >= _SHUTDOWN_ATTEMPTS:
+                logger.error("dropping %d unpublished signals on shutdown", len(self._queue))
+                return
+            await asyncio.sleep(self.retry_delay_s)
+
+
+class SignalStreamReader:
+    """Consumer-group reader for the signal stream, used by the API cache.
+
+    Redis hands each entry to one consumer per group, so a reader that must see
+    every signal (each API process filling its own cache) needs a group of its
+    own; ``drop_group`` removes it again on shutdown.
+    """
+
+    def __init__(
+        self,
+        redis: Any,
+        group: str,
+        consumer: str,
+        stream: str = SIGNAL_STREAM,
+        batch_size: int = 256,
+        block_ms: int = 1_000,
+    ) -> None:
+        self.redis = redis
+        self.group = group
+        self.consumer = consumer
+        self.stream = stream
+        self.batch_size = batch_size
+        self.block_ms = block_ms
+
+    async def ensure_group(self, start_id: str = "$") -> None:
+        try:
+            await self.redis.xgroup_create(self.stream, self.group, id=start_id, mkstream=True)
+        except Exception as exc:  # redis raises ResponseError when the group exists
+            if "BUSYGROUP" not in str(exc):
+                raise
+
+    async def drop_group(self) -> None:
+        await self.redis.xgroup_destroy(self.stream, self.group)
+
+    async def read(self) -> List[StreamEntry]:
+        response = await self.redis.xreadgroup(
+            self.group, self.consumer, {self.stream: ">"}, count=self.batch_size, block=self.block_ms
+        )
+        entries: List[StreamEntry] = []
+        for _, messages in response or []:
+            for entry_id, fields in messages:
+                entries.append(
+                    StreamEntry(
+                        entry_id=_text(entry_id),
+                        symbol=_text(fields[b"symbol"]),
+                        timeframe_min=int(fields[b"timeframe"]),
+                        data=fields[b"data"],
+                    )
+                )
+        return entries
+
+    async def ack(self, entry_ids: Sequence[str]) -> None:
+        if entry_ids:
+            await self.redis.xack(self.stream, self.group, *entry_ids)
+
+
+def _text(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+__all__ = [
+    "SIGNAL_STREAM",
+    "SignalPublisher",
+    "SignalStreamReader",
+    "StreamEntry",
+    "create_redis",
+    "decode_signal",
+    "encode_signal",
+]
@@ -1,30 +1,82 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
 
 import numpy as np
 
 from xrp_platform.data.schemas import CompositeSignal, FeatureVector, SignalScore
 from xrp_platform.signals.modules import MODULES
+from xrp_platform.utils.features import FeatureBatch
+from xrp_platform.utils.metrics import timed
+
+# new regimes are appended so stored regime indices keep their meaning
+REGIMES: Tuple[str, ...] = ("high_volatility", "trending", "range_bound", "decoupled")
+REGIME_MULTIPLIERS: Dict[str, Dict[str, float]] = {
+    "high_volatility": {"regime_classifier": 1.5, "order_book_microstructure": 1.2, "momentum_reversal": 0.8},
+    "trending": {"technical_trend": 1.5, "volume_flow": 1.2},
+    "range_bound": {"momentum_reversal": 1.4, "heuristic_swarm": 1.1},
+    # XRP breaking from BTC/ETH moves on its own flows and news, not the market's
+    "decoupled": {"news_sentiment": 1.4, "onchain_confirmation": 1.3, "volume_flow": 1.2, "technical_trend": 0.8},
+}
+DECOUPLING_THRESHOLD = 0.35
+THRESHOLDS: Dict[str, float] = {"strong_sell": 20.0, "bearish": 40.0, "neutral": 60.0, "bullish": 80.0}
+
+
+@dataclass(frozen=True)
+class CompositeBatch:
+    """Module scores, composites and regimes for every row of a ``FeatureBatch``.
+
+    ``scores`` is ``(N, len(MODULES))`` in ``MODULES`` order and ``regimes`` holds
+    indices into ``REGIMES``. Full ``CompositeSignal`` objects, explanations
+    included, are only built by ``signal`` for the rows a caller serves.
+    """
+
+    engine: "CompositeEngine"
+    features: FeatureBatch
+    scores: np.ndarray
+    composite: np.ndarray
+    regimes: np.ndarray
+    thresholds: Dict[str, float]
+
+    def __len__(self) -> int:
+        return len(self.composite)
+
+    def regime(self, row: int) -> str:
+        return REGIMES[int(self.regimes[row])]
+
+    def signal(self, row: int, symbol: str, timeframe: int) -> CompositeSignal:
+        return self.engine.compute(self.features.vector(row, symbol, timeframe))
 
 
 class CompositeEngine:
-    def __init__(self) -> None:
+    """Regime-weighted blend of the signal modules.
+
+    ``base_weights``, ``regime_multipliers`` and ``thresholds`` default to the
+    production calibration; partial overrides are merged onto the defaults so a
+    parameter sweep only has to name what it varies.
+    """
+
+    def __init__(
+        self,
+        base_weights: Optional[Mapping[str, float]] = None,
+        regime_multipliers: Optional[Mapping[str, Mapping[str, float]]] = None,
+        thresholds: Optional[Mapping[str, float]] = None,
+    ) -> None:
         self.base_weights: Dict[str, float] = {m.name: 1.0 for m in MODULES}
+        self.base_weights.update(base_weights or {})
+        self.regime_multipliers: Dict[str, Dict[str, float]] = {
+            regime: dict(multipliers) for regime, multipliers in REGIME_MULTIPLIERS.items()
+        }
+        for regime, multipliers in (regime_multipliers or {}).items():
+            self.regime_multipliers.setdefault(regime, {}).update(multipliers)
+        self._thresholds: Dict[str, float] = {**THRESHOLDS, **(thresholds or {})}
 
     def adapt_weights(self, regime: str) -> Dict[str, float]:
         weights = self.base_weights.copy()
-        if regime == "high_volatility":
-            weights["regime_classifier"] *= 1.5
-            weights["order_book_microstructure"] *= 1.2
-            weights["momentum_reversal"] *= 0.8
-        elif regime == "trending":
-            weights["technical_trend"] *= 1.5
-            weights["volume_flow"] *= 1.2
-        elif regime == "range_bound":
-            weights["momentum_reversal"] *= 1.4
-            weights["heuristic_swarm"] *= 1.1
+        for module, multiplier in self.regime_multipliers.get(regime, {}).items():
+            weights[module] = weights.get(module, 1.0) * multiplier
         return weights
 
     def classify_regime(self, features: FeatureVector) -> str:
@@ -32,25 +84,52 @@ class CompositeEngine:
         trend_strength = features.meta.get("trend_strength", 0.0)
         if vol_regime > 1.5:
             return "high_volatility"
+        if features.meta.get("decoupling", 0.0) > DECOUPLING_THRESHOLD:
+            return "decoupled"
         if trend_strength > 0.5:
             return "trending"
         return "range_bound"
 
+    def classify_regime_batch(self, batch: FeatureBatch) -> np.ndarray:
+        vol_regime = batch.get("meta", "volatility_regime", 1.0)
+        trend_strength = batch.get("meta", "trend_strength", 0.0)
+        decoupling = batch.get("meta", "decoupling", 0.0)
+        return np.select(
+            [vol_regime > 1.5, decoupling > DECOUPLING_THRESHOLD, trend_strength > 0.5],
+            [REGIMES.index("high_volatility"), REGIMES.index("decoupled"), REGIMES.index("trending")],
+            REGIMES.index("range_bound"),
+        )
+
+    def weight_matrix(self) -> np.ndarray:
+        """``(len(REGIMES), len(MODULES))`` weights, one ``adapt_weights`` row per regime."""
+        rows = [self.adapt_weights(regime) for regime in REGIMES]
+        return np.array([[weights.get(module.name, 1.0) for module in MODULES] for weights in rows], dtype=float)
+
     def thresholds(self) -> Dict[str, float]:
-        return {"strong_sell": 20.0, "bearish": 40.0, "neutral": 60.0, "bullish": 80.0}
+        return dict(self._thresholds)
+
+    def _weighted(self, weights: Dict[str, float], module_scores: Iterable[Tuple[str, float]]) -> float:
+        weighted = []
+        weight_sum = 0.0
+        for module, score in module_scores:
+            weight = weights.get(module, 1.0)
+            weighted.append(score * weight)
+            weight_sum += weight
+        return float(np.sum(weighted) / weight_sum) if weight_sum else 0.0
+
+    def composite_score(self, features: FeatureVector) -> Tuple[float, str]:
+        """Composite value and regime without building per-module explanation models."""
+        regime = self.classify_regime(features)
+        weights = self.adapt_weights(regime)
+        composite_score = self._weighted(weights, ((module.name, module.value(features)) for module in MODULES))
+        return composite_score, regime
 
+    @timed("xrp_composite_compute_seconds", "Composite signal computation from a feature vector")
     def compute(self, features: FeatureVector) -> CompositeSignal:
         regime = self.classify_regime(features)
         weights = self.adapt_weights(regime)
         module_scores: List[SignalScore] = [module.score(features) for module in MODULES]
-
-        weighted = []
-        weight_sum = 0.0
-        for score in module_scores:
-            weight = weights.get(score.module, 1.0)
-            weighted.append(score.score * weight)
-            weight_sum += weight
-        composite_score = float(np.sum(weighted) / weight_sum) if weight_sum else 0.0
+        composite_score = self._weighted(weights, ((score.module, score.score) for score in module_scores))
 
         return CompositeSignal(
             symbol=features.symbol,
@@ -62,5 +141,42 @@ class CompositeEngine:
             thresholds=self.thresholds(),
         )
 
+    def score_batch(self, batch: FeatureBatch) -> np.ndarray:
+        if not len(batch):
+            return np.empty((0, len(MODULES)))
+        return np.column_stack([module.score_batch(batch) for module in MODULES])
+
+    def blend(self, scores: np.ndarray, regimes: np.ndarray) -> np.ndarray:
+        """Composites for precomputed module ``scores`` and regime indices.
+
+        Scores and regimes depend only on the features, so callers that try many
+        weightings over the same bars compute them once and only re-blend.
+        """
+        weights = self.weight_matrix()[regimes]
+        weight_sum = weights.sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(weight_sum != 0, (scores * weights).sum(axis=1) / weight_sum, 0.0)
+
+    def compute_batch(self, batch: FeatureBatch) -> CompositeBatch:
+        """Vectorized ``compute`` over every row of ``batch``."""
+        scores = self.score_batch(batch)
+        regimes = self.classify_regime_batch(batch)
+        composite = self.blend(scores, regimes)
+        return CompositeBatch(
+            engine=self,
+            features=batch,
+            scores=scores,
+            composite=composite,
+            regimes=regimes,
+            thresholds=self.thresholds(),
+        )
+
 
-__all__ = ["CompositeEngine"]
+__all__ = [
+    "CompositeEngine",
+    "CompositeBatch",
+    "DECOUPLING_THRESHOLD",
+    "REGIMES",
+    "REGIME_MULTIPLIERS",
+    "THRESHOLDS",
+]
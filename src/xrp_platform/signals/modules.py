@@ -6,11 +6,20 @@ from typing import Dict, List
 import numpy as np
 
 from xrp_platform.data.schemas import FeatureVector, SignalExplanation, SignalScore
+from xrp_platform.utils.features import FeatureBatch
 
 
 class SignalModule:
     name: str
 
+    def value(self, features: FeatureVector) -> float:
+        """Return the bounded score alone, skipping the explanation model."""
+        return self.score(features).score
+
+    def score_batch(self, batch: FeatureBatch) -> np.ndarray:
+        """Scores for every row of ``batch``; modules override this with array maths."""
+        return np.array([self.value(batch.vector(row, "", 0)) for row in range(len(batch))], dtype=float)
+
     def score(self, features: FeatureVector) -> SignalScore:  # pragma: no cover - interface
         raise NotImplementedError
 
@@ -19,15 +28,29 @@ def _bounded(value: float) -> float:
     return float(100 * tanh(value / 100))
 
 
+def _bounded_array(values: np.ndarray) -> np.ndarray:
+    return 100 * np.tanh(values / 100)
+
+
 class TechnicalTrendModule(SignalModule):
     name = "technical_trend"
 
+    def value(self, features: FeatureVector) -> float:
+        slope = features.technical.get("trend_slope", 0.0)
+        compression = features.technical.get("volatility_compression", 0.0)
+        divergence = features.technical.get("divergence", 0.0)
+        return _bounded(slope * 40 + compression * 10 - divergence * 15)
+
+    def score_batch(self, batch: FeatureBatch) -> np.ndarray:
+        slope = batch.get("technical", "trend_slope", 0.0)
+        compression = batch.get("technical", "volatility_compression", 0.0)
+        divergence = batch.get("technical", "divergence", 0.0)
+        return _bounded_array(slope * 40 + compression * 10 - divergence * 15)
+
     def score(self, features: FeatureVector) -> SignalScore:
         slope = features.technical.get("trend_slope", 0.0)
         compression = features.technical.get("volatility_compression", 0.0)
         divergence = features.technical.get("divergence", 0.0)
-        raw = slope * 40 + compression * 10 - divergence * 15
-        score = _bounded(raw)
         explanation = SignalExplanation(
             factors={
                 "trend_slope": slope,
@@ -36,50 +59,80 @@ class TechnicalTrendModule(SignalModule):
             },
             notes="Trend slope and compression bolster the score while divergence penalizes.",
         )
-        return SignalScore(module=self.name, score=score, explanation=explanation)
+        return SignalScore(module=self.name, score=self.value(features), explanation=explanation)
 
 
 class MomentumReversalModule(SignalModule):
     name = "momentum_reversal"
 
+    def value(self, features: FeatureVector) -> float:
+        momentum = features.technical.get("momentum", 0.0)
+        rsi = features.technical.get("rsi", 50.0)
+        accel = features.technical.get("acceleration", 0.0)
+        return _bounded(momentum * 30 + (rsi - 50) * 1.2 + accel * 25)
+
+    def score_batch(self, batch: FeatureBatch) -> np.ndarray:
+        momentum = batch.get("technical", "momentum", 0.0)
+        rsi = batch.get("technical", "rsi", 50.0)
+        accel = batch.get("technical", "acceleration", 0.0)
+        return _bounded_array(momentum * 30 + (rsi - 50) * 1.2 + accel * 25)
+
     def score(self, features: FeatureVector) -> SignalScore:
         momentum = features.technical.get("momentum", 0.0)
         rsi = features.technical.get("rsi", 50.0)
         accel = features.technical.get("acceleration", 0.0)
-        raw = momentum * 30 + (rsi - 50) * 1.2 + accel * 25
-        score = _bounded(raw)
         explanation = SignalExplanation(
             factors={"momentum": momentum, "rsi_offset": rsi - 50, "acceleration": accel},
             notes="Momentum and acceleration dominate with RSI offset acting as filter.",
         )
-        return SignalScore(module=self.name, score=score, explanation=explanation)
+        return SignalScore(module=self.name, score=self.value(features), explanation=explanation)
 
 
 class VolumeFlowModule(SignalModule):
     name = "volume_flow"
 
+    def value(self, features: FeatureVector) -> float:
+        rvol = features.volume.get("rvol", 1.0)
+        accumulation = features.volume.get("accumulation", 0.0)
+        imbalance = features.volume.get("imbalance", 0.0)
+        return _bounded((rvol - 1) * 20 + accumulation * 35 + imbalance * 30)
+
+    def score_batch(self, batch: FeatureBatch) -> np.ndarray:
+        rvol = batch.get("volume", "rvol", 1.0)
+        accumulation = batch.get("volume", "accumulation", 0.0)
+        imbalance = batch.get("volume", "imbalance", 0.0)
+        return _bounded_array((rvol - 1) * 20 + accumulation * 35 + imbalance * 30)
+
     def score(self, features: FeatureVector) -> SignalScore:
         rvol = features.volume.get("rvol", 1.0)
         accumulation = features.volume.get("accumulation", 0.0)
         imbalance = features.volume.get("imbalance", 0.0)
-        raw = (rvol - 1) * 20 + accumulation * 35 + imbalance * 30
-        score = _bounded(raw)
         explanation = SignalExplanation(
             factors={"rvol": rvol, "accumulation": accumulation, "imbalance": imbalance},
             notes="Relative volume above 1 and accumulation push score positive; imbalance confirms.",
         )
-        return SignalScore(module=self.name, score=score, explanation=explanation)
+        return SignalScore(module=self.name, score=self.value(features), explanation=explanation)
 
 
 class OrderBookMicrostructureModule(SignalModule):
     name = "order_book_microstructure"
 
+    def value(self, features: FeatureVector) -> float:
+        depth_skew = features.order_book.get("depth_skew", 0.0)
+        spoof = features.order_book.get("spoof_likelihood", 0.0)
+        microprice_drift = features.order_book.get("microprice_drift", 0.0)
+        return _bounded(depth_skew * 40 - spoof * 25 + microprice_drift * 35)
+
+    def score_batch(self, batch: FeatureBatch) -> np.ndarray:
+        depth_skew = batch.get("order_book", "depth_skew", 0.0)
+        spoof = batch.get("order_book", "spoof_likelihood", 0.0)
+        microprice_drift = batch.get("order_book", "microprice_drift", 0.0)
+        return _bounded_array(depth_skew * 40 - spoof * 25 + microprice_drift * 35)
+
     def score(self, features: FeatureVector) -> SignalScore:
         depth_skew = features.order_book.get("depth_skew", 0.0)
         spoof = features.order_book.get("spoof_likelihood", 0.0)
         microprice_drift = features.order_book.get("microprice_drift", 0.0)
-        raw = depth_skew * 40 - spoof * 25 + microprice_drift * 35
-        score = _bounded(raw)
         explanation = SignalExplanation(
             factors={
                 "depth_skew": depth_skew,
@@ -88,34 +141,54 @@ class OrderBookMicrostructureModule(SignalModule):
             },
             notes="Order book skew and microprice drift lead; spoof likelihood penalizes.",
         )
-        return SignalScore(module=self.name, score=score, explanation=explanation)
+        return SignalScore(module=self.name, score=self.value(features), explanation=explanation)
 
 
 class NewsSentimentModule(SignalModule):
     name = "news_sentiment"
 
+    def value(self, features: FeatureVector) -> float:
+        sentiment = features.news.get("sentiment_level", 0.0)
+        velocity = features.news.get("sentiment_velocity", 0.0)
+        shock = features.news.get("shock", 0.0)
+        return _bounded(sentiment * 30 + velocity * 20 + shock * 40)
+
+    def score_batch(self, batch: FeatureBatch) -> np.ndarray:
+        sentiment = batch.get("news", "sentiment_level", 0.0)
+        velocity = batch.get("news", "sentiment_velocity", 0.0)
+        shock = batch.get("news", "shock", 0.0)
+        return _bounded_array(sentiment * 30 + velocity * 20 + shock * 40)
+
     def score(self, features: FeatureVector) -> SignalScore:
         sentiment = features.news.get("sentiment_level", 0.0)
         velocity = features.news.get("sentiment_velocity", 0.0)
         shock = features.news.get("shock", 0.0)
-        raw = sentiment * 30 + velocity * 20 + shock * 40
-        score = _bounded(raw)
         explanation = SignalExplanation(
             factors={"sentiment": sentiment, "velocity": velocity, "shock": shock},
             notes="Positive shocks and rising sentiment lift the module; negatives depress it.",
         )
-        return SignalScore(module=self.name, score=score, explanation=explanation)
+        return SignalScore(module=self.name, score=self.value(features), explanation=explanation)
 
 
 class OnChainConfirmationModule(SignalModule):
     name = "onchain_confirmation"
 
+    def value(self, features: FeatureVector) -> float:
+        flow = features.onchain.get("flow_direction", 0.0)
+        active_div = features.onchain.get("active_address_divergence", 0.0)
+        exchange_delta = features.onchain.get("exchange_balance_delta", 0.0)
+        return _bounded(flow * 30 + active_div * 25 - exchange_delta * 20)
+
+    def score_batch(self, batch: FeatureBatch) -> np.ndarray:
+        flow = batch.get("onchain", "flow_direction", 0.0)
+        active_div = batch.get("onchain", "active_address_divergence", 0.0)
+        exchange_delta = batch.get("onchain", "exchange_balance_delta", 0.0)
+        return _bounded_array(flow * 30 + active_div * 25 - exchange_delta * 20)
+
     def score(self, features: FeatureVector) -> SignalScore:
         flow = features.onchain.get("flow_direction", 0.0)
         active_div = features.onchain.get("active_address_divergence", 0.0)
         exchange_delta = features.onchain.get("exchange_balance_delta", 0.0)
-        raw = flow * 30 + active_div * 25 - exchange_delta * 20
-        score = _bounded(raw)
         explanation = SignalExplanation(
             factors={
                 "flow_direction": flow,
@@ -124,18 +197,28 @@ class OnChainConfirmationModule(SignalModule):
             },
             notes="Positive flow and address divergence confirm bias; inflows to exchanges penalize.",
         )
-        return SignalScore(module=self.name, score=score, explanation=explanation)
+        return SignalScore(module=self.name, score=self.value(features), explanation=explanation)
 
 
 class RegimeClassifierModule(SignalModule):
     name = "regime_classifier"
 
+    def value(self, features: FeatureVector) -> float:
+        vol_regime = features.meta.get("volatility_regime", 0.0)
+        trend_strength = features.meta.get("trend_strength", 0.0)
+        noise_ratio = features.meta.get("noise_ratio", 0.0)
+        return _bounded(trend_strength * 30 - noise_ratio * 25 - abs(vol_regime - 1.0) * 20)
+
+    def score_batch(self, batch: FeatureBatch) -> np.ndarray:
+        vol_regime = batch.get("meta", "volatility_regime", 0.0)
+        trend_strength = batch.get("meta", "trend_strength", 0.0)
+        noise_ratio = batch.get("meta", "noise_ratio", 0.0)
+        return _bounded_array(trend_strength * 30 - noise_ratio * 25 - np.abs(vol_regime - 1.0) * 20)
+
     def score(self, features: FeatureVector) -> SignalScore:
         vol_regime = features.meta.get("volatility_regime", 0.0)
         trend_strength = features.meta.get("trend_strength", 0.0)
         noise_ratio = features.meta.get("noise_ratio", 0.0)
-        raw = trend_strength * 30 - noise_ratio * 25 - abs(vol_regime - 1.0) * 20
-        score = _bounded(raw)
         explanation = SignalExplanation(
             factors={
                 "trend_strength": trend_strength,
@@ -144,37 +227,58 @@ class RegimeClassifierModule(SignalModule):
             },
             notes="High trend strength with controlled volatility improves regime confidence.",
         )
-        return SignalScore(module=self.name, score=score, explanation=explanation)
+        return SignalScore(module=self.name, score=self.value(features), explanation=explanation)
 
 
 class PatternClusterModule(SignalModule):
     name = "pattern_cluster"
 
+    def value(self, features: FeatureVector) -> float:
+        cluster_match = features.technical.get("cluster_match", 0.0)
+        analogue = features.technical.get("analogue_score", 0.0)
+        return _bounded(cluster_match * 50 + analogue * 30)
+
+    def score_batch(self, batch: FeatureBatch) -> np.ndarray:
+        cluster_match = batch.get("technical", "cluster_match", 0.0)
+        analogue = batch.get("technical", "analogue_score", 0.0)
+        return _bounded_array(cluster_match * 50 + analogue * 30)
+
     def score(self, features: FeatureVector) -> SignalScore:
         cluster_match = features.technical.get("cluster_match", 0.0)
         analogue = features.technical.get("analogue_score", 0.0)
-        raw = cluster_match * 50 + analogue * 30
-        score = _bounded(raw)
         explanation = SignalExplanation(
             factors={"cluster_match": cluster_match, "analogue_score": analogue},
             notes="Historical analogue and pattern match alignment drive the score.",
         )
-        return SignalScore(module=self.name, score=score, explanation=explanation)
+        return SignalScore(module=self.name, score=self.value(features), explanation=explanation)
 
 
 class HeuristicSwarmModule(SignalModule):
     name = "heuristic_swarm"
 
-    def score(self, features: FeatureVector) -> SignalScore:
+    def _bots(self, features: FeatureVector) -> Dict[str, float]:
         bots: Dict[str, float] = {}
         bots["pullback_buy"] = features.technical.get("pullback_depth", 0.0) * -10 + features.technical.get("trend_slope", 0.0) * 25
         bots["breakout"] = features.technical.get("breakout_strength", 0.0) * 30 + features.volume.get("rvol", 1.0) * 5
         bots["mean_revert"] = -features.technical.get("zscore", 0.0) * 20 + features.volume.get("imbalance", 0.0) * -5
+        return bots
+
+    def value(self, features: FeatureVector) -> float:
+        bots = self._bots(features)
+        return float(np.tanh(np.mean(list(bots.values())) / 50) * 100 if bots else 0.0)
+
+    def score_batch(self, batch: FeatureBatch) -> np.ndarray:
+        pullback_buy = batch.get("technical", "pullback_depth", 0.0) * -10 + batch.get("technical", "trend_slope", 0.0) * 25
+        breakout = batch.get("technical", "breakout_strength", 0.0) * 30 + batch.get("volume", "rvol", 1.0) * 5
+        mean_revert = -batch.get("technical", "zscore", 0.0) * 20 + batch.get("volume", "imbalance", 0.0) * -5
+        return np.tanh((pullback_buy + breakout + mean_revert) / 3 / 50) * 100
+
+    def score(self, features: FeatureVector) -> SignalScore:
+        bots = self._bots(features)
         swarm_score = np.tanh(np.mean(list(bots.values())) / 50) * 100 if bots else 0.0
         explanation = SignalExplanation(factors=bots, notes="Swarm aggregates lightweight heuristics across bots.")
         return SignalScore(module=self.name, score=float(swarm_score), explanation=explanation)
 
-
 MODULES: List[SignalModule] = [
     TechnicalTrendModule(),
     MomentumReversalModule(),
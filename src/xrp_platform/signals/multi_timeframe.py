@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from xrp_platform.data.candles import CandleSeries
+from xrp_platform.data.schemas import MultiTimeframeSignal
+from xrp_platform.features.timeframe import resample_many
+from xrp_platform.signals.composite import CompositeEngine
+from xrp_platform.utils.features import compute_latest_features
+
+DEFAULT_TIMEFRAMES: Tuple[int, ...] = (1, 5, 60, 240, 1440, 10080)
+
+
+def confluence(
+    composites: Sequence[float], timeframes: Sequence[int], thresholds: Dict[str, float]
+) -> Tuple[float, float]:
+    """Cross-timeframe agreement as ``(score, alignment)``.
+
+    Each composite is placed on [-1, 1] relative to the band between the bearish
+    and bullish thresholds. ``score`` is their mean weighted by ``log2(1 + tf)``,
+    so slower timeframes count for more, scaled to [-100, 100]; ``alignment`` is
+    the weighted share of timeframes leaning the same way as the score.
+    """
+    composites = np.asarray(composites, dtype=float)
+    if not len(composites):
+        return 0.0, 0.0
+    middle = (thresholds["bullish"] + thresholds["bearish"]) / 2
+    half_band = max((thresholds["bullish"] - thresholds["bearish"]) / 2, 1e-9)
+    lean = np.clip((composites - middle) / half_band, -1.0, 1.0)
+    weights = np.log2(1 + np.asarray(timeframes, dtype=float))
+    score = float(lean @ weights / weights.sum())
+    agreeing = np.sign(lean) == np.sign(score) if score else lean == 0
+    return score * 100, float(weights[agreeing].sum() / weights.sum())
+
+
+class MultiTimeframePipeline:
+    """Every timeframe's composite signal from one base-timeframe history.
+
+    The history is aggregated into all timeframes in one cascade, features for
+    the latest bar of every timeframe come from one stacked pass, and module
+    scores and composites from one ``compute_batch`` call.
+    """
+
+    def __init__(
+        self,
+        timeframes: Sequence[int] = DEFAULT_TIMEFRAMES,
+        window: int = 60,
+        engine: Optional[CompositeEngine] = None,
+    ) -> None:
+        self.timeframes = tuple(timeframes)
+        self.window = window
+        self.engine = engine or CompositeEngine()
+
+    def aggregate(self, series: CandleSeries) -> Dict[int, CandleSeries]:
+        """``series`` resampled into every timeframe of the pipeline in one cascade."""
+        return resample_many(series, self.timeframes)
+
+    def compute(self, series: CandleSeries) -> MultiTimeframeSignal:
+        if len(series) == 0:
+            raise ValueError("multi-timeframe signals need at least one bar")
+        by_timeframe = self.aggregate(series)
+        batch = compute_latest_features([by_timeframe[tf] for tf in self.timeframes], self.window)
+        composites = self.engine.compute_batch(batch)
+        signals = [composites.signal(row, series.symbol, tf) for row, tf in enumerate(self.timeframes)]
+        score, alignment = confluence(composites.composite, self.timeframes, composites.thresholds)
+        return MultiTimeframeSignal(
+            symbol=series.symbol,
+            computed_at=max(signal.computed_at for signal in signals),
+            signals=signals,
+            confluence=score,
+            alignment=alignment,
+        )
+
+
+__all__ = ["DEFAULT_TIMEFRAMES", "MultiTimeframePipeline", "confluence"]
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Hashable
+
+
+class DedupCache:
+    """Fixed-size LRU of keys already seen."""
+
+    def __init__(self, capacity: int = 100_000) -> None:
+        self.capacity = capacity
+        self._keys: "OrderedDict[Hashable, None]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def seen(self, key: Hashable) -> bool:
+        """True if ``key`` was seen before; either way it becomes the most recent entry."""
+        keys = self._keys
+        if key in keys:
+            keys.move_to_end(key)
+            return True
+        keys[key] = None
+        if len(keys) > self.capacity:
+            keys.popitem(last=False)
+        return False
+
+
+__all__ = ["DedupCache"]
@@ -1,68 +1,554 @@
 from __future__ import annotations
 
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Iterable, Tuple
+from math import fsum
+from typing import Deque, Dict, Iterable, Mapping, Optional, Sequence, Tuple, Union
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
+from xrp_platform.data.candles import CandleSeries, datetime_to_ns, ns_to_datetime
 from xrp_platform.data.schemas import FeatureVector, TimeframeCandle
+from xrp_platform.utils.metrics import timed
 
 
-def compute_features(symbol: str, timeframe: int, candles: Iterable[TimeframeCandle]) -> FeatureVector:
-    candles_list = list(candles)
-    closes = np.array([c.close for c in candles_list], dtype=float)
-    volumes = np.array([c.volume for c in candles_list], dtype=float)
-    vwap = np.array([c.vwap for c in candles_list], dtype=float)
+def _derive_features(
+    count: int,
+    closes_tail: Tuple[float, ...],
+    last_vwap: float,
+    trend_slope: float,
+    mean_close: float,
+    std_close: float,
+    max_close: float,
+    min_close: float,
+    recent_volume: float,
+    mean_volume: float,
+) -> Dict[str, Dict[str, float]]:
+    """Map window statistics onto the feature groups of a ``FeatureVector``.
 
-    trend_slope = float(np.polyfit(range(len(closes)), closes, 1)[0]) if len(closes) >= 2 else 0.0
-    momentum = float(closes[-1] - closes[-2]) if len(closes) >= 2 else 0.0
+    ``closes_tail`` holds up to the last three closes, oldest first. Every other
+    argument is a statistic over the full window, so callers that maintain them
+    incrementally produce the same features as a from-scratch pass.
+    """
+    last = closes_tail[-1] if count else 0.0
+    momentum = float(closes_tail[-1] - closes_tail[-2]) if count >= 2 else 0.0
     rsi = float(50 + np.clip(momentum, -5, 5) * 5)
-    volatility = float(np.std(closes)) if len(closes) >= 2 else 0.0
+    volatility = float(std_close) if count >= 2 else 0.0
     compression = float(1 / (1 + volatility)) if volatility else 1.0
-    accumulation = float(np.sum(volumes[-3:]) / (np.mean(volumes) + 1e-6)) if len(volumes) else 0.0
-    imbalance = float((closes[-1] - np.mean(closes)) / (np.std(closes) + 1e-6)) if len(closes) else 0.0
+    accumulation = float(recent_volume / (mean_volume + 1e-6)) if count else 0.0
+    imbalance = float((last - mean_close) / (std_close + 1e-6)) if count else 0.0
 
-    now = max((c.timestamp for c in candles_list), default=datetime.utcnow())
-
-    return FeatureVector(
-        symbol=symbol,
-        timeframe_min=timeframe,
-        computed_at=now,
-        technical={
+    return {
+        "technical": {
             "trend_slope": trend_slope,
             "volatility_compression": compression,
-            "divergence": float(closes[-1] - vwap[-1]) if len(vwap) else 0.0,
+            "divergence": float(last - last_vwap) if count else 0.0,
             "momentum": momentum,
             "rsi": rsi,
-            "acceleration": float(momentum - (closes[-2] - closes[-3])) if len(closes) >= 3 else 0.0,
+            "acceleration": float(momentum - (closes_tail[-2] - closes_tail[-3])) if count >= 3 else 0.0,
             "cluster_match": float(compression * 0.5 + trend_slope * 0.1),
             "analogue_score": float(np.tanh(trend_slope) * 50),
-            "pullback_depth": float((np.max(closes) - closes[-1]) / (np.max(closes) + 1e-6)) if len(closes) else 0.0,
-            "breakout_strength": float((closes[-1] - np.min(closes)) / (np.std(closes) + 1e-6)) if len(closes) else 0.0,
+            "pullback_depth": float((max_close - last) / (max_close + 1e-6)) if count else 0.0,
+            "breakout_strength": float((last - min_close) / (std_close + 1e-6)) if count else 0.0,
             "zscore": imbalance,
         },
-        volume={
+        "volume": {
             "rvol": float(accumulation),
             "accumulation": float(accumulation - 1),
             "imbalance": imbalance,
         },
-        order_book={
+        "order_book": {
             "depth_skew": float(np.tanh(imbalance)),
             "spoof_likelihood": 0.0,
             "microprice_drift": float(trend_slope),
         },
-        news={"sentiment_level": 0.0, "sentiment_velocity": 0.0, "shock": 0.0},
-        onchain={
+        "news": {"sentiment_level": 0.0, "sentiment_velocity": 0.0, "shock": 0.0},
+        "onchain": {
             "flow_direction": 0.0,
             "active_address_divergence": 0.0,
             "exchange_balance_delta": 0.0,
         },
-        meta={
-            "volatility_regime": float(volatility / (np.mean(closes) + 1e-6)) if len(closes) else 1.0,
+        "meta": {
+            "volatility_regime": float(volatility / (mean_close + 1e-6)) if count else 1.0,
             "trend_strength": float(np.tanh(trend_slope)),
             "noise_ratio": float(volatility / (abs(trend_slope) + 1e-6)) if trend_slope else 0.0,
+            # cross-asset statistics need benchmark prices; CrossAssetFeatures supplies them
+            "btc_correlation": 0.0,
+            "btc_beta": 0.0,
+            "eth_correlation": 0.0,
+            "eth_beta": 0.0,
+            "decoupling": 0.0,
+            "btc_lead": 0.0,
         },
+    }
+
+
+def _override(
+    groups: Dict[str, Dict[str, float]], **overrides: Optional[Mapping[str, float]]
+) -> Dict[str, Dict[str, float]]:
+    """Replace candle-derived proxies with values measured by a dedicated source."""
+    for group, values in overrides.items():
+        if values is not None:
+            groups[group] = {**groups[group], **values}
+    return groups
+
+
+@timed("xrp_compute_features_seconds", "Feature vector computation")
+def compute_features(
+    symbol: str,
+    timeframe: int,
+    candles: Union[CandleSeries, Iterable[TimeframeCandle]],
+    order_book: Optional[Mapping[str, float]] = None,
+    volume: Optional[Mapping[str, float]] = None,
+    onchain: Optional[Mapping[str, float]] = None,
+    news: Optional[Mapping[str, float]] = None,
+    meta: Optional[Mapping[str, float]] = None,
+) -> FeatureVector:
+    """Feature vector over ``candles``.
+
+    ``order_book`` (e.g. ``OrderBook.features()``), ``volume`` (e.g.
+    ``TradeTape.features()``), ``onchain`` (e.g. ``OnChainIndexer.features()``),
+    ``news`` (e.g. ``NewsSentiment.features(symbol)``) and ``meta`` (e.g.
+    ``CrossAssetFeatures.features()``) override the proxies and placeholders
+    that are otherwise derived from the closes.
+    """
+    if isinstance(candles, CandleSeries):
+        closes, volumes, vwap = candles.close, candles.volume, candles.vwap
+        timestamps = candles.timestamp
+        now = ns_to_datetime(timestamps.max(), candles.tz_aware) if len(timestamps) else datetime.utcnow()
+    else:
+        candles_list = list(candles)
+        closes = np.array([c.close for c in candles_list], dtype=float)
+        volumes = np.array([c.volume for c in candles_list], dtype=float)
+        vwap = np.array([c.vwap for c in candles_list], dtype=float)
+        now = max((c.timestamp for c in candles_list), default=datetime.utcnow())
+
+    count = len(closes)
+    groups = _derive_features(
+        count,
+        tuple(closes[-3:].tolist()),
+        float(vwap[-1]) if count else 0.0,
+        float(np.polyfit(range(count), closes, 1)[0]) if count >= 2 else 0.0,
+        float(np.mean(closes)) if count else 0.0,
+        float(np.std(closes)) if count else 0.0,
+        float(np.max(closes)) if count else 0.0,
+        float(np.min(closes)) if count else 0.0,
+        float(np.sum(volumes[-3:])),
+        float(np.mean(volumes)) if count else 0.0,
     )
+    _override(groups, order_book=order_book, volume=volume, onchain=onchain, news=news, meta=meta)
+    return FeatureVector(symbol=symbol, timeframe_min=timeframe, computed_at=now, **groups)
+
+
+class RollingFeatures:
+    """Fixed-size window of candles whose feature statistics update in O(1).
+
+    Sums are kept relative to an offset close to the window mean so the slope and
+    variance updates do not lose precision on long runs, and they are rebuilt
+    exactly once every ``window`` pushes to stop rounding drift from accumulating.
+    """
+
+    def __init__(self, window: int) -> None:
+        if window < 1:
+            raise ValueError("window must be positive")
+        self.window = window
+        self._closes: Deque[float] = deque(maxlen=window)
+        self._volumes: Deque[float] = deque(maxlen=window)
+        self._last_vwap = 0.0
+        # Monotonic deques of (sequence, value) for window max/min lookups.
+        self._max_close: Deque[Tuple[int, float]] = deque()
+        self._min_close: Deque[Tuple[int, float]] = deque()
+        self._max_ts: Deque[Tuple[int, datetime]] = deque()
+        self._seq = 0
+        self._offset = 0.0
+        self._sum = 0.0  # sum of (close - offset)
+        self._sum_xy = 0.0  # sum of i * (close - offset), i = position in window
+        self._mean = 0.0  # mean of (close - offset)
+        self._m2 = 0.0  # sum of squared deviations from the mean
+        self._volume_sum = 0.0
+        self._since_resync = 0
+
+    @property
+    def count(self) -> int:
+        return len(self._closes)
+
+    def push(self, close: float, volume: float, vwap: float, timestamp: datetime) -> None:
+        closes = self._closes
+        n = len(closes)
+        if n == 0:
+            self._offset = close
+        y = close - self._offset
+
+        if n < self.window:
+            self._sum_xy += n * y
+            self._sum += y
+            n += 1
+            delta = y - self._mean
+            self._mean += delta / n
+            self._m2 += delta * (y - self._mean)
+            self._volume_sum += volume
+        else:
+            y_old = closes[0] - self._offset
+            self._sum_xy += (n - 1) * y - (self._sum - y_old)
+            self._sum += y - y_old
+            delta = y - y_old
+            mean_old = self._mean
+            self._mean += delta / n
+            self._m2 += delta * (y - self._mean + y_old - mean_old)
+            self._volume_sum += volume - self._volumes[0]
+
+        closes.append(close)
+        self._volumes.append(volume)
+        self._last_vwap = vwap
+
+        seq = self._seq
+        self._seq += 1
+        expired = seq - self.window
+        for monotonic, keep in ((self._max_close, close.__lt__), (self._min_close, close.__gt__)):
+            while monotonic and not keep(monotonic[-1][1]):
+                monotonic.pop()
+            monotonic.append((seq, close))
+            if monotonic[0][0] <= expired:
+                monotonic.popleft()
+        while self._max_ts and self._max_ts[-1][1] <= timestamp:
+            self._max_ts.pop()
+        self._max_ts.append((seq, timestamp))
+        if self._max_ts[0][0] <= expired:
+            self._max_ts.popleft()
+
+        self._since_resync += 1
+        if self._since_resync >= self.window:
+            self._resync()
+
+    def _resync(self) -> None:
+        closes = list(self._closes)
+        n = len(closes)
+        self._offset = fsum(closes) / n
+        shifted = [c - self._offset for c in closes]
+        self._sum = fsum(shifted)
+        self._sum_xy = fsum(i * y for i, y in enumerate(shifted))
+        self._mean = self._sum / n
+        self._m2 = fsum((y - self._mean) ** 2 for y in shifted)
+        self._volume_sum = fsum(self._volumes)
+        self._since_resync = 0
+
+    def _slope(self) -> float:
+        n = len(self._closes)
+        if n < 2:
+            return 0.0
+        x_mean = (n - 1) / 2
+        sxx = n * (n * n - 1) / 12
+        return float((self._sum_xy - x_mean * self._sum) / sxx)
+
+    def groups(self) -> Dict[str, Dict[str, float]]:
+        closes = self._closes
+        n = len(closes)
+        volumes = self._volumes
+        return _derive_features(
+            n,
+            tuple(closes[i] for i in range(max(0, n - 3), n)),
+            self._last_vwap,
+            self._slope(),
+            self._offset + self._mean if n else 0.0,
+            float(np.sqrt(max(self._m2, 0.0) / n)) if n else 0.0,
+            self._max_close[0][1] if n else 0.0,
+            self._min_close[0][1] if n else 0.0,
+            float(sum(volumes[i] for i in range(max(0, n - 3), n))),
+            self._volume_sum / n if n else 0.0,
+        )
+
+    def features(
+        self,
+        symbol: str,
+        timeframe: int,
+        computed_at: Optional[datetime] = None,
+        order_book: Optional[Mapping[str, float]] = None,
+        volume: Optional[Mapping[str, float]] = None,
+        onchain: Optional[Mapping[str, float]] = None,
+        news: Optional[Mapping[str, float]] = None,
+        meta: Optional[Mapping[str, float]] = None,
+    ) -> FeatureVector:
+        """Build a ``FeatureVector`` without re-validating the internally produced floats."""
+        if computed_at is None:
+            computed_at = self._max_ts[0][1] if self._max_ts else datetime.utcnow()
+        groups = _override(
+            self.groups(), order_book=order_book, volume=volume, onchain=onchain, news=news, meta=meta
+        )
+        return FeatureVector.model_construct(symbol=symbol, timeframe_min=timeframe, computed_at=computed_at, **groups)
+
+
+FEATURE_LAYOUT: Dict[str, Tuple[str, ...]] = {
+    group: tuple(values)
+    for group, values in _derive_features(0, (), 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0).items()
+}
+
+_GROUPS = ("technical", "volume", "order_book", "news", "onchain", "meta")
+_BATCH_CHUNK = 16_384
+
+
+@dataclass(frozen=True)
+class FeatureBatch:
+    """Features for many rows at once, typically one row per window position.
+
+    ``values`` is an ``(N, F)`` matrix whose columns follow ``layout`` (by default
+    ``FEATURE_LAYOUT``); ``group`` returns the 2-D view for one ``FeatureVector``
+    group without copying. ``timestamps`` holds each row's epoch-nanosecond time.
+    """
+
+    values: np.ndarray
+    timestamps: np.ndarray
+    window: int
+    layout: Mapping[str, Tuple[str, ...]] = field(default_factory=lambda: FEATURE_LAYOUT)
+
+    @classmethod
+    def from_vectors(cls, vectors: Sequence[FeatureVector]) -> "FeatureBatch":
+        """Stack feature vectors that share the keys of the first one into a batch."""
+        if not vectors:
+            return cls(values=np.empty((0, 0)), timestamps=np.empty(0, dtype=np.int64), window=0, layout={})
+        layout = {group: tuple(getattr(vectors[0], group)) for group in _GROUPS}
+        values = np.array(
+            [[getattr(vector, group)[key] for group, keys in layout.items() for key in keys] for vector in vectors],
+            dtype=float,
+        )
+        timestamps = np.array([datetime_to_ns(vector.computed_at) for vector in vectors], dtype=np.int64)
+        return cls(values=values, timestamps=timestamps, window=0, layout=layout)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def group(self, name: str) -> np.ndarray:
+        start = 0
+        for group, keys in self.layout.items():
+            if group == name:
+                return self.values[:, start : start + len(keys)]
+            start += len(keys)
+        raise KeyError(name)
+
+    def column(self, group: str, key: str) -> np.ndarray:
+        return self.group(group)[:, self.layout[group].index(key)]
+
+    def get(self, group: str, key: str, default: float) -> np.ndarray:
+        """Column lookup with the same fallback semantics as ``dict.get`` on a vector."""
+        if key in self.layout.get(group, ()):
+            return self.column(group, key)
+        return np.full(len(self.values), default)
+
+    def vector(self, row: int, symbol: str, timeframe: int) -> FeatureVector:
+        groups: Dict[str, Dict[str, float]] = {}
+        values = self.values[row].tolist()
+        start = 0
+        for group, keys in self.layout.items():
+            groups[group] = dict(zip(keys, values[start : start + len(keys)]))
+            start += len(keys)
+        computed_at = ns_to_datetime(self.timestamps[row]) if len(self.timestamps) else datetime.utcnow()
+        return FeatureVector(symbol=symbol, timeframe_min=timeframe, computed_at=computed_at, **groups)
+
+
+def _derive_feature_arrays(
+    count: int,
+    last: np.ndarray,
+    prev: Optional[np.ndarray],
+    prev2: Optional[np.ndarray],
+    last_vwap: np.ndarray,
+    trend_slope: np.ndarray,
+    mean_close: np.ndarray,
+    std_close: np.ndarray,
+    max_close: np.ndarray,
+    min_close: np.ndarray,
+    recent_volume: np.ndarray,
+    mean_volume: np.ndarray,
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """Array counterpart of ``_derive_features``; the two must stay formula-for-formula in sync."""
+    zeros = np.zeros_like(last)
+    momentum = last - prev if count >= 2 else zeros
+    rsi = 50 + np.clip(momentum, -5, 5) * 5
+    volatility = std_close if count >= 2 else zeros
+    with np.errstate(divide="ignore"):
+        compression = np.where(volatility != 0, 1 / (1 + volatility), 1.0)
+    accumulation = recent_volume / (mean_volume + 1e-6)
+    imbalance = (last - mean_close) / (std_close + 1e-6)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        noise_ratio = np.where(trend_slope != 0, volatility / (np.abs(trend_slope) + 1e-6), 0.0)
+
+    return {
+        "technical": {
+            "trend_slope": trend_slope,
+            "volatility_compression": compression,
+            "divergence": last - last_vwap,
+            "momentum": momentum,
+            "rsi": rsi,
+            "acceleration": momentum - (prev - prev2) if count >= 3 else zeros,
+            "cluster_match": compression * 0.5 + trend_slope * 0.1,
+            "analogue_score": np.tanh(trend_slope) * 50,
+            "pullback_depth": (max_close - last) / (max_close + 1e-6),
+            "breakout_strength": (last - min_close) / (std_close + 1e-6),
+            "zscore": imbalance,
+        },
+        "volume": {
+            "rvol": accumulation,
+            "accumulation": accumulation - 1,
+            "imbalance": imbalance,
+        },
+        "order_book": {
+            "depth_skew": np.tanh(imbalance),
+            "spoof_likelihood": zeros,
+            "microprice_drift": trend_slope,
+        },
+        "news": {"sentiment_level": zeros, "sentiment_velocity": zeros, "shock": zeros},
+        "onchain": {
+            "flow_direction": zeros,
+            "active_address_divergence": zeros,
+            "exchange_balance_delta": zeros,
+        },
+        "meta": {
+            "volatility_regime": volatility / (mean_close + 1e-6),
+            "trend_strength": np.tanh(trend_slope),
+            "noise_ratio": noise_ratio,
+            "btc_correlation": zeros,
+            "btc_beta": zeros,
+            "eth_correlation": zeros,
+            "eth_beta": zeros,
+            "decoupling": zeros,
+            "btc_lead": zeros,
+        },
+    }
+
+
+CandleColumns = Union[np.ndarray, Mapping[str, np.ndarray]]
+
+
+def _has_column(columns: CandleColumns, name: str) -> bool:
+    if isinstance(columns, np.ndarray):
+        return columns.dtype.names is not None and name in columns.dtype.names
+    return name in columns
+
+
+def compute_features_batch(columns: CandleColumns, window: int = 60) -> FeatureBatch:
+    """Features for every ``window``-long slice of a columnar candle series.
+
+    ``columns`` is a structured array, a mapping such as ``CandleSeries.columns()``
+    or any object with ``close``, ``volume`` and
+    ``vwap`` columns and an optional ``timestamp`` column (epoch nanoseconds or
+    ``datetime64``). Row ``i`` equals ``compute_features`` over candles
+    ``i .. i + window - 1``. Work is done on sliding-window views in fixed-size
+    chunks, so memory stays bounded regardless of the series length.
+    """
+    if window < 1:
+        raise ValueError("window must be positive")
+    closes = np.asarray(columns["close"], dtype=float)
+    volumes = np.asarray(columns["volume"], dtype=float)
+    vwap = np.asarray(columns["vwap"], dtype=float)
+    timestamps = None
+    if _has_column(columns, "timestamp"):
+        timestamps = np.asarray(columns["timestamp"]).astype("datetime64[ns]").view(np.int64)
+
+    rows = max(len(closes) - window + 1, 0)
+    width = sum(len(keys) for keys in FEATURE_LAYOUT.values())
+    values = np.empty((rows, width), dtype=float)
+    newest = np.empty(rows if timestamps is not None else 0, dtype=np.int64)
+
+    x_centered = np.arange(window, dtype=float) - (window - 1) / 2
+    sxx = float(x_centered @ x_centered)
+    tail = min(window, 3)
+
+    for start in range(0, rows, _BATCH_CHUNK):
+        stop = min(start + _BATCH_CHUNK, rows)
+        close_view = sliding_window_view(closes[start : stop + window - 1], window)
+        volume_view = sliding_window_view(volumes[start : stop + window - 1], window)
+        ends = np.arange(start + window - 1, stop + window - 1)
+
+        groups = _derive_feature_arrays(
+            window,
+            closes[ends],
+            closes[ends - 1] if window >= 2 else None,
+            closes[ends - 2] if window >= 3 else None,
+            vwap[ends],
+            close_view @ x_centered / sxx if window >= 2 else np.zeros(stop - start),
+            close_view.mean(axis=1),
+            close_view.std(axis=1),
+            close_view.max(axis=1),
+            close_view.min(axis=1),
+            volume_view[:, window - tail :].sum(axis=1),
+            volume_view.mean(axis=1),
+        )
+        column = 0
+        for group, keys in FEATURE_LAYOUT.items():
+            for key in keys:
+                values[start:stop, column] = groups[group][key]
+                column += 1
+        if timestamps is not None:
+            newest[start:stop] = sliding_window_view(timestamps[start : stop + window - 1], window).max(axis=1)
+
+    return FeatureBatch(values=values, timestamps=newest, window=window)
+
+
+def compute_latest_features(series: Sequence[CandleSeries], window: int = 60) -> FeatureBatch:
+    """One feature row per series over its last ``window`` bars, in a stacked pass.
+
+    Row ``i`` equals ``compute_features`` over the tail of ``series[i]``. Series
+    with the same tail length (every timeframe with enough history) are stacked
+    into one ``(k, window)`` matrix and reduced together instead of one call each.
+    """
+    if window < 1:
+        raise ValueError("window must be positive")
+    counts = [min(window, len(item)) for item in series]
+    if any(count == 0 for count in counts):
+        raise ValueError("every series needs at least one bar")
+    width = sum(len(keys) for keys in FEATURE_LAYOUT.values())
+    values = np.empty((len(series), width), dtype=float)
+    newest = np.empty(len(series), dtype=np.int64)
+
+    for count in sorted(set(counts)):
+        rows = [i for i, c in enumerate(counts) if c == count]
+        closes = np.stack([series[i].close[-count:] for i in rows])
+        volumes = np.stack([series[i].volume[-count:] for i in rows])
+        x_centered = np.arange(count, dtype=float) - (count - 1) / 2
+        tail = min(count, 3)
+        groups = _derive_feature_arrays(
+            count,
+            closes[:, -1],
+            closes[:, -2] if count >= 2 else None,
+            closes[:, -3] if count >= 3 else None,
+            np.array([series[i].vwap[-1] for i in rows]),
+            closes @ x_centered / float(x_centered @ x_centered) if count >= 2 else np.zeros(len(rows)),
+            closes.mean(axis=1),
+            closes.std(axis=1),
+            closes.max(axis=1),
+            closes.min(axis=1),
+            volumes[:, count - tail :].sum(axis=1),
+            volumes.mean(axis=1),
+        )
+        column = 0
+        for group, keys in FEATURE_LAYOUT.items():
+            for key in keys:
+                values[rows, column] = groups[group][key]
+                column += 1
+        newest[rows] = [series[i].timestamp[-count:].max() for i in rows]
+
+    return FeatureBatch(values=values, timestamps=newest, window=window)
+
+
+def average_true_range(series: CandleSeries, window: int = 14) -> np.ndarray:
+    """Simple moving average of the true range, over fewer bars at the start."""
+    high, low, close = series.high, series.low, series.close
+    if not len(close):
+        return np.empty(0)
+    previous = np.r_[close[0], close[:-1]]
+    true_range = np.maximum(high - low, np.maximum(np.abs(high - previous), np.abs(low - previous)))
+    sums = np.cumsum(true_range)
+    lagged = np.r_[np.zeros(window), sums[:-window]] if len(sums) > window else np.zeros(len(sums))
+    counts = np.minimum(np.arange(1, len(sums) + 1), window)
+    return (sums - lagged[: len(sums)]) / counts
 
 
-__all__ = ["compute_features"]
+__all__ = [
+    "average_true_range",
+    "compute_features",
+    "compute_features_batch",
+    "compute_latest_features",
+    "FeatureBatch",
+    "FEATURE_LAYOUT",
+    "RollingFeatures",
+]
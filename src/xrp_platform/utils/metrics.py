@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+import logging
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+logger = logging.getLogger("metrics")
+
+F = TypeVar("F", bound=Callable[..., Any])
+Labels = Tuple[Tuple[str, str], ...]
+
+# log-linear buckets: 8 per power of two, so a bucket is within 12.5% of any value in it
+_SUB_BITS = 3
+_SUB = 1 << _SUB_BITS
+_BUCKETS = _SUB * (64 - _SUB_BITS)  # enough for any int64 nanosecond count
+# exported ``le`` bounds: powers of two from ~1us to ~69s
+_EXPORT_POWERS = range(10, 37)
+
+
+def _bucket(ns: int) -> int:
+    shift = ns.bit_length() - _SUB_BITS - 1
+    if shift <= 0:
+        return ns if ns > 0 else 0
+    return (shift << _SUB_BITS) + (ns >> shift)
+
+
+def _bucket_upper(index: int) -> int:
+    """Exclusive upper bound in nanoseconds of bucket ``index``."""
+    if index < 2 * _SUB:
+        return index + 1
+    shift = (index >> _SUB_BITS) - 1
+    return (index - (shift << _SUB_BITS) + 1) << shift
+
+
+class Histogram:
+    """Latency histogram with HDR-style log-linear buckets in nanoseconds.
+
+    ``observe_ns`` is a bit length, a shift and two increments, so recording
+    costs a couple of hundred nanoseconds and the histogram can stay on in
+    production; the count and maximum are derived from the buckets when read.
+    Quantiles come out within one bucket (12.5%). The exposition collapses the
+    fine buckets onto power-of-two ``le`` bounds in seconds. Updates are not
+    locked; concurrent threads may rarely lose an increment, which is fine for
+    monitoring.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str = "", labels: Labels = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.counts = [0] * _BUCKETS
+        self.sum_ns = 0
+
+    def observe_ns(self, ns: int) -> None:
+        shift = ns.bit_length() - _SUB_BITS - 1
+        if shift > 0:
+            self.counts[(shift << _SUB_BITS) + (ns >> shift)] += 1
+        else:
+            self.counts[ns if ns > 0 else 0] += 1
+        self.sum_ns += ns
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def observe(self, seconds: float) -> None:
+        self.observe_ns(int(seconds * 1e9))
+
+    def time(self) -> "Span":
+        return Span(self)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound in seconds of the bucket holding the ``q`` quantile."""
+        rank = q * self.count
+        seen = 0
+        last = -1
+        for index, count in enumerate(self.counts):
+            if count:
+                seen += count
+                last = index
+                if seen >= rank:
+                    break
+        return _bucket_upper(last) / 1e9 if last >= 0 else 0.0
+
+    def samples(self) -> List[Tuple[str, Labels, float]]:
+        rows: List[Tuple[str, Labels, float]] = []
+        cumulative = 0
+        start = 0
+        for power in _EXPORT_POWERS:
+            stop = _SUB * (power - _SUB_BITS + 1)  # first bucket at or above 2**power
+            cumulative += sum(self.counts[start:stop])
+            start = stop
+            rows.append((f"{self.name}_bucket", self.labels + (("le", repr(2.0**power / 1e9)),), cumulative))
+        cumulative += sum(self.counts[start:])
+        rows.append((f"{self.name}_bucket", self.labels + (("le", "+Inf"),), cumulative))
+        rows.append((f"{self.name}_sum", self.labels, self.sum_ns / 1e9))
+        rows.append((f"{self.name}_count", self.labels, cumulative))
+        return rows
+
+
+class Span:
+    """``with histogram.time():`` records the block's wall time."""
+
+    __slots__ = ("observe", "started")
+
+    def __init__(self, histogram: Histogram) -> None:
+        self.observe = histogram.observe_ns
+
+    def __enter__(self) -> "Span":
+        self.started = perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, traceback: object) -> None:
+        self.observe(perf_counter_ns() - self.started)
+
+
+class Counter:
+    """Monotonic count; ``fn`` reads it from an existing stats object at scrape time instead."""
+
+    kind = "counter"
+
+    def __init__(
+        self, name: str, help: str = "", labels: Labels = (), fn: Optional[Callable[[], float]] = None
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.fn = fn
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def samples(self) -> List[Tuple[str, Labels, float]]:
+        return [(f"{self.name}_total", self.labels, self.fn() if self.fn is not None else self.value)]
+
+
+class Gauge(Counter):
+    """Current value, set directly or read from ``fn`` (e.g. a queue depth) at scrape time."""
+
+    kind = "gauge"
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def samples(self) -> List[Tuple[str, Labels, float]]:
+        return [(self.name, self.labels, self.fn() if self.fn is not None else self.value)]
+
+
+Metric = Any
+
+
+class Registry:
+    """Metrics by name and labels, rendered in the Prometheus text format."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[Tuple[str, Labels], Metric] = {}
+
+    def _get(self, cls: type, name: str, help: str, labels: Dict[str, str], **options: Any) -> Metric:
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        metric = self._metrics.get(key)
+        if metric is None:
+            metric = self._metrics[key] = cls(name, help, key[1], **options)
+        elif type(metric) is not cls:
+            raise ValueError(f"{name} is already registered as a {metric.kind}")
+        elif options.get("fn") is not None:
+            metric.fn = options["fn"]  # a restarted component re-points its callback
+        return metric
+
+    def histogram(self, name: str, help: str = "", **labels: str) -> Histogram:
+        return self._get(Histogram, name, help, labels)
+
+    def counter(self, name: str, help: str = "", fn: Optional[Callable[[], float]] = None, **labels: str) -> Counter:
+        return self._get(Counter, name, help, labels, fn=fn)
+
+    def gauge(self, name: str, help: str = "", fn: Optional[Callable[[], float]] = None, **labels: str) -> Gauge:
+        return self._get(Gauge, name, help, labels, fn=fn)
+
+    def get(self, name: str, **labels: str) -> Optional[Metric]:
+        return self._metrics.get((name, tuple(sorted((k, str(v)) for k, v in labels.items()))))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        described = set()
+        for (name, _), metric in sorted(self._metrics.items(), key=lambda item: item[0]):
+            if name not in described:
+                described.add(name)
+                if metric.help:
+                    lines.append(f"# HELP {name} {metric.help}")
+                lines.append(f"# TYPE {name} {metric.kind}")
+            try:
+                samples = metric.samples()
+            except Exception:  # a callback into a stopped component must not break the scrape
+                logger.exception("failed to read metric %s", name)
+                continue
+            for sample, labels, value in samples:
+                rendered = ",".join(f'{key}="{_escape(val)}"' for key, val in labels)
+                lines.append(f"{sample}{{{rendered}}} {_number(value)}" if rendered else f"{sample} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+REGISTRY = Registry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def timed(name: str, help: str = "", registry: Optional[Registry] = None, **labels: str) -> Callable[[F], F]:
+    """Decorator recording each call's wall time into a histogram; async functions are awaited."""
+    histogram = (registry or REGISTRY).histogram(name, help, **labels)
+    observe = histogram.observe_ns
+
+    def decorate(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def run_async(*args: Any, **kwargs: Any) -> Any:
+                started = perf_counter_ns()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    observe(perf_counter_ns() - started)
+
+            return run_async  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def run(*args: Any, **kwargs: Any) -> Any:
+            started = perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(perf_counter_ns() - started)
+
+        return run  # type: ignore[return-value]
+
+    return decorate
+
+
+async def serve_metrics(
+    host: str = "0.0.0.0", port: int = 9100, registry: Optional[Registry] = None
+) -> asyncio.AbstractServer:
+    """Minimal HTTP server answering every GET with the rendered registry."""
+    registry = registry or REGISTRY
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+            if request.startswith(b"GET /metrics") or request.startswith(b"GET / "):
+                body, status = registry.render().encode(), b"200 OK"
+            else:
+                body, status = b"not found\n", b"404 Not Found"
+            writer.write(
+                b"HTTP/1.1 " + status + b"\r\nContent-Type: " + CONTENT_TYPE.encode()
+                + b"\r\nContent-Length: " + str(len(body)).encode() + b"\r\nConnection: close\r\n\r\n" + body
+            )
+            await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+
+__all__ = [
+    "CONTENT_TYPE",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "REGISTRY",
+    "Registry",
+    "Span",
+    "serve_metrics",
+    "timed",
+]
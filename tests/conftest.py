@@ -1,7 +1,72 @@
+from datetime import datetime, timedelta
 from pathlib import Path
 import sys
 
+import numpy as np
+import pytest
+
 ROOT = Path(__file__).resolve().parent.parent
 SRC_PATH = ROOT / "src"
 if str(SRC_PATH) not in sys.path:
     sys.path.insert(0, str(SRC_PATH))
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+from xrp_platform.data.schemas import TimeframeCandle  # noqa: E402
+
+
+def _random_walk(points: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    closes = 0.5 + np.cumsum(rng.normal(0, 0.002, points))
+    volumes = rng.uniform(5e5, 1.5e6, points)
+    start = datetime(2024, 1, 1)
+    return [
+        TimeframeCandle(
+            symbol="XRPUSDT",
+            timeframe_min=1,
+            open=float(c),
+            high=float(c) + 0.001,
+            low=float(c) - 0.001,
+            close=float(c),
+            volume=float(v),
+            vwap=float(c) - 0.0002,
+            timestamp=start + timedelta(minutes=i),
+        )
+        for i, (c, v) in enumerate(zip(closes, volumes))
+    ]
+
+
+@pytest.fixture
+def make_candles():
+    """Factory for seeded random-walk 1-minute candles."""
+    return _random_walk
+
+
+@pytest.fixture
+def settings():
+    from xrp_platform.config import Settings
+
+    return Settings.model_validate(
+        {
+            "BINANCE_API_KEY": "test",
+            "BINANCE_API_SECRET": "test",
+            "BINANCE_WS_URL": "wss://stream.binance.com:9443/ws",
+            "BINANCE_REST_URL": "https://api.binance.com",
+            "XRPL_RPC_URL": "https://s1.ripple.com:51234/",
+            "XRPL_WS_URL": "wss://s1.ripple.com",
+            "XRPL_DATA_API": "https://data.ripple.com",
+            "NEWSAPI_KEY": "test",
+            "NEWSAPI_ENDPOINT": "https://newsapi.org/v2/everything",
+            "BTC_MARKET_FEED_URL": "wss://example.com/btc",
+            "ETH_MARKET_FEED_URL": "wss://example.com/eth",
+            "DATABASE_URL": "sqlite+aiosqlite://",
+            "REDIS_URL": "redis://localhost:6379/0",
+            "MAX_POSITION_PCT": 2.0,
+            "MAX_DRAWDOWN_PCT": 10.0,
+            "STOP_MULTIPLIER": 2.0,
+            "TAKE_PROFIT_MULTIPLIER": 3.0,
+            "PUBLIC_API_BASE_URL": "http://localhost:8000",
+            "SYMBOLS": "xrpusdt, XRPBTC",
+        }
+    )
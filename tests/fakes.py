@@ -0,0 +1,93 @@
+"""In-process stand-ins for external services used by the tests."""
+
+import asyncio
+from itertools import count
+
+
+class FakeRedisError(Exception):
+    pass
+
+
+class _FakePipeline:
+    def __init__(self, redis: "FakeRedis") -> None:
+        self.redis = redis
+        self.commands = []
+
+    def xadd(self, name, fields, maxlen=None, approximate=True):
+        self.commands.append((name, fields, maxlen))
+        return self
+
+    async def execute(self):
+        if self.redis.fail_next:
+            self.redis.fail_next -= 1
+            raise FakeRedisError("connection reset")
+        return [await self.redis.xadd(name, fields, maxlen=maxlen) for name, fields, maxlen in self.commands]
+
+
+class FakeRedis:
+    """Just enough of the Redis streams API for publisher and reader tests."""
+
+    def __init__(self) -> None:
+        self.streams = {}
+        self.groups = {}
+        self.acked = []
+        self.fail_next = 0
+        self._ids = count(1)
+        self._changed = asyncio.Condition()
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    async def xadd(self, name, fields, maxlen=None, approximate=True):
+        entry_id = f"{next(self._ids)}-0".encode()
+        encoded = {
+            (k.encode() if isinstance(k, str) else k): (v.encode() if isinstance(v, str) else v)
+            for k, v in fields.items()
+        }
+        entries = self.streams.setdefault(name, [])
+        entries.append((entry_id, encoded))
+        if maxlen is not None and len(entries) > maxlen:
+            del entries[: len(entries) - maxlen]
+        async with self._changed:
+            self._changed.notify_all()
+        return entry_id
+
+    async def xlen(self, name):
+        return len(self.streams.get(name, []))
+
+    async def xgroup_create(self, name, groupname, id="$", mkstream=False):
+        if self.fail_next:
+            self.fail_next -= 1
+            raise FakeRedisError("connection refused")
+        if (name, groupname) in self.groups:
+            raise FakeRedisError("BUSYGROUP Consumer Group name already exists")
+        entries = self.streams.setdefault(name, [])
+        self.groups[(name, groupname)] = len(entries) if id == "$" else 0
+        return True
+
+    async def xgroup_destroy(self, name, groupname):
+        return int(self.groups.pop((name, groupname), None) is not None)
+
+    async def xreadgroup(self, groupname, consumername, streams, count=None, block=None, noack=False):
+        ((name, _),) = streams.items()
+        if (name, groupname) not in self.groups:
+            raise FakeRedisError("NOGROUP No such key or consumer group")
+
+        def pending():
+            entries = self.streams.get(name, [])
+            start = self.groups[(name, groupname)]
+            return entries[start : start + count if count else None]
+
+        if not pending() and block:
+            async with self._changed:
+                try:
+                    await asyncio.wait_for(self._changed.wait_for(lambda: bool(pending())), block / 1000)
+                except asyncio.TimeoutError:
+                    return []
+        batch = pending()
+        self.groups[(name, groupname)] += len(batch)
+        return [[name.encode(), batch]] if batch else []
+
+    async def xack(self, name, groupname, *ids):
+        self.acked.extend(ids)
+        return len(ids)
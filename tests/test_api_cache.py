@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from services.api import main as api_main
+from services.api.cache import SignalCache
+from services.api.main import app
+from tests.fakes import FakeRedis
+from xrp_platform.messaging.streams import SignalStreamReader
+
+
+def test_cache_single_flight_and_ttl():
+    now = [0.0]
+    calls = []
+
+    async def compute() -> bytes:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return b'{"composite": 1.0}'
+
+    async def scenario(cache: SignalCache):
+        return await asyncio.gather(*(cache.get_or_compute("XRPUSDT", 5, compute) for _ in range(50)))
+
+    signal_cache = SignalCache(grace_s=0, clock=lambda: now[0])
+    results = asyncio.run(scenario(signal_cache))
+    assert len(calls) == 1 and set(results) == {b'{"composite": 1.0}'}
+    assert signal_cache.stats.coalesced == 49
+
+    now[0] = 299.0
+    assert signal_cache.get("XRPUSDT", 5) is not None
+    now[0] = 300.0
+    assert signal_cache.get("XRPUSDT", 5) is None
+
+
+def test_every_api_process_sees_every_streamed_signal():
+    async def scenario():
+        redis = FakeRedis()
+        caches = [SignalCache(), SignalCache()]
+        # as in the API lifespan: one group per process, so neither steals the other's entries
+        readers = [SignalStreamReader(redis, f"api-host-{pid}", f"api-host-{pid}", block_ms=50) for pid in (1, 2)]
+        consumers = [asyncio.create_task(c.consume(r)) for c, r in zip(caches, readers)]
+        await asyncio.sleep(0)
+        await redis.xadd("signals", {"symbol": "XRPUSDT", "timeframe": "60", "data": b"{}"})
+        await redis.xadd("signals", {"symbol": "XRPBTC", "timeframe": "5", "data": b"[]"})
+        for _ in range(20):
+            await asyncio.sleep(0.01)
+            if all(c.get("XRPBTC", 5) for c in caches):
+                break
+        for consumer in consumers:
+            consumer.cancel()
+        await asyncio.gather(*consumers, return_exceptions=True)
+        for reader in readers:
+            await reader.drop_group()
+        return caches, redis
+
+    caches, redis = asyncio.run(scenario())
+    for signal_cache in caches:
+        assert signal_cache.get("XRPUSDT", 60) == b"{}" and signal_cache.get("XRPBTC", 5) == b"[]"
+    assert len(redis.acked) == 4 and not redis.groups
+
+
+def test_consumer_outlives_redis_being_down_and_losing_its_group():
+    async def wait_for(condition):
+        for _ in range(100):
+            if condition():
+                return
+            await asyncio.sleep(0.01)
+
+    async def scenario():
+        redis = FakeRedis()
+        redis.fail_next = 2  # Redis is unreachable when the API starts
+        signal_cache = SignalCache()
+        reader = SignalStreamReader(redis, "api-host-1", "api-host-1", block_ms=20)
+        consumer = asyncio.create_task(signal_cache.consume(reader, retry_delay_s=0))
+        await wait_for(lambda: redis.groups)
+        await redis.xadd("signals", {"symbol": "XRPUSDT", "timeframe": "1", "data": b"1"})
+        await wait_for(lambda: signal_cache.get("XRPUSDT", 1))
+        redis.groups.clear()  # a Redis restart without persistence drops the group
+        await wait_for(lambda: redis.groups)
+        await redis.xadd("signals", {"symbol": "XRPUSDT", "timeframe": "5", "data": b"5"})
+        await wait_for(lambda: signal_cache.get("XRPUSDT", 5))
+        consumer.cancel()
+        await asyncio.gather(consumer, return_exceptions=True)
+        return signal_cache
+
+    signal_cache = asyncio.run(scenario())
+    assert signal_cache.get("XRPUSDT", 1) == b"1" and signal_cache.get("XRPUSDT", 5) == b"5"
+    assert signal_cache.stats.stream_updates == 2
+
+
+def test_cache_keeps_at_most_max_entries_least_recently_used_first():
+    signal_cache = SignalCache(max_entries=2)
+    signal_cache.put("A", 1, b"a")
+    signal_cache.put("B", 1, b"b")
+    assert signal_cache.get("A", 1) == b"a"  # A is now the most recent
+    signal_cache.put("C", 1, b"c")
+    assert len(signal_cache) == 2 and signal_cache.stats.evictions == 1
+    assert signal_cache.get("B", 1) is None and signal_cache.get("A", 1) == b"a"
+
+
+@pytest.fixture
+def api_cache(monkeypatch):
+    """A fresh cache behind the API for one test, so cached entries don't leak into others."""
+    fresh = SignalCache()
+    monkeypatch.setattr(api_main, "cache", fresh)
+    return fresh
+
+
+def test_signal_endpoint_serves_cached_bytes(api_cache):
+    client = TestClient(app)
+    first = client.get("/signals/XRPUSDT", params={"timeframe": 5})
+    assert first.status_code == 200 and first.json()["timeframe_min"] == 5
+
+    api_cache.put("XRPUSDT", 5, b'{"cached": true}')
+    assert client.get("/signals/XRPUSDT", params={"timeframe": 5}).json() == {"cached": True}
+
+
+def test_unsupported_timeframes_are_rejected_before_the_cache(api_cache):
+    client = TestClient(app)
+    for timeframe in (0, -5, 7, "abc"):
+        assert client.get("/signals/XRPUSDT", params={"timeframe": timeframe}).status_code == 422
+    assert len(api_cache) == 0 and api_cache.stats.misses == 0
+
+
+def test_multi_timeframe_endpoint_is_served_from_its_cache(monkeypatch):
+    fresh = SignalCache()
+    monkeypatch.setattr(api_main, "timeframes_cache", fresh)
+    client = TestClient(app)
+    first = client.get("/signals/XRPUSDT/timeframes")
+    second = client.get("/signals/XRPUSDT/timeframes")
+    assert first.status_code == 200 and len(first.json()["signals"]) == 6
+    assert second.content == first.content
+    assert fresh.stats.misses == 1 and fresh.stats.hits == 1
@@ -0,0 +1,34 @@
+from datetime import datetime
+
+import numpy as np
+
+from xrp_platform.data.archive import CandleArchive
+from xrp_platform.data.candles import CandleSeries
+
+
+def test_archive_appends_and_seeks_by_date(tmp_path, make_candles):
+    series = CandleSeries.from_candles(make_candles(500))
+    archive = CandleArchive(tmp_path)
+
+    assert archive.append(series[:300]) == 300
+    assert archive.append(series[250:]) == 200  # overlap with archived bars is skipped
+    assert archive.count("xrpusdt", 1) == 500
+    assert list(archive.datasets()) == [("XRPUSDT", 1)]
+
+    window = archive.open("XRPUSDT", 1, start=datetime(2024, 1, 1, 1), end=datetime(2024, 1, 1, 2))
+    assert len(window) == 60
+    assert window.candle(0).timestamp == datetime(2024, 1, 1, 1)
+    assert np.array_equal(window.close, series.close[60:120])
+    assert not window.close.flags.owndata and not window.close.flags.writeable
+
+
+def test_archive_ignores_torn_append(tmp_path, make_candles):
+    series = CandleSeries.from_candles(make_candles(100))
+    archive = CandleArchive(tmp_path)
+    archive.append(series[:50])
+    with open(archive.path("XRPUSDT", 1) / "close.f8", "ab") as handle:
+        handle.write(b"\0" * 12)  # a crash mid-append left a partial tail
+
+    assert archive.count("XRPUSDT", 1) == 50
+    archive.append(series[50:])
+    assert np.array_equal(archive.open("XRPUSDT", 1).close, series.close)
@@ -0,0 +1,91 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from services.backtesting import main as backtesting_main
+
+from services.backtesting.engine import downsample_curve, walk_forward_batch
+from services.backtesting.jobs import CANCELLED, DONE, JobManager, JobsFull
+from xrp_platform.data.candles import CandleSeries
+
+
+def test_job_streams_progress_and_downsampled_result(make_candles):
+    series = CandleSeries.from_candles(make_candles(1_000))
+
+    async def scenario():
+        manager = JobManager(max_points=50, chunk_size=200)
+        job = manager.submit("XRPUSDT", series)
+        return job, [event async for event in job.follow()]
+
+    job, events = asyncio.run(scenario())
+    progress = [event for event in events if event["event"] == "progress"]
+    assert job.status == DONE and events[-1]["event"] == DONE
+    assert [event["bars_done"] for event in progress] == [200, 400, 600, 800, 940]
+
+    expected = walk_forward_batch("XRPUSDT", series)
+    result = events[-1]["result"]
+    assert result["trades"] == expected.trades
+    assert len(result["equity_curve"]) <= 50
+    assert result["equity_curve"][-1] == expected.equity_curve[-1]
+    index, value = progress[-1]["equity"][-1]
+    assert index == 940 and value == expected.equity_curve[-1]
+
+
+def test_job_cancelled_before_it_runs(make_candles):
+    series = CandleSeries.from_candles(make_candles(300))
+    release = threading.Event()
+
+    async def scenario():
+        executor = ThreadPoolExecutor(max_workers=1)
+        executor.submit(release.wait)
+        manager = JobManager(executor=executor)
+        job = manager.submit("XRPUSDT", series)
+        manager.cancel(job.id)
+        release.set()
+        events = [event async for event in job.follow()]
+        executor.shutdown()
+        return job, events
+
+    job, events = asyncio.run(scenario())
+    assert job.status == CANCELLED
+    assert [event["event"] for event in events] == [CANCELLED]
+
+
+def test_unfinished_jobs_are_capped_and_the_api_answers_429(make_candles, monkeypatch):
+    series = CandleSeries.from_candles(make_candles(300))
+    release = threading.Event()
+
+    async def scenario():
+        executor = ThreadPoolExecutor(max_workers=1)
+        executor.submit(release.wait)
+        manager = JobManager(executor=executor, max_jobs=2)
+        queued = [manager.submit("XRPUSDT", series) for _ in range(2)]
+        with pytest.raises(JobsFull):
+            manager.submit("XRPUSDT", series)
+        release.set()
+        for job in queued:
+            [event async for event in job.follow()]
+        # finished jobs make room again
+        extra = manager.submit("XRPUSDT", series)
+        [event async for event in extra.follow()]
+        executor.shutdown()
+        return manager, queued, extra
+
+    manager, queued, extra = asyncio.run(scenario())
+    assert manager.get(extra.id) is extra and len(manager._jobs) == 2
+
+    monkeypatch.setattr(backtesting_main, "jobs", JobManager(max_jobs=0))
+    response = TestClient(backtesting_main.app).post("/backtest/XRPUSDT/jobs")
+    assert response.status_code == 429
+
+
+def test_downsample_keeps_extremes():
+    curve = [1.0] * 1_000
+    curve[500] = 0.5
+    curve[700] = 2.0
+    indices, values = downsample_curve(curve, 20)
+    assert len(values) <= 20 and indices[0] == 0 and indices[-1] == 999
+    assert min(values) == 0.5 and max(values) == 2.0
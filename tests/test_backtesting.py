@@ -0,0 +1,60 @@
+import numpy as np
+
+from services.backtesting.engine import walk_forward, walk_forward_batch, walk_forward_incremental
+from services.backtesting.sweep import run_sweep, sweep_params
+from xrp_platform.data.candles import CandleSeries
+from xrp_platform.data.schemas import SweepParams, SweepRequest
+from xrp_platform.utils.features import RollingFeatures, compute_features
+
+
+def test_rolling_features_match_full_recompute(make_candles):
+    candles = make_candles(400)
+    state = RollingFeatures(window=60)
+    for i, candle in enumerate(candles):
+        state.push(candle.close, candle.volume, candle.vwap, candle.timestamp)
+        if i % 37 and i > 3:
+            continue
+        expected = compute_features("XRPUSDT", 1, candles[max(0, i - 59) : i + 1])
+        actual = state.features("XRPUSDT", 1)
+        assert actual.computed_at == expected.computed_at
+        for group in ("technical", "volume", "order_book", "meta"):
+            for key, value in getattr(expected, group).items():
+                assert np.isclose(getattr(actual, group)[key], value, rtol=1e-9, atol=1e-12), (group, key)
+
+
+def test_incremental_walk_forward_matches_reference(make_candles):
+    candles = make_candles(600)
+    expected = walk_forward("XRPUSDT", candles)
+    actual = walk_forward_incremental("XRPUSDT", candles)
+    assert actual.trades == expected.trades
+    assert actual.win_rate == expected.win_rate
+    assert np.allclose(actual.equity_curve, expected.equity_curve, rtol=1e-12)
+    assert np.isclose(actual.sharpe, expected.sharpe)
+
+
+def test_batch_walk_forward_matches_reference(make_candles):
+    candles = make_candles(400)
+    expected = walk_forward("XRPUSDT", candles, window=30)
+    actual = walk_forward_batch("XRPUSDT", candles, window=30)
+    assert actual.trades == expected.trades
+    assert np.allclose(actual.equity_curve, expected.equity_curve, rtol=1e-12)
+
+
+def test_sweep_ranks_runs_from_shared_series(make_candles):
+    series = CandleSeries.from_candles(make_candles(500))
+    request = SweepRequest(
+        windows=[20, 60],
+        thresholds=[{}, {"bullish": 55.0, "bearish": 45.0}],
+        base_weights=[{}, {"technical_trend": 3.0}],
+    )
+    params = sweep_params(request)
+    assert len(params) == 8
+    assert len(sweep_params(request.model_copy(update={"samples": 3}))) == 3
+
+    runs = run_sweep(series, params, max_workers=2)
+    assert [run.rank for run in runs] == list(range(1, 9))
+    assert all(a.result.sharpe >= b.result.sharpe for a, b in zip(runs, runs[1:]))
+
+    default = next(run for run in runs if run.params == SweepParams(window=60))
+    expected = walk_forward_batch("XRPUSDT", series, window=60)
+    assert default.result.equity_curve == expected.equity_curve
@@ -0,0 +1,72 @@
+import copy
+
+import numpy as np
+
+from benchmarks.__main__ import main
+from benchmarks.data import synthetic_series
+from benchmarks.suite import compare, environment_mismatch, load, run_suite, save
+
+
+def test_synthetic_series_is_seeded_and_well_formed():
+    series = synthetic_series(5_000, seed=3)
+    again = synthetic_series(5_000, seed=3)
+    assert np.array_equal(series.close, again.close) and np.array_equal(series.volume, again.volume)
+    assert not np.array_equal(series.close, synthetic_series(5_000, seed=4).close)
+    assert np.all(series.high >= np.maximum(series.open, series.close))
+    assert np.all(series.low <= np.minimum(series.open, series.close))
+    assert np.all(np.diff(series.timestamp) == 60_000_000_000)
+
+
+def test_suite_reports_throughput_and_memory_per_size(tmp_path):
+    report = run_suite([2_000, 1_000], ["compute_features", "composite_compute", "walk_forward_batch"], repeat=1)
+    rows = [(row["benchmark"], row["bars"]) for row in report["results"]]
+    # sized benchmarks run at every size; the composite call is size-independent and runs once
+    assert rows == [
+        ("compute_features", 1_000),
+        ("composite_compute", 1_000),
+        ("walk_forward_batch", 1_000),
+        ("compute_features", 2_000),
+        ("walk_forward_batch", 2_000),
+    ]
+    assert all(row["throughput"] > 0 and row["peak_bytes"] > 0 for row in report["results"])
+    save(report, tmp_path / "baseline.json")
+    assert load(tmp_path / "baseline.json") == report
+
+
+def test_compare_flags_slower_and_larger_runs(tmp_path):
+    baseline = {
+        "version": 1,
+        "results": [
+            {"benchmark": "aggregate", "bars": 1_000, "throughput": 1_000.0, "peak_bytes": 10 << 20},
+            {"benchmark": "walk_forward", "bars": 1_000, "throughput": 1_000.0, "peak_bytes": 10 << 20},
+            {"benchmark": "resample_many", "bars": 1_000, "throughput": 1_000.0, "peak_bytes": 1_000},
+        ],
+    }
+    current = copy.deepcopy(baseline)
+    current["results"][0]["throughput"] = 950.0  # within the 10% tolerance
+    current["results"][1]["throughput"] = 800.0
+    current["results"][2]["peak_bytes"] = 100_000  # 100x, but far below the noise floor
+    changes = compare(baseline, current)
+    assert [change.regressed for change in changes] == [False, True, False]
+
+    current["results"][0]["peak_bytes"] = 20 << 20
+    assert compare(baseline, current)[0].bigger
+
+    save(baseline, tmp_path / "baseline.json")
+    save(current, tmp_path / "current.json")
+    assert main(["compare", str(tmp_path / "baseline.json"), str(tmp_path / "baseline.json")]) == 0
+    assert main(["compare", str(tmp_path / "baseline.json"), str(tmp_path / "current.json")]) == 1
+
+
+def test_compare_reports_a_different_environment_instead_of_regressions(tmp_path, capsys):
+    report = run_suite([1_000], ["aggregate"], repeat=1, memory=False)
+    other = copy.deepcopy(report)
+    other["environment"]["numpy"] = "1.0.0"
+    other["results"][0]["throughput"] /= 10  # would regress if compared
+    save(report, tmp_path / "baseline.json")
+    save(other, tmp_path / "current.json")
+    paths = [str(tmp_path / "baseline.json"), str(tmp_path / "current.json")]
+    assert environment_mismatch(report, other) == {"numpy": (report["environment"]["numpy"], "1.0.0")}
+    assert main(["compare", *paths]) == 2
+    assert "environment numpy" in capsys.readouterr().out
+    assert main(["compare", "--ignore-environment", *paths]) == 1
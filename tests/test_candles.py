@@ -0,0 +1,39 @@
+import pickle
+from datetime import timezone
+
+import numpy as np
+
+from xrp_platform.data.candles import CandleSeries
+from xrp_platform.utils.features import compute_features
+
+
+def test_candle_series_round_trip_and_features(make_candles):
+    candles = make_candles(90)
+    series = CandleSeries.from_candles(candles)
+
+    assert len(series) == 90
+    assert series.to_candles() == candles
+    assert series[-1] == candles[-1]
+    assert compute_features("XRPUSDT", 1, series) == compute_features("XRPUSDT", 1, candles)
+
+
+def test_candle_series_append_and_views(make_candles):
+    candles = make_candles(40)
+    series = CandleSeries("XRPUSDT", 1, capacity=4)
+    for candle in candles:
+        series.append_candle(candle)
+    assert series.to_candles() == candles
+
+    window = series[10:20]
+    assert np.shares_memory(window.close, series.close)
+    window.append_candle(candles[0])
+    assert len(window) == 11 and len(series) == 40
+    assert series[20] == candles[20]
+
+    restored = pickle.loads(pickle.dumps(series))
+    assert np.array_equal(restored.close, series.close)
+
+
+def test_candle_series_keeps_timezone(make_candles):
+    candles = [c.model_copy(update={"timestamp": c.timestamp.replace(tzinfo=timezone.utc)}) for c in make_candles(3)]
+    assert CandleSeries.from_candles(candles).to_candles() == candles
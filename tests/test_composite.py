@@ -1,7 +1,10 @@
 from datetime import datetime
 
+import numpy as np
+
 from xrp_platform.signals.composite import CompositeEngine
 from xrp_platform.data.schemas import FeatureVector
+from xrp_platform.utils.features import FeatureBatch, compute_features_batch
 
 
 def test_composite_score_range():
@@ -24,3 +27,45 @@ def test_composite_score_range():
 
     assert 0 <= signal.composite <= 100
     assert len(signal.scores) == 9
+
+
+def test_compute_batch_matches_scalar_compute(make_candles):
+    candles = make_candles(200, seed=3)
+    columns = {
+        "close": np.array([c.close for c in candles]),
+        "volume": np.array([c.volume for c in candles]),
+        "vwap": np.array([c.vwap for c in candles]),
+    }
+    engine = CompositeEngine()
+    result = engine.compute_batch(compute_features_batch(columns, window=30))
+
+    assert result.scores.shape == (171, 9)
+    for row in (0, 50, 170):
+        expected = engine.compute(result.features.vector(row, "XRPUSDT", 1))
+        assert np.allclose(result.scores[row], [s.score for s in expected.scores])
+        assert np.isclose(result.composite[row], expected.composite)
+        assert result.regime(row) == expected.regime
+    assert result.signal(5, "XRPUSDT", 1).scores[0].explanation.notes
+
+
+def test_compute_batch_from_vectors_respects_regimes():
+    vectors = [
+        FeatureVector(
+            symbol="XRPUSDT",
+            timeframe_min=1,
+            computed_at=datetime(2024, 1, 1),
+            technical={"trend_slope": 0.1 * i, "rsi": 40 + i},
+            volume={"rvol": 1.0 + 0.1 * i},
+            order_book={},
+            news={},
+            onchain={},
+            meta={"volatility_regime": 0.5 * i, "trend_strength": 0.3 * i},
+        )
+        for i in range(6)
+    ]
+    engine = CompositeEngine()
+    result = engine.compute_batch(FeatureBatch.from_vectors(vectors))
+    for row, vector in enumerate(vectors):
+        expected = engine.compute(vector)
+        assert result.regime(row) == expected.regime
+        assert np.isclose(result.composite[row], expected.composite)
@@ -0,0 +1,208 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import httpx
+import numpy as np
+import orjson
+
+from xrp_platform.connectors.binance import BinanceConnector, BinanceMarketStream
+from xrp_platform.connectors.http import RateLimiter, RestClient
+from xrp_platform.connectors.replay import ReplayConnector
+from xrp_platform.connectors.websocket import StreamSubscriber
+from xrp_platform.data.archive import CandleArchive
+from xrp_platform.data.candles import CandleSeries
+from xrp_platform.data.schemas import OrderBookSnapshot
+
+T0_MS = 1_704_067_200_000  # 2024-01-01
+
+
+def _kline(open_ms, close):
+    return [open_ms, str(close), str(close + 0.01), str(close - 0.01), str(close), "100", open_ms + 59_999, str(close * 100)]
+
+
+async def _no_sleep(seconds):
+    return None
+
+
+def test_klines_page_through_long_ranges_and_retry_throttling():
+    calls = []
+
+    def handler(request):
+        params = request.url.params
+        calls.append(dict(params))
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"Retry-After": "2"}, text="slow down")
+        start = int(params["startTime"])
+        end = int(params["endTime"])
+        rows = [_kline(ms, 0.5 + i * 1e-4) for i, ms in enumerate(range(start, end + 1, 60_000))]
+        return httpx.Response(200, content=orjson.dumps(rows[: int(params["limit"])]))
+
+    async def run():
+        slept = []
+
+        async def sleep(seconds):
+            slept.append(seconds)
+
+        client = httpx.AsyncClient(base_url="https://api.test", transport=httpx.MockTransport(handler))
+        limiter = RateLimiter(rate_per_s=1_000, burst=1_000, sleep=sleep)
+        connector = BinanceConnector(RestClient(client, limiter, sleep=sleep))
+        series = await connector.fetch_klines("XRPUSDT", 1, T0_MS * 1_000_000, (T0_MS + 2_500 * 60_000) * 1_000_000)
+        await client.aclose()
+        return series, slept
+
+    series, slept = asyncio.run(run())
+    assert len(series) == 2_500
+    assert np.all(np.diff(series.timestamp) == 60 * 1_000_000_000)
+    assert series.timestamp[0] == T0_MS * 1_000_000
+    # one throttled attempt, then three pages (1000 + 1000 + 500)
+    assert len(calls) == 4 and slept[0] == 2.0
+    assert np.allclose(series.vwap, series.close)
+
+
+def test_klines_drop_the_still_open_kline():
+    now_ms = T0_MS + 10 * 60_000 + 1_000  # one second into the eleventh minute
+
+    def handler(request):
+        limit = int(request.url.params["limit"])
+        # Binance ends the latest page with the kline still forming at ``now_ms``
+        rows = [_kline(T0_MS + i * 60_000, 0.5) for i in range(11)][-limit:]
+        return httpx.Response(200, content=orjson.dumps(rows))
+
+    async def run():
+        client = httpx.AsyncClient(base_url="https://api.test", transport=httpx.MockTransport(handler))
+        limiter = RateLimiter(rate_per_s=1_000, burst=1_000)
+        connector = BinanceConnector(RestClient(client, limiter), clock=lambda: now_ms / 1_000)
+        latest = await connector.fetch_klines("XRPUSDT", 1, limit=5)
+        ranged = await connector.fetch_klines("XRPUSDT", 1, start_ns=T0_MS * 1_000_000)
+        await client.aclose()
+        return latest, ranged
+
+    latest, ranged = asyncio.run(run())
+    assert len(latest) == 5 and len(ranged) == 10
+    # the newest bar is the one that closed a second ago, not the one that just opened
+    assert latest.timestamp[-1] == ranged.timestamp[-1] == (T0_MS + 9 * 60_000) * 1_000_000
+
+
+class _FakeSocket:
+    """Scripted sessions: each connect yields the next list of messages, or raises."""
+
+    def __init__(self, sessions):
+        self.sessions = list(sessions)
+        self.urls = []
+
+    def __call__(self, url):
+        self.urls.append(url)
+        session = self.sessions.pop(0)
+
+        @asynccontextmanager
+        async def connection():
+            if isinstance(session, Exception):
+                raise session
+
+            async def messages():
+                for message in session:
+                    yield orjson.dumps(message)
+
+            yield messages()
+
+        return connection()
+
+
+class _FakeRest:
+    def __init__(self):
+        self.depth_calls = 0
+        self.trades = {}
+
+    async def depth(self, symbol, limit=1_000):
+        self.depth_calls += 1
+        update_id = 100 * self.depth_calls
+        snapshot = OrderBookSnapshot(symbol=symbol, bids=[[0.5, 10.0]], asks=[[0.51, 10.0]], timestamp="2024-01-01T00:00:00")
+        return update_id, snapshot
+
+    async def agg_trades(self, symbol, from_id, limit=1_000):
+        return [trade for trade in self.trades.get(symbol, []) if trade["a"] >= from_id][:limit]
+
+
+def _trade(trade_id, seller_maker=False):
+    return {"e": "aggTrade", "s": "XRPUSDT", "a": trade_id, "p": "0.5", "q": "10", "T": T0_MS + trade_id, "m": seller_maker}
+
+
+def _depth(first, last, bids=(), asks=()):
+    return {"e": "depthUpdate", "s": "XRPUSDT", "E": T0_MS, "U": first, "u": last, "b": list(bids), "a": list(asks)}
+
+
+def test_stream_reconnects_resyncs_books_and_backfills_missed_trades():
+    rest = _FakeRest()
+    socket = _FakeSocket(
+        [
+            [
+                {"stream": "xrpusdt@depth@100ms", "data": _depth(90, 100, bids=[["0.49", "5"]])},  # in the snapshot
+                {"stream": "xrpusdt@depth@100ms", "data": _depth(101, 101, bids=[["0.495", "7"]])},
+                {"stream": "xrpusdt@aggTrade", "data": _trade(1)},
+                {"stream": "xrpusdt@aggTrade", "data": _trade(2, seller_maker=True)},
+            ],
+            ConnectionError("dropped"),
+            [
+                {"stream": "xrpusdt@aggTrade", "data": _trade(4)},  # already backfilled
+                {"stream": "xrpusdt@depth@100ms", "data": _depth(305, 306, asks=[["0.505", "3"]])},  # gap
+            ],
+        ]
+    )
+    rest.trades["XRPUSDT"] = [_trade(i) for i in range(1, 5)]
+    stream = BinanceMarketStream("wss://stream.test/ws", ["xrpusdt"], rest, connect=socket)
+    stream.subscriber.sleep = _no_sleep
+
+    asyncio.run(stream.subscriber.run(max_connects=3))
+
+    assert socket.urls[0] == "wss://stream.test/stream?streams=xrpusdt@depth@100ms/xrpusdt@aggTrade"
+    assert stream.subscriber.stats.connects == 2 and stream.subscriber.stats.disconnects == 3
+    tape = stream.tapes["XRPUSDT"]
+    # trades 1, 2 live, 3 and 4 backfilled on reconnect, the live 4 dropped as a duplicate
+    assert tape.stats(60).trades == 4
+    assert tape.stats(60).sell_volume == 10.0
+    book = stream.books["XRPUSDT"]
+    # three snapshots: two connects and one gap resync, after which 305..306 still leaves a gap and is dropped
+    assert rest.depth_calls == 3
+    assert book.bids.levels() == [(0.5, 10.0)] and book.asks.levels() == [(0.51, 10.0)]
+
+
+def test_replay_connector_serves_archive_klines_and_recorded_stream(tmp_path, make_candles):
+    archive = CandleArchive(tmp_path / "candles")
+    archive.append(CandleSeries.from_candles(make_candles(500)))
+    recording = tmp_path / "stream.ndjson"
+    messages = [
+        {"stream": "xrpusdt@depth@100ms", "data": _depth(1, 1, bids=[["0.49", "5"]], asks=[["0.51", "4"]])},
+        {"stream": "xrpusdt@aggTrade", "data": _trade(1)},
+        {"stream": "xrpusdt@depth@100ms", "data": _depth(2, 2, bids=[["0.495", "2"]])},
+        {"stream": "xrpusdt@aggTrade", "data": _trade(2, seller_maker=True)},
+    ]
+    recording.write_bytes(b"\n".join(orjson.dumps(message) for message in messages) + b"\n")
+    replay = ReplayConnector(archive, recording, now_ns=int(archive.open("XRPUSDT", 1).timestamp[400]))
+
+    async def run():
+        latest = await replay.fetch_klines("XRPUSDT", 1, limit=120)
+        stream = BinanceMarketStream("wss://unused/ws", ["XRPUSDT"], replay, connect=replay.connect)
+        await stream.subscriber.run(max_connects=1)
+        return latest, stream
+
+    latest, stream = asyncio.run(run())
+    full = archive.open("XRPUSDT", 1)
+    assert len(latest) == 120
+    assert np.array_equal(latest.timestamp, full.timestamp[280:400])
+    assert stream.books["XRPUSDT"].bids.levels() == [(0.495, 2.0), (0.49, 5.0)]
+    assert stream.tapes["XRPUSDT"].stats(60).trades == 2
+
+
+def test_subscriber_keeps_connection_when_handler_fails():
+    socket = _FakeSocket([[{"n": 1}, {"n": 2}, {"n": 3}]])
+    seen = []
+
+    async def on_message(message):
+        if message["n"] == 2:
+            raise ValueError("bad message")
+        seen.append(message["n"])
+
+    subscriber = StreamSubscriber("wss://test", on_message, connect=socket, sleep=_no_sleep)
+    asyncio.run(subscriber.run(max_connects=1))
+    assert seen == [1, 3]
+    assert subscriber.stats.handler_errors == 1 and subscriber.stats.messages == 3
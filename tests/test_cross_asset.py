@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from xrp_platform.data.candles import CandleSeries
+from xrp_platform.features.cross_asset import CrossAssetFeatures, RollingCovariance
+from xrp_platform.signals.composite import REGIMES, CompositeEngine
+from xrp_platform.utils.features import FeatureBatch, compute_features
+
+MINUTE_NS = 60_000_000_000
+
+
+def test_rolling_covariance_matches_numpy_over_the_window():
+    rng = np.random.default_rng(1)
+    xs = rng.normal(0.5, 0.01, 3_000)
+    ys = 0.7 * xs + rng.normal(0, 0.005, 3_000)
+    stats = RollingCovariance(250)
+    for i, (x, y) in enumerate(zip(xs, ys)):
+        stats.push(x, y)
+        if i % 397 or i < 2:
+            continue
+        wx, wy = xs[max(0, i - 249) : i + 1], ys[max(0, i - 249) : i + 1]
+        assert stats.covariance() == pytest.approx(np.cov(wx, wy)[0, 1], rel=1e-9)
+        assert stats.correlation() == pytest.approx(np.corrcoef(wx, wy)[0, 1], rel=1e-9)
+        assert stats.beta() == pytest.approx(np.polyfit(wy, wx, 1)[0], rel=1e-9)
+
+
+def _series(symbol, timestamps, returns):
+    close = 0.5 * np.exp(np.cumsum(returns))
+    return CandleSeries.from_arrays(
+        symbol, 1, timestamp=timestamps, open=close, high=close, low=close, close=close, volume=np.ones_like(close), vwap=close
+    )
+
+
+def _market(points, seed=2, idiosyncratic_from=None):
+    rng = np.random.default_rng(seed)
+    btc = rng.normal(0, 0.002, points)
+    eth = rng.normal(0, 0.002, points)
+    xrp = 1.2 * eth + rng.normal(0, 0.0005, points)
+    xrp[2:] += 0.8 * btc[:-2]  # XRP follows BTC two bars late
+    if idiosyncratic_from is not None:
+        xrp[idiosyncratic_from:] = rng.normal(0, 0.004, points - idiosyncratic_from)
+    timestamps = np.arange(points, dtype=np.int64) * MINUTE_NS
+    return _series("XRPUSDT", timestamps, xrp), {"btc": _series("BTCUSDT", timestamps, btc), "eth": _series("ETHUSDT", timestamps, eth)}
+
+
+def test_betas_and_lead_lag_recovered_from_incremental_syncs():
+    xrp, benchmarks = _market(2_000)
+    cross = CrossAssetFeatures(windows=(60, 240, 960), lead_window=480)
+    # the worker re-sends a rolling 120-bar window every bar; only new bars are pushed
+    pushed = 0
+    for end in range(120, 2_001, 40):
+        pushed += cross.sync(xrp[end - 120 : end], {name: series[end - 120 : end] for name, series in benchmarks.items()})
+    assert pushed == 2_000 and cross.bars == 1_999
+
+    assert cross.stats("eth", 960).beta() == pytest.approx(1.2, rel=0.1)
+    assert abs(cross.stats("btc", 960).correlation()) < 0.15
+    lag, correlation = cross.lead_lag("btc")
+    assert lag == 2 and correlation > 0.4
+    features = cross.features()
+    assert features["btc_lead"] == correlation
+    assert features["decoupling"] < 0.2
+
+
+def test_decoupling_selects_the_decoupled_regime():
+    xrp, benchmarks = _market(1_500, idiosyncratic_from=1_450)
+    cross = CrossAssetFeatures(windows=(30, 120, 480))
+    cross.sync(xrp, benchmarks)
+    meta = cross.features()
+    assert meta["decoupling"] > 0.35
+
+    engine = CompositeEngine()
+    calm = compute_features("XRPUSDT", 1, xrp[-60:])
+    decoupled = compute_features("XRPUSDT", 1, xrp[-60:], meta=meta)
+    assert engine.classify_regime(decoupled) == "decoupled"
+    assert engine.classify_regime(calm) != "decoupled"
+    batch = FeatureBatch.from_vectors([calm, decoupled])
+    assert [REGIMES[i] for i in engine.classify_regime_batch(batch)] == [
+        engine.classify_regime(calm),
+        "decoupled",
+    ]
@@ -0,0 +1,161 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert, select, text
+from sqlalchemy.exc import IntegrityError
+
+from xrp_platform.data.schemas import CompositeSignal
+from xrp_platform.data.sink import ExecutionSink
+from xrp_platform.data.storage import Base, ExecutionLog, create_engine, ensure_execution_log_columns
+from xrp_platform.execution.engine import ExecutionEngine, RiskEngine, RiskLimits
+from xrp_platform.execution.pipeline import Dispatch, ExecutionPipeline, PaperBroker
+from xrp_platform.execution.portfolio import PortfolioRisk
+
+BAR = datetime(2024, 1, 1, 12)
+
+
+def _signal(composite: float, minute: int = 0, symbol: str = "XRPUSDT") -> CompositeSignal:
+    return CompositeSignal(
+        symbol=symbol,
+        timeframe_min=1,
+        computed_at=BAR + timedelta(minutes=minute),
+        scores=[],
+        composite=composite,
+        regime="trending",
+        thresholds={"bullish": 0.3, "bearish": -0.3},
+    )
+
+
+def _router(portfolio=None):
+    return ExecutionEngine(risk=RiskEngine(limits=RiskLimits()), portfolio=portfolio)
+
+
+def test_paper_pipeline_dedups_bars_and_logs_every_dispatch(tmp_path):
+    async def scenario():
+        engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'executions.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        portfolio = PortfolioRisk(100_000.0)
+        broker = PaperBroker(portfolio, fee_bps=0.0, slippage_bps=0.0)
+        pipeline = ExecutionPipeline(_router(portfolio), broker, ExecutionSink(engine, flush_interval_s=60))
+        pipeline.start()
+        commands = [
+            pipeline.submit(_signal(0.9), 1.00, 0.01),
+            pipeline.submit(_signal(0.9), 1.00, 0.01),  # the same bar recomputed
+            pipeline.submit(_signal(0.0, minute=1), 1.00, 0.01),  # neutral: nothing to trade
+            pipeline.submit(_signal(-0.9, minute=2, symbol="XRPBTC"), 2.00, 0.02),
+        ]
+        await pipeline.stop()
+        async with engine.connect() as conn:
+            rows = (await conn.execute(select(ExecutionLog).order_by(ExecutionLog.id))).all()
+        await engine.dispose()
+        return pipeline, portfolio, commands, rows
+
+    pipeline, portfolio, commands, rows = asyncio.run(scenario())
+    assert commands[1] is None and commands[2] is None
+    assert pipeline.stats.duplicates == 1 and pipeline.stats.routed == 2 and pipeline.stats.dispatched == 2
+    assert pipeline.queue_depth == 0 and 0 < pipeline.stats.max_latency_ms < 2_000
+    assert [row.idempotency_key for row in rows] == [commands[0].idempotency_key, commands[3].idempotency_key]
+    assert [row.status for row in rows] == ["filled", "filled"]
+    assert rows[0].size == pytest.approx(2_000.0) and rows[0].fill_price == pytest.approx(1.00)
+    assert rows[1].side == "SELL" and rows[1].stop == pytest.approx(2.04)
+    assert portfolio.position("XRPUSDT") == pytest.approx(2_000.0)
+    assert portfolio.position("XRPBTC") == pytest.approx(-1_000.0)
+
+
+def test_execution_logs_from_before_the_pipeline_are_upgraded_in_place(tmp_path):
+    row = {"symbol": "XRPUSDT", "side": "BUY", "size": 1.0, "entry": 1.0, "stop": 0.9, "take_profit": 1.2}
+
+    async def scenario():
+        engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'executions.db'}")
+        async with engine.begin() as conn:
+            # the table as it shipped before idempotency keys and fill reports
+            await conn.execute(
+                text(
+                    "CREATE TABLE execution_logs (id INTEGER PRIMARY KEY, symbol VARCHAR(16), side VARCHAR(8), "
+                    "size FLOAT, entry FLOAT, stop FLOAT, take_profit FLOAT, risk_tags JSON, created_at DATETIME)"
+                )
+            )
+            await conn.execute(insert(ExecutionLog.__table__).values(**row, risk_tags={}, created_at=BAR))
+            await conn.run_sync(Base.metadata.create_all)
+            await ensure_execution_log_columns(conn)
+            await ensure_execution_log_columns(conn)  # a second run finds nothing to add
+        upgraded = dict(row, idempotency_key="k", status="filled", fill_price=1.0, latency_ms=3.0)
+        async with engine.begin() as conn:
+            await conn.execute(insert(ExecutionLog.__table__).values(**upgraded, risk_tags={}, created_at=BAR))
+        with pytest.raises(IntegrityError):
+            async with engine.begin() as conn:
+                await conn.execute(insert(ExecutionLog.__table__).values(**upgraded, risk_tags={}, created_at=BAR))
+        async with engine.connect() as conn:
+            rows = (await conn.execute(select(ExecutionLog).order_by(ExecutionLog.id))).all()
+        await engine.dispose()
+        return rows
+
+    rows = asyncio.run(scenario())
+    assert [(r.idempotency_key, r.status, r.fill_price) for r in rows] == [(None, None, None), ("k", "filled", 1.0)]
+
+
+class _SlowBroker:
+    def __init__(self, delay_s):
+        self.delay_s = delay_s
+        self.placed = []
+
+    async def submit(self, command):
+        await asyncio.sleep(self.delay_s)
+        self.placed.append(command)
+        return Dispatch("accepted")
+
+    def mark(self, symbol, price):
+        pass
+
+
+class _Sink:
+    def __init__(self):
+        self.rows = []
+
+    def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def submit(self, row):
+        self.rows.append(row)
+
+
+def test_commands_past_their_latency_budget_are_not_placed():
+    async def scenario():
+        broker = _SlowBroker(0.2)
+        sink = _Sink()
+        pipeline = ExecutionPipeline(_router(), broker, sink, max_latency_s=0.3)
+        for minute in range(3):
+            pipeline.submit(_signal(0.9, minute), 1.0, 0.01)
+        pipeline.start()
+        await pipeline.stop()
+        return pipeline, broker, sink
+
+    pipeline, broker, sink = asyncio.run(scenario())
+    # the first is placed within budget, the second is cut off mid-call, the third never starts
+    assert [row["status"] for row in sink.rows] == ["accepted", "timeout", "stale"]
+    assert len(broker.placed) == 1
+    assert pipeline.stats.dispatched == 1 and pipeline.stats.stale == 1 and pipeline.stats.errors == 1
+    assert 200 <= sink.rows[0]["latency_ms"] < 300
+
+
+def test_paper_broker_is_idempotent_and_closes_brackets_on_marks():
+    async def scenario():
+        portfolio = PortfolioRisk(10_000.0)
+        broker = PaperBroker(portfolio, fee_bps=0.0, slippage_bps=0.0)
+        command = _router().route(_signal(0.9), 10_000.0, 1.0, 0.01)
+        first = await broker.submit(command)
+        again = await broker.submit(command)
+        return portfolio, broker, first, again
+
+    portfolio, broker, first, again = asyncio.run(scenario())
+    assert first == again and portfolio.position("XRPUSDT") == pytest.approx(200.0)
+    broker.mark("XRPUSDT", 1.01)
+    assert broker.open_brackets("XRPUSDT") == 1
+    broker.mark("XRPUSDT", 1.03)  # take-profit at entry + 3 ATR
+    assert broker.open_brackets("XRPUSDT") == 0 and portfolio.position("XRPUSDT") == 0.0
+    assert portfolio.equity == pytest.approx(10_000.0 + 200.0 * 0.03)
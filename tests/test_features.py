@@ -0,0 +1,24 @@
+import numpy as np
+
+from xrp_platform.utils.features import FEATURE_LAYOUT, compute_features, compute_features_batch
+
+
+def test_batch_features_match_per_window_compute(make_candles):
+    candles = make_candles(300, seed=11)
+    columns = {
+        "close": np.array([c.close for c in candles]),
+        "volume": np.array([c.volume for c in candles]),
+        "vwap": np.array([c.vwap for c in candles]),
+        "timestamp": np.array([np.datetime64(c.timestamp, "ns") for c in candles]),
+    }
+    batch = compute_features_batch(columns, window=60)
+    assert batch.values.shape == (241, sum(len(keys) for keys in FEATURE_LAYOUT.values()))
+
+    for row in (0, 17, 240):
+        expected = compute_features("XRPUSDT", 1, candles[row : row + 60])
+        actual = batch.vector(row, "XRPUSDT", 1)
+        assert actual.computed_at == expected.computed_at
+        for group, keys in FEATURE_LAYOUT.items():
+            for key in keys:
+                assert np.isclose(getattr(actual, group)[key], getattr(expected, group)[key], rtol=1e-9, atol=1e-12)
+    assert np.array_equal(batch.column("technical", "rsi"), batch.group("technical")[:, 4])
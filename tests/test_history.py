@@ -0,0 +1,177 @@
+import asyncio
+from datetime import date, datetime, timedelta
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select, text
+
+
+from scripts.bootstrap_db import init_db
+from services.api.main import app
+from xrp_platform.data.schemas import CompositeSignal, SignalExplanation, SignalScore
+from xrp_platform.data.sink import SignalSink
+from xrp_platform.data.storage import (
+    Base,
+    SignalRecord,
+    create_engine,
+    ensure_signal_partitions,
+    maintain_signal_partitions,
+)
+
+
+def _signal(symbol: str, i: int) -> CompositeSignal:
+    return CompositeSignal(
+        symbol=symbol,
+        timeframe_min=5,
+        computed_at=datetime(2024, 1, 31, 23) + timedelta(minutes=5 * i),
+        scores=[SignalScore(module="volume_flow", score=float(i), explanation=SignalExplanation(factors={}))],
+        composite=float(i),
+        regime="trending",
+        thresholds={"bullish": 80.0},
+    )
+
+
+def test_history_pages_by_cursor_across_months(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'signals.db'}"
+
+    async def populate():
+        engine = create_engine(url)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        sink = SignalSink(engine, max_batch=10)
+        sink.start()
+        for i in range(30):
+            await sink.submit(_signal("XRPUSDT", i))
+            await sink.submit(_signal("XRPBTC", i))
+        await sink.submit(_signal("XRPUSDT", 3))  # duplicate key is skipped
+        await sink.stop()
+        await engine.dispose()
+        return sink
+
+    sink = asyncio.run(populate())
+    assert sink.stats.errors == 0
+
+    app.state.db_engine = create_engine(url)
+    try:
+        client = TestClient(app)
+        seen, cursor, pages = [], None, 0
+        while True:
+            params = {"timeframe": 5, "limit": 12, "start": "2024-01-31T23:10:00"}
+            if cursor is not None:
+                params["cursor"] = cursor
+            response = client.get("/signals/XRPUSDT/history", params=params)
+            assert response.headers["content-type"] == "application/x-ndjson"
+            lines = [orjson.loads(line) for line in response.content.splitlines()]
+            pages += 1
+            cursor = lines[-1].get("next_cursor")
+            seen.extend(line for line in lines if "next_cursor" not in line)
+            if cursor is None:
+                break
+    finally:
+        del app.state.db_engine
+
+    assert pages == 3
+    assert [row["composite"] for row in seen] == [float(i) for i in range(2, 30)]
+    assert {row["symbol"] for row in seen} == {"XRPUSDT"}
+    assert seen[0]["scores"] == {"volume_flow": 2.0}
+
+
+class _RecordingConnection:
+    """Stands in for a PostgreSQL connection: records statements, knows which tables exist."""
+
+    class dialect:
+        name = "postgresql"
+
+    def __init__(self, existing):
+        self.existing = set(existing)
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(str(statement))
+
+    async def scalar(self, statement):
+        return str(statement).split("'")[1] in self.existing
+
+
+def test_missing_partitions_absorb_default_rows_before_attaching():
+    conn = _RecordingConnection({"signals", "signals_2024_04", "signals_2024_05"})
+    asyncio.run(ensure_signal_partitions(conn, date(2024, 5, 20), months_ahead=1))
+    created = [s.split()[2] for s in conn.statements if s.startswith("CREATE TABLE signals_2")]
+    assert created == ["signals_2024_06"]
+    june = [s for s in conn.statements if "2024-06-01" in s]
+    assert [s.split()[0] for s in june] == ["INSERT", "DELETE", "ALTER"]
+    assert "FROM signals_default" in june[0] and "ATTACH PARTITION signals_2024_06" in june[2]
+
+
+def test_partitioning_an_unpartitioned_signals_table_says_how_to_migrate():
+    conn = _RecordingConnection(set())  # ``signals`` exists but is missing from pg_partitioned_table
+    with pytest.raises(RuntimeError, match="bootstrap_db"):
+        asyncio.run(ensure_signal_partitions(conn, date(2024, 5, 20)))
+    assert conn.statements == []
+
+
+def test_bootstrap_migrates_a_signals_table_in_the_first_shipped_layout(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'legacy.db'}"
+    legacy = [
+        ("XRPUSDT", "2024-01-01 00:00:00", '{"volume_flow": 0.5}', 10.0),
+        ("XRPUSDT", "2024-01-01 00:00:00", '{"volume_flow": 0.7, "retired_module": 1.0}', 20.0),  # recomputed bar
+        ("XRPBTC", "2024-01-01 00:05:00", '[{"module": "news_sentiment", "score": -0.2}]', -5.0),
+    ]
+
+    async def scenario():
+        engine = create_engine(url)
+        async with engine.begin() as conn:
+            await conn.execute(
+                text(
+                    "CREATE TABLE signals (id INTEGER PRIMARY KEY, symbol VARCHAR(16), timeframe_min INTEGER, "
+                    "composite FLOAT, regime VARCHAR(32), scores JSON, thresholds JSON, computed_at DATETIME)"
+                )
+            )
+            for symbol, at, scores, composite in legacy:
+                await conn.execute(
+                    text(
+                        "INSERT INTO signals (symbol, timeframe_min, composite, regime, scores, thresholds, "
+                        "computed_at) VALUES (:symbol, 5, :composite, 'trending', :scores, '{}', :at)"
+                    ),
+                    {"symbol": symbol, "composite": composite, "scores": scores, "at": at},
+                )
+        await engine.dispose()
+        for _ in range(2):  # the second run finds nothing left to migrate
+            await init_db(create_engine(url))
+
+        engine = create_engine(url)
+        sink = SignalSink(engine)
+        await sink.flush([sink.row(_signal("XRPETH", 1))])  # the sink writes the migrated table
+        async with engine.connect() as conn:
+            rows = (await conn.execute(select(SignalRecord).order_by(SignalRecord.symbol))).all()
+            kept = await conn.scalar(text("SELECT COUNT(*) FROM signals_legacy"))
+        await engine.dispose()
+        return sink, rows, kept
+
+    sink, rows, kept = asyncio.run(scenario())
+    assert sink.stats.rows == 1 and kept == 3
+    assert [(row.symbol, row.composite) for row in rows] == [("XRPBTC", -5.0), ("XRPETH", 1.0), ("XRPUSDT", 20.0)]
+    assert rows[0].score_news_sentiment == -0.2 and rows[0].score_volume_flow is None
+    assert rows[2].score_volume_flow == 0.7
+
+
+def test_partition_maintenance_runs_at_start_and_on_schedule(tmp_path):
+    days = iter([date(2024, 1, 31), date(2024, 2, 1), date(2024, 2, 2)])
+    slept = []
+
+    async def sleep(seconds):
+        slept.append(seconds)
+        if len(slept) == 3:
+            raise asyncio.CancelledError
+
+    async def scenario():
+        engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'partitions.db'}")
+        try:
+            await maintain_signal_partitions(engine, 3_600, today=lambda: next(days), sleep=sleep)
+        except asyncio.CancelledError:
+            pass
+        await engine.dispose()
+
+    asyncio.run(scenario())
+    assert slept == [3_600, 3_600, 3_600] and next(days, None) is None
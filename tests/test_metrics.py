@@ -0,0 +1,105 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from services.api.main import app
+from services.signal_worker.main import STAGES, SignalWorker
+from xrp_platform.utils.metrics import REGISTRY, Registry, serve_metrics, timed
+
+
+def test_histogram_quantiles_stay_within_one_bucket():
+    registry = Registry()
+    histogram = registry.histogram("job_seconds", "Job latency", stage="features")
+    values = np.random.default_rng(1).lognormal(np.log(50_000), 1.0, 20_000).astype(np.int64)
+    for ns in values:
+        histogram.observe_ns(int(ns))
+    assert histogram.count == len(values) and histogram.sum_ns == int(values.sum())
+    for q in (0.5, 0.9, 0.99):
+        exact = np.quantile(values, q) / 1e9
+        assert exact <= histogram.quantile(q) <= exact * 1.13
+
+    text = registry.render()
+    assert "# TYPE job_seconds histogram" in text
+    assert f'job_seconds_bucket{{stage="features",le="+Inf"}} {len(values)}' in text
+    assert f'job_seconds_count{{stage="features"}} {len(values)}' in text
+    buckets = [int(line.rsplit(" ", 1)[1]) for line in text.splitlines() if line.startswith("job_seconds_bucket")]
+    assert buckets == sorted(buckets)
+
+
+def test_timed_records_sync_and_async_calls_and_callbacks_render():
+    registry = Registry()
+
+    @timed("sync_seconds", registry=registry)
+    def square(x):
+        return x * x
+
+    @timed("async_seconds", registry=registry)
+    async def wait(x):
+        await asyncio.sleep(0.01)
+        return x
+
+    assert square(3) == 9 and asyncio.run(wait(4)) == 4
+    assert registry.get("sync_seconds").count == 1
+    assert registry.get("async_seconds").quantile(1.0) >= 0.01
+
+    depth = [3]
+    registry.gauge("queue_depth", "Queued items", fn=lambda: depth[0])
+    registry.counter("broken", fn=lambda: 1 / 0)
+    depth[0] = 7
+    text = registry.render()
+    assert "queue_depth 7" in text and "broken_total" not in text
+    with pytest.raises(ValueError):
+        registry.counter("queue_depth")
+
+
+def test_worker_records_each_stage_and_the_api_serves_them(settings):
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        worker = SignalWorker(settings, executor=executor)
+        before = {stage: REGISTRY.histogram("xrp_worker_stage_seconds", stage=stage).count for stage in STAGES}
+        asyncio.run(worker.run_once("XRPUSDT", 1))
+    recorded = {stage for stage in STAGES if REGISTRY.get("xrp_worker_stage_seconds", stage=stage).count > before[stage]}
+    assert recorded == set(STAGES) - {"route"}  # no execution pipeline configured
+
+    with TestClient(app) as client:
+        client.get("/health")
+        response = client.get("/metrics")
+    assert response.status_code == 200 and response.headers["content-type"].startswith("text/plain")
+    assert 'xrp_worker_stage_seconds_count{stage="composite"}' in response.text
+    assert 'xrp_api_requests_total{route="/health",status="200"}' in response.text
+    assert "xrp_compute_features_seconds_count" in response.text
+
+
+def test_compute_timings_reach_the_worker_registry_from_either_executor(settings):
+    def counts():
+        return tuple(
+            REGISTRY.histogram(name).count for name in ("xrp_compute_features_seconds", "xrp_composite_compute_seconds")
+        )
+
+    for executor in (ThreadPoolExecutor(max_workers=1), ProcessPoolExecutor(max_workers=1)):
+        with executor:
+            worker = SignalWorker(settings, executor=executor)
+            before = counts()
+            asyncio.run(worker.compute("XRPUSDT", 1))
+        # once each: ``@timed`` in-process, merged from the child for a pool
+        assert counts() == (before[0] + 1, before[1] + 1), type(executor).__name__
+
+
+def test_worker_metrics_server_answers_scrapes():
+    async def scenario():
+        registry = Registry()
+        registry.counter("scrapes").inc(2)
+        server = await serve_metrics("127.0.0.1", 0, registry)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET /metrics HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        response = await reader.read()
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return response
+
+    response = asyncio.run(scenario())
+    assert response.startswith(b"HTTP/1.1 200 OK") and response.endswith(b"scrapes_total 2\n")
@@ -0,0 +1,41 @@
+import numpy as np
+
+from xrp_platform.data.candles import CandleSeries
+from xrp_platform.features.timeframe import resample, resample_many
+from xrp_platform.signals.composite import CompositeEngine
+from xrp_platform.signals.multi_timeframe import DEFAULT_TIMEFRAMES, MultiTimeframePipeline, confluence
+from xrp_platform.utils.features import compute_features
+
+
+def test_resample_many_matches_direct_resample(make_candles):
+    series = CandleSeries.from_candles(make_candles(3 * 10_080))
+    cascade = resample_many(series, DEFAULT_TIMEFRAMES)
+    assert cascade[1] is series
+    for timeframe in DEFAULT_TIMEFRAMES[1:]:
+        direct = resample(series, timeframe)
+        assert np.array_equal(cascade[timeframe].timestamp, direct.timestamp)
+        for name in ("open", "high", "low", "close"):
+            assert np.array_equal(cascade[timeframe].columns()[name], direct.columns()[name]), (timeframe, name)
+        assert np.allclose(cascade[timeframe].volume, direct.volume, rtol=1e-12)
+        assert np.allclose(cascade[timeframe].vwap, direct.vwap, rtol=1e-12)
+
+
+def test_pipeline_matches_per_timeframe_compute(make_candles):
+    series = CandleSeries.from_candles(make_candles(2 * 10_080))
+    result = MultiTimeframePipeline().compute(series)
+    engine = CompositeEngine()
+
+    assert [signal.timeframe_min for signal in result.signals] == list(DEFAULT_TIMEFRAMES)
+    for signal in result.signals:
+        bars = resample(series, signal.timeframe_min)[-60:]
+        expected = engine.compute(compute_features("XRPUSDT", signal.timeframe_min, bars))
+        assert signal.computed_at == expected.computed_at
+        assert np.isclose(signal.composite, expected.composite, rtol=1e-9, atol=1e-9)
+    assert -100.0 <= result.confluence <= 100.0 and 0.0 <= result.alignment <= 1.0
+
+
+def test_confluence_weights_slow_timeframes():
+    thresholds = CompositeEngine().thresholds()
+    score, alignment = confluence([80.0, 40.0], [1, 1440], thresholds)
+    assert score < 0 and np.isclose(alignment, np.log2(1441) / (1 + np.log2(1441)))
+    assert confluence([80.0, 80.0], [5, 60], thresholds) == (100.0, 1.0)
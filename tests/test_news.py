@@ -0,0 +1,103 @@
+import asyncio
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+from xrp_platform.connectors.http import RestClient
+from xrp_platform.connectors.news import NewsApiConnector, NewsFeed
+from xrp_platform.data.schemas import NewsArticle
+from xrp_platform.features.news import LexiconScorer, NewsSentiment, SentimentState, content_key
+from xrp_platform.utils.dedup import DedupCache
+
+FIXTURE = Path(__file__).parent / "fixtures" / "newsapi_everything.json"
+
+
+def test_lexicon_scores_direction_and_negation():
+    scores = LexiconScorer().score_batch(
+        [
+            "XRP surges after court win",
+            "Exchange hacked, XRP plunges",
+            "XRP does not rally",
+            "Ripple publishes quarterly report",
+        ]
+    )
+    assert scores[0] > 0.5 and scores[1] < -0.5
+    assert scores[2] < 0
+    assert scores[3] == 0.0
+    assert np.all(np.abs(scores) < 1)
+
+
+def test_feed_dedups_syndicated_copies_against_fixture_endpoint():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, content=FIXTURE.read_bytes())
+
+    async def run():
+        client = httpx.AsyncClient(base_url="https://newsapi.test", transport=httpx.MockTransport(handler))
+        sentiment = NewsSentiment(["XRPUSDT", "XRPBTC"])
+        feed = NewsFeed(NewsApiConnector(RestClient(client), "key"), sentiment)
+        first = await feed.poll()
+        second = await feed.poll()
+        await client.aclose()
+        return sentiment, feed, first, second
+
+    sentiment, feed, first, second = asyncio.run(run())
+    # 8 entries: one removed placeholder, one syndicated copy of the court story
+    assert first == 6 and second == 0
+    assert sentiment.duplicates == 1 + 7
+    assert requests[0].url.path == "/v2/everything"
+    assert "from" not in requests[0].url.params
+    assert requests[1].url.params["from"] == "2024-01-31T09:25:00"
+    assert feed.newest == datetime.fromisoformat("2024-01-31T09:55:00+00:00")
+
+    features = sentiment.features("XRPUSDT")
+    assert features == sentiment.features("XRPBTC")
+    # the latest stories are the positive ones, so the fast level leads the slow one
+    assert features["sentiment_velocity"] > 0
+    assert -1 < features["sentiment_level"] < 1
+    assert sentiment.features("XRPETH") is None
+
+
+def test_keywords_route_articles_to_symbols():
+    sentiment = NewsSentiment(["XRPUSDT", "BTCUSDT"], keywords={"XRPUSDT": ["xrp", "ripple"], "BTCUSDT": ["bitcoin"]})
+    at = datetime(2024, 1, 31, 12)
+    sentiment.ingest([NewsArticle(title="Ripple wins appeal", published_at=at)])
+    assert sentiment.features("XRPUSDT")["sentiment_level"] > 0
+    assert sentiment.features("BTCUSDT") is None
+
+
+def test_shock_fires_on_a_burst_against_the_rolling_baseline():
+    state = SentimentState(bucket_s=900, shock_buckets=96)
+    start = datetime(2024, 1, 1).timestamp()
+    rng = np.random.default_rng(5)
+    # a day of routine coverage: a couple of mildly mixed stories per 15 minutes
+    for bucket in range(96):
+        for offset in (100, 500):
+            state.add(float(rng.normal(0, 0.3)), start + bucket * 900 + offset)
+    assert state.features(start + 96 * 900)["shock"] == 0.0
+
+    burst_at = start + 96 * 900 + 60
+    for i in range(12):
+        state.add(-0.8, burst_at + i * 30)
+    features = state.features()
+    assert features["shock"] < -0.5
+    assert features["sentiment_velocity"] < 0
+
+    # once the burst bucket is history, the shock is gone
+    assert state.features(burst_at + 2 * 900)["shock"] == 0.0
+
+
+def test_dedup_cache_evicts_least_recently_seen():
+    cache = DedupCache(capacity=2)
+    keys = [content_key(NewsArticle(title=f"headline {i}", published_at=datetime(2024, 1, 1))) for i in range(3)]
+    assert not cache.seen(keys[0]) and not cache.seen(keys[1])
+    assert cache.seen(keys[0])  # refreshes keys[0]
+    assert not cache.seen(keys[2])  # evicts keys[1]
+    assert cache.seen(keys[0]) and not cache.seen(keys[1])
+    assert len(cache) == 2
+    same = NewsArticle(title="XRP surges - Reuters", published_at=datetime(2024, 1, 1) + timedelta(hours=1))
+    assert content_key(same) == content_key(NewsArticle(title="XRP Surges | CoinDesk", published_at=datetime(2024, 1, 1)))
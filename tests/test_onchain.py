@@ -0,0 +1,166 @@
+import asyncio
+import json
+import random
+from pathlib import Path
+
+import httpx
+import orjson
+import pytest
+
+from xrp_platform.connectors.http import RestClient
+from xrp_platform.connectors.xrpl import XrplConnector, XrplLedgerFeed
+from xrp_platform.features.onchain import RIPPLE_EPOCH_S, HyperLogLog, OnChainIndexer
+from xrp_platform.utils.features import compute_features
+
+FIXTURE = Path(__file__).parent / "fixtures" / "xrpl_ledgers.json"
+EXCHANGES = [
+    "binance:rEb8TK3gBgk5auZkwc6sHnwrGVJH8DuaLh",
+    "binance:rJb5KsHsDHF1YS5B5DU6QCkH5NsPaKQTcy",
+    "bitstamp:rvYAfWj5gh67oV6fW32ZzP3Aw4Eubs59B",
+]
+
+
+def _ledgers():
+    return json.loads(FIXTURE.read_text())
+
+
+def test_recorded_ledgers_produce_exchange_flows_and_active_addresses():
+    indexer = OnChainIndexer(EXCHANGES)
+    ledgers = _ledgers()
+    # the failed payment and the non-payment count as processed, not as flow
+    assert indexer.process(ledgers) == 7
+    assert indexer.process(ledgers[:1]) == 0 and indexer.skipped_ledgers == 1
+    assert indexer.last_ledger_index == 85_000_001
+    assert indexer.close_time_s == 760_000_004 + RIPPLE_EPOCH_S
+
+    # inflows 1000 + 300 (bitstamp -> binance) + 60 delivered of a partial 100;
+    # outflows 250 + 300; binance's internal 5000 shuffle is ignored
+    assert indexer.net_inflow() == pytest.approx(1_360 - 550)
+    assert round(indexer.active_addresses()) == 6
+    features = indexer.features()
+    assert features["exchange_balance_delta"] == pytest.approx(810 / 1_910)
+    assert features["flow_direction"] == pytest.approx(-810 / 1_910)
+    assert features["active_address_divergence"] == 0.0  # no completed short window yet
+
+    vector = compute_features("XRPUSDT", 1, [], onchain=features)
+    assert vector.onchain == features
+
+
+def test_unparseable_amounts_and_failed_ledgers_leave_no_half_applied_state():
+    indexer = OnChainIndexer(EXCHANGES)
+    exchange = EXCHANGES[0].split(":")[1]
+    ledger = {
+        "ledger_index": "100",
+        "close_time": 760_000_000,
+        "transactions": [
+            # old ledgers report what a payment delivered as "unavailable"
+            {
+                "TransactionType": "Payment",
+                "Account": "rSender",
+                "Destination": exchange,
+                "Amount": "5000000",
+                "meta": {"TransactionResult": "tesSUCCESS", "delivered_amount": "unavailable"},
+            },
+            {"TransactionType": "Payment", "Account": "rBroken", "meta": {"TransactionResult": "tesSUCCESS"}},
+            {
+                "TransactionType": "Payment",
+                "Account": "rSender",
+                "Destination": exchange,
+                "Amount": "2000000",
+                "meta": {"TransactionResult": "tesSUCCESS"},
+            },
+        ],
+    }
+    assert indexer.process_ledger(ledger) == 2
+    assert indexer.malformed_transactions == 1 and indexer.net_inflow() == pytest.approx(2.0)
+
+    broken = {"ledger_index": "101", "close_time": "not a time", "transactions": ledger["transactions"]}
+    with pytest.raises(ValueError):
+        indexer.process_ledger(broken)
+    # nothing from the failed ledger stuck, so the next poll indexes it in full
+    assert indexer.last_ledger_index == 100 and indexer.ledgers == 1
+    assert indexer.process_ledger({**broken, "close_time": 760_000_010}) == 2
+    assert indexer.last_ledger_index == 101 and indexer.net_inflow() == pytest.approx(4.0)
+
+
+def _synthetic_ledgers(start_index, start_close, count, addresses, rng, exchange):
+    for offset in range(count):
+        transactions = []
+        for _ in range(5):
+            source, destination = rng.choice(addresses), rng.choice(addresses)
+            if rng.random() < 0.2:
+                destination = exchange
+            transactions.append(
+                {
+                    "Account": source,
+                    "Destination": destination,
+                    "Amount": str(rng.randint(1, 1_000) * 1_000_000),
+                    "TransactionType": "Payment",
+                    "metaData": {"TransactionResult": "tesSUCCESS"},
+                }
+            )
+        yield {
+            "ledger_index": str(start_index + offset),
+            "close_time": start_close + offset * 4,
+            "transactions": transactions,
+        }
+
+
+def test_windows_expire_and_activity_spikes_show_as_divergence():
+    rng = random.Random(3)
+    exchange = "rEb8TK3gBgk5auZkwc6sHnwrGVJH8DuaLh"
+    indexer = OnChainIndexer([exchange], short_s=600, long_s=6_000, bucket_s=60, precision=10)
+    regulars = [f"rRegular{i}" for i in range(200)]
+    # 2 hours of steady activity from the same 200 wallets: 4s ledgers
+    steady = list(_synthetic_ledgers(1, 0, 1_800, regulars, rng, exchange))
+    indexer.process(steady)
+    assert abs(indexer.features()["active_address_divergence"]) < 0.1
+    assert indexer.features()["exchange_balance_delta"] == pytest.approx(1.0)
+
+    # ten minutes in which thousands of new wallets appear
+    newcomers = [f"rNew{i}" for i in range(5_000)]
+    indexer.process(_synthetic_ledgers(1_801, 7_200, 150, newcomers, rng, exchange))
+    assert indexer.features()["active_address_divergence"] > 0.5
+
+    # after a silence longer than the long window every total has expired
+    indexer.process([{"ledger_index": "5000", "close_time": 20_000, "transactions": []}])
+    assert indexer.net_inflow() == 0.0
+    assert indexer.active_addresses() == 0.0
+
+
+def test_hyperloglog_estimates_within_its_error_and_merges():
+    left, right = HyperLogLog(), HyperLogLog()
+    left.update(f"addr-{i}" for i in range(60_000))
+    right.update(f"addr-{i}" for i in range(40_000, 100_000))
+    assert left.count() == pytest.approx(60_000, rel=0.05)
+    left.merge(right)
+    assert left.count() == pytest.approx(100_000, rel=0.05)
+    with pytest.raises(ValueError):
+        left.merge(HyperLogLog(precision=10))
+
+
+def test_ledger_feed_polls_validated_ledgers_over_json_rpc():
+    ledgers = {int(entry["ledger_index"]): entry for entry in _ledgers()}
+    latest = [85_000_000]
+
+    def handler(request):
+        params = orjson.loads(request.content)["params"][0]
+        if params["ledger_index"] == "validated":
+            return httpx.Response(200, content=orjson.dumps({"result": {"ledger_index": latest[0], "status": "success"}}))
+        entry = ledgers[params["ledger_index"]]
+        assert params["transactions"] and params["expand"]
+        return httpx.Response(200, content=orjson.dumps({"result": {**entry, "status": "success"}}))
+
+    async def run():
+        client = httpx.AsyncClient(base_url="https://rippled.test", transport=httpx.MockTransport(handler))
+        indexer = OnChainIndexer(EXCHANGES)
+        feed = XrplLedgerFeed(XrplConnector(RestClient(client)), indexer)
+        first = await feed.poll()
+        latest[0] = 85_000_001
+        second = await feed.poll()
+        await client.aclose()
+        return indexer, first, second
+
+    indexer, first, second = asyncio.run(run())
+    assert (first, second) == (1, 1)
+    assert indexer.ledgers == 2 and indexer.transactions == 7
@@ -0,0 +1,65 @@
+import random
+
+import numpy as np
+
+from xrp_platform.data.schemas import OrderBookSnapshot
+from xrp_platform.features.order_book import OrderBook
+from xrp_platform.signals.modules import OrderBookMicrostructureModule
+from xrp_platform.utils.features import compute_features
+
+
+def _updates(count, seed=3):
+    rng = random.Random(seed)
+    for _ in range(count):
+        is_bid = rng.random() < 0.5
+        offset = rng.randint(1, 40) / 10_000
+        price = round(0.5 - offset if is_bid else 0.5 + offset, 4)
+        size = 0.0 if rng.random() < 0.3 else float(rng.randint(1, 5_000))
+        yield is_bid, price, size
+
+
+def test_book_matches_rebuilt_reference():
+    book = OrderBook("XRPUSDT", depth_levels=5)
+    reference = {True: {}, False: {}}
+    for i, (is_bid, price, size) in enumerate(_updates(20_000)):
+        book.update(is_bid, price, size)
+        if size:
+            reference[is_bid][price] = size
+        else:
+            reference[is_bid].pop(price, None)
+        if i % 997 or not (reference[True] and reference[False]):
+            continue
+        bids = sorted(reference[True].items(), reverse=True)
+        asks = sorted(reference[False].items())
+        assert book.bids.levels() == bids and book.asks.levels() == asks
+        bid_depth = sum(size for _, size in bids[:5])
+        ask_depth = sum(size for _, size in asks[:5])
+        assert np.isclose(book.depth_skew(), (bid_depth - ask_depth) / (bid_depth + ask_depth))
+        (bid, bid_size), (ask, ask_size) = bids[0], asks[0]
+        assert np.isclose(book.microprice(), (bid * ask_size + ask * bid_size) / (bid_size + ask_size))
+        assert -1.0 <= book.microprice_drift() <= 1.0
+
+
+def test_flickering_walls_raise_spoof_likelihood():
+    snapshot = OrderBookSnapshot(
+        symbol="XRPUSDT",
+        bids=[[0.4999 - i / 10_000, 1_000.0] for i in range(10)],
+        asks=[[0.5001 + i / 10_000, 1_000.0] for i in range(10)],
+        timestamp="2024-01-01T00:00:00",
+    )
+    steady = OrderBook.from_snapshot(snapshot)
+    spoofed = OrderBook.from_snapshot(snapshot)
+    for i in range(200):
+        steady.update(True, 0.4999, 1_000.0 + (i % 2) * 50)
+        spoofed.update(False, 0.5004, 50_000.0 if i % 2 == 0 else 1_000.0)
+    assert steady.spoof_likelihood() < 0.1
+    assert spoofed.spoof_likelihood() > 0.9
+
+
+def test_order_book_features_feed_microstructure_module(make_candles):
+    book = OrderBook("XRPUSDT")
+    book.apply_diff(bids=[[0.4999, 9_000.0], [0.4998, 4_000.0]], asks=[[0.5001, 1_000.0]])
+    features = compute_features("XRPUSDT", 1, make_candles(60), order_book=book.features())
+    assert features.order_book == book.features()
+    assert features.order_book["depth_skew"] > 0.8 and features.order_book["microprice_drift"] > 0.5
+    assert OrderBookMicrostructureModule().value(features) > 40
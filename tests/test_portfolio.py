@@ -0,0 +1,130 @@
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from services.backtesting.simulator import FillModel, SimulationConfig
+from xrp_platform.config import Settings
+from xrp_platform.data.candles import as_series
+from xrp_platform.data.schemas import CompositeSignal
+from xrp_platform.execution.engine import ExecutionEngine, RiskEngine, RiskLimits
+from xrp_platform.execution.portfolio import PortfolioRisk
+
+
+def test_running_totals_match_a_full_revaluation():
+    rng = np.random.default_rng(3)
+    portfolio = PortfolioRisk(100_000.0, RiskLimits(max_drawdown_pct=100.0))
+    symbols = ["XRPUSDT", "BTCUSDT", "ETHUSDT"]
+    quantities = dict.fromkeys(symbols, 0.0)
+    marks = dict.fromkeys(symbols, 1.0)
+    cash, peak, worst = 100_000.0, 100_000.0, 0.0
+    for _ in range(2_000):
+        symbol = symbols[rng.integers(3)]
+        price = float(rng.uniform(0.5, 2.0))
+        if rng.random() < 0.5:
+            side, quantity, fee = int(rng.choice([-1, 1])), float(rng.uniform(1, 500)), float(rng.uniform(0, 1))
+            portfolio.on_fill(symbol, side, quantity, price, fee)
+            cash -= side * quantity * price + fee
+            quantities[symbol] += side * quantity
+        else:
+            portfolio.mark(symbol, price)
+        marks[symbol] = price
+        equity = cash + sum(quantities[s] * marks[s] for s in symbols)
+        peak = max(peak, equity)
+        worst = 1 - equity / peak
+        assert portfolio.equity == pytest.approx(equity, rel=1e-9)
+        assert portfolio.gross_exposure == pytest.approx(sum(abs(quantities[s] * marks[s]) for s in symbols), rel=1e-9)
+        assert portfolio.drawdown == pytest.approx(worst, abs=1e-9)
+    assert portfolio.high_water == pytest.approx(peak, rel=1e-9)
+
+
+def test_kill_switch_latches_but_lets_positions_shrink():
+    portfolio = PortfolioRisk(10_000.0, RiskLimits(max_drawdown_pct=10.0, max_exposure_pct=50.0))
+    # exposure headroom caps a new order at half the equity
+    assert portfolio.scale("XRPUSDT", 1, 10_000.0) == pytest.approx(0.5)
+    portfolio.on_fill("XRPUSDT", 1, 5_000.0, 1.0)
+    assert portfolio.scale("BTCUSDT", 1, 1_000.0) == 0.0
+
+    portfolio.mark("XRPUSDT", 0.85)  # 750 down: 7.5% drawdown, inside the throttle band
+    assert not portfolio.halted
+    assert portfolio.scale("XRPUSDT", -1, 1_000.0) == 1.0
+    portfolio.mark("XRPUSDT", 0.80)
+    assert portfolio.halted and portfolio.drawdown == pytest.approx(0.1)
+    portfolio.mark("XRPUSDT", 0.95)  # recovering does not clear the switch
+    assert portfolio.halted and portfolio.scale("ETHUSDT", 1, 10.0) == 0.0
+    # closing out is still allowed, but only down to flat
+    assert portfolio.scale("XRPUSDT", -1, 9_500.0) == pytest.approx(0.5)
+
+    portfolio.on_fill("XRPUSDT", -1, 5_000.0, 0.95)
+    portfolio.rearm()
+    assert portfolio.gross_exposure == 0.0 and portfolio.equity == pytest.approx(9_750.0)
+    assert portfolio.scale("ETHUSDT", 1, 1_000.0) == 1.0
+
+
+def test_route_scales_by_drawdown_and_stops_at_the_limit():
+    portfolio = PortfolioRisk(1_000_000.0, RiskLimits(max_drawdown_pct=10.0))
+    engine = ExecutionEngine(risk=RiskEngine(limits=RiskLimits()), portfolio=portfolio)
+    signal = CompositeSignal(
+        symbol="XRPUSDT",
+        timeframe_min=1,
+        scores=[],
+        composite=0.9,
+        regime="trending",
+        thresholds={"bullish": 0.3, "bearish": -0.3},
+        computed_at=datetime(2024, 1, 1),
+    )
+    assert engine.route(signal, 1_000_000.0, 1.0, 0.01).size == pytest.approx(20_000.0)
+
+    portfolio.on_fill("BTCUSDT", 1, 10.0, 10_000.0)
+    portfolio.mark("BTCUSDT", 7_000.0)  # 3% down, no throttle yet
+    assert engine.route(signal, 1_000_000.0, 1.0, 0.01).size == pytest.approx(20_000.0)
+    portfolio.mark("BTCUSDT", 2_500.0)  # 7.5% down: halfway through the throttle band
+    assert engine.route(signal, 1_000_000.0, 1.0, 0.01).size == pytest.approx(10_000.0)
+    portfolio.mark("BTCUSDT", 0.0)
+    assert portfolio.halted and engine.route(signal, 1_000_000.0, 1.0, 0.01) is None
+
+
+def test_backtest_stops_trading_after_the_drawdown_limit(make_candles):
+    candles = make_candles(3_000, seed=4)
+    series = as_series(candles, "XRPUSDT", 1)
+    composites = np.where(np.arange(2_900) % 2, 0.9, -0.9)
+    config = SimulationConfig(
+        limits=RiskLimits(max_position_pct=50.0, max_drawdown_pct=1.0), fill_model=FillModel(fee_bps=25.0)
+    )
+    unlimited = SimulationConfig(
+        limits=RiskLimits(max_position_pct=50.0, max_drawdown_pct=100.0), fill_model=FillModel(fee_bps=25.0)
+    )
+    thresholds = {"bullish": 0.3, "bearish": -0.3}
+
+    simulator = config.simulator(series)
+    simulator.run_signals(composites, 59, thresholds)
+    baseline = unlimited.simulator(series)
+    baseline.run_signals(composites, 59, thresholds)
+
+    assert simulator.portfolio.halted and not baseline.portfolio.halted
+    assert len(simulator.trades) < len(baseline.trades)
+    last_exit = int(simulator.trades["exit_bar"].max())
+    assert last_exit < len(series) - 1
+    # no new risk once the limit is hit, so equity is flat after the last exit
+    curve = simulator.equity(0, len(series))
+    assert np.all(curve[last_exit:] == curve[-1])
+    assert simulator.portfolio.equity == pytest.approx(curve[-1])
+
+
+def test_shipped_example_limits_are_percentages():
+    example = Path(__file__).resolve().parent.parent / ".env.example"
+    values = dict(
+        line.split("=", 1) for line in example.read_text().splitlines() if line and not line.startswith("#")
+    )
+    limits = RiskLimits.from_settings(Settings.model_validate(values))
+    portfolio = PortfolioRisk(100_000.0, limits)
+    portfolio.on_fill("XRPUSDT", 1, 50_000.0, 1.0)
+    portfolio.mark("XRPUSDT", 0.98)  # 1% drawdown: well inside a 10% limit
+    assert not portfolio.halted and portfolio.scale("XRPBTC", 1, 1_000.0) == 1.0
+    portfolio.mark("XRPUSDT", 0.79)
+    assert portfolio.halted
+
+    with pytest.raises(ValidationError):
+        Settings.model_validate({**values, "MAX_DRAWDOWN_PCT": "150"})
@@ -0,0 +1,124 @@
+import asyncio
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from services.signal_worker.main import BASE_BARS, CROSS_ASSET_WINDOWS, HISTORY_BARS, SignalWorker
+from services.signal_worker.scheduler import Job, SignalScheduler
+from xrp_platform.config import Settings
+from xrp_platform.features.timeframe import MINUTE_NS
+
+
+class FakeClock:
+    """Virtual time that only advances to the earliest pending sleeper's deadline."""
+
+    def __init__(self, start: float) -> None:
+        self.now = start
+        self.pending = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, delay: float) -> None:
+        target = self.now + delay
+        self.pending.append(target)
+        while self.now < target:
+            for _ in range(10):
+                await asyncio.sleep(0)
+            if target == min(self.pending):
+                self.now = target
+        self.pending.remove(target)
+
+
+def test_scheduler_aligns_jobs_to_bar_close_and_caps_concurrency():
+    clock = FakeClock(1_700_000_000.0)  # 22:13:20 UTC
+    runs = []
+    peak = 0
+    active = 0
+
+    async def run_job(symbol: str, timeframe: int) -> None:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        runs.append((symbol, timeframe, clock.now))
+        await asyncio.sleep(0)
+        active -= 1
+
+    scheduler = SignalScheduler(
+        run_job=run_job,
+        symbols=["XRPUSDT", "XRPBTC", "XRPETH"],
+        timeframes=[1, 5, 60],
+        max_in_flight=2,
+        clock=clock,
+        sleep=clock.sleep,
+    )
+    asyncio.run(scheduler.run(until=clock.now + 3_600))
+
+    assert peak <= 2
+    for symbol, timeframe, at in runs:
+        assert (at - scheduler.settle_s) % (timeframe * 60) == 0
+    assert scheduler.stats[Job("XRPBTC", 5)].runs == 12
+    assert scheduler.stats[Job("XRPETH", 60)].runs == 1
+
+
+def test_worker_offloads_compute_to_executor(settings):
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        worker = SignalWorker(settings, executor=executor)
+        signal = asyncio.run(worker.compute("XRPBTC", 5))
+    assert settings.symbols == ["XRPUSDT", "XRPBTC"]
+    assert signal.symbol == "XRPBTC" and signal.timeframe_min == 5
+    assert len(worker.scheduler().jobs) == 2 * len(settings.timeframes)
+
+
+def test_worker_without_a_publisher_keeps_stdout_clean(settings, capsys):
+    worker = SignalWorker(settings)
+    asyncio.run(worker.run_once("XRPUSDT", 1))
+    assert capsys.readouterr().out == ""
+
+
+def test_jobs_share_one_base_fetch_and_resample_it(settings):
+    worker = SignalWorker(settings)
+    fetch = worker.fetch_candles
+    fetched = []
+
+    async def counting_fetch(symbol, timeframe, limit=HISTORY_BARS):
+        fetched.append((symbol, timeframe, limit))
+        return await fetch(symbol, timeframe, limit)
+
+    worker.fetch_candles = counting_fetch
+
+    async def scenario():
+        return await asyncio.gather(*(worker.timeframe_candles("XRPUSDT", tf) for tf in (1, 5, 60)))
+
+    one, five, hour = asyncio.run(scenario())
+    # 1m and 5m come out of the shared 1m history; 1000 1m bars hold too few hourly bars
+    assert fetched == [("XRPUSDT", 1, BASE_BARS), ("XRPUSDT", 60, HISTORY_BARS)]
+    assert len(one) == len(five) == len(hour) == HISTORY_BARS
+    assert five.timeframe_min == 5 and np.all(np.diff(five.timestamp) == 5 * MINUTE_NS)
+    # the newest 5m bar closes where the newest 1m bar does
+    assert five.close[-1] == one.close[-1] and five.timestamp[-1] <= one.timestamp[-1]
+
+
+def test_cross_asset_windows_fill_from_one_fetch(settings):
+    worker = SignalWorker(settings)
+
+    async def scenario():
+        candles = await worker.timeframe_candles("XRPUSDT", 60)
+        return await worker.cross_asset("XRPUSDT", 60, candles)
+
+    meta = asyncio.run(scenario())
+    cross = worker.cross_assets[("XRPUSDT", 60)]
+    assert cross.windows == CROSS_ASSET_WINDOWS
+    # every window, the long one behind ``decoupling`` included, is full after the first sync
+    assert all(cross.stats(name, window).count == window for name in ("btc", "eth") for window in cross.windows)
+    assert meta is not None and "decoupling" in meta
+
+
+def test_compose_forwards_every_setting_to_the_worker():
+    compose = (Path(__file__).parents[1] / "docker-compose.yml").read_text()
+    worker = compose.split("  signal-worker:", 1)[1].split("\n  redis:", 1)[0]
+    forwarded = set(re.findall(r"^      - (\w+)=", worker, flags=re.MULTILINE))
+    aliases = {field.alias for field in Settings.model_fields.values()}
+    assert aliases - forwarded == set()
@@ -0,0 +1,136 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from services.backtesting.simulator import END, STOP, TAKE_PROFIT, FillModel, FillSimulator
+from xrp_platform.data.candles import CandleSeries, as_series
+from xrp_platform.data.schemas import CompositeSignal
+from xrp_platform.execution.engine import ExecutionEngine, RiskEngine, RiskLimits
+from xrp_platform.utils.features import average_true_range
+
+MINUTE_NS = 60_000_000_000
+FREE = FillModel(fee_bps=0.0, slippage_bps=0.0)
+
+
+def _bars(rows):
+    """Series from (open, high, low, close) rows, one minute apart."""
+    open_, high, low, close = (np.array(column, dtype=float) for column in zip(*rows))
+    timestamps = np.arange(len(rows), dtype=np.int64) * MINUTE_NS
+    return CandleSeries.from_arrays(
+        "XRPUSDT", 1, timestamp=timestamps, open=open_, high=high, low=low, close=close, volume=np.ones(len(rows)), vwap=close
+    )
+
+
+def test_long_and_short_exit_inside_later_bars():
+    series = _bars(
+        [
+            (1.00, 1.00, 1.00, 1.00),
+            (1.00, 1.01, 0.99, 1.00),  # fills both entries at 1.00
+            (1.00, 1.02, 0.995, 1.01),
+            (1.01, 1.06, 1.00, 1.05),  # long target 1.05 and short stop 1.04 trade through
+            (1.05, 1.05, 1.05, 1.05),
+        ]
+    )
+    simulator = FillSimulator(series, fill_model=FREE, max_positions=2)
+    long_row = simulator.submit_order(0, 1, 10.0, 1.00, 0.96, 1.05, last_bar=1)
+    short_row = simulator.submit_order(0, -1, 10.0, 1.00, 1.04, 0.90, last_bar=1)
+    trades = simulator.trades
+    assert trades[long_row]["fill_bar"] == 1 and trades[long_row]["exit_bar"] == 3
+    assert trades[long_row]["reason"] == TAKE_PROFIT and trades[long_row]["exit"] == 1.05
+    assert trades[short_row]["reason"] == STOP and trades[short_row]["exit"] == 1.04
+    assert simulator.closed(0, 5) == (1, 2)
+
+
+def test_gaps_fill_at_the_open_with_slippage_on_stops():
+    series = _bars(
+        [
+            (1.00, 1.00, 1.00, 1.00),
+            (0.98, 0.99, 0.97, 0.98),  # gaps below the 0.99 buy limit
+            (0.98, 0.985, 0.975, 0.98),
+            (0.90, 0.91, 0.89, 0.90),  # gaps through the 0.95 stop
+        ]
+    )
+    simulator = FillSimulator(series, fill_model=FillModel(fee_bps=10.0, slippage_bps=50.0))
+    row = simulator.submit_order(0, 1, 100.0, 0.99, 0.95, 1.10, last_bar=2)
+    trade = simulator.trades[row]
+    assert trade["entry"] == 0.98
+    assert trade["exit"] == pytest.approx(0.90 * (1 - 0.005))
+    assert trade["fees"] == pytest.approx((0.98 + trade["exit"]) * 100.0 * 0.001)
+    assert simulator.realized_equity(3) == pytest.approx(1_000_000 + 100.0 * (trade["exit"] - 0.98) - trade["fees"])
+
+
+def test_a_gap_through_the_stop_on_the_fill_bar_books_a_loss():
+    series = _bars(
+        [
+            (1.00, 1.00, 1.00, 1.00),
+            (0.90, 0.92, 0.88, 0.91),  # opens below both the 0.99 buy limit and its 0.95 stop
+            (1.10, 1.12, 1.08, 1.10),  # opens above both the 1.01 sell limit and its 1.05 stop
+        ]
+    )
+    simulator = FillSimulator(series, fill_model=FREE, max_positions=2)
+    long_row = simulator.submit_order(0, 1, 10.0, 0.99, 0.95, 1.10, last_bar=1)
+    short_row = simulator.submit_order(1, -1, 10.0, 1.01, 1.05, 0.90, last_bar=2)
+    long_trade, short_trade = simulator.trades[long_row], simulator.trades[short_row]
+    # stopped out where they filled, at the open, instead of at a stop on the wrong side of the fill
+    assert long_trade["reason"] == STOP and long_trade["entry"] == long_trade["exit"] == 0.90
+    assert short_trade["reason"] == STOP and short_trade["entry"] == short_trade["exit"] == 1.10
+    assert simulator.realized_equity(3) <= 1_000_000
+
+
+def test_unfilled_limit_expires_and_frees_its_slot():
+    series = _bars([(1.00, 1.00, 1.00, 1.00)] + [(1.02, 1.03, 1.01, 1.02)] * 4 + [(1.00, 1.00, 0.98, 0.99)] * 2)
+    simulator = FillSimulator(series, fill_model=FREE)
+    assert simulator.submit_order(0, 1, 1.0, 1.00, 0.95, 1.10, last_bar=2) is None
+    assert simulator.expired == 1
+    # the slot is held until the order expires, then takes new orders
+    assert simulator.submit_order(1, 1, 1.0, 1.02, 0.95, 1.10, last_bar=3) is None
+    assert simulator.rejected == 1
+    row = simulator.submit_order(4, 1, 1.0, 1.00, 0.95, 1.10, last_bar=5)
+    assert simulator.trades[row]["fill_bar"] == 5 and simulator.trades[row]["reason"] == END
+
+
+def test_routed_command_replays_with_side_aware_stops():
+    series = _bars([(1.00, 1.00, 1.00, 1.00), (1.00, 1.00, 0.99, 0.995), (0.995, 1.03, 0.99, 1.03)])
+    engine = ExecutionEngine(risk=RiskEngine(limits=RiskLimits(max_position_pct=2.0)))
+    signal = CompositeSignal(
+        symbol="XRPUSDT",
+        timeframe_min=1,
+        scores=[],
+        composite=-0.9,
+        regime="range_bound",
+        thresholds={"bullish": 0.3, "bearish": -0.3},
+        computed_at=datetime(1970, 1, 1),
+    )
+    command = engine.route(signal, balance=1_000_000, price=1.00, atr=0.01)
+    assert command.side == "SELL" and command.stop == pytest.approx(1.02) and command.take_profit == pytest.approx(0.97)
+    assert command.expires_at == datetime(1970, 1, 1) + timedelta(minutes=1)
+
+    simulator = FillSimulator(series, risk=engine.risk, fill_model=FREE)
+    row = simulator.submit(command, 0)
+    trade = simulator.trades[row]
+    assert trade["side"] == -1 and trade["fill_bar"] == 1 and trade["size"] == pytest.approx(20_000)
+    assert trade["reason"] == STOP and trade["exit"] == pytest.approx(1.02)
+
+
+def test_equity_matches_brute_force_mark_to_market(make_candles):
+    series = as_series(make_candles(600, seed=11), "XRPUSDT", 1)
+    simulator = FillSimulator(series, max_positions=3)
+    composites = np.sin(np.arange(560) / 7.0)
+    simulator.run_signals(composites, 39, {"bullish": 0.6, "bearish": -0.6}, average_true_range(series), expiry_bars=3)
+    trades = simulator.trades
+    assert len(trades) > 10 and set(trades["side"].tolist()) == {-1, 1}
+    assert np.all(trades["fill_bar"] > trades["signal_bar"]) and np.all(trades["exit_bar"] >= trades["fill_bar"])
+
+    expected = np.full(len(series), 1_000_000.0)
+    for trade in trades:
+        signed = trade["side"] * trade["size"]
+        for bar in range(trade["fill_bar"], len(series)):
+            if bar < trade["exit_bar"]:
+                expected[bar] += signed * (series.close[bar] - trade["entry"]) - trade["entry_fee"]
+            else:
+                expected[bar] += signed * (trade["exit"] - trade["entry"]) - trade["fees"]
+    assert np.allclose(simulator.equity(0, len(series)), expected, rtol=0, atol=1e-6)
+    assert np.allclose(simulator.equity(250, 400), expected[250:400], rtol=0, atol=1e-6)
+    wins, count = simulator.closed(0, len(series))
+    assert count == len(trades) and simulator.stats()["filled"] == count
@@ -0,0 +1,89 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from xrp_platform.data.schemas import CompositeSignal, SignalExplanation, SignalScore
+from xrp_platform.data.sink import SignalSink
+from xrp_platform.data.storage import Base, SignalRecord, create_engine
+
+
+def _signal(i: int) -> CompositeSignal:
+    return CompositeSignal(
+        symbol="XRPUSDT",
+        timeframe_min=1,
+        computed_at=datetime(2024, 1, 1) + timedelta(minutes=i),
+        scores=[SignalScore(module="technical_trend", score=float(i), explanation=SignalExplanation(factors={}))],
+        composite=float(i),
+        regime="trending",
+        thresholds={"bullish": 80.0},
+    )
+
+
+def test_sink_flushes_by_size_and_on_stop(tmp_path):
+    async def scenario():
+        engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'signals.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        sink = SignalSink(engine, max_batch=100, flush_interval_s=60)
+        sink.start()
+        for i in range(250):
+            await sink.submit(_signal(i))
+        await sink.stop()
+
+        async with engine.connect() as conn:
+            count = await conn.scalar(select(func.count()).select_from(SignalRecord))
+            scores = await conn.scalar(select(SignalRecord.score_technical_trend).where(SignalRecord.composite == 42.0))
+        await engine.dispose()
+        return sink, count, scores
+
+    sink, count, scores = asyncio.run(scenario())
+    assert count == 250
+    assert scores == 42.0
+    assert sink.stats.flushes == 3 and sink.stats.rows == 250
+    assert sink.queue_depth == 0 and sink.stats.last_flush_ms > 0
+
+
+def test_failed_flushes_are_retried_then_counted_when_abandoned(tmp_path):
+    async def scenario(failures):
+        engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / f'retry-{failures}.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        sink = SignalSink(engine, flush_interval_s=60, max_retries=2, retry_delay_s=0.001)
+        write = sink._write
+        attempts = []
+
+        async def flaky(rows):
+            attempts.append(len(rows))
+            if len(attempts) <= failures:
+                raise ConnectionError("database restarting")
+            await write(rows)
+
+        sink._write = flaky
+        sink.start()
+        for i in range(10):
+            await sink.submit(_signal(i))
+        await sink.stop()
+        async with engine.connect() as conn:
+            count = await conn.scalar(select(func.count()).select_from(SignalRecord))
+        await engine.dispose()
+        return sink, count
+
+    sink, count = asyncio.run(scenario(failures=2))
+    assert count == 10 and sink.stats.errors == 2 and sink.stats.abandoned == 0
+
+    sink, count = asyncio.run(scenario(failures=3))
+    assert count == 0 and sink.stats.errors == 3 and sink.stats.abandoned == 10
+
+
+def test_submit_nowait_counts_what_a_full_queue_refuses():
+    async def scenario():
+        engine = create_engine("sqlite+aiosqlite://")
+        sink = SignalSink(engine, max_queue=2)
+        accepted = [sink.submit_nowait(_signal(i)) for i in range(3)]
+        await engine.dispose()
+        return sink, accepted
+
+    sink, accepted = asyncio.run(scenario())
+    assert accepted == [True, True, False] and sink.stats.dropped == 1 and sink.queue_depth == 2
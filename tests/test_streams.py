@@ -0,0 +1,55 @@
+import asyncio
+from datetime import datetime
+
+from tests.fakes import FakeRedis
+from xrp_platform.data.schemas import CompositeSignal
+from xrp_platform.messaging.streams import SignalPublisher, SignalStreamReader, decode_signal
+
+
+def _signal(symbol: str, composite: float) -> CompositeSignal:
+    return CompositeSignal(
+        symbol=symbol,
+        timeframe_min=5,
+        computed_at=datetime(2024, 1, 1),
+        scores=[],
+        composite=composite,
+        regime="trending",
+        thresholds={"bearish": 40.0, "bullish": 80.0},
+    )
+
+
+def test_publisher_batches_and_reader_consumes():
+    async def scenario():
+        redis = FakeRedis()
+        reader = SignalStreamReader(redis, group="api", consumer="api-1", block_ms=100)
+        await reader.ensure_group()
+        await reader.ensure_group()
+
+        publisher = SignalPublisher(redis, batch_size=4, maxlen=50, retry_delay_s=0)
+        redis.fail_next = 1
+        publisher.start()
+        for i in range(10):
+            publisher.publish_nowait(_signal("XRPUSDT", float(i)))
+        await publisher.stop()
+
+        entries = await reader.read()
+        await reader.ack([entry.entry_id for entry in entries])
+        return redis, publisher, entries
+
+    redis, publisher, entries = asyncio.run(scenario())
+    assert publisher.stats.published == 10
+    assert publisher.stats.errors == 1 and publisher.stats.batches == 3
+    assert [decode_signal(entry.data).composite for entry in entries] == [float(i) for i in range(10)]
+    assert entries[0].symbol == "XRPUSDT" and entries[0].timeframe_min == 5
+    assert len(redis.acked) == 10
+
+
+def test_publisher_drops_oldest_when_queue_is_full():
+    async def scenario():
+        publisher = SignalPublisher(FakeRedis(), max_queue=3)
+        for i in range(5):
+            publisher.publish_nowait(_signal("XRPUSDT", float(i)))
+        return publisher
+
+    publisher = asyncio.run(scenario())
+    assert publisher.queue_depth == 3 and publisher.stats.dropped == 2
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from xrp_platform.data.candles import CandleSeries
+from xrp_platform.features.timeframe import StreamingAggregator, TimeframeAggregator, resample
+
+TIMEFRAMES = [1, 5, 60, 240, 1440, 10080]
+
+
+def _minute_series(minutes: int) -> CandleSeries:
+    rng = np.random.default_rng(5)
+    close = 0.5 + np.cumsum(rng.normal(0, 0.001, minutes))
+    start = np.datetime64("2024-01-03T22:00", "ns")  # a Wednesday, mid-week and mid-day
+    return CandleSeries.from_arrays(
+        "XRPUSDT",
+        1,
+        timestamp=start + np.arange(minutes) * np.timedelta64(1, "m"),
+        open=close - 0.0002,
+        high=close + 0.001,
+        low=close - 0.001,
+        close=close,
+        volume=rng.uniform(1e5, 1e6, minutes),
+        vwap=close,
+    )
+
+
+def test_resample_aligns_long_timeframes():
+    series = _minute_series(3 * 10080)
+    four_hour = TimeframeAggregator().aggregate(series, 240)
+    assert four_hour[0].timestamp == datetime(2024, 1, 3, 20)
+    assert all(c.timestamp.hour % 4 == 0 and c.timestamp.minute == 0 for c in four_hour)
+    assert np.isclose(four_hour[1].volume, series.volume[120:360].sum())
+
+    daily = resample(series, 1440)
+    assert all(ts % (1440 * 60_000_000_000) == 0 for ts in daily.timestamp.tolist())
+    weekly = TimeframeAggregator().aggregate(series, 10080)
+    assert [c.timestamp.weekday() for c in weekly] == [0] * len(weekly)
+    assert weekly[1].timestamp - weekly[0].timestamp == timedelta(days=7)
+    assert weekly[1].high == series.high[(weekly[1].timestamp - datetime(2024, 1, 3, 22)) // timedelta(minutes=1) :][:10080].max()
+
+
+def test_streaming_matches_bulk_resample():
+    series = _minute_series(2 * 1440 + 17)
+    streaming = StreamingAggregator("XRPUSDT", TIMEFRAMES)
+    closed = {tf: [] for tf in TIMEFRAMES}
+    for candle in series:
+        for bar in streaming.update(candle):
+            closed[bar.timeframe_min].append(bar)
+
+    for tf in TIMEFRAMES:
+        bulk = resample(series, tf).to_candles()
+        emitted = closed[tf]
+        assert len(emitted) in (len(bulk) - 1, len(bulk))
+        for expected, actual in zip(bulk, emitted):
+            assert actual.timestamp == expected.timestamp
+            assert (actual.open, actual.high, actual.low, actual.close) == (
+                expected.open,
+                expected.high,
+                expected.low,
+                expected.close,
+            )
+            assert np.isclose(actual.volume, expected.volume) and np.isclose(actual.vwap, expected.vwap)
+    assert streaming.partial(10080) is not None
+    assert {bar.timeframe_min for bar in streaming.flush()} == {5, 60, 240, 1440, 10080}
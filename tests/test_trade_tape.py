@@ -0,0 +1,94 @@
+import random
+import tracemalloc
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from xrp_platform.data.schemas import Trade
+from xrp_platform.features.trade_tape import SECOND_NS, TradeTape
+from xrp_platform.utils.features import compute_features
+
+T0 = 1_704_067_200 * SECOND_NS  # 2024-01-01
+
+
+def _trades(count, seed=11):
+    rng = random.Random(seed)
+    timestamp = T0
+    for _ in range(count):
+        timestamp += int(rng.expovariate(1 / 0.25) * SECOND_NS)
+        yield timestamp, 0.5 + rng.gauss(0, 0.002), rng.uniform(1, 2_000), rng.random() < 0.55
+
+
+def test_windows_match_brute_force_and_survive_ring_wrap():
+    trades = list(_trades(6_000))
+    tape = TradeTape("XRPUSDT", horizons_s=(10, 60, 600), capacity=4_096)
+    for i, trade in enumerate(trades):
+        tape.ingest_values(*trade)
+        if i % 499:
+            continue
+        now = trade[0]
+        for horizon in (10, 60):
+            inside = [t for t in trades[: i + 1] if t[0] > now - horizon * SECOND_NS]
+            stats = tape.stats(horizon)
+            assert stats.trades == len(inside)
+            assert np.isclose(stats.buy_volume, sum(t[2] for t in inside if t[3]))
+            assert np.isclose(stats.sell_volume, sum(t[2] for t in inside if not t[3]))
+            assert np.isclose(stats.vwap, sum(t[1] * t[2] for t in inside) / sum(t[2] for t in inside))
+    # the 600s horizon holds ~2400 trades, so a 4096 ring wraps but never truncates it
+    assert tape.stats(600).trades < 4_096 and len(tape) == 4_096
+
+
+def test_idle_tapes_stay_small_and_grow_only_with_the_trade_rate():
+    tracemalloc.start()
+    try:
+        tapes = [TradeTape(f"PAIR{i}") for i in range(10)]
+        idle_bytes = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    # ten symbols' worth of empty tapes in well under a megabyte
+    assert idle_bytes < 1 << 20
+
+    quiet, busy = tapes[0], tapes[1]
+    for timestamp, price, size, is_buy in _trades(6_000):
+        busy.ingest_values(timestamp, price, size, is_buy)
+        # one trade a minute: the hour horizon never holds more than 60
+        quiet.ingest_values(T0 + (timestamp - T0) * 240, price, size, is_buy)
+    assert quiet.allocated_slots == 1_024
+    # all 6000 trades (~25 minutes) are inside the hour horizon: doubled to fit them, no further
+    assert busy.allocated_slots == 8_192 and busy.stats(3_600).trades == 6_000
+
+
+def test_one_minute_candles_match_resampled_trades():
+    trades = list(_trades(2_000))
+    tape = TradeTape("XRPUSDT")
+    candles = []
+    for trade in trades:
+        timestamp, price, size, is_buy = trade
+        event = Trade(
+            symbol="XRPUSDT",
+            price=price,
+            size=size,
+            side="buy" if is_buy else "sell",
+            timestamp=datetime(1970, 1, 1) + timedelta(microseconds=timestamp // 1_000),
+        )
+        candles.extend(tape.ingest(event))
+    candles.extend(tape.flush())
+
+    minutes = {}
+    for timestamp, price, size, _ in trades:
+        minutes.setdefault(timestamp // (60 * SECOND_NS), []).append((price, size))
+    assert len(candles) == len(minutes)
+    for candle, bucket in zip(candles, minutes.values()):
+        prices = [price for price, _ in bucket]
+        assert (candle.open, candle.close, candle.high, candle.low) == (prices[0], prices[-1], max(prices), min(prices))
+        assert np.isclose(candle.volume, sum(size for _, size in bucket))
+
+
+def test_tape_features_override_candle_proxies(make_candles):
+    tape = TradeTape("XRPUSDT", horizons_s=(60, 600))
+    for second in range(600):
+        tape.ingest_values(T0 + second * SECOND_NS, 0.5, 100.0 if second < 540 else 400.0, second >= 540)
+    volume = tape.features()
+    assert np.isclose(volume["rvol"], 400 / ((540 * 100 + 60 * 400) / 599))
+    assert volume["imbalance"] == 1.0 and volume["accumulation"] < 0
+    assert compute_features("XRPUSDT", 1, make_candles(60), volume=volume).volume == volume